@@ -14,10 +14,16 @@ and can't be exercised locally (dev has no libpq). The Postgres import is lazy f
 the same reason: importing it on a dev box (no ``psycopg`` binary) would explode,
 and dev never takes that branch.
 
+Opening a saver costs a connection plus ``setup()``'s schema checks, so a long-
+lived process shares one per store (:func:`shared_checkpointer`): one SQLite
+connection per checkpoint file, or a Postgres connection pool, set up once.
+:func:`make_checkpointer` still builds a private one for callers that own it.
+
 Thread-key convention (the checkpointer's ``thread_id``):  ``"{agent}:{org_id}:{record_id}"``
 built by :func:`thread_key`.
 """
 import sqlite3
+import threading
 
 from django.conf import settings
 
@@ -26,6 +32,9 @@ from langgraph.checkpoint.sqlite import SqliteSaver
 SQLITE = 'sqlite'
 POSTGRES = 'postgres'
 
+_shared = {}
+_shared_lock = threading.Lock()
+
 
 def thread_key(agent, org_id, record_id):
     """The canonical checkpoint thread id for a run. Also the AgentThread key."""
@@ -49,29 +58,93 @@ def make_checkpointer(*, engine=None, sqlite_path=None):
 
     ``engine``/``sqlite_path`` are injectable so tests can force a kind and an
     isolated checkpoint file. Callers own the saver's lifetime: the SQLite saver
-    holds an open connection, so close it (or use it as a context manager) when a
-    long-lived process is done. Graph runs are short, so the runner builds one
-    per invocation.
+    holds an open connection, so close it (or use it as a context manager) when
+    they are done. The runner uses :func:`shared_checkpointer` instead.
     """
     kind = checkpointer_kind(engine or _default_engine())
     if kind == SQLITE:
-        path = sqlite_path or getattr(
-            settings, 'AGENT_CHECKPOINT_DB', str(settings.BASE_DIR / 'agent_checkpoints.sqlite3')
-        )
-        conn = sqlite3.connect(path, check_same_thread=False)
-        saver = SqliteSaver(conn)
-        saver.setup()
-        return saver
+        return _make_sqlite_saver(_sqlite_path(sqlite_path))
     return _make_postgres_saver()
 
 
+def shared_checkpointer(*, engine=None, sqlite_path=None):
+    """The process's saver for the configured (or given) store, built and set up
+    on first use and reused after.
+
+    Safe to share across threads: ``SqliteSaver`` serialises its connection
+    behind a lock, and the Postgres saver checks a connection out of its pool
+    (AGENT_CHECKPOINT_POOL_SIZE) per operation. Nobody closes it but
+    :func:`close_shared_checkpointers`.
+    """
+    kind = checkpointer_kind(engine or _default_engine())
+    key = (kind, _sqlite_path(sqlite_path) if kind == SQLITE else _conn_string())
+    with _shared_lock:
+        if key not in _shared:
+            build = _make_sqlite_saver if kind == SQLITE else _make_postgres_pool_saver
+            _shared[key] = build(key[1])
+        return _shared[key]
+
+
+def close_shared_checkpointers():
+    """Close and forget every shared saver (tests, and process shutdown)."""
+    with _shared_lock:
+        savers = list(_shared.values())
+        _shared.clear()
+    for saver in savers:
+        close_saver(saver)
+
+
+def close_saver(saver):
+    """Best-effort close of a saver's connection (or pool)."""
+    conn = getattr(saver, 'conn', None)
+    if conn is not None:
+        try:
+            conn.close()
+        except Exception:  # pragma: no cover - best-effort cleanup
+            pass
+
+
+def _sqlite_path(sqlite_path):
+    return sqlite_path or getattr(
+        settings, 'AGENT_CHECKPOINT_DB', str(settings.BASE_DIR / 'agent_checkpoints.sqlite3')
+    )
+
+
+def _make_sqlite_saver(path):
+    saver = SqliteSaver(sqlite3.connect(path, check_same_thread=False))
+    saver.setup()
+    return saver
+
+
+def _conn_string():
+    return settings.DATABASES['default'].get('CONN_STRING') or _postgres_conn_string()
+
+
 def _make_postgres_saver():
     """Lazily construct the Postgres saver. Imported here (not at module top) so
     a dev box without libpq never trips over the import — dev is always SQLite."""
     from langgraph.checkpoint.postgres import PostgresSaver
 
-    conn_string = settings.DATABASES['default'].get('CONN_STRING') or _postgres_conn_string()
-    saver = PostgresSaver.from_conn_string(conn_string).__enter__()
+    saver = PostgresSaver.from_conn_string(_conn_string()).__enter__()
+    saver.setup()
+    return saver
+
+
+def _make_postgres_pool_saver(conn_string):
+    """The shared Postgres saver: a saver over a connection pool, with the
+    connection settings ``PostgresSaver.from_conn_string`` uses. Lazy imports,
+    as :func:`_make_postgres_saver`."""
+    from langgraph.checkpoint.postgres import PostgresSaver
+    from psycopg.rows import dict_row
+    from psycopg_pool import ConnectionPool
+
+    pool = ConnectionPool(
+        conn_string,
+        max_size=settings.AGENT_CHECKPOINT_POOL_SIZE,
+        kwargs={'autocommit': True, 'prepare_threshold': 0, 'row_factory': dict_row},
+        open=True,
+    )
+    saver = PostgresSaver(pool)
     saver.setup()
     return saver
 
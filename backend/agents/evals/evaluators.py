@@ -78,6 +78,7 @@ def llm_judge(output, case, context):
     try:
         verdict, _model = llm.complete_structured(
             'LLM_AGENT_EVAL_JUDGE', prompt, str(output), JUDGE_SCHEMA,
+            validate=lambda data: validate_structured(data, JUDGE_SCHEMA),
         )
         validate_structured(verdict, JUDGE_SCHEMA)
     except (llm.LLMError, SchemaValidationError) as exc:
@@ -7,16 +7,30 @@ unit-testable: it returns an :class:`EvalReport`. The management command
 Baseline (v1): a run passes iff **every assertion evaluator on every case passes**.
 A numeric threshold can replace this once there are enough cases to warrant it;
 for now any assertion failure is a regression.
+
+Cases are graded on a pool of ``workers`` threads (AGENT_EVAL_WORKERS); results
+keep the dataset's order whatever order they finish in. Each case records its
+wall time and the tokens its calls reported, and the report prices them
+(LLM_PRICES) and summarises p50/p95 latency. ``as_dict`` is the JSON form the
+command writes, and ``compare`` checks a report against an earlier one for
+cases that stopped passing or a p95 that slowed down.
 """
+import contextvars
 import json
+import math
+import time
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass, field
 from pathlib import Path
 
-from portioning import llm
+from django.conf import settings
+
+from portioning import llm, llm_limits
 
 from agents.nodes import AskStructuredError
 from agents.evals.evaluators import EVALUATORS, EvalOutcome
 from agents.evals.targets import TARGETS, catalog_names
+from bookings.services.local_worker import closing_connection
 
 DATASETS_DIR = Path(__file__).resolve().parent / 'datasets'
 
@@ -26,15 +40,24 @@ class CaseResult:
     case_id: str
     passed: bool
     outcomes: list  # list[EvalOutcome]
+    seconds: float = 0.0
+    usage: llm_limits.Tally = field(default_factory=llm_limits.Tally)
 
     def failures(self):
         return [o for o in self.outcomes if not o.passed]
 
+    @property
+    def cost(self):
+        """Estimated USD for the case's calls; None if any model is unpriced."""
+        return _cost(self.usage.by_task)
+
 
 @dataclass
 class EvalReport:
     agent: str
     results: list = field(default_factory=list)  # list[CaseResult]
+    workers: int = 1
+    seconds: float = 0.0
 
     @property
     def passed_count(self):
@@ -49,6 +72,79 @@ class EvalReport:
         """Any case failing an assertion is a regression below baseline."""
         return self.failed_count > 0
 
+    def percentile(self, pct):
+        """Nearest-rank percentile of the per-case seconds (0 with no cases)."""
+        timings = sorted(r.seconds for r in self.results)
+        if not timings:
+            return 0.0
+        return timings[max(0, math.ceil(pct / 100 * len(timings)) - 1)]
+
+    @property
+    def cost(self):
+        costs = [r.cost for r in self.results]
+        return None if None in costs else sum(costs)
+
+    def as_dict(self):
+        return {
+            'agent': self.agent,
+            'workers': self.workers,
+            'seconds': round(self.seconds, 3),
+            'passed': self.passed_count,
+            'failed': self.failed_count,
+            'p50_seconds': round(self.percentile(50), 3),
+            'p95_seconds': round(self.percentile(95), 3),
+            'input_tokens': sum(r.usage.input_tokens for r in self.results),
+            'output_tokens': sum(r.usage.output_tokens for r in self.results),
+            'cached_tokens': sum(r.usage.cached_tokens for r in self.results),
+            'cost_usd': self.cost,
+            'cases': [
+                {
+                    'id': r.case_id,
+                    'passed': r.passed,
+                    'seconds': round(r.seconds, 3),
+                    'calls': r.usage.calls,
+                    'input_tokens': r.usage.input_tokens,
+                    'output_tokens': r.usage.output_tokens,
+                    'cached_tokens': r.usage.cached_tokens,
+                    'cost_usd': r.cost,
+                    'failures': [f"{o.evaluator}: {o.detail}" for o in r.failures()],
+                }
+                for r in self.results
+            ],
+        }
+
+
+def _cost(by_task):
+    total = 0.0
+    for task_setting, (input_tokens, output_tokens) in by_task.items():
+        provider, model = llm.resolve(task_setting)
+        prices = settings.LLM_PRICES.get(f"{provider}:{model}")
+        if prices is None:
+            return None
+        total += (input_tokens * prices[0] + output_tokens * prices[1]) / 1_000_000
+    return total
+
+
+def compare(report, baseline, *, max_slowdown=1.25):
+    """What got worse since ``baseline`` (an earlier ``as_dict()``), as lines.
+
+    A case that passed then and fails now is a regression, and so is a p95 more
+    than ``max_slowdown`` times the baseline's.
+    """
+    current = report.as_dict()
+    problems = []
+    passed_before = {c['id'] for c in baseline.get('cases', []) if c['passed']}
+    for case in current['cases']:
+        if case['id'] in passed_before and not case['passed']:
+            problems.append(f"{case['id']} passed in the baseline and fails now")
+    before = baseline.get('p95_seconds') or 0
+    if before and current['p95_seconds'] > before * max_slowdown:
+        problems.append(
+            f"p95 {current['p95_seconds']:.2f}s is over {max_slowdown:g}x "
+            f"the baseline's {before:.2f}s"
+        )
+    return problems
+
 
 def load_dataset(name):
     """Load a dataset by name (``datasets/<name>.json``) or explicit path."""
@@ -59,31 +155,54 @@ def load_dataset(name):
         return json.load(fh)
 
 
-def run_evals(dataset, org, *, target_override=None):
+def run_evals(dataset, org, *, target_override=None, workers=None):
     """Grade every case in ``dataset`` for ``org``. Returns an :class:`EvalReport`.
 
     ``target_override`` swaps the system-under-test for a callable ``(case, org)
     -> dict`` — used by tests to drive a target with a scripted fake provider, and
-    by REL-413 to point cases at a specific flow.
+    by REL-413 to point cases at a specific flow. ``workers`` (default
+    AGENT_EVAL_WORKERS) cases run at once; with one, they run on the calling
+    thread.
     """
+    workers = workers or settings.AGENT_EVAL_WORKERS
     context_catalog = catalog_names(org)
-    report = EvalReport(agent=dataset.get('agent', 'unknown'))
+    report = EvalReport(agent=dataset.get('agent', 'unknown'), workers=workers)
+    cases = dataset['cases']
+
+    started = time.perf_counter()
+    if workers <= 1 or len(cases) <= 1:
+        report.results = [_grade(case, org, context_catalog, target_override) for case in cases]
+    else:
+        with ThreadPoolExecutor(
+            max_workers=min(workers, len(cases)), thread_name_prefix='agent-eval',
+        ) as pool:
+            # Each case runs in a copy of this context, so a cache mode forced
+            # around the run (llm_cache.forced) applies inside the pool too.
+            futures = [
+                pool.submit(contextvars.copy_context().run, closing_connection(_grade),
+                            case, org, context_catalog, target_override)
+                for case in cases
+            ]
+            report.results = [future.result() for future in futures]
+    report.seconds = time.perf_counter() - started
+    return report
+
 
-    for case in dataset['cases']:
-        target_fn, schema = TARGETS[case['target']]
-        run = target_override or target_fn
-        context = {'catalog': context_catalog, 'schema': schema}
+def _grade(case, org, context_catalog, target_override):
+    target_fn, schema = TARGETS[case['target']]
+    run = target_override or target_fn
+    context = {'catalog': context_catalog, 'schema': schema}
 
+    started = time.perf_counter()
+    with llm_limits.tally() as usage:
         try:
             output = run(case, org)
         except (AskStructuredError, llm.LLMError) as exc:
             # The target itself failed to produce output — the whole case fails.
-            report.results.append(CaseResult(
-                case['id'], False, [EvalOutcome('target', False, str(exc))],
-            ))
-            continue
-
-        outcomes = [EVALUATORS[name](output, case, context) for name in case['constraints']]
-        report.results.append(CaseResult(case['id'], all(o.passed for o in outcomes), outcomes))
-
-    return report
+            outcomes = [EvalOutcome('target', False, str(exc))]
+        else:
+            outcomes = [EVALUATORS[name](output, case, context) for name in case['constraints']]
+    return CaseResult(
+        case['id'], all(o.passed for o in outcomes), outcomes,
+        seconds=time.perf_counter() - started, usage=usage,
+    )
@@ -14,6 +14,8 @@ Two targets today:
 
 Both go through ``portioning/llm.py`` (via ``ask_structured``) — no other LLM path.
 """
+from portioning import llm
+
 from agents.nodes import ask_structured, load_org_context
 from agents.graphs.skeleton import TASK_SETTING as SKELETON_TASK_SETTING, generate_question
 from agents.evals.schemas import INQUIRY_EXTRACTION_SCHEMA, SKELETON_QUESTION_SCHEMA
@@ -42,14 +44,16 @@ def skeleton_target(case, org):
 def inquiry_extraction_target(case, org):
     """Extract {proposed_dishes, event_date, headcount} from the case's inquiry."""
     catalog = sorted(_catalog_names(org))
-    user = (
-        f"Catalog (only propose from these): {catalog}\n\n"
-        f"Enquiry:\n{case['input']['inquiry']}"
+    # The org's catalog is its own system block after the fixed rules, so the
+    # provider caches both across every enquiry for the org; only the enquiry
+    # itself is new on each call.
+    system = llm.SystemPrompt(
+        _EXTRACTION_SYSTEM, f"\n\nCatalog (only propose from these): {catalog}",
     )
     data, _model, _attempts = ask_structured(
         task_setting=EXTRACTION_TASK_SETTING,
-        system=_EXTRACTION_SYSTEM,
-        user_content=user,
+        system=system,
+        user_content=f"Enquiry:\n{case['input']['inquiry']}",
         schema=INQUIRY_EXTRACTION_SCHEMA,
     )
     return data
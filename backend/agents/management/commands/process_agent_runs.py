@@ -0,0 +1,35 @@
+"""Start the agent runs queued by the HTTP start (`agents.runner.queue_run`).
+
+With AGENT_RUN_MODE=thread the web process starts them itself; this is for
+AGENT_RUN_MODE=off (run with --loop as a worker process) and for clearing a
+backlog by hand:
+
+    python manage.py process_agent_runs
+"""
+import time
+
+from django.core.management.base import BaseCommand
+
+from agents import runner
+
+
+class Command(BaseCommand):
+    help = 'Start every queued agent run.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--concurrency', type=int,
+            help='Runs started in parallel (default: AGENT_RUN_CONCURRENCY).',
+        )
+        parser.add_argument(
+            '--loop', action='store_true',
+            help=f'Keep starting queued runs every {runner.POLL_SECONDS}s instead of exiting.',
+        )
+
+    def handle(self, *args, **options):
+        while True:
+            started = runner.drain(concurrency=options['concurrency'])
+            self.stdout.write(self.style.SUCCESS(f'Agent runs drained — {started} run(s) started.'))
+            if not options['loop']:
+                return
+            time.sleep(runner.POLL_SECONDS)
@@ -2,16 +2,29 @@
 
     python manage.py run_agent_evals --org <id|slug|name> [--agent skeleton|inquiry_extraction]
     python manage.py run_agent_evals --org <slug> --dataset path/to/dataset.json
+    python manage.py run_agent_evals --org <slug> --cache   # reuse earlier answers
+    python manage.py run_agent_evals --org <slug> --workers 8 --json today.json
+    python manage.py run_agent_evals --org <slug> --baseline yesterday.json
+    python manage.py run_agent_evals --org <slug> --record   # then --replay, offline
 
-Prints per-case pass/fail and a summary, and **exits non-zero on any regression**
-(a failed assertion below baseline) so it can gate a change. Real runs call the
+Prints per-case pass/fail with timings and a summary (p50/p95, tokens, cost),
+and **exits non-zero on any regression** (a failed assertion below baseline, or
+— with ``--baseline`` — a case that used to pass, or a p95 more than
+``--max-slowdown`` times the baseline's) so it can gate a change. ``--json``
+writes the report for a later ``--baseline``. ``--record`` saves the provider's
+answers (to ``--recordings``, default LLM_RECORDINGS_DIR) and ``--replay`` runs
+from them alone, so a recorded run reproduces with no network. Real runs call the
 real provider — keep this out of required CI (evaluator mechanics are covered by
 the normal suite with the fake provider).
 """
+import json
+
 from django.core.management.base import BaseCommand, CommandError
 
+from portioning import llm_cache, llm_replay
+
 from agents.evals import run_evals
-from agents.evals.runner import load_dataset
+from agents.evals.runner import compare, load_dataset
 from agents.management.commands._org import resolve_org
 
 # Default dataset per agent when --dataset isn't given.
@@ -28,6 +41,33 @@ class Command(BaseCommand):
         parser.add_argument('--org', required=True, help='Org id, slug, or name (catalog source).')
         parser.add_argument('--agent', choices=sorted(DEFAULT_DATASETS), default='inquiry_extraction')
         parser.add_argument('--dataset', help='Dataset name or path (overrides --agent default).')
+        parser.add_argument(
+            '--cache', action='store_true',
+            help='Answer from the LLM response cache where the same prompt was run before.',
+        )
+        parser.add_argument(
+            '--workers', type=int,
+            help='Cases to grade at once (default AGENT_EVAL_WORKERS).',
+        )
+        parser.add_argument('--json', help='Write the report as JSON to this path.')
+        transport = parser.add_mutually_exclusive_group()
+        transport.add_argument(
+            '--record', action='store_const', dest='transport', const=llm_replay.RECORD,
+            help="Save the provider's answers for a later --replay.",
+        )
+        transport.add_argument(
+            '--replay', action='store_const', dest='transport', const=llm_replay.REPLAY,
+            help='Answer from earlier --record runs only; no network.',
+        )
+        parser.add_argument('--recordings', help='Where recordings live (default LLM_RECORDINGS_DIR).')
+        parser.add_argument(
+            '--baseline',
+            help='An earlier --json report; fail on cases that stopped passing or a slower p95.',
+        )
+        parser.add_argument(
+            '--max-slowdown', type=float, default=1.25,
+            help='How many times the baseline p95 counts as a latency regression (default 1.25).',
+        )
 
     def handle(self, *args, **options):
         org = resolve_org(options['org'])
@@ -37,16 +77,49 @@ class Command(BaseCommand):
         except (FileNotFoundError, ValueError) as exc:
             raise CommandError(f"Could not load dataset {dataset_name!r}: {exc}")
 
-        report = run_evals(dataset, org)
+        baseline = None
+        if options['baseline']:
+            try:
+                with open(options['baseline']) as fh:
+                    baseline = json.load(fh)
+            except (OSError, ValueError) as exc:
+                raise CommandError(f"Could not load baseline {options['baseline']!r}: {exc}")
+
+        llm_cache.reset_stats()
+        with llm_cache.forced(True if options['cache'] else None), \
+                llm_replay.using(options['transport'] or llm_replay.mode(), options['recordings']):
+            report = run_evals(dataset, org, workers=options['workers'])
 
         for result in report.results:
             mark = self.style.SUCCESS('PASS') if result.passed else self.style.ERROR('FAIL')
-            self.stdout.write(f"{mark}  {result.case_id}")
+            self.stdout.write(f"{mark}  {result.case_id}  ({result.seconds:.2f}s)")
             for outcome in result.failures():
                 self.stdout.write(f"        ✗ {outcome.evaluator}: {outcome.detail}")
 
+        data = report.as_dict()
+        if options['json']:
+            with open(options['json'], 'w') as fh:
+                json.dump(data, fh, indent=2)
+        cost = 'unpriced' if data['cost_usd'] is None else f"${data['cost_usd']:.4f}"
+        self.stdout.write(
+            f"Timing: p50 {data['p50_seconds']:.2f}s, p95 {data['p95_seconds']:.2f}s, "
+            f"{data['seconds']:.2f}s total on {data['workers']} worker(s). "
+            f"Tokens: {data['input_tokens']} in, {data['output_tokens']} out ({cost})."
+        )
+
         total = len(report.results)
         summary = f"{report.passed_count}/{total} cases passed ({report.agent})"
+        if options['cache']:
+            counts = llm_cache.stats().values()
+            self.stdout.write(
+                f"LLM cache: {sum(c['hits'] for c in counts)} hit(s), "
+                f"{sum(c['misses'] for c in counts)} miss(es)."
+            )
+        worse = compare(report, baseline, max_slowdown=options['max_slowdown']) if baseline else []
+        for problem in worse:
+            self.stdout.write(self.style.ERROR(f"        ✗ baseline: {problem}"))
         if report.regressed:
             raise CommandError(f"REGRESSION — {summary}; {report.failed_count} failed.")
+        if worse:
+            raise CommandError(f"REGRESSION against the baseline — {summary}; {len(worse)} problem(s).")
         self.stdout.write(self.style.SUCCESS(f"OK — {summary}."))
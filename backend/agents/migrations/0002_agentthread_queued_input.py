@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-19 05:23
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('agents', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='agentthread',
+            name='queued_input',
+            field=models.JSONField(blank=True, null=True),
+        ),
+    ]
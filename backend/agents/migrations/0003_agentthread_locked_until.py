@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-19 05:53
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('agents', '0002_agentthread_queued_input'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='agentthread',
+            name='locked_until',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+    ]
@@ -52,6 +52,11 @@ class AgentThread(OrgScopedModel, models.Model):
     result = models.JSONField(default=dict, blank=True)
     # Populated only on FAILED — the validation/LLM error that ended the run.
     error = models.TextField(blank=True, default='')
+    # A run queued to start (runner.queue_run): the graph input it starts from,
+    # until a worker has run it. Null after that, and for runs started inline.
+    queued_input = models.JSONField(null=True, blank=True)
+    # A worker's claim on a queued run; once it passes, another may start it.
+    locked_until = models.DateTimeField(null=True, blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
@@ -48,7 +48,14 @@ def ask_structured(*, task_setting, system, user_content, schema, max_retries=MA
     for attempt in range(max_retries + 1):
         attempts = attempt + 1
         try:
-            data, model_used = llm.complete_structured(task_setting, system, user_content, schema)
+            # A retry must reach the provider: a cached answer is the one that
+            # just failed (and is replaced by the fresh one).
+            # Checked before it is cached, so an off-schema answer is never
+            # stored; a cached one (stored without the check) is checked here.
+            data, model_used = llm.complete_structured(
+                task_setting, system, user_content, schema, cache=False if attempt else None,
+                validate=lambda data: validate_structured(data, schema),
+            )
             validate_structured(data, schema)
             return data, model_used, attempts
         except llm.LLMNotConfigured:
@@ -13,18 +13,46 @@ transitions the graph can't see from the inside:
 
 Keeping this out of the management commands means the same logic backs the real
 HTTP endpoints REL-413 will add.
+
+A start runs the graph up to its interrupt: an LLM call, and up to two retries of
+it. ``start_run`` does that in the caller; ``queue_run`` records the run and
+returns it ``RUNNING`` at once, and a worker starts it (AGENT_RUN_MODE, as for
+the outbox: ``thread`` wakes a worker thread in the web process once the row
+commits, ``inline`` starts it inside the call — what the test runner uses —
+and ``off`` leaves it for ``manage.py process_agent_runs``). ``run_events``
+reads how far a run has got back out of its checkpoints, for a caller to poll.
 """
 import logging
+import threading
+from datetime import timedelta
 
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
 from langgraph.types import Command
 
-from agents.checkpointer import make_checkpointer, thread_key
+from agents.checkpointer import shared_checkpointer, thread_key
 from agents.graphs.skeleton import AGENT_NAME, build_skeleton_graph
 from agents.models import AgentThread
 from agents.tracing import configure_tracing
+from bookings.services.local_worker import LocalWorker, pool_map
 
 logger = logging.getLogger(__name__)
 
+# How often the worker looks for queued runs nobody woke it for (left over from
+# before a restart).
+POLL_SECONDS = 60
+# How long a claimed run is held before another worker may start it again.
+LEASE = timedelta(minutes=5)
+# Checkpoints `run_events` reads per query while walking back through a run.
+HISTORY_PAGE = 20
+
+# Compiled graphs, per (agent, checkpointer): compiling validates and wires the
+# whole graph, and a compiled graph can be invoked from many threads at once.
+_graphs = {}
+_graphs_lock = threading.Lock()
+
 
 class AgentRunError(Exception):
     """A run could not be started/resumed (already exists, wrong state, wrong org)."""
@@ -37,24 +65,85 @@ def start_run(*, organisation, record_id, checkpointer=None):
     ``FAILED`` if the LLM node exhausted its retries. ``checkpointer`` is
     injectable for tests; production passes none and the factory picks one.
     """
+    thread, initial = _create_thread(organisation, record_id)
+    return _start(thread, initial, checkpointer)
+
+
+def queue_run(*, organisation, record_id):
+    """Start the skeleton agent for ``organisation``/``record_id`` without
+    waiting for it: returns the AgentThread ``RUNNING``, and a worker takes the
+    run from there (see the module docstring). Raises :class:`AgentRunError` as
+    ``start_run`` does."""
+    thread, initial = _create_thread(organisation, record_id, queued=True)
+    mode = settings.AGENT_RUN_MODE
+    if mode == 'inline':
+        _run_queued(thread.pk)
+        thread.refresh_from_db()
+    elif mode == 'thread':
+        transaction.on_commit(worker.wake)
+    return thread
+
+
+def drain(concurrency=None):
+    """Start every queued run. Returns how many this call started."""
+    ids = list(
+        AgentThread.objects.unscoped()
+        .filter(agent=AGENT_NAME, queued_input__isnull=False)
+        .filter(Q(locked_until__isnull=True) | Q(locked_until__lte=timezone.now()))
+        .order_by('created_at').values_list('pk', flat=True)
+    )
+    concurrency = concurrency or settings.AGENT_RUN_CONCURRENCY
+    return sum(pool_map(_run_queued, ids, concurrency, 'agent-runs'))
+
+
+def _run_queued(pk):
+    """Claim queued run ``pk`` and start it. Returns whether this call did.
+
+    The claim is a lease (``locked_until``), taken with a conditional UPDATE so
+    two drains never start a run at once. The run stays queued until it has
+    been through the graph: if the worker dies mid-run, the next drain after
+    the lease runs out starts it again, rather than leaving it ``RUNNING``
+    for good.
+    """
+    now = timezone.now()
+    claimed = (
+        AgentThread.objects.unscoped()
+        .filter(pk=pk, queued_input__isnull=False)
+        .filter(Q(locked_until__isnull=True) | Q(locked_until__lte=now))
+        .update(locked_until=now + LEASE)
+    )
+    if not claimed:
+        return False
+    thread = AgentThread.objects.unscoped().get(pk=pk)
+    _start(thread, thread.queued_input, None)
+    AgentThread.objects.unscoped().filter(pk=pk).update(queued_input=None, locked_until=None)
+    return True
+
+
+def _create_thread(organisation, record_id, queued=False):
     key = thread_key(AGENT_NAME, organisation.id, record_id)
+    initial = {
+        'agent': AGENT_NAME,
+        'org_id': organisation.id,
+        'record_id': record_id,
+        'thread_key': key,
+    }
     thread, created = AgentThread.objects.get_or_create(
         thread_key=key,
         defaults={
             'organisation': organisation,
             'agent': AGENT_NAME,
             'status': AgentThread.RUNNING,
+            'queued_input': initial if queued else None,
         },
     )
     if not created:
         raise AgentRunError(f"A run already exists for {key} (status={thread.status}).")
+    return thread, initial
 
-    initial = {
-        'agent': AGENT_NAME,
-        'org_id': organisation.id,
-        'record_id': record_id,
-        'thread_key': key,
-    }
+
+def _start(thread, initial, checkpointer):
+    key = thread.thread_key
     try:
         result = _invoke(key, initial, checkpointer)
     except Exception as exc:
@@ -102,31 +191,81 @@ def resume_run(*, organisation, record_id, answer, checkpointer=None):
     return thread
 
 
+def run_events(*, organisation, record_id, after=None, checkpointer=None):
+    """How far run ``record_id`` has got, scoped to ``organisation``: its
+    AgentThread and, oldest first, one event per checkpoint after step
+    ``after``.
+
+    An event is ``{'step', 'node', 'at'}``: the node the run moved on to at that
+    step (the one it is waiting in, at an interrupt), or ``None`` once it has
+    ended. Read from the checkpointer, so it shows a run a worker is still
+    executing. Raises :class:`AgentRunError` if there is no such run for this
+    org.
+    """
+    key = thread_key(AGENT_NAME, organisation.id, record_id)
+    try:
+        thread = AgentThread.objects.for_org(organisation).get(thread_key=key)
+    except AgentThread.DoesNotExist:
+        raise AgentRunError(f"No run {key} for this organisation.")
+    config = {'configurable': {'thread_id': key}}
+    events = []
+    for snapshot in _history_after(_app(checkpointer), config, after):
+        step = snapshot.metadata['step']
+        if step < 0:
+            continue
+        events.append({
+            'step': step,
+            'node': snapshot.next[0] if snapshot.next else None,
+            'at': snapshot.created_at,
+        })
+    events.reverse()
+    return thread, events
+
+
+def _history_after(app, config, after):
+    """The thread's checkpoints after step ``after``, newest first.
+
+    Read a page at a time, and only as far back as ``after``: a poll with
+    nothing new reads the one latest checkpoint, not the whole history.
+    """
+    before, limit = None, 1 if after is not None else HISTORY_PAGE
+    while True:
+        page = list(app.get_state_history(config, before=before, limit=limit))
+        for snapshot in page:
+            if after is not None and snapshot.metadata['step'] <= after:
+                return
+            yield snapshot
+        if len(page) < limit:
+            return
+        before, limit = page[-1].config, HISTORY_PAGE
+
+
 def _invoke(key, invoke_arg, checkpointer):
-    """Compile the skeleton graph against a checkpointer and invoke it once.
+    """Invoke the skeleton graph once against a checkpointer.
 
-    When we own the checkpointer (none injected) we close its connection after —
-    the checkpoint is already durably written, so the next process/resume just
-    re-opens the store.
+    With none injected, the process's shared checkpointer is used and the graph
+    compiled against it is reused: the checkpoint store is opened and set up
+    once per process, not once per run. An injected checkpointer stays the
+    caller's — the graph is compiled against it for this run only.
     """
-    own = checkpointer is None
     # Opt-in LangSmith tracing (dev/eval only; a no-op unless explicitly enabled
     # with a key — never in CI/prod, see agents/tracing.py). Off ⇒ no network.
     configure_tracing()
-    saver = checkpointer or make_checkpointer()
-    try:
-        app = build_skeleton_graph().compile(checkpointer=saver)
-        config = {'configurable': {'thread_id': key}}
-        return app.invoke(invoke_arg, config)
-    finally:
-        if own:
-            _close(saver)
-
-
-def _close(saver):
-    conn = getattr(saver, 'conn', None)
-    if conn is not None:
-        try:
-            conn.close()
-        except Exception:  # pragma: no cover - best-effort cleanup
-            pass
+    config = {'configurable': {'thread_id': key}}
+    return _app(checkpointer).invoke(invoke_arg, config)
+
+
+def _app(checkpointer):
+    if checkpointer is None:
+        return _compiled(AGENT_NAME, build_skeleton_graph, shared_checkpointer())
+    return build_skeleton_graph().compile(checkpointer=checkpointer)
+
+
+def _compiled(agent, build_graph, saver):
+    with _graphs_lock:
+        if (agent, saver) not in _graphs:
+            _graphs[agent, saver] = build_graph().compile(checkpointer=saver)
+        return _graphs[agent, saver]
+
+
+worker = LocalWorker(drain, 'agent-runs', POLL_SECONDS)
@@ -0,0 +1,10 @@
+from rest_framework import serializers
+
+from agents.models import AgentThread
+
+
+class AgentThreadSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = AgentThread
+        fields = ['id', 'agent', 'thread_key', 'status', 'result', 'error', 'created_at', 'updated_at']
+        read_only_fields = fields
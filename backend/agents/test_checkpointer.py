@@ -56,3 +56,36 @@ class MakeCheckpointerTests(SimpleTestCase):
             result = cp.make_checkpointer(engine=POSTGRES_ENGINE)
         self.assertIs(result, sentinel)
         mk.assert_called_once()
+
+
+class SharedCheckpointerTests(SimpleTestCase):
+    def setUp(self):
+        self.addCleanup(cp.close_shared_checkpointers)
+
+    def test_one_saver_per_store_set_up_once(self):
+        with tempfile.NamedTemporaryFile(suffix='.sqlite3') as a, \
+                tempfile.NamedTemporaryFile(suffix='.sqlite3') as b:
+            with patch.object(SqliteSaver, 'setup', autospec=True) as setup:
+                first = cp.shared_checkpointer(engine=SQLITE_ENGINE, sqlite_path=a.name)
+                again = cp.shared_checkpointer(engine=SQLITE_ENGINE, sqlite_path=a.name)
+                other = cp.shared_checkpointer(engine=SQLITE_ENGINE, sqlite_path=b.name)
+            self.assertIs(first, again)
+            self.assertIsNot(first, other)
+            self.assertEqual(setup.call_count, 2)
+
+    def test_closing_forgets_and_closes_the_savers(self):
+        with tempfile.NamedTemporaryFile(suffix='.sqlite3') as tmp:
+            saver = cp.shared_checkpointer(engine=SQLITE_ENGINE, sqlite_path=tmp.name)
+            cp.close_shared_checkpointers()
+            with self.assertRaises(sqlite3.ProgrammingError):
+                saver.conn.execute('SELECT 1')
+            self.assertIsNot(cp.shared_checkpointer(engine=SQLITE_ENGINE, sqlite_path=tmp.name), saver)
+
+    def test_postgres_engine_builds_one_pooled_saver(self):
+        sentinel = object()
+        with patch.object(cp, '_make_postgres_pool_saver', return_value=sentinel) as mk, \
+                patch.object(cp, '_make_postgres_saver') as single:
+            self.assertIs(cp.shared_checkpointer(engine=POSTGRES_ENGINE), sentinel)
+            self.assertIs(cp.shared_checkpointer(engine=POSTGRES_ENGINE), sentinel)
+        mk.assert_called_once()
+        single.assert_not_called()
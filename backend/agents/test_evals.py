@@ -1,5 +1,10 @@
 """Eval harness: evaluator units, a passing run (AC3), and the seeded
 out-of-catalog regression that must fail and exit non-zero (AC4)."""
+import json
+import os
+import tempfile
+import time
+from io import StringIO
 from unittest.mock import patch
 
 from django.core.management import call_command
@@ -7,9 +12,11 @@ from django.core.management.base import CommandError
 from django.test import TestCase, override_settings
 
 from dishes.models import Dish, DishCategory
+from portioning import llm
 from users.models import Organisation
 
 from agents.evals import run_evals
+from agents.evals.runner import compare
 from agents.evals.evaluators import (catalog_subset, date_not_invented,
                                      headcount_echoed, schema_valid)
 from agents.evals.schemas import INQUIRY_EXTRACTION_SCHEMA
@@ -94,6 +101,21 @@ class RunEvalsTests(TestCase):
             with self.assertRaises(CommandError):
                 call_command('run_agent_evals', '--org', 'caterer', '--dataset', 'inquiry_v1')
 
+    def test_command_can_rerun_from_the_cache(self):
+        from io import StringIO
+        from django.core.cache import caches
+        caches['llm'].clear()
+        good = '{"proposed_dishes": [], "event_date": null, "headcount": null}'
+        dataset = self._dataset()
+        dataset['cases'][0]['constraints'] = ['schema_valid']
+        with patch('agents.management.commands.run_agent_evals.load_dataset', return_value=dataset), \
+                patch('portioning.llm._call_openai', return_value=good) as m:
+            call_command('run_agent_evals', '--org', 'caterer', '--cache', stdout=StringIO())
+            out = StringIO()
+            call_command('run_agent_evals', '--org', 'caterer', '--cache', stdout=out)
+        self.assertEqual(m.call_count, 1)
+        self.assertIn('LLM cache: 1 hit(s), 0 miss(es).', out.getvalue())
+
     def test_command_passes_when_provider_behaves(self):
         # AC3 end-to-end on the shipped dataset: every case in-catalog & faithful.
         # The shipped inquiry_v1 has varied expected date/headcount, so a single
@@ -116,3 +138,110 @@ class RunEvalsTests(TestCase):
             with patch('portioning.llm._call_openai', return_value='{"question": "How many guests?"}'):
                 report = run_evals(load_dataset('skeleton_v1'), self.org)
         self.assertFalse(report.regressed)
+
+
+@override_settings(**FAKE_LLM, LLM_PRICES={'openai:gpt-test': (1.0, 4.0)})
+class ParallelEvalTests(TestCase):
+    def setUp(self):
+        self.org = Organisation.objects.create(name='Caterer', slug='caterer')
+
+    def _dataset(self, count):
+        return {
+            'agent': 'inquiry_extraction',
+            'cases': [
+                {'id': f'case-{n}', 'target': 'inquiry_extraction', 'input': {'n': n, 'inquiry': f'Enquiry {n}'},
+                 'constraints': ['schema_valid']}
+                for n in range(count)
+            ],
+        }
+
+    def test_cases_run_at_once_report_in_order_with_their_own_tokens(self):
+        def call(model, api_key, system, user_content, *rest):
+            n = int(user_content)
+            time.sleep(0.05 * (3 - n))  # the first case finishes last
+            llm._report_usage(100 * (n + 1), 10)
+            return '{"proposed_dishes": [], "event_date": null, "headcount": null}'
+
+        def target(case, org):
+            data, _model = llm.complete_structured(
+                'LLM_AGENT_INQUIRY_EXTRACTION', 'sys', str(case['input']['n']),
+                INQUIRY_EXTRACTION_SCHEMA,
+            )
+            return data
+
+        with patch('portioning.llm._call_openai', side_effect=call):
+            report = run_evals(self._dataset(3), self.org, target_override=target, workers=3)
+        self.assertEqual([r.case_id for r in report.results], ['case-0', 'case-1', 'case-2'])
+        self.assertEqual([r.usage.input_tokens for r in report.results], [100, 200, 300])
+        # All three overlapped: the run took about as long as its slowest case.
+        self.assertLess(report.seconds, 0.15 + 0.1)
+        data = report.as_dict()
+        self.assertEqual((data['input_tokens'], data['output_tokens']), (600, 30))
+        self.assertAlmostEqual(data['cost_usd'], (600 * 1.0 + 30 * 4.0) / 1_000_000)
+        self.assertEqual(data['p95_seconds'], data['cases'][0]['seconds'])
+        self.assertLessEqual(data['p50_seconds'], data['p95_seconds'])
+
+    @override_settings(LLM_PRICES={})
+    def test_an_unpriced_model_has_tokens_but_no_cost(self):
+        def call(*args):
+            llm._report_usage(50, 5)
+            return '{"proposed_dishes": [], "event_date": null, "headcount": null}'
+
+        with patch('portioning.llm._call_openai', side_effect=call):
+            data = run_evals(self._dataset(1), self.org).as_dict()
+        self.assertEqual(data['input_tokens'], 50)
+        self.assertIsNone(data['cost_usd'])
+
+    def test_command_writes_json_and_compares_against_a_baseline(self):
+        good = '{"proposed_dishes": [], "event_date": null, "headcount": null}'
+        fd, path = tempfile.mkstemp(suffix='.json')
+        os.close(fd)
+        self.addCleanup(os.remove, path)
+        args = ('run_agent_evals', '--org', 'caterer')
+        with patch('agents.management.commands.run_agent_evals.load_dataset',
+                   return_value=self._dataset(2)), \
+                patch('portioning.llm._call_openai', return_value=good):
+            out = StringIO()
+            call_command(*args, '--json', path, stdout=out)
+            self.assertIn('p95', out.getvalue())
+            with open(path) as fh:
+                written = json.load(fh)
+            self.assertEqual([c['id'] for c in written['cases']], ['case-0', 'case-1'])
+
+            # Comparing a run with itself, at a generous tolerance, passes.
+            call_command(*args, '--baseline', path, '--max-slowdown', '1000', stdout=StringIO())
+
+            # A baseline far faster than this run is a latency regression.
+            written['p95_seconds'] = 1e-9
+            with open(path, 'w') as fh:
+                json.dump(written, fh)
+            out = StringIO()
+            with self.assertRaises(CommandError):
+                call_command(*args, '--baseline', path, stdout=out)
+            self.assertIn('p95', out.getvalue())
+
+
+    def test_a_case_that_stopped_passing_is_a_baseline_regression(self):
+        bad = '{"proposed_dishes": 1}'
+        with patch('portioning.llm._call_openai', return_value=bad):
+            report = run_evals(self._dataset(2), self.org)
+        baseline = {'p95_seconds': 0, 'cases': [
+            {'id': 'case-0', 'passed': True}, {'id': 'case-1', 'passed': False},
+        ]}
+        self.assertEqual(compare(report, baseline), ['case-0 passed in the baseline and fails now'])
+
+    def test_command_replays_a_recorded_run_without_the_provider(self):
+        good = '{"proposed_dishes": [], "event_date": null, "headcount": null}'
+        recordings = self.enterContext(tempfile.TemporaryDirectory())
+        args = ('run_agent_evals', '--org', 'caterer', '--recordings', recordings)
+        with patch('agents.management.commands.run_agent_evals.load_dataset',
+                   return_value=self._dataset(2)), \
+                override_settings(LLM_REPLAY_LATENCY='0'):
+            with patch('portioning.llm._call_openai', return_value=good):
+                call_command(*args, '--record', stdout=StringIO())
+            self.assertEqual(len(os.listdir(recordings)), 2)
+            out = StringIO()
+            with patch('portioning.llm._call_openai', side_effect=AssertionError('went live')), \
+                    override_settings(OPENAI_API_KEY=''):
+                call_command(*args, '--replay', stdout=out)
+        self.assertIn('OK — 2/2 cases passed', out.getvalue())
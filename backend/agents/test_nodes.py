@@ -1,6 +1,7 @@
 """Unit tests for the node library (pure functions)."""
 from unittest.mock import patch
 
+from django.core.cache import caches
 from django.test import SimpleTestCase, TestCase, override_settings
 
 from agents.nodes import AskStructuredError, ask_structured, load_org_context
@@ -64,6 +65,34 @@ class AskStructuredTests(SimpleTestCase):
         self.assertEqual(m.call_count, 3)
         self.assertEqual(ctx.exception.attempts, 3)
 
+    @override_settings(LLM_CACHE_TASKS=['LLM_AGENT_SKELETON'])
+    def test_a_retry_skips_the_cached_answer(self):
+        # An off-schema answer that came from the cache would come back on every
+        # retry; the retry asks the provider and replaces it.
+        caches['llm'].clear()
+        with patch('portioning.llm._call_openai', return_value='{"wrong": 1}'):
+            llm.complete_structured('LLM_AGENT_SKELETON', 's', 'u', SCHEMA)
+        with patch('portioning.llm._call_openai', return_value='{"question": "ok"}') as m:
+            data, _model, attempts = ask_structured(
+                task_setting='LLM_AGENT_SKELETON', system='s', user_content='u', schema=SCHEMA,
+            )
+            self.assertEqual((data, attempts), ({"question": "ok"}, 2))
+            ask_structured(task_setting='LLM_AGENT_SKELETON', system='s', user_content='u', schema=SCHEMA)
+        self.assertEqual(m.call_count, 1)
+
+    @override_settings(LLM_CACHE_TASKS=['LLM_AGENT_SKELETON'])
+    def test_an_off_schema_answer_is_never_cached(self):
+        caches['llm'].clear()
+        with patch('portioning.llm._call_openai', return_value='{"wrong": 1}'):
+            with self.assertRaises(AskStructuredError):
+                ask_structured(task_setting='LLM_AGENT_SKELETON', system='s', user_content='u', schema=SCHEMA)
+        with patch('portioning.llm._call_openai', return_value='{"question": "ok"}') as m:
+            data, _model, attempts = ask_structured(
+                task_setting='LLM_AGENT_SKELETON', system='s', user_content='u', schema=SCHEMA,
+            )
+        self.assertEqual((data, attempts), ({"question": "ok"}, 1))
+        m.assert_called_once()
+
     @override_settings(LLM_AGENT_SKELETON='nonsense')  # no provider prefix
     def test_misconfiguration_is_not_retried(self):
         with patch('portioning.llm._call_openai') as m:
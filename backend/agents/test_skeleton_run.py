@@ -8,14 +8,20 @@ on. The LLM is faked by patching ``portioning.llm._call_openai`` (the same seam
 """
 import os
 import tempfile
+from datetime import timedelta
 
 from unittest.mock import patch
 
 from django.test import TransactionTestCase, override_settings
+from django.utils import timezone
+from rest_framework.test import APIClient
 
-from agents.checkpointer import make_checkpointer, thread_key
+from agents import runner
+from agents.checkpointer import close_shared_checkpointers, make_checkpointer, thread_key
+from agents.graphs.skeleton import build_skeleton_graph
 from agents.models import AgentThread
 from agents.runner import AgentRunError, resume_run, start_run
+from tests.base import get_test_user
 from users.models import Organisation
 
 SQLITE_ENGINE = 'django.db.backends.sqlite3'
@@ -111,3 +117,141 @@ class SkeletonRunTests(TransactionTestCase):
             with self.assertRaises(AgentRunError):
                 start_run(organisation=self.org, record_id=1, checkpointer=saver2)
             saver2.conn.close()
+
+    def test_runs_without_a_checkpointer_share_the_process_saver_and_graph(self):
+        # One store setup and one compile serve every start/resume in the process.
+        self.addCleanup(close_shared_checkpointers)
+        self.addCleanup(runner._graphs.clear)
+        with override_settings(AGENT_CHECKPOINT_DB=self.cp_path), \
+                patch('agents.runner.build_skeleton_graph', wraps=build_skeleton_graph) as build:
+            with patch('portioning.llm._call_openai', return_value='{"question": "How many guests?"}'):
+                start_run(organisation=self.org, record_id=1)
+                start_run(organisation=self.other, record_id=1)
+            done = resume_run(organisation=self.org, record_id=1, answer='80 guests')
+        self.assertEqual(build.call_count, 1)
+        self.assertEqual(done.status, AgentThread.COMPLETED)
+        self.assertEqual(done.result['answer'], '80 guests')
+        self.assertEqual(
+            AgentThread.objects.get(organisation=self.other).status, AgentThread.AWAITING_INPUT,
+        )
+
+
+@override_settings(**FAKE_LLM)
+class QueuedRunTests(TransactionTestCase):
+    """The non-blocking start, its worker, and following a run over HTTP."""
+
+    def setUp(self):
+        self.user = get_test_user()
+        self.org = self.user.organisation
+        fd, cp_path = tempfile.mkstemp(suffix='.sqlite3')
+        os.close(fd)
+        self.addCleanup(os.remove, cp_path)
+        self.addCleanup(runner._graphs.clear)
+        self.addCleanup(close_shared_checkpointers)
+        self.enterContext(override_settings(AGENT_CHECKPOINT_DB=cp_path))
+        self.llm = self.enterContext(
+            patch('portioning.llm._call_openai', return_value='{"question": "How many guests?"}'),
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+
+    @override_settings(AGENT_RUN_MODE='off')
+    def test_queue_returns_running_and_the_worker_starts_the_run(self):
+        thread = runner.queue_run(organisation=self.org, record_id=1)
+        self.assertEqual(thread.status, AgentThread.RUNNING)
+        self.llm.assert_not_called()
+
+        self.assertEqual(runner.drain(), 1)
+        self.assertEqual(runner.drain(), 0)  # claimed once, started once
+        thread.refresh_from_db()
+        self.assertEqual(thread.status, AgentThread.AWAITING_INPUT)
+        self.assertIsNone(thread.queued_input)
+        self.assertEqual(self.llm.call_count, 1)
+
+    @override_settings(AGENT_RUN_MODE='off')
+    def test_a_run_whose_worker_died_is_started_again_once_its_lease_runs_out(self):
+        thread = runner.queue_run(organisation=self.org, record_id=1)
+        # A worker claimed it, then died mid-graph.
+        AgentThread.objects.filter(pk=thread.pk).update(
+            locked_until=timezone.now() + runner.LEASE,
+        )
+        self.assertEqual(runner.drain(), 0)  # still held
+        AgentThread.objects.filter(pk=thread.pk).update(
+            locked_until=timezone.now() - timedelta(seconds=1),
+        )
+        self.assertEqual(runner.drain(), 1)
+        thread.refresh_from_db()
+        self.assertEqual(thread.status, AgentThread.AWAITING_INPUT)
+        self.assertIsNone(thread.queued_input)
+        self.assertIsNone(thread.locked_until)
+
+    def test_inline_mode_starts_the_run_in_the_call(self):
+        thread = runner.queue_run(organisation=self.org, record_id=1)
+        self.assertEqual(thread.status, AgentThread.AWAITING_INPUT)
+
+    def test_events_follow_the_nodes_through_to_the_end(self):
+        runner.queue_run(organisation=self.org, record_id=1)
+        _thread, events = runner.run_events(organisation=self.org, record_id=1)
+        self.assertEqual(
+            [e['node'] for e in events], ['load_org_context', 'generate_question', 'await_answer'],
+        )
+        resume_run(organisation=self.org, record_id=1, answer='80 guests')
+        thread, later = runner.run_events(organisation=self.org, record_id=1, after=events[-1]['step'])
+        self.assertEqual([e['node'] for e in later], ['finalize', None])
+        self.assertEqual(thread.status, AgentThread.COMPLETED)
+
+    @patch.object(runner, 'HISTORY_PAGE', 2)
+    def test_events_read_only_the_checkpoints_after_the_last_step(self):
+        runner.queue_run(organisation=self.org, record_id=1)
+        app = runner._app(None)
+        with patch.object(app, 'get_state_history', wraps=app.get_state_history) as history:
+            _thread, events = runner.run_events(organisation=self.org, record_id=1)
+            self.assertEqual(len(events), 3)  # read in pages of two
+            history.reset_mock()
+            _thread, later = runner.run_events(organisation=self.org, record_id=1, after=events[-1]['step'])
+        self.assertEqual(later, [])
+        history.assert_called_once()
+        self.assertEqual(history.call_args.kwargs['limit'], 1)
+
+    @override_settings(AGENT_RUN_MODE='off')
+    def test_http_start_answers_at_once_and_the_events_show_progress(self):
+        res = self.client.post('/api/agents/skeleton/runs/', {'record_id': 7}, format='json')
+        self.assertEqual(res.status_code, 202)
+        self.assertEqual(res.json()['status'], AgentThread.RUNNING)
+        self.llm.assert_not_called()
+
+        url = '/api/agents/skeleton/runs/7/events/'
+        self.assertEqual(self.client.get(url).json()['events'], [])
+        runner.drain()
+        body = self.client.get(url).json()
+        self.assertEqual(body['thread']['status'], AgentThread.AWAITING_INPUT)
+        self.assertEqual(body['events'][-1]['node'], 'await_answer')
+        after = body['events'][-1]['step']
+        self.assertEqual(self.client.get(url, {'after': after}).json()['events'], [])
+
+        again = self.client.post('/api/agents/skeleton/runs/', {'record_id': 7}, format='json')
+        self.assertEqual(again.status_code, 409)
+
+    def test_events_stream_as_server_sent_events(self):
+        runner.queue_run(organisation=self.org, record_id=1)
+        res = self.client.get('/api/agents/skeleton/runs/1/events/', HTTP_ACCEPT='text/event-stream')
+        self.assertEqual(res.status_code, 200)
+        self.assertEqual(res['Content-Type'], 'text/event-stream')
+        stream = b''.join(res.streaming_content).decode()
+        self.assertTrue(stream.startswith('retry: 5000\n\n'))
+        self.assertIn('event: node\ndata: {"step": 2, "node": "await_answer"', stream)
+        self.assertIn('event: thread', stream)
+        self.assertIn('"status": "awaiting_input"', stream)
+
+        # A reconnect carries on after the last event it saw.
+        res = self.client.get(
+            '/api/agents/skeleton/runs/1/events/',
+            HTTP_ACCEPT='text/event-stream', HTTP_LAST_EVENT_ID='2',
+        )
+        self.assertNotIn('event: node', b''.join(res.streaming_content).decode())
+
+    def test_another_orgs_run_is_not_found(self):
+        other = Organisation.objects.create(name='Rival', slug='rival')
+        runner.queue_run(organisation=other, record_id=1)
+        res = self.client.get('/api/agents/skeleton/runs/1/events/')
+        self.assertEqual(res.status_code, 404)
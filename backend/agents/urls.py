@@ -0,0 +1,11 @@
+from django.urls import path
+
+from agents.views import SkeletonRunEventsView, SkeletonRunStartView
+
+urlpatterns = [
+    path('agents/skeleton/runs/', SkeletonRunStartView.as_view(), name='agent-skeleton-run-start'),
+    path(
+        'agents/skeleton/runs/<int:record_id>/events/',
+        SkeletonRunEventsView.as_view(), name='agent-skeleton-run-events',
+    ),
+]
@@ -0,0 +1,128 @@
+"""HTTP start and progress for the skeleton agent, over `agents.runner`.
+
+A start is queued (`runner.queue_run`) and answered at once with the run
+``RUNNING``: the graph's LLM calls happen on the agent-run worker, not in the
+request. The client then follows the run through its events endpoint, either
+as a long poll (JSON) or as server-sent events (``Accept: text/event-stream``).
+Both are answered within AGENT_EVENTS_WAIT_SECONDS, so neither holds a web
+thread for the length of a run: a poll is repeated with ``?after=<last step>``,
+and an event stream reconnects after AGENT_EVENTS_RETRY_SECONDS (EventSource
+does this itself, sending the last step back as ``Last-Event-ID``). Each look
+at the run reads only the checkpoints after the last step sent.
+"""
+import json
+import time
+
+from django.conf import settings
+from django.http import StreamingHttpResponse
+from rest_framework import generics, renderers, status
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+
+from agents.models import AgentThread
+from agents.runner import AgentRunError, queue_run, run_events
+from agents.serializers import AgentThreadSerializer
+from users.mixins import get_request_org
+
+# How often a waiting events request looks at the checkpoints again.
+EVENTS_POLL_SECONDS = 0.5
+
+
+class EventStreamRenderer(renderers.BaseRenderer):
+    """Lets a client ask for ``text/event-stream``; the view writes the stream."""
+
+    media_type = 'text/event-stream'
+    format = 'event-stream'
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        # Only errors come through here; the stream itself is a
+        # StreamingHttpResponse.
+        return f"event: error\ndata: {json.dumps(data, default=str)}\n\n".encode()
+
+
+class SkeletonRunStartView(generics.GenericAPIView):
+    """POST /api/agents/skeleton/runs/ {"record_id": <int>} — start a run.
+    202 with the AgentThread, still ``running``."""
+
+    def post(self, request):
+        org = get_request_org(request)
+        if org is None:
+            return Response({'detail': 'No organisation.'}, status=status.HTTP_400_BAD_REQUEST)
+        try:
+            record_id = int(request.data.get('record_id'))
+        except (TypeError, ValueError):
+            return Response({'detail': 'record_id must be an integer.'}, status=status.HTTP_400_BAD_REQUEST)
+        try:
+            thread = queue_run(organisation=org, record_id=record_id)
+        except AgentRunError as exc:
+            return Response({'detail': str(exc)}, status=status.HTTP_409_CONFLICT)
+        return Response(AgentThreadSerializer(thread).data, status=status.HTTP_202_ACCEPTED)
+
+
+class SkeletonRunEventsView(generics.GenericAPIView):
+    """GET /api/agents/skeleton/runs/<record_id>/events/?after=<step> — the
+    run's node transitions after ``step``, and its AgentThread.
+
+    As JSON, waits until there is a new event or the run is no longer
+    ``running`` (or AGENT_EVENTS_WAIT_SECONDS pass). As an event stream, sends
+    each event as it is checkpointed, then the run as a ``thread`` event when
+    it stops running (the client's cue to close), and closes.
+    """
+
+    renderer_classes = [*api_settings.DEFAULT_RENDERER_CLASSES, EventStreamRenderer]
+
+    def get(self, request, record_id):
+        org = get_request_org(request)
+        if org is None:
+            return Response({'detail': 'No organisation.'}, status=status.HTTP_400_BAD_REQUEST)
+        streaming = request.accepted_renderer.format == EventStreamRenderer.format
+        after = request.headers.get('Last-Event-ID') if streaming else None
+        after = after or request.query_params.get('after')
+        try:
+            after = int(after) if after not in (None, '') else None
+        except ValueError:
+            return Response({'detail': 'after must be an integer.'}, status=status.HTTP_400_BAD_REQUEST)
+        try:
+            thread, events = run_events(organisation=org, record_id=record_id, after=after)
+        except AgentRunError as exc:
+            return Response({'detail': str(exc)}, status=status.HTTP_404_NOT_FOUND)
+
+        if streaming:
+            response = StreamingHttpResponse(
+                _stream(org, record_id, thread, events, after), content_type=EventStreamRenderer.media_type,
+            )
+            response['Cache-Control'] = 'no-cache'
+            response['X-Accel-Buffering'] = 'no'  # don't let a proxy hold the events back
+            return response
+
+        deadline = time.monotonic() + settings.AGENT_EVENTS_WAIT_SECONDS
+        while (
+            after is not None and not events and thread.status == AgentThread.RUNNING
+            and time.monotonic() < deadline
+        ):
+            time.sleep(EVENTS_POLL_SECONDS)
+            thread, events = run_events(organisation=org, record_id=record_id, after=after)
+        return Response({'thread': AgentThreadSerializer(thread).data, 'events': events})
+
+
+def _stream(org, record_id, thread, events, after):
+    deadline = time.monotonic() + settings.AGENT_EVENTS_WAIT_SECONDS
+    yield f"retry: {int(settings.AGENT_EVENTS_RETRY_SECONDS * 1000)}\n\n"
+    while True:
+        for event in events:
+            after = event['step']
+            yield _sse('node', event, event_id=after)
+        if thread.status != AgentThread.RUNNING:
+            yield _sse('thread', AgentThreadSerializer(thread).data)
+            return
+        if time.monotonic() >= deadline:
+            return
+        time.sleep(EVENTS_POLL_SECONDS)
+        thread, events = run_events(organisation=org, record_id=record_id, after=after)
+
+
+def _sse(kind, data, event_id=None):
+    lines = [f"event: {kind}", f"data: {json.dumps(data, default=str)}"]
+    if event_id is not None:
+        lines.insert(0, f"id: {event_id}")
+    return '\n'.join(lines) + '\n\n'
@@ -1,21 +1,131 @@
+from collections import Counter
+
 from django.contrib.contenttypes.models import ContentType
+from django.db import IntegrityError, transaction
+from django.db.models import Case, CharField, Count, F, Value, When
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+
+from bookings.models.activity import ActivityLog, LeadActivityRollup
+
+
+def _rollup_status(action, new_value):
+    return new_value if action == 'status_change' else ''
+
+
+def save_logs(logs):
+    """Insert unsaved ActivityLog rows and roll them up, in one transaction —
+    which `rebuild_rollups` relies on to count each log exactly once."""
+    with transaction.atomic():
+        ActivityLog.objects.bulk_create(logs)
+        roll_up(logs)
+    return logs
+
+
+def roll_up(logs):
+    """Add freshly written lead ActivityLog rows to LeadActivityRollup.
+
+    Every ActivityLog insert goes through `save_logs`, which calls this. Other
+    targets and org-less rows aren't rolled up. Each key is one UPDATE once its
+    row exists for the day.
+    """
+    from bookings.models.leads import Lead
+    lead_ct_id = ContentType.objects.get_for_model(Lead).pk
+    counts = Counter(
+        (log.organisation_id, timezone.localdate(log.created_at), log.user_id,
+         log.action, _rollup_status(log.action, log.new_value))
+        for log in logs
+        if log.content_type_id == lead_ct_id and log.organisation_id is not None
+    )
+    for (org_id, day, user_id, action, status), n in counts.items():
+        _bump(dict(organisation_id=org_id, day=day, user_id=user_id, action=action, status=status), n)
 
-from bookings.models.activity import ActivityLog
+
+def _bump(key, n):
+    """Add `n` to `key`'s rollup row, creating it if need be."""
+    if LeadActivityRollup.objects.filter(**key).update(count=F('count') + n):
+        return
+    try:
+        with transaction.atomic():
+            LeadActivityRollup.objects.create(count=n, **key)
+    except IntegrityError:
+        # Another writer created the row since the update missed it.
+        LeadActivityRollup.objects.filter(**key).update(count=F('count') + n)
+
+
+def rebuild_rollups(org=None):
+    """Recompute LeadActivityRollup from the log (one org, or all). Returns
+    the number of rollup rows written.
+
+    One org and day at a time, each in a transaction that locks the day's rows
+    before counting its logs. A log written meanwhile (`save_logs`) either
+    committed, with its bump, before the lock — and is counted here — or bumps
+    the rebuilt row once the day is done; never both.
+    """
+    from bookings.models.leads import Lead
+    logs = ActivityLog.objects.filter(
+        content_type=ContentType.objects.get_for_model(Lead), organisation__isnull=False,
+    )
+    rollups = LeadActivityRollup.objects.all()
+    if org is not None:
+        logs = logs.filter(organisation=org)
+        rollups = rollups.filter(organisation=org)
+    days = set(logs.annotate(day=TruncDate('created_at')).values_list('organisation_id', 'day').distinct())
+    days |= set(rollups.values_list('organisation_id', 'day').distinct())
+    return sum(_rebuild_day(logs, org_id, day) for org_id, day in sorted(days))
+
+
+def _rebuild_day(logs, org_id, day):
+    with transaction.atomic():
+        existing, spare = {}, []
+        for row in LeadActivityRollup.objects.select_for_update().filter(organisation_id=org_id, day=day):
+            key = (row.user_id, row.action, row.status)
+            if key in existing:
+                spare.append(row)  # a twin: rows without a user aren't unique per key
+            else:
+                existing[key] = row
+        counts = (
+            logs.filter(organisation_id=org_id, created_at__date=day)
+            .annotate(status=Case(
+                When(action='status_change', then=F('new_value')),
+                default=Value(''), output_field=CharField(),
+            ))
+            .values_list('user_id', 'action', 'status')
+            .annotate(count=Count('id'))
+            .order_by()
+        )
+        written = 0
+        for user_id, action, status, count in counts:
+            row = existing.pop((user_id, action, status), None)
+            if row is None:
+                # Not there when the day was locked: a concurrent first write
+                # may be adding it, so add to it rather than set it.
+                _bump(dict(organisation_id=org_id, day=day, user_id=user_id, action=action, status=status), count)
+            elif row.count != count:
+                row.count = count
+                row.save(update_fields=['count'])
+            written += 1
+        # Keys with no logs left, and the twins of the rows kept above.
+        stale = [row.pk for row in [*existing.values(), *spare]]
+        if stale:
+            LeadActivityRollup.objects.filter(pk__in=stale).delete()
+    return written
 
 
 def log_activity(instance, action, user=None, field_name='', old_value='', new_value='', description=''):
     """Log a single activity entry for any model instance."""
     ct = ContentType.objects.get_for_model(instance)
-    ActivityLog.objects.create(
+    save_logs([ActivityLog(
         content_type=ct,
         object_id=instance.pk,
+        organisation_id=getattr(instance, 'organisation_id', None),
         action=action,
         field_name=field_name,
         old_value=str(old_value) if old_value is not None else '',
         new_value=str(new_value) if new_value is not None else '',
         description=description,
         user=user,
-    )
+    )])
 
 
 TRACKED_FIELDS = [
@@ -65,6 +175,7 @@ def log_field_changes(instance, old_data, new_data, user=None):
     """Compare old vs new dicts and log each changed tracked field."""
     logs = []
     ct = ContentType.objects.get_for_model(instance)
+    org_id = getattr(instance, 'organisation_id', None)
     for field in TRACKED_FIELDS:
         old_val = old_data.get(field)
         new_val = new_data.get(field)
@@ -84,6 +195,7 @@ def log_field_changes(instance, old_data, new_data, user=None):
             logs.append(ActivityLog(
                 content_type=ct,
                 object_id=instance.pk,
+                organisation_id=org_id,
                 action='updated',
                 field_name=field,
                 old_value=old_str,
@@ -92,5 +204,5 @@ def log_field_changes(instance, old_data, new_data, user=None):
                 user=user,
             ))
     if logs:
-        ActivityLog.objects.bulk_create(logs)
+        save_logs(logs)
     return logs
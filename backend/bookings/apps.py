@@ -4,3 +4,8 @@ from django.apps import AppConfig
 class BookingsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'bookings'
+
+    def ready(self):
+        from portioning import request_cache
+        from bookings.models import OrgSettings
+        request_cache.track(OrgSettings)
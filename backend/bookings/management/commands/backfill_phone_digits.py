@@ -0,0 +1,18 @@
+from django.core.management.base import BaseCommand
+
+from bookings.models import Lead, OrgSettings
+from bookings.phones import backfill_phone_digits
+
+
+class Command(BaseCommand):
+    help = (
+        "Recompute the indexed phone-digits columns used to match inbound WhatsApp "
+        "(Lead.phone_digits, OrgSettings.twilio_whatsapp_number_digits). Save() keeps "
+        "them current; run this after writing phone numbers with raw SQL or .update()."
+    )
+
+    def handle(self, *args, **options):
+        leads, org_settings = backfill_phone_digits(Lead, OrgSettings)
+        self.stdout.write(self.style.SUCCESS(
+            f"Phone digits backfilled — {leads} lead(s), {org_settings} org setting(s) updated."
+        ))
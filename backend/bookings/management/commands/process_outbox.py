@@ -0,0 +1,35 @@
+"""Deliver the client messages waiting in the outbox.
+
+With OUTBOX_MODE=thread the web process delivers them itself; this is for
+OUTBOX_MODE=off (run with --loop as a worker process) and for clearing a
+backlog by hand:
+
+    python manage.py process_outbox
+"""
+import time
+
+from django.core.management.base import BaseCommand
+
+from bookings.services import outbox
+
+
+class Command(BaseCommand):
+    help = 'Deliver every queued client message that is due.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--concurrency', type=int,
+            help='Mailboxes/numbers delivered in parallel (default: OUTBOX_WORKER_CONCURRENCY).',
+        )
+        parser.add_argument(
+            '--loop', action='store_true',
+            help=f'Keep delivering every {outbox.POLL_SECONDS}s instead of exiting.',
+        )
+
+    def handle(self, *args, **options):
+        while True:
+            delivered = outbox.drain(concurrency=options['concurrency'])
+            self.stdout.write(self.style.SUCCESS(f'Outbox drained — {delivered} message(s) delivered.'))
+            if not options['loop']:
+                return
+            time.sleep(outbox.POLL_SECONDS)
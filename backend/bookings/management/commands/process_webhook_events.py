@@ -0,0 +1,35 @@
+"""Drain the inbound-webhook queue (Meta lead ads, Twilio callbacks).
+
+With WEBHOOK_QUEUE_MODE=thread the web process drains it itself; this is for
+WEBHOOK_QUEUE_MODE=off (run with --loop as a worker process) and for clearing a
+backlog by hand:
+
+    python manage.py process_webhook_events
+"""
+import time
+
+from django.core.management.base import BaseCommand
+
+from bookings.services import webhook_queue
+
+
+class Command(BaseCommand):
+    help = 'Handle every stored Meta/Twilio webhook event that is due.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--concurrency', type=int,
+            help='Events handled in parallel (default: WEBHOOK_WORKER_CONCURRENCY).',
+        )
+        parser.add_argument(
+            '--loop', action='store_true',
+            help=f'Keep draining every {webhook_queue.POLL_SECONDS}s instead of exiting.',
+        )
+
+    def handle(self, *args, **options):
+        while True:
+            handled = webhook_queue.drain(concurrency=options['concurrency'])
+            self.stdout.write(self.style.SUCCESS(f'Webhook queue drained — {handled} event(s) handled.'))
+            if not options['loop']:
+                return
+            time.sleep(webhook_queue.POLL_SECONDS)
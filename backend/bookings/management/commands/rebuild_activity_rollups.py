@@ -0,0 +1,32 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from bookings.activity import rebuild_rollups
+from users.models import Organisation
+
+
+class Command(BaseCommand):
+    help = (
+        "Recompute the dashboard's daily lead-activity rollups from the activity log. "
+        "Safe to re-run; needed only if the rollups drifted (e.g. rows written by raw SQL)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--org", help="Limit to one organisation by id or name.",
+        )
+
+    def handle(self, *args, **options):
+        org = None
+        if options["org"]:
+            value = options["org"]
+            org = Organisation.objects.filter(pk=value).first() if value.isdigit() else None
+            if org is None:
+                org = Organisation.objects.filter(name=value).first()
+            if org is None:
+                raise CommandError(f"No organisation matching {value!r}")
+
+        written = rebuild_rollups(org)
+        scope = org.name if org else "all organisations"
+        self.stdout.write(self.style.SUCCESS(
+            f"Activity rollups rebuilt for {scope} — {written} row(s)."
+        ))
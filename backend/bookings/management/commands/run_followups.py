@@ -2,6 +2,7 @@ from django.core.management.base import BaseCommand
 
 from bookings.models import OrgSettings
 from bookings.services.followup_scheduler import run_all, run_for_org, run_scheduled
+from portioning.request_cache import request_scope
 from users.models import Organisation
 
 
@@ -23,18 +24,30 @@ class Command(BaseCommand):
             "--dry-run", action="store_true",
             help="Report which leads would get a draft without calling the AI or writing anything.",
         )
+        parser.add_argument(
+            "--concurrency", type=int,
+            help="Follow-ups drafted in parallel (default: FOLLOWUP_DRAFT_CONCURRENCY).",
+        )
+        parser.add_argument(
+            "--batch", action="store_true",
+            help="Submit the drafts to the LLM provider's batch API as one job and wait for it "
+                 "(cheaper, but answers can take hours). For nightly runs.",
+        )
         parser.add_argument(
             "--first-responses", action="store_true",
             help="Draft AI FIRST responses for newly-created flagged leads (REL-515) "
                  "instead of quiet-lead follow-ups. What the frequent cron calls.",
         )
 
+    @request_scope()
     def handle(self, *args, **options):
         dry_run = options["dry_run"]
+        concurrency = options["concurrency"]
+        batch = options["batch"]
 
         if options["first_responses"]:
             from bookings.services import first_response
-            summaries = first_response.run_all()
+            summaries = first_response.run_all(batch=batch)
             total_created = sum(s.get("created", 0) for s in summaries)
             for s in summaries:
                 self.stdout.write(str(s))
@@ -44,12 +57,12 @@ class Command(BaseCommand):
             return
 
         if options["scheduled"]:
-            summaries = run_scheduled()
+            summaries = run_scheduled(concurrency=concurrency, batch=batch)
         elif options["org"]:
             org = self._resolve_org(options["org"])
-            summaries = [run_for_org(org, dry_run=dry_run)]
+            summaries = [run_for_org(org, dry_run=dry_run, concurrency=concurrency, batch=batch)]
         else:
-            summaries = run_all(dry_run=dry_run)
+            summaries = run_all(dry_run=dry_run, concurrency=concurrency, batch=batch)
 
         total_created = sum(s.get("created", 0) for s in summaries)
         for s in summaries:
@@ -10,11 +10,13 @@ retention window. Run hourly via the cron endpoint, or by hand:
 from django.core.management.base import BaseCommand
 
 from bookings.services import meta_leads
+from portioning.request_cache import request_scope
 
 
 class Command(BaseCommand):
     help = 'Ingest any not-yet-seen Meta lead-ad submissions for all connected Pages.'
 
+    @request_scope()
     def handle(self, *args, **options):
         created = meta_leads.backfill_all()
         self.stdout.write(self.style.SUCCESS(f'Meta backfill complete — {created} new lead(s) created.'))
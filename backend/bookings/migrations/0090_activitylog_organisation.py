@@ -0,0 +1,31 @@
+# Generated by Django 5.2.18 on 2026-10-19 02:28
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('bookings', '0089_alter_orgsettings_first_response_enabled'),
+        ('contenttypes', '0002_remove_content_type_name'),
+        ('users', '0009_create_cache_table'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='activitylog',
+            name='organisation',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='activity_logs', to='users.organisation'),
+        ),
+        migrations.AddIndex(
+            model_name='activitylog',
+            index=models.Index(fields=['organisation', 'content_type', 'created_at'], name='bookings_ac_organis_a17809_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='activitylog',
+            index=models.Index(fields=['organisation', 'action', 'created_at'], name='bookings_ac_organis_533744_idx'),
+        ),
+    ]
@@ -0,0 +1,44 @@
+from django.db import migrations, transaction
+from django.db.models import Max, OuterRef, Subquery
+
+# Rows per UPDATE. Each chunk commits on its own, so a large table is never
+# locked by one long transaction.
+CHUNK_SIZE = 5000
+
+
+def backfill_organisation(apps, schema_editor):
+    """Copy each log's organisation from the object it points at, one pk range
+    at a time. Targets without an `organisation` field are left null."""
+    ActivityLog = apps.get_model('bookings', 'ActivityLog')
+    ContentType = apps.get_model('contenttypes', 'ContentType')
+
+    last_pk = ActivityLog.objects.aggregate(m=Max('pk'))['m'] or 0
+    ct_ids = ActivityLog.objects.values_list('content_type_id', flat=True).distinct()
+    for ct in ContentType.objects.filter(pk__in=list(ct_ids)):
+        try:
+            model = apps.get_model(ct.app_label, ct.model)
+        except LookupError:
+            continue
+        if not any(f.name == 'organisation' for f in model._meta.concrete_fields):
+            continue
+        org_of_target = Subquery(
+            model.objects.filter(pk=OuterRef('object_id')).values('organisation_id')[:1]
+        )
+        for start in range(0, last_pk, CHUNK_SIZE):
+            with transaction.atomic():
+                ActivityLog.objects.filter(
+                    content_type=ct, organisation__isnull=True,
+                    pk__gt=start, pk__lte=start + CHUNK_SIZE,
+                ).update(organisation_id=org_of_target)
+
+
+class Migration(migrations.Migration):
+    atomic = False
+
+    dependencies = [
+        ('bookings', '0090_activitylog_organisation'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_organisation, migrations.RunPython.noop),
+    ]
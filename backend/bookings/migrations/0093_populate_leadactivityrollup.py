@@ -0,0 +1,42 @@
+from django.db import migrations
+from django.db.models import Case, CharField, Count, F, Value, When
+from django.db.models.functions import TruncDate
+
+
+def populate_rollups(apps, schema_editor):
+    """Roll up the existing lead activity log — the same grouping as
+    `bookings.activity.rebuild_rollups`."""
+    ActivityLog = apps.get_model('bookings', 'ActivityLog')
+    LeadActivityRollup = apps.get_model('bookings', 'LeadActivityRollup')
+    ContentType = apps.get_model('contenttypes', 'ContentType')
+
+    lead_ct = ContentType.objects.filter(app_label='bookings', model='lead').first()
+    if lead_ct is None:
+        return
+    rows = (
+        ActivityLog.objects.filter(content_type=lead_ct, organisation__isnull=False)
+        .annotate(
+            day=TruncDate('created_at'),
+            status=Case(
+                When(action='status_change', then=F('new_value')),
+                default=Value(''), output_field=CharField(),
+            ),
+        )
+        .values('organisation_id', 'day', 'user_id', 'action', 'status')
+        .annotate(count=Count('id'))
+        .order_by()
+    )
+    LeadActivityRollup.objects.bulk_create(
+        (LeadActivityRollup(**row) for row in rows.iterator()), batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('bookings', '0092_leadactivityrollup'),
+    ]
+
+    operations = [
+        migrations.RunPython(populate_rollups, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,39 @@
+# Generated by Django 5.2.18 on 2026-10-19 02:44
+
+from django.db import migrations, models
+
+TRIGRAM_INDEX = 'bookings_lead_search_text_trgm'
+
+
+def create_trigram_index(apps, schema_editor):
+    """A trigram GIN index so `search_text LIKE '%term%'` is an index scan.
+    Postgres only — SQLite has no equivalent and scans."""
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    schema_editor.execute(
+        f'CREATE INDEX IF NOT EXISTS {TRIGRAM_INDEX} '
+        'ON bookings_lead USING gin (search_text gin_trgm_ops)'
+    )
+
+
+def drop_trigram_index(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute(f'DROP INDEX IF EXISTS {TRIGRAM_INDEX}')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('bookings', '0093_populate_leadactivityrollup'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='lead',
+            name='search_text',
+            field=models.TextField(blank=True, default='', editable=False),
+        ),
+        migrations.RunPython(create_trigram_index, drop_trigram_index),
+    ]
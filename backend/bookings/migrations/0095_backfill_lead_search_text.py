@@ -0,0 +1,33 @@
+from django.db import migrations
+
+BATCH_SIZE = 2000
+
+
+def backfill_search_text(apps, schema_editor):
+    """Fill Lead.search_text for existing leads, the way Lead.save() does."""
+    from bookings.search import build_search_text
+    Lead = apps.get_model('bookings', 'Lead')
+
+    batch = []
+    for lead in Lead.objects.select_related('account').order_by('pk').iterator(chunk_size=BATCH_SIZE):
+        lead.search_text = build_search_text(
+            lead.contact_name, lead.contact_email, lead.contact_phone,
+            lead.account.name if lead.account_id else '',
+        )
+        batch.append(lead)
+        if len(batch) >= BATCH_SIZE:
+            Lead.objects.bulk_update(batch, ['search_text'])
+            batch = []
+    if batch:
+        Lead.objects.bulk_update(batch, ['search_text'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('bookings', '0094_lead_search_text'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_search_text, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,31 @@
+# Generated by Django 5.2.18 on 2026-10-19 03:03
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('bookings', '0095_backfill_lead_search_text'),
+        ('events', '0038_event_beo_revised_at_event_beo_revision'),
+        ('users', '0009_create_cache_table'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='lead',
+            name='phone_digits',
+            field=models.CharField(blank=True, default='', editable=False, max_length=50),
+        ),
+        migrations.AddField(
+            model_name='orgsettings',
+            name='twilio_whatsapp_number_digits',
+            field=models.CharField(blank=True, db_index=True, default='', editable=False, max_length=20),
+        ),
+        migrations.AddIndex(
+            model_name='lead',
+            index=models.Index(fields=['organisation', 'phone_digits'], name='bookings_le_organis_608e19_idx'),
+        ),
+    ]
@@ -0,0 +1,17 @@
+from django.db import migrations
+
+
+def backfill(apps, schema_editor):
+    from bookings.phones import backfill_phone_digits
+    backfill_phone_digits(apps.get_model('bookings', 'Lead'), apps.get_model('bookings', 'OrgSettings'))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('bookings', '0096_phone_digits'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill, migrations.RunPython.noop),
+    ]
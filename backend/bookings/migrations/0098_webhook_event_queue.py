@@ -0,0 +1,74 @@
+# Generated by Django 5.2.18 on 2026-10-19 03:11
+
+import django.db.models.deletion
+import users.model_mixins
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('bookings', '0097_backfill_phone_digits'),
+        ('users', '0009_create_cache_table'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TwilioWebhookEvent',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('payload', models.JSONField(default=dict)),
+                ('received_at', models.DateTimeField(auto_now_add=True)),
+                ('processed_at', models.DateTimeField(blank=True, null=True)),
+                ('error', models.TextField(blank=True, default='')),
+                ('attempts', models.PositiveSmallIntegerField(default=0)),
+                ('next_attempt_at', models.DateTimeField(blank=True, null=True)),
+                ('failed_at', models.DateTimeField(blank=True, null=True)),
+                ('locked_until', models.DateTimeField(blank=True, null=True)),
+                ('kind', models.CharField(choices=[('inbound', 'Inbound message'), ('status', 'Status callback')], max_length=10)),
+                ('message_sid', models.CharField(max_length=64)),
+                ('sequence_key', models.CharField(max_length=64)),
+            ],
+            options={
+                'ordering': ['-received_at'],
+            },
+            bases=(users.model_mixins.OrgScopedModel, models.Model),
+        ),
+        migrations.AddField(
+            model_name='metawebhookevent',
+            name='attempts',
+            field=models.PositiveSmallIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='metawebhookevent',
+            name='failed_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='metawebhookevent',
+            name='locked_until',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='metawebhookevent',
+            name='next_attempt_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='metawebhookevent',
+            index=models.Index(condition=models.Q(('failed_at__isnull', True), ('processed_at__isnull', True)), fields=['page_id', 'received_at'], name='metawebhookevent_pending'),
+        ),
+        migrations.AddField(
+            model_name='twiliowebhookevent',
+            name='organisation',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='twilio_webhook_events', to='users.organisation'),
+        ),
+        migrations.AddIndex(
+            model_name='twiliowebhookevent',
+            index=models.Index(fields=['processed_at'], name='bookings_tw_process_56fe54_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='twiliowebhookevent',
+            index=models.Index(condition=models.Q(('failed_at__isnull', True), ('processed_at__isnull', True)), fields=['sequence_key', 'received_at'], name='twiliowebhookevent_pending'),
+        ),
+    ]
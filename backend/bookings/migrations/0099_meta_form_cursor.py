@@ -0,0 +1,31 @@
+# Generated by Django 5.2.18 on 2026-10-19 03:24
+
+import django.db.models.deletion
+import users.model_mixins
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('bookings', '0098_webhook_event_queue'),
+        ('users', '0009_create_cache_table'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='MetaFormCursor',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('form_id', models.CharField(max_length=64)),
+                ('last_created_time', models.DateTimeField()),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('organisation', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='meta_form_cursors', to='users.organisation')),
+                ('page', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='form_cursors', to='bookings.connectedmetapage')),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('page', 'form_id'), name='unique_page_meta_form_cursor')],
+            },
+            bases=(users.model_mixins.OrgScopedModel, models.Model),
+        ),
+    ]
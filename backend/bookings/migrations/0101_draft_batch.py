@@ -0,0 +1,28 @@
+# Generated by Django 5.2.18 on 2026-10-19 05:49
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('bookings', '0100_outbox'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DraftBatch',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('followup', 'Follow-up'), ('first_response', 'First response')], max_length=20)),
+                ('leads', models.JSONField(default=list)),
+                ('job', models.JSONField(blank=True, null=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('finished_at', models.DateTimeField(blank=True, null=True)),
+                ('locked_until', models.DateTimeField(blank=True, null=True)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['kind', 'finished_at'], name='bookings_dr_kind_074bbb_idx')],
+            },
+        ),
+    ]
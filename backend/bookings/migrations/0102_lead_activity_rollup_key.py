@@ -0,0 +1,35 @@
+# Generated by Django 5.2.18 on 2026-10-19 06:20
+
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count, Sum
+
+
+def merge_twins(apps, schema_editor):
+    """Fold repeated rows for a key (which readers summed) into one."""
+    LeadActivityRollup = apps.get_model('bookings', 'LeadActivityRollup')
+    rows = LeadActivityRollup.objects.using(schema_editor.connection.alias).filter(user__isnull=False)
+    key = ('organisation_id', 'day', 'user_id', 'action', 'status')
+    twins = rows.values(*key).annotate(rows=Count('id'), total=Sum('count')).filter(rows__gt=1).order_by()
+    for twin in twins:
+        same = rows.filter(**{field: twin[field] for field in key}).order_by('pk')
+        keep = same.first()
+        same.exclude(pk=keep.pk).delete()
+        same.filter(pk=keep.pk).update(count=twin['total'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('bookings', '0101_draft_batch'),
+        ('users', '0009_create_cache_table'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RunPython(merge_twins, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='leadactivityrollup',
+            constraint=models.UniqueConstraint(condition=models.Q(('user__isnull', False)), fields=('organisation', 'day', 'user', 'action', 'status'), name='uniq_lead_activity_rollup_key'),
+        ),
+    ]
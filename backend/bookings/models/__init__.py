@@ -7,12 +7,13 @@ from .addons import AddOnProduct, AddOnVariant, BookingLineItem
 from .choices import EventTypeOption, SourceOption, ServiceStyleOption, LeadStatusOption, LostReasonOption, MealTypeOption, TimelinePresetOption
 from .finance import Invoice, Payment
 from .settings import OrgSettings
-from .activity import ActivityLog
+from .activity import ActivityLog, LeadActivityRollup
 from .reminders import Reminder
-from .whatsapp import WhatsAppMessage
-from .followups import FollowUpDraft
+from .whatsapp import WhatsAppMessage, TwilioWebhookEvent
+from .followups import DraftBatch, FollowUpDraft
+from .outbox import OutboxMessage
 from .locked_dates import LockedDate
 from .commission import CommissionPlan, CommissionBand, SalesTarget, RepCommissionPlan
 from .email_account import ConnectedMailbox
 from .meta_account import MetaAccountConnection, ConnectedMetaPage
-from .meta_webhook import MetaWebhookEvent, MetaIngestedLead
+from .meta_webhook import MetaWebhookEvent, MetaIngestedLead, MetaFormCursor
@@ -59,7 +59,26 @@ class Account(models.Model):
         # existing rows are never rewritten.
         if not self.pk and not self.billing_country and self.organisation_id:
             self.billing_country = self.organisation.country
+        update_fields = kwargs.get('update_fields')
+        stored_name = None
+        if self.pk and (update_fields is None or 'name' in update_fields):
+            stored_name = Account.objects.filter(pk=self.pk).values_list('name', flat=True).first()
         super().save(*args, **kwargs)
+        if stored_name is not None and stored_name != self.name:
+            self._refresh_lead_search_text()
+
+    def _refresh_lead_search_text(self):
+        """Leads carry the account name in their search column; rewrite it
+        after a rename, reading only the columns it is built from."""
+        from bookings.models.leads import Lead
+        from bookings.search import build_search_text
+        leads = [
+            Lead(pk=pk, search_text=build_search_text(name, email, phone, self.name))
+            for pk, name, email, phone in self.leads.values_list(
+                'pk', 'contact_name', 'contact_email', 'contact_phone',
+            )
+        ]
+        Lead.objects.bulk_update(leads, ['search_text'])
 
     def __str__(self):
         return self.name
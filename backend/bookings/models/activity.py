@@ -16,6 +16,13 @@ class ActivityLog(models.Model):
     content_type = models.ForeignKey(ContentType, on_delete=models.CASCADE)
     object_id = models.PositiveIntegerField()
     content_object = GenericForeignKey('content_type', 'object_id')
+    # Denormalised from the target so per-org scans (the dashboard) are an index
+    # range scan rather than `object_id__in=<every lead the org ever had>`.
+    # Null only for targets that have no organisation.
+    organisation = models.ForeignKey(
+        'users.Organisation', null=True, blank=True,
+        on_delete=models.CASCADE, related_name='activity_logs',
+    )
 
     action = models.CharField(max_length=20, choices=ACTION_CHOICES)
     field_name = models.CharField(max_length=100, blank=True)
@@ -35,7 +42,47 @@ class ActivityLog(models.Model):
             models.Index(fields=['content_type', 'object_id']),
             models.Index(fields=['action', 'created_at']),
             models.Index(fields=['user', 'created_at']),
+            models.Index(fields=['organisation', 'content_type', 'created_at']),
+            models.Index(fields=['organisation', 'action', 'created_at']),
         ]
 
     def __str__(self):
         return f"{self.action} on {self.content_type} #{self.object_id}"
+
+
+class LeadActivityRollup(models.Model):
+    """Lead ActivityLog rows counted per (org, day, user, action, status).
+
+    Kept up to date by `bookings.activity.roll_up` on every write, so the
+    dashboard's period totals read a handful of rows per day instead of
+    scanning the log. `status` is the new status for a status_change and blank
+    for every other action. A key has one row; rows without a user (which a
+    deleted user's become) may repeat, and readers sum them.
+    `rebuild_activity_rollups` recomputes the table from the log.
+    """
+    organisation = models.ForeignKey(
+        'users.Organisation', on_delete=models.CASCADE, related_name='lead_activity_rollups',
+    )
+    day = models.DateField()
+    user = models.ForeignKey(
+        'users.User', null=True, blank=True,
+        on_delete=models.SET_NULL, related_name='+',
+    )
+    action = models.CharField(max_length=20, choices=ActivityLog.ACTION_CHOICES)
+    status = models.CharField(max_length=50, blank=True)
+    count = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['organisation', 'day']),
+        ]
+        constraints = [
+            models.UniqueConstraint(
+                fields=['organisation', 'day', 'user', 'action', 'status'],
+                condition=models.Q(user__isnull=False),
+                name='uniq_lead_activity_rollup_key',
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.day} {self.action} {self.status} x{self.count}"
@@ -92,3 +92,31 @@ class FollowUpDraft(OrgScopedModel, models.Model):
 
     def __str__(self):
         return f"Follow-up draft for {self.lead} ({self.status})"
+
+
+class DraftBatch(models.Model):
+    """A provider batch job drafting follow-ups or first responses
+    (`bookings.services.draft_batches`).
+
+    A batch can run for hours and is paid for when submitted, so it is written
+    down before it is submitted: its leads count as in flight until it is
+    finished, and a later run skips them. If the run waiting on the job dies,
+    a later one polls the same job once the lease runs out, rather than paying
+    for the drafts again. One batch can cover several orgs, so it has none.
+    """
+
+    kind = models.CharField(max_length=20, choices=FollowUpDraft.KIND_CHOICES)
+    # [[lead_id, channel], ...], in the order of the job's requests.
+    leads = models.JSONField(default=list)
+    # The job `portioning.llm_batch.submit` returned. Null until it is submitted.
+    job = models.JSONField(null=True, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+    # Held by the run waiting on the job; once it passes, another run may poll it.
+    locked_until = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        indexes = [models.Index(fields=['kind', 'finished_at'])]
+
+    def __str__(self):
+        return f"{self.kind} batch {self.pk} ({len(self.leads)} lead(s))"
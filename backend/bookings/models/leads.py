@@ -1,6 +1,7 @@
 from django.db import models
 from django.utils import timezone
 from bookings.names import TITLE_CHOICES as SHARED_TITLE_CHOICES
+from bookings.search import SOURCE_FIELDS as SEARCH_SOURCE_FIELDS, build_search_text
 from users.managers import TenantManager, TenantQuerySet
 from users.model_mixins import OrgScopedModel
 
@@ -93,6 +94,9 @@ class Lead(OrgScopedModel, models.Model):
     contact_last_name = models.CharField(max_length=100, blank=True, default='')
     contact_email = models.EmailField(blank=True)
     contact_phone = models.CharField(max_length=50, blank=True)
+    # Digits of contact_phone, kept by save(): inbound WhatsApp matches the
+    # sender to a lead on the (organisation, phone_digits) index.
+    phone_digits = models.CharField(max_length=50, blank=True, default='', editable=False)
     source = models.CharField(max_length=50, blank=True, default='')
     event_date = models.DateField(null=True, blank=True)
     guest_estimate = models.IntegerField(null=True, blank=True)
@@ -135,6 +139,9 @@ class Lead(OrgScopedModel, models.Model):
         on_delete=models.SET_NULL, related_name='leads',
     )
     lost_notes = models.TextField(blank=True)
+    # Lowercased name/email/account plus phone digits, for lead search — see
+    # bookings/search.py. Written by save(); never edited directly.
+    search_text = models.TextField(blank=True, default='', editable=False)
     # Set when an INTEGRATION lead arrives (Meta lead ads) while the org has AI
     # first-response on (REL-515), and cleared once the frequent cron has had its
     # one go at drafting the speed-to-lead reply. Hand-created leads are never
@@ -153,12 +160,21 @@ class Lead(OrgScopedModel, models.Model):
 
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['organisation', 'phone_digits']),
+        ]
+
+    # Columns save() derives, and the fields each is derived from.
+    DERIVED_FIELDS = {
+        'search_text': SEARCH_SOURCE_FIELDS,
+        'phone_digits': ('contact_phone',),
+    }
 
     def save(self, *args, **kwargs):
         # contact_name stays the display/search/sort column; first/last are the
         # structured parts. Parts win when set; a bare two-word name is split.
         from bookings.names import compose_full_name, split_full_name
-        from bookings.phones import normalize_phone
+        from bookings.phones import normalize_phone, phone_digits
         composed = compose_full_name(self.contact_first_name, self.contact_last_name)
         if composed:
             self.contact_name = composed
@@ -166,8 +182,25 @@ class Lead(OrgScopedModel, models.Model):
             self.contact_first_name, self.contact_last_name = split_full_name(self.contact_name)
         if self.contact_phone and self.organisation_id:
             self.contact_phone = normalize_phone(self.contact_phone, self.organisation.country)
+        # A save of named fields rebuilds only the columns derived from them —
+        # search_text reads the account's name, which may cost a query.
+        update_fields = kwargs.get('update_fields')
+        derived = set(self.DERIVED_FIELDS) if update_fields is None else {
+            column for column, sources in self.DERIVED_FIELDS.items()
+            if set(update_fields) & set(sources)
+        }
+        if 'search_text' in derived:
+            self.search_text = self.build_search_text()
+        if 'phone_digits' in derived:
+            self.phone_digits = phone_digits(self.contact_phone)
+        if update_fields is not None:
+            kwargs['update_fields'] = {*update_fields, *derived}
         super().save(*args, **kwargs)
 
+    def build_search_text(self):
+        account_name = self.account.name if self.account_id else ''
+        return build_search_text(self.contact_name, self.contact_email, self.contact_phone, account_name)
+
     def __str__(self):
         return f"{self.contact_name} — {self.event_type} ({self.status})"
 
@@ -1,16 +1,18 @@
 """Raw Meta webhook events, persisted before processing (REL-507).
 
-Every webhook POST is written here the instant it arrives, *before* we try to
-fetch the lead or route the message. That way a processing bug (or a transient
-Graph API failure) can never lose an inquiry: the raw payload survives and the
-hourly backfill / a reprocess can pick it up. `organisation` is nullable because
+Every webhook POST is written here the instant it arrives, and the view answers
+straight away; the webhook queue worker fetches the lead or routes the message
+afterwards, one page at a time in arrival order. That way a processing bug (or
+a transient Graph API failure) can never lose an inquiry: the raw payload
+survives, the worker retries it, and the hourly backfill recovers the rest. `organisation` is nullable because
 an event may arrive for a `page_id` no org has connected — we still record it
-(and ignore it) rather than 4xx, which would make Meta retry and eventually
+(and the worker ignores it) rather than 4xx, which would make Meta retry and eventually
 disable the subscription.
 """
 
 from django.db import models
 
+from bookings.models.webhook_queue import QueuedWebhookEvent
 from users.managers import TenantManager
 from users.model_mixins import OrgScopedModel
 
@@ -21,26 +23,30 @@ LEADGEN = 'leadgen'
 MESSAGES = 'messages'
 
 
-class MetaWebhookEvent(OrgScopedModel, models.Model):
+class MetaWebhookEvent(OrgScopedModel, QueuedWebhookEvent):
+    QUEUE_KEY = 'page_id'
+
     objects = TenantManager()
 
+    # Filled in by the worker once it has resolved the page.
     organisation = models.ForeignKey(
         'users.Organisation', null=True, blank=True,
         on_delete=models.CASCADE, related_name='meta_webhook_events',
     )
     page_id = models.CharField(max_length=64, blank=True, default='', db_index=True)
     field = models.CharField(max_length=32, blank=True, default='')
-    payload = models.JSONField(default=dict)
-
-    received_at = models.DateTimeField(auto_now_add=True)
-    # Set once the event has been handled; a row with received_at but no
-    # processed_at is what the backfill/reprocess looks for.
-    processed_at = models.DateTimeField(null=True, blank=True)
-    error = models.TextField(blank=True, default='')
 
     class Meta:
         ordering = ['-received_at']
-        indexes = [models.Index(fields=['processed_at'])]
+        indexes = [
+            models.Index(fields=['processed_at']),
+            # The worker's "next event for this page" lookup, over pending rows only.
+            models.Index(
+                fields=['page_id', 'received_at'],
+                condition=models.Q(processed_at__isnull=True, failed_at__isnull=True),
+                name='metawebhookevent_pending',
+            ),
+        ]
 
     def __str__(self):
         return f'MetaWebhookEvent {self.field or "?"} page={self.page_id or "?"} #{self.pk}'
@@ -81,3 +87,35 @@ class MetaIngestedLead(OrgScopedModel, models.Model):
 
     def __str__(self):
         return f'MetaIngestedLead org={self.organisation_id} leadgen={self.leadgen_id}'
+
+
+class MetaFormCursor(OrgScopedModel, models.Model):
+    """How far the hourly backfill has read one lead form (its high-water mark).
+
+    `last_created_time` is the newest submission the sweep has ingested from
+    the form; the next sweep asks Graph only for submissions after it (less a
+    small overlap), instead of re-listing the whole 90-day window every hour.
+    Advanced only once every submission in a sweep has been handled, so a
+    failure part-way through is re-read next time — the ledger above makes the
+    re-read harmless.
+    """
+
+    objects = TenantManager()
+
+    organisation = models.ForeignKey(
+        'users.Organisation', on_delete=models.CASCADE, related_name='meta_form_cursors',
+    )
+    page = models.ForeignKey(
+        'bookings.ConnectedMetaPage', on_delete=models.CASCADE, related_name='form_cursors',
+    )
+    form_id = models.CharField(max_length=64)
+    last_created_time = models.DateTimeField()
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['page', 'form_id'], name='unique_page_meta_form_cursor'),
+        ]
+
+    def __str__(self):
+        return f'MetaFormCursor page={self.page_id} form={self.form_id} @ {self.last_created_time}'
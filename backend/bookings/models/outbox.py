@@ -0,0 +1,64 @@
+"""The outbox — client messages recorded but not yet handed to a provider.
+
+A send that should not make its caller wait (a bulk approval, the signed copy
+after a client signs, a sign link) writes its ledger row as `queued` and one of
+these beside it, in the same transaction. `bookings.services.outbox` delivers
+them afterwards and writes the outcome onto the ledger row, which stays the
+one place a message's final status is read from.
+"""
+from django.db import models
+
+from bookings.models.retry_queue import RetryQueued
+from users.managers import TenantManager
+from users.model_mixins import OrgScopedModel
+
+
+class OutboxMessage(OrgScopedModel, RetryQueued):
+    objects = TenantManager()
+
+    organisation = models.ForeignKey(
+        'users.Organisation', on_delete=models.CASCADE, related_name='outbox_messages',
+    )
+    message = models.OneToOneField(
+        'bookings.WhatsAppMessage', on_delete=models.CASCADE, related_name='outbox',
+    )
+    # What the message goes out through: the org's mailbox, or the Twilio number
+    # it is sent from. A route's messages are delivered one at a time, oldest
+    # first; different routes in parallel.
+    route = models.CharField(max_length=64)
+
+    # The messaging kind (`messaging_kinds`) for a booking send — it decides the
+    # PDF attached and whether a quote moves to sent once the message is out.
+    # Blank for a plain message.
+    kind = models.CharField(max_length=20, blank=True, default='')
+    # The PDF is rendered when the message is delivered, never stored here —
+    # the same "generated per send" rule the ledger's attachment name follows.
+    attach_pdf = models.BooleanField(default=False)
+    signature = models.ForeignKey(
+        'bookings.BookingSignature', null=True, blank=True,
+        on_delete=models.SET_NULL, related_name='+',
+    )
+    # The follow-up draft this send approves. If delivery fails for good the
+    # draft goes back to the review queue, as it did when the send was inline.
+    draft = models.ForeignKey(
+        'bookings.FollowUpDraft', null=True, blank=True,
+        on_delete=models.SET_NULL, related_name='outbox_messages',
+    )
+
+    created_at = models.DateTimeField(auto_now_add=True)
+    # Set once delivered. Retries are `RetryQueued`'s: a permanent failure, or
+    # the last attempt, sets `failed_at` and marks the ledger row failed.
+    delivered_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ['created_at']
+        indexes = [
+            models.Index(
+                fields=['route', 'created_at'],
+                condition=models.Q(delivered_at__isnull=True, failed_at__isnull=True),
+                name='outboxmessage_pending',
+            ),
+        ]
+
+    def __str__(self):
+        return f'OutboxMessage #{self.pk} via {self.route}'
@@ -0,0 +1,24 @@
+"""The retry bookkeeping shared by every table `bookings.services.retry_queue` drains.
+
+A row is a piece of queued work — an inbound webhook event, an outbound
+message. Each concrete table adds what the work is and when it was done; the
+queue engine reads and writes only these columns.
+"""
+from django.db import models
+
+
+class RetryQueued(models.Model):
+    # The last failure, for whoever looks at a row that is retrying or failed.
+    error = models.TextField(blank=True, default='')
+    # A failed attempt bumps `attempts` and pushes `next_attempt_at` out; once
+    # attempts run out (or the failure is permanent) `failed_at` is set and the
+    # worker stops trying (the row stays, error and all, for a human).
+    attempts = models.PositiveSmallIntegerField(default=0)
+    next_attempt_at = models.DateTimeField(null=True, blank=True)
+    failed_at = models.DateTimeField(null=True, blank=True)
+    # A worker holds a row until this time. A crashed worker's claim simply
+    # lapses, so nothing is stuck behind it for longer than the lease.
+    locked_until = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        abstract = True
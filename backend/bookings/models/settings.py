@@ -2,6 +2,7 @@ from decimal import Decimal
 
 from django.core.validators import MaxValueValidator, MinValueValidator
 from django.db import models
+from portioning import request_cache
 from users.managers import TenantManager
 
 
@@ -120,6 +121,11 @@ class OrgSettings(models.Model):
         max_length=20, blank=True, default='',
         help_text='Twilio WhatsApp sender number, e.g. +14155238886',
     )
+    # Digits of twilio_whatsapp_number, kept by save(): inbound webhooks find
+    # the org by the To number with one indexed lookup.
+    twilio_whatsapp_number_digits = models.CharField(
+        max_length=20, blank=True, default='', db_index=True, editable=False,
+    )
 
     # Which channel the send modal preselects. Only a preselection — it never
     # restricts what the rep can pick, and a contact's own preferred_channel
@@ -208,11 +214,15 @@ class OrgSettings(models.Model):
 
     def save(self, *args, **kwargs):
         # The Twilio sender must be E.164 like every other number we dial.
-        from bookings.phones import normalize_phone
+        from bookings.phones import normalize_phone, phone_digits
         if self.twilio_whatsapp_number and self.organisation_id:
             self.twilio_whatsapp_number = normalize_phone(
                 self.twilio_whatsapp_number, self.organisation.country,
             )
+        self.twilio_whatsapp_number_digits = phone_digits(self.twilio_whatsapp_number)
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and 'twilio_whatsapp_number' in update_fields:
+            kwargs['update_fields'] = {*update_fields, 'twilio_whatsapp_number_digits'}
         super().save(*args, **kwargs)
 
     def __str__(self):
@@ -258,8 +268,10 @@ class OrgSettings(models.Model):
 
     @classmethod
     def for_org(cls, org):
-        """Return OrgSettings for the given org, creating with defaults if needed."""
+        """Return OrgSettings for the given org, creating with defaults if needed.
+
+        Memoised per request — see portioning.request_cache.
+        """
         if org is None:
             return cls()
-        obj, _ = cls.objects.get_or_create(organisation=org)
-        return obj
+        return request_cache.get_for_org(cls, org)
@@ -0,0 +1,25 @@
+"""The queue columns shared by every inbound-webhook event table.
+
+A webhook view only verifies the caller, writes one of these rows and answers;
+`bookings.services.webhook_queue` drains them afterwards. Each concrete model
+names the column its events are ordered by (`QUEUE_KEY`): events sharing a key
+are handled strictly in arrival order, events with different keys in parallel.
+"""
+from django.db import models
+
+from bookings.models.retry_queue import RetryQueued
+
+
+class QueuedWebhookEvent(RetryQueued):
+    # The field whose value events are serialised on. Set by each subclass.
+    QUEUE_KEY = None
+
+    payload = models.JSONField(default=dict)
+
+    received_at = models.DateTimeField(auto_now_add=True)
+    # Set once the event has been handled; a row with received_at but no
+    # processed_at is what the worker (and the backfill/reprocess) looks for.
+    processed_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        abstract = True
@@ -13,6 +13,8 @@ When something machine-triggered would need a shortcut, nothing is claimed at
 all: the row is `to_send`, a task for a human, not a send.
 """
 from django.db import models
+
+from bookings.models.webhook_queue import QueuedWebhookEvent
 from users.managers import TenantManager
 from users.model_mixins import OrgScopedModel
 
@@ -154,3 +156,44 @@ class WhatsAppMessage(OrgScopedModel, models.Model):
     def __str__(self):
         label = 'Email' if self.channel == self.CHANNEL_EMAIL else 'WhatsApp'
         return f"{label} to {self.recipient} ({self.status})"
+
+
+class TwilioWebhookEvent(OrgScopedModel, QueuedWebhookEvent):
+    """A Twilio callback as received — an inbound message or a delivery status.
+
+    Written by `TwilioWebhookView` once the signature checks out and handled by
+    the webhook queue worker. `sequence_key` keeps what must stay ordered in
+    order: a message's status callbacks (queued → sent → delivered → read) on
+    its SID, and one customer's inbound messages on their number.
+    """
+
+    INBOUND = 'inbound'
+    STATUS = 'status'
+    KIND_CHOICES = [(INBOUND, 'Inbound message'), (STATUS, 'Status callback')]
+
+    QUEUE_KEY = 'sequence_key'
+
+    objects = TenantManager()
+
+    # Filled in by the worker once it has matched the sender number or message.
+    organisation = models.ForeignKey(
+        'users.Organisation', null=True, blank=True,
+        on_delete=models.CASCADE, related_name='twilio_webhook_events',
+    )
+    kind = models.CharField(max_length=10, choices=KIND_CHOICES)
+    message_sid = models.CharField(max_length=64)
+    sequence_key = models.CharField(max_length=64)
+
+    class Meta:
+        ordering = ['-received_at']
+        indexes = [
+            models.Index(fields=['processed_at']),
+            models.Index(
+                fields=['sequence_key', 'received_at'],
+                condition=models.Q(processed_at__isnull=True, failed_at__isnull=True),
+                name='twiliowebhookevent_pending',
+            ),
+        ]
+
+    def __str__(self):
+        return f'TwilioWebhookEvent {self.kind} {self.message_sid} #{self.pk}'
@@ -1,3 +1,11 @@
+import base64
+import binascii
+import json
+
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import F, Q
+from rest_framework.exceptions import ValidationError
 from rest_framework.pagination import PageNumberPagination
 
 
@@ -16,3 +24,67 @@ class OptionalPagination(PageNumberPagination):
         if self.get_page_size(request) is None:
             return None
         return super().paginate_queryset(queryset, request, view)
+
+
+# --- Keyset ("load more") cursors ---
+#
+# A cursor is the sort key of the last row a client has, so the next page is
+# an index range read ("rows after this key") rather than an OFFSET that scans
+# and discards everything before it. NULLs always sort last, on every
+# database, so the "after" condition is the same on SQLite and Postgres.
+
+def keyset_order(qs):
+    """The queryset's ordering as [(field, descending)], with pk appended as a
+    tie-breaker so every row has a unique key. String orderings only."""
+    keys = []
+    for term in qs.query.order_by or qs.model._meta.ordering:
+        name = term.lstrip('-')
+        keys.append(('pk' if name in ('id', 'pk') else name, term.startswith('-')))
+    if not any(name == 'pk' for name, _ in keys):
+        keys.append(('pk', True))
+    return keys
+
+
+def keyset_order_by(keys):
+    """ORDER BY expressions for `keys`, NULLs last."""
+    return [
+        F(name).desc(nulls_last=True) if desc else F(name).asc(nulls_last=True)
+        for name, desc in keys
+    ]
+
+
+def encode_cursor(obj, keys):
+    values = [getattr(obj, name) for name, _ in keys]
+    raw = json.dumps(values, cls=DjangoJSONEncoder).encode()
+    return base64.urlsafe_b64encode(raw).decode()
+
+
+def decode_cursor(token, model, keys):
+    """The key values in `token`; raises ValidationError if it's malformed."""
+    try:
+        values = json.loads(base64.urlsafe_b64decode(token.encode()))
+        if not isinstance(values, list) or len(values) != len(keys):
+            raise ValueError
+        return [
+            None if value is None else model._meta.get_field(
+                model._meta.pk.name if name == 'pk' else name
+            ).to_python(value)
+            for (name, _), value in zip(keys, values)
+        ]
+    except (ValueError, TypeError, DjangoValidationError, binascii.Error):
+        raise ValidationError({'cursor': 'Invalid cursor.'})
+
+
+def after_cursor(keys, values):
+    """Q for the rows that sort after the row with key `values`."""
+    condition = Q(pk__in=[])
+    same_so_far = Q()
+    for (name, desc), value in zip(keys, values):
+        if value is None:
+            # Nothing sorts after NULL on this key except more NULLs.
+            same_so_far &= Q(**{f'{name}__isnull': True})
+            continue
+        later = Q(**{f'{name}__lt' if desc else f'{name}__gt': value}) | Q(**{f'{name}__isnull': True})
+        condition |= same_so_far & later
+        same_so_far &= Q(**{name: value})
+    return condition
@@ -41,3 +41,37 @@ def normalize_phone(raw, country=''):
     if 8 <= len(candidate) <= 15:
         return '+' + candidate
     return raw
+
+
+def phone_digits(raw):
+    """The digits of a number — the indexed match key for inbound WhatsApp
+    (Lead.phone_digits, OrgSettings.twilio_whatsapp_number_digits). For an
+    E.164 number that's the full international number without the '+'."""
+    return re.sub(r'\D', '', raw or '')
+
+
+def backfill_phone_digits(lead_model, settings_model, batch_size=2000):
+    """Recompute Lead.phone_digits and OrgSettings.twilio_whatsapp_number_digits
+    where they're stale. Takes the model classes so the 0097 migration can pass
+    its historical models; the backfill_phone_digits command passes the real
+    ones. Returns (leads_updated, settings_updated)."""
+    def sync(model, source, target):
+        updated, batch = 0, []
+        rows = model.objects.only('pk', source, target).order_by('pk').iterator(chunk_size=batch_size)
+        for row in rows:
+            digits = phone_digits(getattr(row, source))
+            if getattr(row, target) != digits:
+                setattr(row, target, digits)
+                batch.append(row)
+            if len(batch) >= batch_size:
+                model.objects.bulk_update(batch, [target])
+                updated, batch = updated + len(batch), []
+        if batch:
+            model.objects.bulk_update(batch, [target])
+            updated += len(batch)
+        return updated
+
+    return (
+        sync(lead_model, 'contact_phone', 'phone_digits'),
+        sync(settings_model, 'twilio_whatsapp_number', 'twilio_whatsapp_number_digits'),
+    )
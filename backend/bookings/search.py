@@ -0,0 +1,64 @@
+"""Lead search over one normalised, denormalised column.
+
+`Lead.search_text` holds the lead's name, email and account name lowercased,
+plus the digits of its phone number, space-separated. Lead.save() keeps it
+current (and Account.save() for its leads); the 0095 migration backfilled it.
+
+A search is then a substring match on that one column — no join to accounts
+and no OR across five columns. On Postgres a trigram GIN index (migration 0094)
+serves the `LIKE '%term%'`; on SQLite it's a plain scan, which is fine at dev
+sizes. Results are ranked: a match at the start of the column (the name)
+first, then one at the start of any word, then anything else.
+"""
+import re
+
+from django.db.models import Case, IntegerField, Q, Value, When
+
+# The Lead fields search_text is built from. A save() that touches any of them
+# also writes search_text.
+SOURCE_FIELDS = ('contact_name', 'contact_email', 'contact_phone', 'account')
+
+_SEPARATORS = re.compile(r'[\s\-().+]')
+
+
+def build_search_text(name, email, phone, account_name):
+    """The search_text value for a lead."""
+    digits = re.sub(r'\D', '', phone or '')
+    parts = [name, email, account_name, digits]
+    return ' '.join(' '.join(p.split()).lower() for p in parts if p and p.strip())
+
+
+def search_terms(search):
+    """The strings any of which a matching lead's search_text contains.
+
+    Phones are stored E.164 (+923001269792); users search with dashes, spaces,
+    a + or a leading 0 — so a phone-shaped search also matches on its bare
+    digits, with and without the trunk 0.
+    """
+    term = ' '.join(search.split()).lower()
+    terms = [term] if term else []
+    phone = _SEPARATORS.sub('', search)
+    if phone.isdigit():
+        if phone != term:
+            terms.append(phone)
+        if phone.startswith('0') and len(phone) > 1:
+            terms.append(phone.lstrip('0'))
+    return terms
+
+
+def apply_search(qs, search, rank=True):
+    """Filter a Lead queryset to `search`; with `rank`, order best match first."""
+    terms = search_terms(search)
+    if not terms:
+        return qs
+    condition = Q()
+    for term in terms:
+        condition |= Q(search_text__contains=term)
+    qs = qs.filter(condition)
+    if not rank:
+        return qs
+    whens = [When(search_text__startswith=t, then=Value(3)) for t in terms]
+    whens += [When(search_text__contains=f' {t}', then=Value(2)) for t in terms]
+    return qs.annotate(
+        search_rank=Case(*whens, default=Value(1), output_field=IntegerField()),
+    ).order_by('-search_rank', *qs.query.order_by or qs.model._meta.ordering)
@@ -19,6 +19,9 @@ class FollowUpDraftSerializer(serializers.ModelSerializer):
     lead_days_stale = serializers.SerializerMethodField()
     email_available = serializers.SerializerMethodField()
     email_reason = serializers.SerializerMethodField()
+    # An approved draft's ledger row: `queued` until the outbox delivers it,
+    # then `sent` (or `failed`). Null while the draft is still under review.
+    message_status = serializers.CharField(source='whatsapp_message.status', read_only=True, default=None)
 
     def _email_block(self, obj):
         """Why email can't be used for this draft, or None.
@@ -93,7 +96,7 @@ class FollowUpDraftSerializer(serializers.ModelSerializer):
             'lead_event_date', 'lead_guest_estimate', 'lead_assigned_to_name',
             'lead_days_stale', 'email_available', 'email_reason',
             'kind', 'channel', 'subject', 'body', 'reasoning',
-            'status', 'model_used', 'whatsapp_message',
+            'status', 'model_used', 'whatsapp_message', 'message_status',
             'reviewed_by', 'reviewed_by_name', 'reviewed_at', 'created_at',
         ]
         # `channel` and `subject` are changed through the approve endpoint, which
@@ -11,11 +11,11 @@ import calendar
 from datetime import date
 from decimal import Decimal
 
-from django.db.models import Sum
+from django.db.models import Count, Prefetch, Q, Sum, prefetch_related_objects
 from django.utils import timezone
 
 from bookings.commission import compute_commission
-from bookings.models import CommissionPlan, OrgSettings, SalesTarget, RepCommissionPlan
+from bookings.models import CommissionBand, CommissionPlan, OrgSettings, SalesTarget, RepCommissionPlan
 from events.models import Event
 
 # Statuses that represent a real, booked event (excludes tentative + cancelled).
@@ -28,20 +28,6 @@ BASIS_TO_DATE_FIELD = {'event_date': 'event_date', 'booking_date': 'booking_date
 PERIOD_LENGTHS = {'monthly': 12, 'quarterly': 4, 'yearly': 1}
 
 
-def rep_plan(org, user):
-    """The commission plan a salesperson is on: their assigned plan, else the
-    org's default plan (else None)."""
-    rp = (
-        RepCommissionPlan.objects
-        .filter(organisation=org, user=user)
-        .select_related('plan')
-        .first()
-    )
-    if rp and rp.plan_id:
-        return rp.plan
-    return CommissionPlan.objects.filter(organisation=org, is_default=True).first()
-
-
 def period_position(today, period_type, fiscal_start=1):
     """Locate ``today`` within the financial year as (fiscal_year, period_index,
     period_count). ``fiscal_year`` is the calendar year the FY starts in;
@@ -58,19 +44,6 @@ def period_position(today, period_type, fiscal_start=1):
     return fy_start.year, index, count
 
 
-def rep_target(org, user, today, period_type, fiscal_start=1):
-    """The rep's target for the period containing ``today`` (0 if unset)."""
-    fy, index, _ = period_position(today, period_type, fiscal_start)
-    amount = (
-        SalesTarget.objects
-        .filter(organisation=org, user=user, period_type=period_type,
-                fiscal_year=fy, period_index=index)
-        .values_list('amount', flat=True)
-        .first()
-    )
-    return amount or Decimal('0')
-
-
 def fiscal_year_label(fiscal_start, fiscal_year):
     """Human label for a financial year: '2026' for a calendar year, 'FY 2026/27'
     for a fiscal one."""
@@ -129,70 +102,125 @@ def period_bounds(period, today, fiscal_start=1):
     return start, end, start.strftime('%B %Y')
 
 
-def _event_revenue(org, user, date_field, start=None, end=None):
-    """(revenue, event_count) of a rep's confirmed events, optionally bounded by
-    ``date_field`` in [start, end). Revenue is the sum of ``Event.total``."""
-    qs = Event.objects.filter(
-        organisation=org, assigned_to=user, status__in=EARNED_EVENT_STATUSES,
+def _event_totals(org, user_ids, date_field, period, year):
+    """{user_id: (revenue, deals, year_revenue, year_deals)} from reps'
+    confirmed events, in one grouped query. ``period`` and ``year`` are
+    (start, end_exclusive) dates on ``date_field``; the period lies inside the
+    year. Revenue is the sum of ``Event.total``."""
+    def between(bounds):
+        return Q(**{f'{date_field}__gte': bounds[0], f'{date_field}__lt': bounds[1]})
+
+    rows = (
+        Event.objects
+        .filter(between(year), organisation=org, assigned_to__in=user_ids,
+                status__in=EARNED_EVENT_STATUSES)
+        .values('assigned_to')
+        .annotate(
+            revenue=Sum('total', filter=between(period)),
+            deals=Count('id', filter=between(period)),
+            year_revenue=Sum('total'),
+            year_deals=Count('id'),
+        )
+        .order_by()
     )
-    if start is not None:
-        qs = qs.filter(**{f'{date_field}__gte': start})
-    if end is not None:
-        qs = qs.filter(**{f'{date_field}__lt': end})
-    agg = qs.aggregate(revenue=Sum('total'))
-    return (agg['revenue'] or Decimal('0')), qs.count()
+    return {
+        row['assigned_to']: (
+            row['revenue'] or Decimal('0'), row['deals'],
+            row['year_revenue'] or Decimal('0'), row['year_deals'],
+        )
+        for row in rows
+    }
 
 
-def commission_summary(org, user, today=None):
-    """Build the commission + target summary for one salesperson.
+def _rep_plans(org, user_ids):
+    """{user_id: plan} — each rep's assigned plan, else the org's default plan
+    (else None) — with ``bands`` prefetched in threshold order."""
+    assigned = {
+        rp.user_id: rp.plan
+        for rp in RepCommissionPlan.objects
+        .filter(organisation=org, user__in=user_ids, plan__isnull=False)
+        .select_related('plan')
+    }
+    default = CommissionPlan.objects.filter(organisation=org, is_default=True).first()
+    plans = {uid: assigned.get(uid, default) for uid in user_ids}
+    # One instance per plan, so each plan's bands are fetched once.
+    by_pk = {p.pk: p for p in plans.values() if p is not None}
+    prefetch_related_objects(
+        list(by_pk.values()),
+        Prefetch('bands', queryset=CommissionBand.objects.order_by('min_attainment_pct')),
+    )
+    return {uid: by_pk[p.pk] if p is not None else None for uid, p in plans.items()}
 
-    Returns a plain dict (no Decimal rounding here — the serializer/view rounds
-    for display)."""
+
+def commission_summaries(org, users, today=None):
+    """``commission_summary`` for several salespeople, keyed by user id.
+
+    A fixed number of queries however many reps: one grouped, conditionally
+    aggregated query for period and year revenue, one for targets, and the
+    plans with their bands prefetched."""
     today = today or timezone.now().date()
+    user_ids = [u.pk for u in users]
     settings = OrgSettings.for_org(org)
     date_field = BASIS_TO_DATE_FIELD.get(settings.commission_basis, 'date')
     fiscal_start = settings.fiscal_year_start_month
     start, end, label = period_bounds(settings.target_period, today, fiscal_start)
+    year_start, year_end, year_label = fiscal_year_bounds(today, fiscal_start)
+    fy, period_index, _ = period_position(today, settings.target_period, fiscal_start)
 
-    revenue, deals = _event_revenue(org, user, date_field, start, end)
-    target = rep_target(org, user, today, settings.target_period, fiscal_start)
-    plan = rep_plan(org, user)
-    if plan is not None:
-        model = plan.commission_model
-        flat_rate = plan.commission_flat_rate
-        bands = list(plan.bands.order_by('min_attainment_pct').values_list('min_attainment_pct', 'rate'))
-    else:
-        model, flat_rate, bands = 'flat', Decimal('0'), []
-
-    result = compute_commission(
-        revenue, target, model=model, flat_rate=flat_rate, bands=bands,
-    )
+    totals = _event_totals(org, user_ids, date_field, (start, end), (year_start, year_end))
 
-    year_start, year_end, year_label = fiscal_year_bounds(today, fiscal_start)
-    year_revenue, year_deals = _event_revenue(org, user, date_field, year_start, year_end)
-    year_fy, _, _ = period_position(today, settings.target_period, fiscal_start)
-    year_target = (
+    targets = {uid: Decimal('0') for uid in user_ids}
+    year_targets = {uid: Decimal('0') for uid in user_ids}
+    for uid, index, amount in (
         SalesTarget.objects
-        .filter(organisation=org, user=user, period_type=settings.target_period, fiscal_year=year_fy)
-        .aggregate(s=Sum('amount'))['s']
-    ) or Decimal('0')
+        .filter(organisation=org, user__in=user_ids, period_type=settings.target_period, fiscal_year=fy)
+        .values_list('user_id', 'period_index', 'amount')
+    ):
+        year_targets[uid] += amount
+        if index == period_index:
+            targets[uid] = amount
+
+    plans = _rep_plans(org, user_ids)
+
+    summaries = {}
+    for uid in user_ids:
+        revenue, deals, year_revenue, year_deals = totals.get(uid, (Decimal('0'), 0, Decimal('0'), 0))
+        plan = plans[uid]
+        if plan is not None:
+            model = plan.commission_model
+            flat_rate = plan.commission_flat_rate
+            bands = [(b.min_attainment_pct, b.rate) for b in plan.bands.all()]
+        else:
+            model, flat_rate, bands = 'flat', Decimal('0'), []
+
+        result = compute_commission(
+            revenue, targets[uid], model=model, flat_rate=flat_rate, bands=bands,
+        )
+        summaries[uid] = {
+            'period': label,
+            'period_unit': settings.target_period,
+            'period_start': start,
+            'period_end': end,
+            'model': model,
+            'plan': plan.name if plan is not None else None,
+            'basis': settings.commission_basis,
+            'revenue': revenue,
+            'target': targets[uid],
+            'attainment_pct': result['attainment_pct'],
+            'commission': result['commission'],
+            'breakdown': result['breakdown'],
+            'deals': deals,
+            'year_label': year_label,
+            'year_revenue': year_revenue,
+            'year_target': year_targets[uid],
+            'year_deals': year_deals,
+        }
+    return summaries
 
-    return {
-        'period': label,
-        'period_unit': settings.target_period,
-        'period_start': start,
-        'period_end': end,
-        'model': model,
-        'plan': plan.name if plan is not None else None,
-        'basis': settings.commission_basis,
-        'revenue': revenue,
-        'target': target,
-        'attainment_pct': result['attainment_pct'],
-        'commission': result['commission'],
-        'breakdown': result['breakdown'],
-        'deals': deals,
-        'year_label': year_label,
-        'year_revenue': year_revenue,
-        'year_target': year_target,
-        'year_deals': year_deals,
-    }
+
+def commission_summary(org, user, today=None):
+    """Build the commission + target summary for one salesperson.
+
+    Returns a plain dict (no Decimal rounding here — the serializer/view rounds
+    for display)."""
+    return commission_summaries(org, [user], today)[user.pk]
@@ -0,0 +1,117 @@
+"""Drafting through provider batch jobs, without ever paying for a job twice.
+
+A batch job (`portioning.llm_batch`) can take hours, and the cron that starts
+one fires again long before then — every hour for follow-ups, every few
+minutes for first responses. So each job is written down (`DraftBatch`) before
+it is submitted:
+
+- **In flight.** The leads of an unfinished batch are `in_flight`, and the
+  planners leave them out: a later tick never submits them again.
+- **Lease.** The run that submitted a job waits on it under a short lease
+  (`locked_until`), renewed each time it polls. If that run dies, a later one
+  `resume`s the job once the lease is up — minutes, not the whole
+  LLM_BATCH_TIMEOUT: it polls the stored job, and stores its drafts once it
+  ends, rather than submitting a new one.
+
+What a finished job's results become is the caller's `finish(entries,
+results)`, given ``(lead, channel)`` pairs and one result per pair, in order;
+it returns one outcome per pair.
+"""
+import logging
+from datetime import timedelta
+
+from django.conf import settings
+from django.db.models import Q
+from django.utils import timezone
+
+from bookings.models import DraftBatch, Lead
+from portioning import llm, llm_batch
+
+logger = logging.getLogger(__name__)
+
+# How long a run holds a job between polls before another may take it over.
+LEASE = timedelta(minutes=10)
+
+
+def in_flight(kind):
+    """Ids of the leads in `kind`'s unfinished batches."""
+    rows = DraftBatch.objects.filter(kind=kind, finished_at__isnull=True).values_list('leads', flat=True)
+    return {lead_id for leads in rows for lead_id, _channel in leads}
+
+
+def run(kind, task_setting, entries, prompts, finish):
+    """Draft `entries` (``(lead, channel)`` pairs) as one batch job of
+    `prompts`, wait for it, and return `finish`'s outcomes. Raises LLMError if
+    the job can't be submitted."""
+    batch = DraftBatch.objects.create(
+        kind=kind,
+        leads=[[lead.pk, channel] for lead, channel in entries],
+        locked_until=timezone.now() + LEASE,
+    )
+    try:
+        batch.job = llm_batch.submit(task_setting, prompts)
+    except Exception:
+        batch.delete()
+        raise
+    batch.save(update_fields=['job'])
+
+    outcomes = finish(entries, llm_batch.wait(batch.job, on_poll=lambda: _renew(batch)))
+    _finished(batch)
+    return outcomes
+
+
+def _renew(batch):
+    batch.locked_until = timezone.now() + LEASE
+    batch.save(update_fields=['locked_until'])
+
+
+def resume(kind, finish):
+    """Poll `kind`'s batches that no run is waiting on, and finish the ones that
+    have ended. A job past LLM_BATCH_TIMEOUT is cancelled. Returns how many
+    batches were finished."""
+    now = timezone.now()
+    orphans = DraftBatch.objects.filter(kind=kind, finished_at__isnull=True).filter(
+        Q(locked_until__isnull=True) | Q(locked_until__lt=now),
+    )
+    finished = 0
+    for batch in orphans:
+        claimed = DraftBatch.objects.filter(pk=batch.pk, locked_until=batch.locked_until).update(
+            locked_until=now + LEASE,
+        )
+        if not claimed:
+            continue  # another run took it
+        if batch.job is None:
+            # Its run died before the job was submitted: there is nothing to collect.
+            _finished(batch)
+            continue
+        try:
+            results = llm_batch.poll(batch.job)
+        except llm.LLMError as exc:
+            logger.warning("Could not poll draft batch %s: %s", batch.pk, exc)
+            continue
+        if results is llm_batch.RUNNING:
+            if now < batch.created_at + timedelta(seconds=settings.LLM_BATCH_TIMEOUT):
+                continue
+            results = llm_batch.cancel(batch.job)
+
+        leads = Lead.objects.unscoped().select_related('organisation').in_bulk(
+            [lead_id for lead_id, _channel in batch.leads],
+        )
+        kept = [
+            ((leads[lead_id], channel), result)
+            for (lead_id, channel), result in zip(batch.leads, results)
+            if lead_id in leads
+        ]
+        if kept:
+            entries, kept_results = zip(*kept)
+            finish(list(entries), list(kept_results))
+        _finished(batch)
+        finished += 1
+        logger.info("Finished draft batch %s left by an earlier run", batch.pk)
+    return finished
+
+
+def _finished(batch):
+    batch.finished_at = timezone.now()
+    batch.locked_until = None
+    batch.save(update_fields=['finished_at', 'locked_until'])
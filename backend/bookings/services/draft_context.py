@@ -0,0 +1,117 @@
+"""What the lead drafters know about each lead, loaded for many leads at once.
+
+A follow-up or first-response prompt (`followup_drafter`) states a lead's
+recent activity, quotes, follow-up ledger and message thread. Read lead by
+lead, that is half a dozen queries each: a scheduler run over 300 leads made
+thousands before its first LLM call. `load` reads the same facts for any
+number of leads in a fixed number of queries (one per kind of fact, newest-N
+per lead done with a window in the database) and hands back one
+`LeadContext` per lead for the drafters to format.
+
+Drafting a single lead goes through here too, with a list of one, so the
+bulk and single paths can never state different facts.
+"""
+from dataclasses import dataclass, field
+
+from django.contrib.contenttypes.models import ContentType
+from django.db.models import Count, F, Max, Window
+from django.db.models.functions import RowNumber
+
+# How much of each lead's history a prompt states.
+ACTIVITY_LIMIT = 8
+QUOTE_LIMIT = 3
+MESSAGE_LIMIT = 6
+
+
+@dataclass
+class LeadContext:
+    event_label: str = ''
+    activity: list = field(default_factory=list)  # ActivityLog, newest first
+    quotes: list = field(default_factory=list)  # Quote, newest first
+    followups_sent: int = 0
+    last_followup_at: object = None
+    last_reply_at: object = None
+    messages: list = field(default_factory=list)  # WhatsAppMessage (any channel), newest first
+
+
+def load(leads):
+    """{lead.pk: LeadContext} for `leads` (a queryset or a list of Lead).
+
+    Also attaches each lead's organisation, read once per org, since every
+    prompt names the business and writes dates in its country's order.
+    """
+    from bookings.models import ActivityLog, FollowUpDraft, Lead, Quote, WhatsAppMessage
+    from bookings.models.choices import EventTypeOption
+    from users.models import Organisation
+
+    leads = list(leads)
+    if not leads:
+        return {}
+    ids = [lead.pk for lead in leads]
+    contexts = {pk: LeadContext() for pk in ids}
+
+    _attach_organisations(leads, Lead, Organisation)
+
+    labels = {}
+    option_rows = (
+        EventTypeOption.objects
+        .filter(
+            organisation_id__in={lead.organisation_id for lead in leads},
+            value__in={lead.event_type for lead in leads if lead.event_type},
+        )
+        .order_by('pk')
+        .values_list('organisation_id', 'value', 'label')
+    )
+    for org_id, value, label in option_rows:
+        labels.setdefault((org_id, value), label)
+    for lead in leads:
+        contexts[lead.pk].event_label = (
+            labels.get((lead.organisation_id, lead.event_type), lead.event_type)
+            if lead.event_type else lead.event_type
+        )
+
+    lead_type = ContentType.objects.get_for_model(Lead)
+    activity = ActivityLog.objects.filter(content_type=lead_type, object_id__in=ids)
+    for entry in _newest(activity, 'object_id', ACTIVITY_LIMIT):
+        contexts[entry.object_id].activity.append(entry)
+
+    for quote in _newest(Quote.objects.filter(lead_id__in=ids), 'lead_id', QUOTE_LIMIT):
+        contexts[quote.lead_id].quotes.append(quote)
+
+    ledger = (
+        FollowUpDraft.objects
+        .filter(lead_id__in=ids, status='sent', kind=FollowUpDraft.KIND_FOLLOWUP)
+        .values('lead_id')
+        .annotate(sent=Count('pk'), last=Max('reviewed_at'))
+    )
+    for row in ledger:
+        contexts[row['lead_id']].followups_sent = row['sent']
+        contexts[row['lead_id']].last_followup_at = row['last']
+
+    replies = (
+        WhatsAppMessage.objects.filter(lead_id__in=ids, direction='inbound')
+        .values('lead_id').annotate(last=Max('created_at'))
+    )
+    for row in replies:
+        contexts[row['lead_id']].last_reply_at = row['last']
+
+    for message in _newest(WhatsAppMessage.objects.filter(lead_id__in=ids), 'lead_id', MESSAGE_LIMIT):
+        contexts[message.lead_id].messages.append(message)
+
+    return contexts
+
+
+def _attach_organisations(leads, Lead, Organisation):
+    missing = {lead.organisation_id for lead in leads if not Lead.organisation.is_cached(lead)}
+    orgs = Organisation.objects.in_bulk(missing) if missing else {}
+    for lead in leads:
+        if lead.organisation_id in orgs:
+            lead.organisation = orgs[lead.organisation_id]
+
+
+def _newest(queryset, per, limit):
+    """The newest `limit` rows of `queryset` per value of `per`, newest first."""
+    ranked = queryset.annotate(
+        newest_rank=Window(RowNumber(), partition_by=[F(per)], order_by=F('created_at').desc()),
+    )
+    return ranked.filter(newest_rank__lte=limit).order_by(per, 'newest_rank')
@@ -0,0 +1,72 @@
+"""Run LLM drafting jobs on a bounded pool of threads.
+
+A drafting job is one LLM round trip: seconds of waiting on the provider, with
+almost no work on our side. Run one after another, a morning's follow-ups take
+as long as all of those waits added up. `run` spreads the jobs over
+FOLLOWUP_DRAFT_CONCURRENCY threads, at most FOLLOWUP_DRAFT_PER_ORG of one
+org's jobs at once, so a single large org can't hold every thread while the
+others wait. (The limit per LLM supplier is `portioning.llm`'s own, held by
+every call whoever makes it.)
+
+The jobs are queued round-robin across orgs, so the per-org limit rarely leaves
+a thread blocked while another org's job could have run.
+
+Each job is responsible for its own writes. The pool only runs the jobs and
+returns their results.
+"""
+import logging
+import threading
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from itertools import chain, zip_longest
+
+from django.conf import settings
+
+from bookings.services.local_worker import closing_connection
+
+logger = logging.getLogger(__name__)
+
+_org_slots = {}
+_slots_lock = threading.Lock()
+
+
+def _org_slot(org_id):
+    size = settings.FOLLOWUP_DRAFT_PER_ORG
+    with _slots_lock:
+        if (org_id, size) not in _org_slots:
+            _org_slots[org_id, size] = threading.BoundedSemaphore(size)
+        return _org_slots[org_id, size]
+
+
+def run(jobs, concurrency=None):
+    """Run `jobs` — ``(org, fn, *args)`` tuples, each calling ``fn(*args)`` —
+    and return their results in the order given.
+
+    With a concurrency of 1, or a single job, everything runs on the calling
+    thread.
+    """
+    concurrency = concurrency or settings.FOLLOWUP_DRAFT_CONCURRENCY
+    if concurrency <= 1 or len(jobs) <= 1:
+        return [_run_job(job) for job in jobs]
+
+    order = _round_robin(jobs)
+    with ThreadPoolExecutor(
+        max_workers=min(concurrency, len(jobs)), thread_name_prefix='drafting',
+    ) as pool:
+        run_job = closing_connection(_run_job)
+        futures = {index: pool.submit(run_job, jobs[index]) for index in order}
+        return [futures[index].result() for index in range(len(jobs))]
+
+
+def _round_robin(jobs):
+    """Job indexes, taking one job from each org in turn."""
+    by_org = defaultdict(list)
+    for index, job in enumerate(jobs):
+        by_org[job[0].pk].append(index)
+    return [index for index in chain.from_iterable(zip_longest(*by_org.values())) if index is not None]
+
+
+def _run_job(job):
+    org, fn, *args = job
+    with _org_slot(org.pk):
+        return fn(*args)
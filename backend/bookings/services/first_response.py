@@ -25,9 +25,13 @@ from django.utils import timezone
 
 from bookings.activity import log_activity
 from bookings.models import FollowUpDraft, Lead, OrgSettings
+from bookings.services import draft_batches, draft_context
 from bookings.services import email as email_service
-from bookings.services.followup_drafter import draft_first_response
+from bookings.services.followup_drafter import (
+    MODEL_SETTING, draft_first_response, finish_draft, first_response_prompt,
+)
 from bookings.services.followup_scheduler import choose_channel
+from portioning import llm
 
 logger = logging.getLogger(__name__)
 
@@ -94,7 +98,7 @@ def eligible_leads(org):
     )
 
 
-def run_for_org(org):
+def run_for_org(org, batch=False):
     """Draft first responses for one org's flagged leads. Returns a summary dict.
 
     The flag is cleared on every DEFINITIVE outcome — a draft created, or the
@@ -110,75 +114,158 @@ def run_for_org(org):
     that wins the swap creates the draft: never a duplicate. And because the
     clear and the create commit together, a crash between them rolls the flag
     back, so the next tick retries rather than dropping the lead.
+
+    With `batch`, the drafts go to the provider's batch API as one job
+    (`portioning.llm_batch`) — see `run_orgs`.
     """
+    return run_orgs([org], batch=batch)[0]
+
+
+def run_orgs(orgs, batch=False):
+    """`run_for_org` for several orgs. Returns one summary dict per org, in order.
+
+    With `batch`, every org's drafts are submitted as one provider batch job and
+    stored once it ends (`bookings.services.draft_batches`), after any job an
+    earlier tick left behind is collected. That can take a while, so each lead's
+    eligibility is checked again before its draft is written; a lead that
+    stopped qualifying keeps its flag and is left to the usual rules. A flagged
+    lead already in a running batch job is left out, batch or not: the ticks in
+    between would otherwise submit it again.
+    """
+    if batch:
+        draft_batches.resume(FollowUpDraft.KIND_FIRST_RESPONSE, _finish_batch)
+    busy = draft_batches.in_flight(FollowUpDraft.KIND_FIRST_RESPONSE)
+    summaries, work = [], []
+    for org in orgs:
+        summary, candidates = _plan(org, busy)
+        summaries.append(summary)
+        contexts = draft_context.load([lead for lead, _channel in candidates])
+        work += [(org, summary, lead, channel, contexts[lead.pk]) for lead, channel in candidates]
+
+    if batch:
+        outcomes = _draft_in_batch(work)
+    else:
+        # A generator, so each draft is stored before the next one is asked for.
+        outcomes = (
+            _store_draft(org, lead, channel, draft_first_response(lead, channel=channel, context=context))
+            for org, _summary, lead, channel, context in work
+        )
+    for (_org, summary, *_rest), created in zip(work, outcomes):
+        summary['created' if created else 'skipped'] += 1
+    return summaries
+
+
+def _plan(org, busy=frozenset()):
+    """One org's summary so far, and the (lead, channel) pairs to draft. Leads
+    in `busy` (in a running batch job) are left out."""
     settings = OrgSettings.for_org(org)
     if not settings.first_response_configured:
-        return {'org': org.pk, 'skipped': 'not configured', 'created': 0}
+        return {'org': org.pk, 'skipped': 'not configured', 'created': 0}, []
 
-    created = skipped = 0
+    summary = {'org': org.pk, 'created': 0, 'skipped': 0}
+    candidates = []
     mailbox_usable = email_service.mailbox_is_usable(org)
-
     for lead in eligible_leads(org):
+        if lead.pk in busy:
+            continue
         channel = choose_channel(lead, mailbox_usable=mailbox_usable)
         if channel is None:
             # Unreachable right now (no phone, no working email). Leave the flag:
             # a number/address may still be added inside the window.
-            skipped += 1
+            summary['skipped'] += 1
             continue
+        candidates.append((lead, channel))
+    return summary, candidates
 
-        result = draft_first_response(lead, channel=channel)
-        if result is None:
-            # Transient LLM failure — keep the flag so the next tick retries.
-            skipped += 1
-            continue
 
-        with transaction.atomic():
-            # Compare-and-swap: only the worker that flips True->False proceeds.
-            # A lost swap means an overlapping tick already handled this lead.
-            claimed = Lead.objects.filter(
-                pk=lead.pk, needs_first_response=True,
-            ).update(needs_first_response=False)
-            if not claimed:
-                skipped += 1
-                continue
-
-            if not result.get('should_follow_up'):
-                # Declined — flag stays cleared (committed) so we don't re-ask.
-                skipped += 1
-                continue
-
-            draft = FollowUpDraft.objects.create(
-                organisation=org,
-                lead=lead,
-                kind=FollowUpDraft.KIND_FIRST_RESPONSE,
-                channel=channel,
-                subject=result.get('subject', ''),
-                body=result['message'],
-                reasoning=result.get('reasoning', ''),
-                model_used=result.get('model_used', ''),
-            )
-            log_activity(
-                lead, 'updated',
-                field_name='followup_draft',
-                description='AI drafted a first response for review',
-            )
-        created += 1
-        logger.info("Created first-response draft %s for lead %s", draft.pk, lead.pk)
-
-    return {'org': org.pk, 'created': created, 'skipped': skipped}
-
-
-def run_all():
+def _draft_in_batch(work):
+    """Draft `work` as one batch job and store the drafts. Returns, in order,
+    whether each lead's draft was created."""
+    if not work:
+        return []
+    entries = [(lead, channel) for _org, _summary, lead, channel, _context in work]
+    prompts = [
+        first_response_prompt(lead, channel, context)
+        for _org, _summary, lead, channel, context in work
+    ]
+    try:
+        return draft_batches.run(
+            FollowUpDraft.KIND_FIRST_RESPONSE, MODEL_SETTING, entries, prompts, _finish_batch,
+        )
+    except llm.LLMError as exc:
+        logger.error("First-response batch failed: %s", exc)
+        return [False] * len(work)
+
+
+def _finish_batch(entries, results):
+    """Store a batch job's drafts for `entries` (``(lead, channel)`` pairs).
+    Returns whether each was created. A failed request, or a lead no longer
+    eligible, is a transient miss: the lead keeps its flag."""
+    orgs = {lead.organisation_id: lead.organisation for lead, _channel in entries}
+    eligible = set()
+    for org in orgs.values():
+        lead_ids = [lead.pk for lead, _channel in entries if lead.organisation_id == org.pk]
+        eligible |= set(eligible_leads(org).filter(pk__in=lead_ids).values_list('pk', flat=True))
+
+    created = []
+    for (lead, channel), result in zip(entries, results):
+        if isinstance(result, Exception):
+            logger.warning("First-response draft failed for lead %s: %s", lead.pk, result)
+            draft = None
+        elif lead.pk not in eligible:
+            draft = None
+        else:
+            draft = finish_draft(lead, channel, *result)
+        created.append(_store_draft(orgs[lead.organisation_id], lead, channel, draft))
+    return created
+
+
+def _store_draft(org, lead, channel, result):
+    """Claim `lead` and store its draft; see `run_for_org`. True if created."""
+    if result is None:
+        # Transient LLM failure — keep the flag so the next tick retries.
+        return False
+
+    with transaction.atomic():
+        # Compare-and-swap: only the worker that flips True->False proceeds.
+        # A lost swap means an overlapping tick already handled this lead.
+        claimed = Lead.objects.filter(
+            pk=lead.pk, needs_first_response=True,
+        ).update(needs_first_response=False)
+        if not claimed:
+            return False
+
+        if not result.get('should_follow_up'):
+            # Declined — flag stays cleared (committed) so we don't re-ask.
+            return False
+
+        draft = FollowUpDraft.objects.create(
+            organisation=org,
+            lead=lead,
+            kind=FollowUpDraft.KIND_FIRST_RESPONSE,
+            channel=channel,
+            subject=result.get('subject', ''),
+            body=result['message'],
+            reasoning=result.get('reasoning', ''),
+            model_used=result.get('model_used', ''),
+        )
+        log_activity(
+            lead, 'updated',
+            field_name='followup_draft',
+            description='AI drafted a first response for review',
+        )
+    logger.info("Created first-response draft %s for lead %s", draft.pk, lead.pk)
+    return True
+
+
+def run_all(batch=False):
     """Draft first responses for every org that has the feature on (cron entry).
 
     Safe to call every few minutes: each lead is drafted at most once (the flag
     plus the no-prior-draft guard), and orgs without the toggle are skipped.
     """
-    summaries = []
     org_settings = (
         OrgSettings.objects.filter(first_response_enabled=True)
         .select_related('organisation')
     )
-    for settings in org_settings:
-        summaries.append(run_for_org(settings.organisation))
-    return summaries
+    return run_orgs([settings.organisation for settings in org_settings], batch=batch)
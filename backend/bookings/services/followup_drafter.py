@@ -12,9 +12,8 @@ message is a cheap-and-fast-tier job on any provider.
 import logging
 import re
 
-from django.contrib.contenttypes.models import ContentType
-
-from bookings.models import ActivityLog, FollowUpDraft, WhatsAppMessage
+from bookings.models import WhatsAppMessage
+from bookings.services import draft_context
 from bookings.services.greeting import GREETING_RULE
 from bookings.services.message_templates import format_event_date, org_country
 from portioning import llm
@@ -94,12 +93,13 @@ def build_system_prompt(org, channel):
     """The system prompt for this org and channel.
 
     Two things vary and both come from data, never from a hardcoded default:
-    the channel's register, and which English the org's market writes in.
+    the channel's register, and which English the org's market writes in. They
+    are separate blocks, fixed rules first, so the provider can cache the part
+    every org shares; the lead itself only ever appears in the user content.
     """
-    return (
-        SYSTEM_PROMPT
-        + CHANNEL_RULES.get(channel, CHANNEL_RULES[CHANNEL_WHATSAPP])
-        + language_rule_for_org(org)
+    return llm.SystemPrompt(
+        SYSTEM_PROMPT + CHANNEL_RULES.get(channel, CHANNEL_RULES[CHANNEL_WHATSAPP]),
+        language_rule_for_org(org),
     )
 
 
@@ -145,12 +145,18 @@ def _event_label(lead):
     return opt.label if opt else lead.event_type
 
 
-def _build_context(lead, channel=CHANNEL_WHATSAPP):
-    """Assemble the lead's details, recent activity, and recent message thread."""
+def _build_context(lead, channel=CHANNEL_WHATSAPP, context=None):
+    """Assemble the lead's details, recent activity, and recent message thread.
+
+    `context` is the lead's `draft_context.LeadContext`; callers drafting many
+    leads load them all at once. Without one it is loaded for this lead alone.
+    """
+    if context is None:
+        context = draft_context.load([lead])[lead.pk]
     lines = [
         f"Our business name: {lead.organisation.name}",
         f"Contact name: {lead.contact_name}",
-        f"Event type: {_event_label(lead)}",
+        f"Event type: {context.event_label}",
         f"Channel: {'email' if channel == CHANNEL_EMAIL else 'WhatsApp'}",
     ]
     if lead.contact_title:
@@ -171,23 +177,17 @@ def _build_context(lead, channel=CHANNEL_WHATSAPP):
     if lead.notes:
         lines.append(f"Notes: {lead.notes}")
 
-    ct = ContentType.objects.get_for_model(lead)
-    recent_activity = (
-        ActivityLog.objects.filter(content_type=ct, object_id=lead.pk)
-        .order_by('-created_at')[:8]
-    )
-    if recent_activity:
+    if context.activity:
         lines.append("\nRecent activity (newest first):")
-        for entry in recent_activity:
+        for entry in context.activity:
             lines.append(f"- {entry.created_at:%Y-%m-%d}: {entry.description or entry.action}")
 
     # Quotations tied to this lead — stated as facts so the model never has
     # to guess. The sent/not-sent distinction matters: a draft quote is
     # internal and the customer has NOT seen it.
-    quotes = lead.quotes.order_by('-created_at')[:3]
-    if quotes:
+    if context.quotes:
         lines.append("\nQuotations for this lead:")
-        for q in quotes:
+        for q in context.quotes:
             if q.status == 'sent':
                 lines.append(
                     f"- A quotation WAS SENT to the lead (on {q.updated_at:%Y-%m-%d})."
@@ -204,37 +204,26 @@ def _build_context(lead, channel=CHANNEL_WHATSAPP):
     # have we nudged them" on THIS, never on counting messages in the thread.
     # Follow-ups only — a first response is not a "follow-up already sent"; it
     # shows in the message thread below either way (REL-515).
-    sent = lead.followup_drafts.filter(
-        status='sent', kind=FollowUpDraft.KIND_FOLLOWUP,
-    ).order_by('-reviewed_at')
-    sent_count = sent.count()
-    lines.append(f"\nFollow-ups already sent to this lead: {sent_count}")
-    if sent_count:
-        lines.append(f"Most recent follow-up sent: {sent[0].reviewed_at:%Y-%m-%d}")
-    last_reply = (
-        WhatsAppMessage.objects.filter(lead=lead, direction='inbound')
-        .order_by('-created_at').first()
-    )
-    if last_reply:
-        lines.append(f"Most recent reply from the lead: {last_reply.created_at:%Y-%m-%d}")
+    lines.append(f"\nFollow-ups already sent to this lead: {context.followups_sent}")
+    if context.last_followup_at:
+        lines.append(f"Most recent follow-up sent: {context.last_followup_at:%Y-%m-%d}")
+    if context.last_reply_at:
+        lines.append(f"Most recent reply from the lead: {context.last_reply_at:%Y-%m-%d}")
     else:
         lines.append("The lead has never replied to us.")
 
     # The ledger carries email as well as WhatsApp, so the thread is named for
     # what it is rather than for one of the channels in it.
-    recent_messages = (
-        WhatsAppMessage.objects.filter(lead=lead).order_by('-created_at')[:6]
-    )
-    if recent_messages:
+    if context.messages:
         lines.append("\nRecent messages with this lead (newest first):")
-        for msg in recent_messages:
+        for msg in context.messages:
             who = 'Us' if msg.direction == 'outbound' else 'Lead'
             lines.append(f"- {who} ({msg.get_channel_display()}): {msg.body}")
 
     return "\n".join(lines)
 
 
-def draft_followup(lead, channel=CHANNEL_WHATSAPP):
+def draft_followup(lead, channel=CHANNEL_WHATSAPP, context=None):
     """Ask the configured LLM to draft a follow-up for a lead, on one channel.
 
     Returns a dict {should_follow_up, message, subject, reasoning, model_used},
@@ -242,24 +231,34 @@ def draft_followup(lead, channel=CHANNEL_WHATSAPP):
     present and is empty for WhatsApp, so callers never have to branch on
     channel just to read the result.
     """
+    try:
+        data, model_used = llm.complete_structured(MODEL_SETTING, *followup_prompt(lead, channel, context))
+    except Exception as exc:
+        logger.exception("Follow-up draft failed for lead %s: %s", lead.pk, exc)
+        return None
+    return finish_draft(lead, channel, data, model_used)
+
+
+def followup_prompt(lead, channel=CHANNEL_WHATSAPP, context=None):
+    """The `llm.Prompt` `draft_followup` sends — also what a batch run submits.
+    `context` as for `_build_context`."""
     is_email = channel == CHANNEL_EMAIL
-    context = _build_context(lead, channel)
     instruction = (
         "Draft an email follow-up for this lead, or decide to skip it."
         if is_email else
         "Draft a WhatsApp follow-up for this lead, or decide to skip it."
     )
-    try:
-        data, model_used = llm.complete_structured(
-            MODEL_SETTING,
-            build_system_prompt(lead.organisation, channel),
-            instruction + "\n\n" + context,
-            EMAIL_DRAFT_SCHEMA if is_email else DRAFT_SCHEMA,
-        )
-    except Exception as exc:
-        logger.exception("Follow-up draft failed for lead %s: %s", lead.pk, exc)
-        return None
+    return llm.Prompt(
+        build_system_prompt(lead.organisation, channel),
+        instruction + "\n\n" + _build_context(lead, channel, context),
+        EMAIL_DRAFT_SCHEMA if is_email else DRAFT_SCHEMA,
+    )
+
 
+def finish_draft(lead, channel, data, model_used):
+    """The model's answer for `lead`, made safe to show: the result dict
+    `draft_followup` and `draft_first_response` return."""
+    is_email = channel == CHANNEL_EMAIL
     # Belt-and-braces on top of the prompt rule: long dashes never survive.
     if data.get("message"):
         data["message"] = re.sub(r"\s*\u2014\s*", ", ", data["message"])
@@ -312,43 +311,40 @@ FIRST_RESPONSE_SYSTEM_PROMPT = (
 
 def build_first_response_system_prompt(org, channel):
     """The first-response system prompt for this org and channel — same channel
-    register and org-language rules as a follow-up, different intent."""
-    return (
-        FIRST_RESPONSE_SYSTEM_PROMPT
-        + CHANNEL_RULES.get(channel, CHANNEL_RULES[CHANNEL_WHATSAPP])
-        + language_rule_for_org(org)
+    register and org-language rules (and blocks) as a follow-up, different
+    intent."""
+    return llm.SystemPrompt(
+        FIRST_RESPONSE_SYSTEM_PROMPT + CHANNEL_RULES.get(channel, CHANNEL_RULES[CHANNEL_WHATSAPP]),
+        language_rule_for_org(org),
     )
 
 
-def draft_first_response(lead, channel=CHANNEL_WHATSAPP):
+def draft_first_response(lead, channel=CHANNEL_WHATSAPP, context=None):
     """Ask the configured LLM to draft a first response for a brand-new lead, on
     one channel. Same return shape and safeguards as `draft_followup` (returns
     None on a declined/failed call), so callers treat the two identically —
     `should_follow_up` here means "yes, draft a first reply"."""
+    try:
+        data, model_used = llm.complete_structured(MODEL_SETTING, *first_response_prompt(lead, channel, context))
+    except Exception as exc:
+        logger.exception("First-response draft failed for lead %s: %s", lead.pk, exc)
+        return None
+    return finish_draft(lead, channel, data, model_used)
+
+
+def first_response_prompt(lead, channel=CHANNEL_WHATSAPP, context=None):
+    """The `llm.Prompt` `draft_first_response` sends."""
     is_email = channel == CHANNEL_EMAIL
-    context = _build_context(lead, channel)
     instruction = (
         "Draft the first email reply to this new enquiry, or decline if it looks like junk."
         if is_email else
         "Draft the first WhatsApp reply to this new enquiry, or decline if it looks like junk."
     )
-    try:
-        data, model_used = llm.complete_structured(
-            MODEL_SETTING,
-            build_first_response_system_prompt(lead.organisation, channel),
-            instruction + "\n\n" + context,
-            EMAIL_DRAFT_SCHEMA if is_email else DRAFT_SCHEMA,
-        )
-    except Exception as exc:
-        logger.exception("First-response draft failed for lead %s: %s", lead.pk, exc)
-        return None
-
-    if data.get("message"):
-        data["message"] = re.sub(r"\s*—\s*", ", ", data["message"])
-    subject = (data.get("subject") or '').strip() if is_email else ''
-    data["subject"] = subject or (fallback_subject(lead) if is_email else '')
-    data["model_used"] = model_used
-    return data
+    return llm.Prompt(
+        build_first_response_system_prompt(lead.organisation, channel),
+        instruction + "\n\n" + _build_context(lead, channel, context),
+        EMAIL_DRAFT_SCHEMA if is_email else DRAFT_SCHEMA,
+    )
 
 
 def fallback_subject(lead):
@@ -2,7 +2,8 @@
 
 Deliberately not an "agent" — everything here is deterministic query logic
 (eligibility, cadence, caps). The only AI is in followup_drafter, which this
-scheduler hands one approved lead at a time.
+scheduler hands the approved leads, through the drafting pool
+(`bookings.services.drafting`).
 
 This is the code the scheduled management command calls. It is deliberately
 side-effect-light: it only ever creates *pending* FollowUpDraft rows for a human
@@ -11,13 +12,18 @@ to approve — nothing is sent.
 import logging
 from datetime import timedelta
 
+from django.db import transaction
 from django.db.models import Count, Max, OuterRef, Q, Subquery
 from django.utils import timezone
 
 from bookings.activity import log_activity
 from bookings.models import FollowUpDraft, Lead, OrgSettings, WhatsAppMessage
+from bookings.services import draft_batches, draft_context, drafting
 from bookings.services import email as email_service
-from bookings.services.followup_drafter import draft_followup
+from bookings.services.followup_drafter import (
+    MODEL_SETTING, draft_followup, finish_draft, followup_prompt,
+)
+from portioning import llm, request_cache
 
 logger = logging.getLogger(__name__)
 
@@ -183,32 +189,141 @@ def lead_last_touch(lead):
     return last_touch_from_parts(lead.updated_at, last_reviewed, last_message)
 
 
-def run_for_org(org, dry_run=False):
+def run_for_org(org, dry_run=False, concurrency=None, batch=False):
     """Generate follow-up drafts for one org. Returns a summary dict."""
+    return run_orgs([org], dry_run=dry_run, concurrency=concurrency, batch=batch)[0]
+
+
+def run_orgs(orgs, dry_run=False, concurrency=None, batch=False):
+    """Generate follow-up drafts for several orgs at once. Returns one summary
+    dict per org, in order.
+
+    The eligibility queries run here, org by org; the drafts — an LLM round
+    trip each — go to the drafting pool together (`bookings.services.drafting`),
+    so one org's leads don't wait behind another's. With `batch` they go to the
+    provider's batch API instead, as one job (`_draft_in_batch`), after any job
+    an earlier run left behind is collected.
+
+    Leads already in a batch job that is still running are left out either way.
+    """
+    if batch and not dry_run:
+        draft_batches.resume(FollowUpDraft.KIND_FOLLOWUP, _finish_batch)
+    busy = draft_batches.in_flight(FollowUpDraft.KIND_FOLLOWUP)
+    summaries, jobs = [], []
+    for org in orgs:
+        summary, org_jobs = _plan(org, dry_run, busy)
+        summaries.append(summary)
+        jobs += org_jobs
+
+    by_org = {summary['org']: summary for summary in summaries}
+    if batch:
+        outcomes = _draft_in_batch(jobs)
+    else:
+        outcomes = drafting.run(jobs, concurrency=concurrency)
+    for (org, *_), outcome in zip(jobs, outcomes):
+        by_org[org.pk][outcome] += 1
+    return summaries
+
+
+def _plan(org, dry_run, busy=frozenset()):
+    """One org's summary so far, and its drafting jobs. Leads in `busy` (in a
+    running batch job) are left out."""
     settings = OrgSettings.for_org(org)
     if not settings.ai_followups_configured:
-        return {'org': org.pk, 'skipped': 'not configured', 'created': 0}
+        return {'org': org.pk, 'skipped': 'not configured', 'created': 0}, []
 
-    created = skipped = 0
+    summary = {'org': org.pk, 'created': 0, 'skipped': 0}
+    jobs = []
     # One mailbox read for the whole run, not one per lead.
     mailbox_usable = email_service.mailbox_is_usable(org)
 
-    for lead in find_stale_leads(org, settings).distinct():
-        if dry_run:
-            created += 1
-            continue
+    leads = [lead for lead in find_stale_leads(org, settings).distinct() if lead.pk not in busy]
+    if dry_run:
+        summary['created'] = len(leads)
+        return summary, jobs
 
+    # Every lead's prompt context in a handful of queries, not a handful each.
+    contexts = draft_context.load(leads)
+    for lead in leads:
         channel = choose_channel(lead, mailbox_usable=mailbox_usable)
         if channel is None:
             # The mailbox died between the query and here — nothing to draft.
-            skipped += 1
+            summary['skipped'] += 1
             continue
+        jobs.append((org, _draft_lead, org, lead, channel, contexts[lead.pk]))
+    return summary, jobs
+
+
+def _draft_lead(org, lead, channel, context=None):
+    """Draft one lead's follow-up and store it. Returns 'created' or 'skipped'.
+
+    The draft is written in its own transaction, under a lock on the lead row,
+    after checking again that the lead has no pending draft: the LLM call took
+    seconds, and in that time a first response, a manual run or an overlapping
+    cron tick may have given the lead one. Two runs can both spend the LLM call,
+    but only one of them creates a draft.
+    """
+    return _store_draft(org, lead, channel, draft_followup(lead, channel=channel, context=context))
+
+
+def _draft_in_batch(jobs):
+    """Draft `jobs` as one provider batch job (`bookings.services.draft_batches`)
+    and store the results. Returns their outcomes, in order."""
+    if not jobs:
+        return []
+    entries = [(lead, channel) for _org, _draft, _org_arg, lead, channel, _context in jobs]
+    prompts = [
+        followup_prompt(lead, channel, context)
+        for _org, _draft, _org_arg, lead, channel, context in jobs
+    ]
+    try:
+        return draft_batches.run(FollowUpDraft.KIND_FOLLOWUP, MODEL_SETTING, entries, prompts, _finish_batch)
+    except llm.LLMError as exc:
+        logger.error("Follow-up batch failed: %s", exc)
+        return ['skipped'] * len(jobs)
 
-        result = draft_followup(lead, channel=channel)
-        if not result or not result.get('should_follow_up'):
-            skipped += 1
-            continue
 
+def _finish_batch(entries, results):
+    """Store a batch job's drafts for `entries` (``(lead, channel)`` pairs).
+    Returns their outcomes, in order.
+
+    A batch can take hours to come back, so each lead is checked against
+    `find_stale_leads` again before its draft is stored: one that replied, was
+    touched or won in the meantime is skipped, exactly as if the run had
+    started now.
+    """
+    orgs = {lead.organisation_id: lead.organisation for lead, _channel in entries}
+    still_stale = set()
+    for org in orgs.values():
+        lead_ids = [lead.pk for lead, _channel in entries if lead.organisation_id == org.pk]
+        still_stale |= set(
+            find_stale_leads(org, OrgSettings.for_org(org))
+            .filter(pk__in=lead_ids).values_list('pk', flat=True)
+        )
+
+    outcomes = []
+    for (lead, channel), result in zip(entries, results):
+        org = orgs[lead.organisation_id]
+        if isinstance(result, Exception):
+            logger.warning("Follow-up draft failed for lead %s: %s", lead.pk, result)
+            outcomes.append('skipped')
+        elif lead.pk not in still_stale:
+            logger.info("Lead %s stopped qualifying while its batch ran; dropping its draft", lead.pk)
+            outcomes.append('skipped')
+        else:
+            outcomes.append(_store_draft(org, lead, channel, finish_draft(lead, channel, *result)))
+    return outcomes
+
+
+def _store_draft(org, lead, channel, result):
+    if not result or not result.get('should_follow_up'):
+        return 'skipped'
+
+    with transaction.atomic():
+        Lead.objects.select_for_update().filter(pk=lead.pk).first()
+        if FollowUpDraft.objects.filter(lead=lead, status='pending').exists():
+            logger.info("Lead %s got a pending draft while drafting; dropping ours", lead.pk)
+            return 'skipped'
         draft = FollowUpDraft.objects.create(
             organisation=org,
             lead=lead,
@@ -223,16 +338,14 @@ def run_for_org(org, dry_run=False):
             field_name='followup_draft',
             description='AI drafted a follow-up for review',
         )
-        created += 1
-        logger.info("Created follow-up draft %s for lead %s", draft.pk, lead.pk)
-
-    return {'org': org.pk, 'created': created, 'skipped': skipped}
+    logger.info("Created follow-up draft %s for lead %s", draft.pk, lead.pk)
+    return 'created'
 
 
 RUN_HOUR = 7  # org-local hour after which the daily scheduled run may fire
 
 
-def run_scheduled(now=None):
+def run_scheduled(now=None, concurrency=None, batch=False):
     """The cron entrypoint — safe to call every hour. For each org with AI
     follow-ups configured AND auto-generation on, runs once per org-local day,
     the first time it's called after RUN_HOUR local. Late calls self-heal (a
@@ -240,10 +353,10 @@ def run_scheduled(now=None):
     """
     from zoneinfo import ZoneInfo
     now = now or timezone.now()
-    summaries = []
     org_settings = OrgSettings.objects.filter(
         ai_followups_enabled=True, followup_auto_generate=True,
     ).select_related('organisation')
+    due = []
     for settings in org_settings:
         try:
             tz = ZoneInfo(settings.timezone or 'UTC')
@@ -255,20 +368,42 @@ def run_scheduled(now=None):
         last = settings.followup_last_auto_run_at
         if last and last.astimezone(tz).date() == local_now.date():
             continue  # already ran today (org-local)
-        summary = run_for_org(settings.organisation)
+        if _claim_auto_run(settings, now):
+            due.append(settings)
+
+    return run_orgs([settings.organisation for settings in due], concurrency=concurrency, batch=batch)
+
+
+def _claim_auto_run(settings, now):
+    """Mark `settings`' org as run today before any of its drafts are made.
+
+    A conditional UPDATE on the stamp read above, so when two ticks overlap (or
+    one follows a crash mid-run) only one of them claims the org and pays for
+    its drafts. Returns whether this call claimed it.
+    """
+    last = settings.followup_last_auto_run_at
+    unchanged = (
+        {'followup_last_auto_run_at__isnull': True} if last is None
+        else {'followup_last_auto_run_at': last}
+    )
+    claimed = OrgSettings.objects.filter(pk=settings.pk, **unchanged).update(
+        followup_last_auto_run_at=now,
+    )
+    if claimed:
         settings.followup_last_auto_run_at = now
-        settings.save(update_fields=['followup_last_auto_run_at'])
-        summaries.append(summary)
-    return summaries
+        # An UPDATE sends no post_save; drop the cached row by hand.
+        request_cache.invalidate(OrgSettings, settings.organisation_id)
+    return bool(claimed)
 
 
-def run_all(dry_run=False):
+def run_all(dry_run=False, concurrency=None, batch=False):
     """Generate drafts for every org with AI follow-ups configured."""
-    summaries = []
     org_ids = (
         OrgSettings.objects.filter(ai_followups_enabled=True)
         .values_list('organisation_id', flat=True)
     )
-    for settings in OrgSettings.objects.filter(organisation_id__in=list(org_ids)).select_related('organisation'):
-        summaries.append(run_for_org(settings.organisation, dry_run=dry_run))
-    return summaries
+    org_settings = OrgSettings.objects.filter(organisation_id__in=list(org_ids)).select_related('organisation')
+    return run_orgs(
+        [settings.organisation for settings in org_settings],
+        dry_run=dry_run, concurrency=concurrency, batch=batch,
+    )
@@ -0,0 +1,86 @@
+"""A daemon thread in the web process that runs a drain function on demand.
+
+Production is one gunicorn process with no separate worker, so background
+queues (inbound webhooks, the outbox) are drained by a thread of their own in
+that process: woken when something is queued, and every `poll_seconds`
+regardless, to pick up retries that have come due and anything left over from
+before a restart.
+
+Their drains fan out over short-lived thread pools (`pool_map`); a pool thread
+opens a database connection of its own, which `closing_connection` closes.
+"""
+import functools
+import logging
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from django.db import connection
+
+logger = logging.getLogger(__name__)
+
+
+class LocalWorker:
+    """Runs `drain()` whenever woken, and every `poll_seconds` regardless.
+
+    Started by the first `wake`, and again in a forked child (gunicorn), whose
+    copy of the parent's thread does not run.
+    """
+
+    def __init__(self, drain, name, poll_seconds):
+        self._drain = drain
+        self._name = name
+        self._poll_seconds = poll_seconds
+        self._wakeup = threading.Event()
+        self._lock = threading.Lock()
+        self._thread = None
+        self._pid = None
+
+    def wake(self):
+        self._ensure_running()
+        self._wakeup.set()
+
+    def _ensure_running(self):
+        with self._lock:
+            if self._pid == os.getpid() and self._thread.is_alive():
+                return
+            self._pid = os.getpid()
+            self._thread = threading.Thread(target=self._run, name=self._name, daemon=True)
+            self._thread.start()
+
+    def _run(self):
+        while True:
+            self._wakeup.wait(self._poll_seconds)
+            self._wakeup.clear()
+            try:
+                self._drain()
+            except Exception:
+                logger.exception('%s drain failed', self._name)
+            finally:
+                connection.close()
+
+
+def closing_connection(fn):
+    """`fn`, closing the calling thread's database connection once it returns.
+
+    For work on a pool thread: Django opens that thread a connection of its
+    own, and nothing else closes it.
+    """
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs):
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            connection.close()
+    return wrapper
+
+
+def pool_map(fn, items, concurrency, name):
+    """`fn(item)` for each of `items`, results in order. On the calling thread
+    with a concurrency of 1 or a single item; otherwise on up to `concurrency`
+    threads named after `name`."""
+    items = list(items)
+    if concurrency <= 1 or len(items) <= 1:
+        return [fn(item) for item in items]
+    with ThreadPoolExecutor(max_workers=min(concurrency, len(items)), thread_name_prefix=name) as pool:
+        return list(pool.map(closing_connection(fn), items))
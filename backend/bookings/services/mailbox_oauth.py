@@ -1,7 +1,8 @@
 """Provider plumbing for the caterer's connected mailbox (REL-460).
 
 Everything that knows a Google or Microsoft URL lives here; `services/email.py`
-holds the transport contract the rest of the app calls. Scopes are deliberately
+holds the transport contract the rest of the app calls. Calls go through the
+provider's pooled session (`portioning.outbound`, keyed by the provider name). Scopes are deliberately
 send-only — the platform must never be able to read a caterer's inbox.
 """
 
@@ -15,6 +16,8 @@ from urllib.parse import urlencode
 import requests
 from django.conf import settings
 
+from portioning import outbound
+
 logger = logging.getLogger(__name__)
 
 GOOGLE = 'google'
@@ -207,7 +210,7 @@ def refresh_access_token(provider, refresh_token):
 
 
 def _post_token(provider, payload, timeout=HTTP_TIMEOUT):
-    response = requests.post(
+    response = outbound.session(provider).post(
         _CONFIG[provider]['token_url'], data=payload, timeout=timeout,
     )
     if response.status_code >= 400:
@@ -225,7 +228,7 @@ def _resolve_email(provider, token_data, access_token):
     if email:
         return email
     try:
-        response = requests.get(
+        response = outbound.session(provider).get(
             _CONFIG[provider]['userinfo_url'],
             headers={'Authorization': f'Bearer {access_token}'},
             timeout=HTTP_TIMEOUT,
@@ -286,7 +289,7 @@ def _send_google(access_token, from_address, to, subject, body, attachments):
         from_address=from_address, to=to, subject=subject, body=body, attachments=attachments,
     )
     raw = base64.urlsafe_b64encode(message.as_bytes()).decode()
-    response = requests.post(
+    response = outbound.session(GOOGLE).post(
         _CONFIG[GOOGLE]['send_url'],
         headers={'Authorization': f'Bearer {access_token}'},
         json={'raw': raw},
@@ -316,7 +319,7 @@ def _send_microsoft(access_token, to, subject, body, attachments):
             for filename, content, mimetype in attachments
         ]
 
-    response = requests.post(
+    response = outbound.session(MICROSOFT).post(
         _CONFIG[MICROSOFT]['send_url'],
         headers={'Authorization': f'Bearer {access_token}'},
         json={'message': message, 'saveToSentItems': True},
@@ -306,6 +306,14 @@ def _booking_pdf(booking, kind, signature=None):
             content, 'application/pdf')
 
 
+def _pdf_filename(booking, kind, signature=None):
+    """What `_booking_pdf` will call its document, without rendering it."""
+    if kind == KIND_SIGNED_COPY and signature is None:
+        signature = effective_signature(booking)
+    frozen = kind == KIND_SIGNED_COPY and signature is not None and signature.signed_pdf
+    return attachment_filename(booking, kind, signed=bool(frozen))
+
+
 def compose_attachment_available(parent, channel):
     """Can an ordinary composed message carry a document at all?
 
@@ -351,6 +359,27 @@ def send_client_email(parent, *, subject, body, sent_by=None, attachment=None,
     and re-raised, so an interactive caller can report it while the ledger keeps
     the evidence either way.
     """
+    msg = record_client_email(
+        parent, subject=subject, body=body, sent_by=sent_by, to_email=to_email,
+        attachment_filename=attachment[0] if attachment else '',
+    )
+    try:
+        deliver_client_email(msg, attachment=attachment)
+    except email_service.MailboxError as exc:
+        msg.status = 'failed'
+        msg.error_message = str(exc)[:500]
+        msg.save(update_fields=['status', 'error_message', 'updated_at'])
+        raise
+    return msg
+
+
+def record_client_email(parent, *, subject, body, sent_by=None, to_email=None,
+                        attachment_filename=''):
+    """Write the `queued` ledger row for an email, without sending it.
+
+    Runs the same pre-flight as a send — no mailbox, a dead one, no address all
+    raise `ChannelUnavailable` before anything is recorded.
+    """
     org = parent.organisation
     who = recipient_for(parent)
     address = valid_email(to_email or who['email'])
@@ -358,37 +387,151 @@ def send_client_email(parent, *, subject, body, sent_by=None, attachment=None,
     if blocker is not None:
         raise ChannelUnavailable(_EMAIL_BLOCKER_MESSAGES[blocker], reason=blocker)
 
-    msg = WhatsAppMessage.objects.create(
+    return WhatsAppMessage.objects.create(
         organisation=org,
         channel=CHANNEL_EMAIL,
         to_email=address,
         subject=subject,
         body=body,
-        attachment_filename=attachment[0] if attachment else '',
+        attachment_filename=attachment_filename,
         direction='outbound',
         status='queued',
         sent_by=sent_by,
         **parent_kwargs(parent),
     )
 
-    try:
-        message_id = email_service.send_via_mailbox(
-            org,
-            to=address,
-            subject=subject,
-            body=body,
-            attachments=[attachment] if attachment else None,
-        )
-    except email_service.MailboxError as exc:
-        msg.status = 'failed'
-        msg.error_message = str(exc)[:500]
-        msg.save(update_fields=['status', 'error_message', 'updated_at'])
-        raise
 
+def deliver_client_email(msg, attachment=None):
+    """Send a `queued` email ledger row through the org's mailbox and mark it
+    sent. Raises `MailboxError` and leaves the row as it was on failure."""
+    message_id = email_service.send_via_mailbox(
+        msg.organisation,
+        to=msg.to_email,
+        subject=msg.subject,
+        body=msg.body,
+        attachments=[attachment] if attachment else None,
+    )
     msg.provider_message_id = message_id or ''
     msg.status = 'sent'
     msg.save(update_fields=['provider_message_id', 'status', 'updated_at'])
-    return msg
+
+
+# ── queued sends (the outbox) ────────────────────────────────────────────────
+
+def queue_client_email(parent, *, subject, body, sent_by=None, to_email=None,
+                       kind='', attach_pdf=False, signature=None, draft=None):
+    """Record an email as `queued` and add it to the outbox, unsent.
+
+    Returns the `OutboxMessage`; the caller hands it to `outbox.enqueue` once
+    everything it is queueing together has been added. `attach_pdf` attaches
+    the booking's document for `kind`, rendered when the message is delivered.
+    """
+    from bookings.services import outbox
+    filename = _pdf_filename(parent, kind, signature) if attach_pdf else ''
+    msg = record_client_email(
+        parent, subject=subject, body=body, sent_by=sent_by, to_email=to_email,
+        attachment_filename=filename,
+    )
+    return outbox.add(msg, kind=kind, attach_pdf=attach_pdf, signature=signature, draft=draft)
+
+
+def queue_whatsapp(parent, *, body, sent_by=None, kind='', signature=None, draft=None):
+    """Record a Twilio WhatsApp send as `queued` and add it to the outbox.
+
+    Raises ValueError, as `send_via_twilio` does, when the org can't
+    platform-send or the contact has no number.
+    """
+    from bookings.services import outbox
+    msg = whatsapp_service.record_twilio_message(
+        parent.organisation,
+        to_phone=recipient_for(parent)['phone'],
+        body=body,
+        parent=parent_kwargs(parent),
+        sent_by=sent_by,
+    )
+    return outbox.add(msg, kind=kind, signature=signature, draft=draft)
+
+
+def deliver_queued(entry):
+    """Deliver one outbox entry on its channel. Raises if the provider fails.
+
+    Called by the outbox worker; what a successful send means for the booking
+    (a draft quote is now sent) or the lead (an approved follow-up went out)
+    happens here, once it has actually gone.
+    """
+    msg = entry.message
+    if msg.channel == CHANNEL_EMAIL:
+        attachment = (_booking_pdf(msg.parent, entry.kind, signature=entry.signature)
+                      if entry.attach_pdf else None)
+        deliver_client_email(msg, attachment=attachment)
+    else:
+        whatsapp_service.deliver_via_twilio(msg)
+    if entry.kind:
+        _mark_quote_sent(msg.parent, entry.kind, msg)
+    if entry.draft_id:
+        _log_draft_sent(entry.draft, msg)
+
+
+def queued_send_failed(entry):
+    """Undo what queueing a send promised, once it has failed for good.
+
+    An approved follow-up goes back to the review queue — the inline send left
+    it pending on failure, and "reconnect your mailbox, then press send again"
+    must still work. A signed copy that got through on no channel at all
+    becomes a task row, as `send_signed_copy` writes when it can't even start.
+    """
+    if entry.draft_id:
+        _return_draft_to_review(entry.draft, entry.message)
+    if entry.kind == KIND_SIGNED_COPY and entry.signature_id:
+        _signed_copy_undelivered(entry)
+
+
+def _log_draft_sent(draft, msg):
+    from bookings.activity import log_activity
+    log_activity(
+        draft.lead, 'updated', user=msg.sent_by,
+        field_name='followup_draft',
+        description=(
+            'Sent an AI-drafted follow-up by email' if msg.channel == CHANNEL_EMAIL
+            else 'Sent an AI-drafted follow-up'
+        ),
+    )
+
+
+def _return_draft_to_review(draft, msg):
+    from bookings.activity import log_activity
+    if draft.status != 'sent' or draft.whatsapp_message_id != msg.pk:
+        return
+    draft.status = 'pending'
+    draft.whatsapp_message = None
+    draft.reviewed_by = None
+    draft.reviewed_at = None
+    draft.save(update_fields=['status', 'whatsapp_message', 'reviewed_by', 'reviewed_at', 'updated_at'])
+    log_activity(
+        draft.lead, 'updated',
+        field_name='followup_draft',
+        description=f'An approved follow-up could not be sent and is back for review: {msg.error_message}',
+    )
+
+
+def _signed_copy_undelivered(entry):
+    from bookings.models import OutboxMessage
+    still_going = (
+        OutboxMessage.objects.filter(signature_id=entry.signature_id, kind=KIND_SIGNED_COPY)
+        .exclude(pk=entry.pk).filter(failed_at__isnull=True)
+    )
+    if still_going.exists():
+        return  # another channel delivered it, or may yet
+    booking = entry.message.parent
+    who = recipient_for(booking)
+    if who['phone'] and OrgSettings.for_org(booking.organisation).whatsapp_shortcuts_enabled:
+        rendered = render_client_message(
+            booking, KIND_SIGNED_COPY, CHANNEL_WHATSAPP, url=booking_public_url(booking),
+        )
+        record_task_row(
+            booking, body=rendered['body'],
+            reason='The signed copy could not be sent automatically.',
+        )
 
 
 def record_whatsapp_handoff(parent, *, body, sent_by=None):
@@ -448,7 +591,12 @@ def send_booking_link(booking, kind, *, channel=None, sent_by=None,
     `kind` is 'sign_link' or 'signed_copy'. `subject`/`body` override the
     deterministic template — that is how an edited AI draft is sent, and why the
     ledger records what the rep actually approved rather than what we proposed.
+
+    Email and Twilio sends go through the outbox: the row returned is `queued`
+    until the worker delivers it (or already delivered, under OUTBOX_MODE=inline),
+    and the quote only moves to sent once it has actually gone.
     """
+    from bookings.services import outbox
     org = booking.organisation
     channel = channel or resolve_channel(org, booking)
     url = booking_public_url(booking)
@@ -457,15 +605,17 @@ def send_booking_link(booking, kind, *, channel=None, sent_by=None,
     final_body = body if body is not None else rendered['body']
 
     if channel == CHANNEL_EMAIL:
-        msg = send_client_email(
+        entry = queue_client_email(
             booking,
             subject=final_subject,
             body=final_body,
             sent_by=sent_by,
-            attachment=_booking_pdf(booking, kind, signature=signature),
+            kind=kind,
+            attach_pdf=True,
+            signature=signature,
         )
-        _mark_quote_sent(booking, kind, msg)
-        return msg
+        outbox.enqueue([entry])
+        return entry.message
 
     if channel != CHANNEL_WHATSAPP:
         raise ChannelUnavailable(f'Unknown channel {channel!r}.', reason=UNKNOWN_CHANNEL)
@@ -478,16 +628,12 @@ def send_booking_link(booking, kind, *, channel=None, sent_by=None,
 
     org_settings = OrgSettings.for_org(org)
     if whatsapp_service.platform_sending_available(org_settings):
-        msg = whatsapp_service.send_via_twilio(
-            org,
-            to_phone=who['phone'],
-            body=final_body,
-            parent=parent_kwargs(booking),
-            sent_by=sent_by,
-        )
-    else:
-        # Shortcut mechanism: the caller opens wa.me; we only record the handoff.
-        msg = record_whatsapp_handoff(booking, body=final_body, sent_by=sent_by)
+        entry = queue_whatsapp(booking, body=final_body, sent_by=sent_by, kind=kind)
+        outbox.enqueue([entry])
+        return entry.message
+
+    # Shortcut mechanism: the caller opens wa.me; we only record the handoff.
+    msg = record_whatsapp_handoff(booking, body=final_body, sent_by=sent_by)
     _mark_quote_sent(booking, kind, msg)
     return msg
 
@@ -520,14 +666,17 @@ def _mark_quote_sent(booking, kind, msg):
 def send_signed_copy(booking, signature):
     """After a client signs, get them their signed copy — without ever blocking.
 
-    Runs on every API-capable channel the org has. Nothing here may raise: this
-    is called from inside signing, and a messaging problem must never cost a
-    client their signature. Every outcome, including total failure, leaves a row.
+    Queues a send on every API-capable channel the org has — the client is
+    waiting on the sign page, and no provider call should be in their way.
+    Nothing here may raise: this is called from inside signing, and a messaging
+    problem must never cost a client their signature. Every outcome, including
+    total failure, leaves a row.
     """
+    from bookings.services import outbox
     org = booking.organisation
     org_settings = OrgSettings.for_org(org)
     who = recipient_for(booking)
-    sent = []
+    queued = []
 
     url = booking_public_url(booking)
     rendered = render_client_message(booking, KIND_SIGNED_COPY, CHANNEL_EMAIL, url=url)
@@ -544,35 +693,38 @@ def send_signed_copy(booking, signature):
 
     if email_service.mailbox_is_usable(org) and email_address:
         try:
-            sent.append(send_client_email(
+            queued.append(queue_client_email(
                 booking,
                 subject=rendered['subject'],
                 body=rendered['body'],
                 sent_by=None,
                 to_email=email_address,
-                attachment=_booking_pdf(booking, KIND_SIGNED_COPY, signature=signature),
+                kind=KIND_SIGNED_COPY,
+                attach_pdf=True,
+                signature=signature,
             ))
         except Exception as exc:
-            # send_client_email already wrote the `failed` row before raising.
-            logger.warning('Signed-copy email failed for booking %s: %s', booking.pk, exc)
+            logger.warning('Signed-copy email could not be queued for booking %s: %s', booking.pk, exc)
 
     wa_rendered = render_client_message(
         booking, KIND_SIGNED_COPY, CHANNEL_WHATSAPP, url=url,
     )
     if who['phone'] and whatsapp_service.platform_sending_available(org_settings):
         try:
-            sent.append(whatsapp_service.send_via_twilio(
-                org,
-                to_phone=who['phone'],
-                body=wa_rendered['body'],
-                parent=parent_kwargs(booking),
-                sent_by=None,
+            queued.append(queue_whatsapp(
+                booking, body=wa_rendered['body'], kind=KIND_SIGNED_COPY, signature=signature,
             ))
         except Exception as exc:
-            logger.warning('Signed-copy WhatsApp failed for booking %s: %s', booking.pk, exc)
+            logger.warning('Signed-copy WhatsApp could not be queued for booking %s: %s', booking.pk, exc)
 
-    if sent:
-        return sent
+    if queued:
+        # Queued together, so a channel that fails knows whether another is
+        # still going before it leaves a task row (`queued_send_failed`).
+        try:
+            outbox.enqueue(queued)
+        except Exception as exc:
+            logger.exception('Signed-copy sends for booking %s not handed on: %s', booking.pk, exc)
+        return [entry.message for entry in queued]
 
     # Nothing could be sent unattended. Say so honestly, and leave a task if a
     # human could still do it by hand.
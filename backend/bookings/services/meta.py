@@ -2,8 +2,9 @@
 
 Everything that knows a Facebook URL or the OAuth mechanics lives here; the view
 layer (`bookings/views/meta.py`) drives the flow and the models hold the tokens.
-Thin and requests-based like `mailbox_oauth` and the Twilio client, so tests
-patch it at the `requests` boundary and never hit Meta.
+Thin and requests-based like `mailbox_oauth` and the Twilio client; every call
+goes through the shared Graph session (`portioning.outbound`), so tests patch
+it at the `requests.Session` boundary and never hit Meta.
 
 The flow, once per org:
 
@@ -14,12 +15,17 @@ The flow, once per org:
     then subscribe_page() subscribes our app to each connected Page's webhooks.
 """
 
+import json
 import logging
+import threading
+import time
 from urllib.parse import urlencode
 
 import requests
 from django.conf import settings
 
+from portioning import outbound
+
 logger = logging.getLogger(__name__)
 
 # Pin the Graph version so a Meta-side default bump can't silently change
@@ -255,13 +261,13 @@ def fetch_lead(leadgen_id: str, page_access_token: str) -> dict:
     })
 
 
-def list_lead_forms(page_id: str, page_access_token: str) -> list:
+def list_lead_forms(page_id: str, page_access_token: str, session=None) -> list:
     """The ids of a Page's lead-gen forms (for the backfill sweep)."""
     forms = []
     url = f'{GRAPH}/{page_id}/leadgen_forms'
     params = {'access_token': page_access_token, 'limit': 100}
     for _ in range(20):
-        data = _get_json(url, params)
+        data = _get_json(url, params, session)
         forms.extend(f.get('id') for f in data.get('data', []) if f.get('id'))
         next_url = (data.get('paging') or {}).get('next')
         if not next_url:
@@ -270,13 +276,21 @@ def list_lead_forms(page_id: str, page_access_token: str) -> list:
     return forms
 
 
-def list_form_leads(form_id: str, page_access_token: str) -> list:
-    """Every submission for a form (Meta retains ~90 days) — for the backfill."""
+def list_form_leads(form_id: str, page_access_token: str, since=None, session=None) -> list:
+    """Every submission for a form (Meta retains ~90 days) — for the backfill.
+
+    With `since` (an aware datetime), only submissions created after it.
+    `session`, if given, is what the calls go through (see `backfill_all`).
+    """
     leads = []
     url = f'{GRAPH}/{form_id}/leads'
     params = {'fields': _LEAD_FIELDS, 'access_token': page_access_token, 'limit': 100}
+    if since is not None:
+        params['filtering'] = json.dumps([{
+            'field': 'time_created', 'operator': 'GREATER_THAN', 'value': int(since.timestamp()),
+        }])
     for _ in range(50):
-        data = _get_json(url, params)
+        data = _get_json(url, params, session)
         leads.extend(data.get('data', []))
         next_url = (data.get('paging') or {}).get('next')
         if not next_url:
@@ -287,16 +301,43 @@ def list_form_leads(form_id: str, page_access_token: str) -> list:
 
 # ── HTTP helpers ──
 
-def _get_json(url: str, params) -> dict:
-    return _read(_request(requests.get, url, params=params))
+class PacedSession:
+    """Calls through a shared session, spaced at most `calls_per_second` apart.
+
+    The backfill wraps the Graph session in one of these per Page: Graph rate
+    limits are per Page token, so Pages run side by side while each stays
+    under its own limit. 0 = unpaced.
+    """
+
+    def __init__(self, session, calls_per_second: float):
+        self._session = session
+        self._interval = 1 / calls_per_second if calls_per_second else 0
+        self._next_at = 0.0
+        self._lock = threading.Lock()
+
+    def get(self, url, **kwargs):
+        with self._lock:
+            wait = self._next_at - time.monotonic()
+            if wait > 0:
+                time.sleep(wait)
+            self._next_at = time.monotonic() + self._interval
+        return self._session.get(url, **kwargs)
+
+
+def _session():
+    return outbound.session(outbound.META)
+
+
+def _get_json(url: str, params, session=None) -> dict:
+    return _read(_request((session or _session()).get, url, params=params))
 
 
 def _post(url: str, data) -> dict:
-    return _read(_request(requests.post, url, data=data))
+    return _read(_request(_session().post, url, data=data))
 
 
 def _delete(url: str, params) -> dict:
-    return _read(_request(requests.delete, url, params=params))
+    return _read(_request(_session().delete, url, params=params))
 
 
 def _request(method, url: str, **kwargs):
@@ -1,28 +1,37 @@
 """Turn Meta lead-ad submissions into CRM leads (REL-507).
 
 Two entry points share one mapping/dedup path:
-* ``ingest_from_webhook`` — called inline from the webhook with the change value
-  (fetches the answers from the Graph API by leadgen id).
+* ``ingest_from_webhook`` — called by the webhook queue worker
+  (``process_webhook_event``) with the stored change value (fetches the answers
+  from the Graph API by leadgen id).
 * ``backfill_all`` — the hourly cron sweep; lists each connected Page's forms and
-  their submissions and ingests anything we don't already have (the 90-day
-  retention safety net for anything the webhook missed).
+  their submissions since the form's high-water mark (``MetaFormCursor``) and
+  ingests anything we don't already have (the 90-day retention safety net for
+  anything the webhook missed). Pages are swept in parallel over the shared
+  Graph session, each paced to its own Graph rate limit.
 
 Idempotency is keyed on ``Lead.meta_leadgen_id``; dedup against an existing open
 lead is by normalized email/phone.
 """
 
 import logging
-from datetime import datetime
+from datetime import datetime, timedelta
 
+from django.conf import settings
 from django.db import IntegrityError, transaction
 from django.db.models import Q
 
 from bookings.activity import log_activity
-from bookings.models import ConnectedMetaPage, Lead, MetaIngestedLead, OrgSettings, ProductLine
+from bookings.models import (
+    ConnectedMetaPage, Lead, MetaFormCursor, MetaIngestedLead, OrgSettings, ProductLine,
+)
+from bookings.models.meta_webhook import LEADGEN
 from bookings.phones import normalize_phone
 from bookings.services import meta
 from bookings.services.leads import default_status_for, terminal_statuses_for
+from bookings.services.local_worker import pool_map
 from bookings.services.round_robin import assign_lead
+from portioning import outbound
 
 logger = logging.getLogger(__name__)
 
@@ -30,6 +39,35 @@ logger = logging.getLogger(__name__)
 # appended to notes verbatim (structured extraction is REL-509, not here).
 _STANDARD_KEYS = {'full_name', 'first_name', 'last_name', 'email', 'phone_number'}
 
+# How far before a form's high-water mark the backfill re-reads, for
+# submissions Graph hadn't listed yet when the last sweep ran. The ledger makes
+# the overlap free of duplicates.
+CURSOR_OVERLAP = timedelta(minutes=10)
+
+
+def process_webhook_event(event):
+    """Handle one stored MetaWebhookEvent (the webhook queue's Meta handler).
+
+    Raising leaves the event for a retry; returning marks it processed.
+    """
+    # Resolve the org by page_id (a Page belongs to whichever org connected
+    # it). Unknown page ⇒ record + ignore, never an error (AC6).
+    # Deterministic if the same Page were ever connected by two orgs (the
+    # unique constraint is per-(org, page_id)): oldest connection wins.
+    page = (
+        ConnectedMetaPage.objects.unscoped()
+        .filter(page_id=event.page_id).select_related('organisation')
+        .order_by('id').first()
+    )
+    if page is None:
+        logger.info('Meta webhook for unconnected page %s — recorded, ignoring', event.page_id)
+        return
+    event.organisation = page.organisation
+    if event.field != LEADGEN:
+        # `messages` routing arrives with REL-508; the raw event is stored.
+        return
+    ingest_from_webhook(page, event.payload.get('value') or {})
+
 
 def ingest_from_webhook(page: ConnectedMetaPage, value: dict):
     """Handle one `leadgen` webhook change value for a connected Page."""
@@ -50,28 +88,51 @@ def ingest_lead(page: ConnectedMetaPage, leadgen_id: str):
     return lead
 
 
-def backfill_page(page: ConnectedMetaPage) -> int:
-    """Ingest every not-yet-seen submission across a Page's forms. Returns the
-    number of new Leads created."""
+def backfill_page(page: ConnectedMetaPage, session=None) -> int:
+    """Ingest every not-yet-seen submission across a Page's forms, reading each
+    form only from its high-water mark on. Returns the number of new Leads
+    created."""
     created = 0
-    for form_id in meta.list_lead_forms(page.page_id, page.page_access_token):
-        for raw in meta.list_form_leads(form_id, page.page_access_token):
+    cursors = {c.form_id: c for c in MetaFormCursor.objects.for_org(page.organisation).filter(page=page)}
+    for form_id in meta.list_lead_forms(page.page_id, page.page_access_token, session=session):
+        cursor = cursors.get(form_id)
+        newest = cursor.last_created_time if cursor else None
+        since = newest - CURSOR_OVERLAP if newest else None
+        for raw in meta.list_form_leads(form_id, page.page_access_token, since=since, session=session):
             _lead, was_created = _build_lead(page, raw)
             if was_created:
                 created += 1
+            seen = _parse_created_time(raw.get('created_time'))
+            if seen and (newest is None or seen > newest):
+                newest = seen
+        if newest and (cursor is None or newest > cursor.last_created_time):
+            MetaFormCursor.objects.update_or_create(
+                organisation=page.organisation, page=page, form_id=form_id,
+                defaults={'last_created_time': newest},
+            )
     return created
 
 
-def backfill_all() -> int:
-    """Sweep every connected Page across all orgs (cron entry point)."""
-    total = 0
+def backfill_all(concurrency=None) -> int:
+    """Sweep every connected Page across all orgs (cron entry point).
+
+    Up to META_BACKFILL_CONCURRENCY Pages at a time, over the shared Graph
+    session, each Page's Graph calls paced to META_BACKFILL_PAGE_RATE a second.
+    """
     # unscoped: the cron runs platform-wide, not within one org's request.
-    for page in ConnectedMetaPage.objects.unscoped().select_related('organisation'):
-        try:
-            total += backfill_page(page)
-        except Exception as exc:
-            logger.warning('Meta lead backfill failed for page %s: %s', page.page_id, exc)
-    return total
+    pages = list(ConnectedMetaPage.objects.unscoped().select_related('organisation'))
+    concurrency = concurrency or settings.META_BACKFILL_CONCURRENCY
+    session = outbound.session(outbound.META)
+    jobs = [(page, meta.PacedSession(session, settings.META_BACKFILL_PAGE_RATE)) for page in pages]
+    return sum(pool_map(lambda job: _backfill_page_logged(*job), jobs, concurrency, 'meta-backfill'))
+
+
+def _backfill_page_logged(page, session):
+    try:
+        return backfill_page(page, session=session)
+    except Exception as exc:
+        logger.warning('Meta lead backfill failed for page %s: %s', page.page_id, exc)
+        return 0
 
 
 # ── mapping + dedup ──
@@ -82,16 +143,25 @@ def _build_lead(page: ConnectedMetaPage, raw: dict):
     The (org, leadgen_id) ledger row is the idempotency primitive: claiming it
     atomically means the very first delivery wins and every retry / backfill
     re-sighting / concurrent race is skipped — covering the merge path too, so
-    the backfill never re-logs a duplicate activity.
+    the backfill never re-logs a duplicate activity. The claim and the lead's
+    writes are one transaction: if the build fails, the claim is undone and the
+    retry builds it again. The Graph fetch is the caller's, before any of this.
     """
     org = page.organisation
     leadgen_id = str(raw.get('id') or '')
 
-    try:
-        with transaction.atomic():
-            ref = MetaIngestedLead.objects.create(organisation=org, leadgen_id=leadgen_id)
-    except IntegrityError:
-        return None, False  # already ingested (retry / backfill overlap / race)
+    with transaction.atomic():
+        try:
+            with transaction.atomic():
+                ref = MetaIngestedLead.objects.create(organisation=org, leadgen_id=leadgen_id)
+        except IntegrityError:
+            return None, False  # already ingested (retry / backfill overlap / race)
+        return _create_or_merge(page, ref, raw)
+
+
+def _create_or_merge(page, ref, raw):
+    org = page.organisation
+    leadgen_id = ref.leadgen_id
 
     answers = _answers(raw.get('field_data'))
     first = answers.pop('first_name', '')
@@ -196,6 +266,16 @@ def _parse_created_date(created_time):
         return None
 
 
+def _parse_created_time(created_time):
+    """The submission's creation time as an aware datetime, or None."""
+    if not created_time:
+        return None
+    try:
+        return datetime.fromisoformat(str(created_time).replace('+0000', '+00:00'))
+    except ValueError:
+        return None
+
+
 def _find_open_duplicate(org, email, phone):
     """An existing non-closed lead in the org matching email or phone, or None."""
     if not (email or phone):
@@ -0,0 +1,122 @@
+"""Deliver queued client messages: the outbox (`OutboxMessage`).
+
+A send that shouldn't hold its caller — bulk-approving a page of follow-ups,
+the signed copy inside a client's signing request, a sign link — writes its
+ledger row as `queued` plus an outbox entry, and returns. Delivery happens here:
+
+- **Routes.** Each entry names what it goes out through: the org's mailbox or
+  the Twilio number it is sent from. A route's messages go one at a time, oldest
+  first, so a burst never has more than one call open against one mailbox or
+  one number; different routes are delivered in parallel, at most
+  OUTBOX_WORKER_CONCURRENCY at once.
+- **Claims and retries** are the shared queue engine's (`retry_queue`). A
+  transient failure (a timeout, a 5xx, a 429) is retried with backoff and holds
+  back the rest of its route meanwhile. A permanent one — the mailbox needs
+  reconnecting, the provider refused this message — fails the entry at once,
+  as does the last of OUTBOX_MAX_ATTEMPTS.
+- **The ledger.** Success and final failure are written onto the ledger row,
+  which is where a message's status is always read. What a failure undoes (a
+  follow-up draft goes back for review, an unsent signed copy becomes a task)
+  is `messaging.queued_send_failed`.
+
+Who delivers is OUTBOX_MODE: ``thread`` wakes a worker thread in the web
+process once the entries commit (production); ``inline`` delivers them inside
+the call that queued them, once, with any failure final — what sending was like
+before the outbox, and what the test runner uses; ``off`` leaves them for
+``manage.py process_outbox``.
+"""
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from bookings.models import OutboxMessage, WhatsAppMessage
+from bookings.services import email as email_service
+from bookings.services import messaging, retry_queue
+from bookings.services.local_worker import LocalWorker
+
+RETRY_MAX_SECONDS = 1800
+POLL_SECONDS = 30
+
+
+def route_for(message):
+    """The route a ledger row is delivered over — see the module docstring."""
+    if message.channel == WhatsAppMessage.CHANNEL_EMAIL:
+        return f'mailbox:{message.organisation_id}'
+    return f'twilio:{message.from_phone}'
+
+
+def add(message, *, kind='', attach_pdf=False, signature=None, draft=None):
+    """Queue a `queued` ledger row for delivery. Hand the result to `enqueue`."""
+    return OutboxMessage.objects.create(
+        organisation=message.organisation,
+        message=message,
+        route=route_for(message),
+        kind=kind,
+        attach_pdf=attach_pdf,
+        signature=signature,
+        draft=draft,
+    )
+
+
+def enqueue(entries):
+    """Hand freshly added entries on, as OUTBOX_MODE says."""
+    mode = settings.OUTBOX_MODE
+    if mode == 'inline':
+        now = timezone.now()
+        for entry in entries:
+            if queue.claim(entry, now):
+                queue.run(entry, final=True)
+    elif mode == 'thread':
+        transaction.on_commit(worker.wake)
+
+
+def pending():
+    """Entries neither delivered nor given up on."""
+    return queue.pending()
+
+
+def drain(concurrency=None):
+    """Deliver everything that is due now. Returns how many were delivered."""
+    concurrency = concurrency or settings.OUTBOX_WORKER_CONCURRENCY
+    return retry_queue.drain([queue], concurrency, 'outbox')
+
+
+def process_route(route):
+    """Deliver `route`'s entries oldest first. Returns how many were delivered."""
+    return queue.process_key(route)
+
+
+def is_permanent(exc):
+    """True for a failure that retrying cannot fix."""
+    if isinstance(exc, (
+        ValueError, messaging.MessagingError,
+        email_service.MailboxNotConnected, email_service.MailboxNeedsReconnect,
+    )):
+        return True
+    # A provider that answered 4xx (other than 429) refused this message itself.
+    status = getattr(exc, 'status', None)
+    return isinstance(status, int) and 400 <= status < 500 and status != 429
+
+
+def _give_up(entry, exc):
+    """Mark the ledger row failed, then undo what the send was for."""
+    msg = entry.message
+    msg.status = 'failed'
+    msg.error_message = str(exc)[:500]
+    msg.save(update_fields=['status', 'error_message', 'updated_at'])
+    messaging.queued_send_failed(entry)
+
+
+queue = retry_queue.RetryQueue(
+    OutboxMessage,
+    key='route',
+    handler=messaging.deliver_queued,
+    done_field='delivered_at',
+    order_by=('created_at', 'pk'),
+    select_related=('message',),
+    max_attempts_setting='OUTBOX_MAX_ATTEMPTS',
+    retry_max_seconds=RETRY_MAX_SECONDS,
+    is_permanent=is_permanent,
+    give_up=_give_up,
+)
+worker = LocalWorker(drain, 'outbox', POLL_SECONDS)
@@ -0,0 +1,140 @@
+"""Drain a table of queued work (`RetryQueued` rows): ordered, leased, retried.
+
+The inbound-webhook queue and the outbox are both this engine over their own
+table; a `RetryQueue` names only what differs between them:
+
+- **Ordering.** `key` is the column work is serialised on (a Meta page, a
+  mailbox or Twilio number). A key's rows are handled one at a time, oldest
+  first; a failed row holds back the ones behind it until it succeeds or is
+  given up. Different keys run in parallel (`drain`).
+- **Claims.** A worker leases a row (`locked_until`) with a conditional UPDATE
+  before touching it, so two drains — two threads, or the web process and a
+  management command — never handle the same row twice.
+- **Retries.** A handler that raises is retried with exponential backoff, up
+  to the queue's max-attempts setting; a failure `is_permanent` says retrying
+  can't fix gives up at once. Giving up sets `failed_at` and calls `give_up`.
+"""
+import logging
+from datetime import timedelta
+
+from django.conf import settings
+from django.db.models import Q
+from django.utils import timezone
+
+from bookings.services.local_worker import pool_map
+
+logger = logging.getLogger(__name__)
+
+# How long a claimed row is held before another worker may take it over.
+LEASE = timedelta(minutes=5)
+# Retry n waits RETRY_BASE_SECONDS * 2**(n-1), capped at the queue's maximum.
+RETRY_BASE_SECONDS = 30
+
+
+class RetryQueue:
+    """One table's queue.
+
+    `handler(row)` does the work; returning means done, raising means retry.
+    `done_field` is the timestamp set once it is done, `order_by` the head-of-key
+    ordering, and `save_fields` anything else the handler sets on the row that
+    is saved with the outcome. `max_attempts_setting` names the setting capping
+    attempts; `is_permanent(exc)` and `give_up(row, exc)` are optional.
+    """
+
+    def __init__(self, model, *, key, handler, done_field, order_by, max_attempts_setting,
+                 retry_max_seconds, save_fields=(), select_related=(), is_permanent=None, give_up=None):
+        self.model = model
+        self.key = key
+        self.handler = handler
+        self.done_field = done_field
+        self.order_by = order_by
+        self.max_attempts_setting = max_attempts_setting
+        self.retry_max_seconds = retry_max_seconds
+        self.save_fields = list(save_fields)
+        self.select_related = select_related
+        self.is_permanent = is_permanent or (lambda exc: False)
+        self.give_up = give_up
+
+    def pending(self):
+        """Rows neither done nor given up on."""
+        return self.model.objects.unscoped().filter(
+            **{f'{self.done_field}__isnull': True}, failed_at__isnull=True,
+        )
+
+    def due_keys(self, now):
+        """Keys with a row that is due now."""
+        return list(
+            self.pending()
+            .filter(Q(next_attempt_at__isnull=True) | Q(next_attempt_at__lte=now))
+            .order_by().values_list(self.key, flat=True).distinct()
+        )
+
+    def process_key(self, key):
+        """Handle `key`'s rows oldest first, stopping at one that must wait for
+        a retry or that another worker holds. Returns how many were handled."""
+        handled = 0
+        while True:
+            now = timezone.now()
+            head = (
+                self.pending().filter(**{self.key: key}).select_related(*self.select_related)
+                .order_by(*self.order_by).first()
+            )
+            if head is None or (head.next_attempt_at and head.next_attempt_at > now):
+                return handled
+            if not self.claim(head, now):
+                return handled
+            if self.run(head):
+                handled += 1
+            elif head.failed_at is None:
+                return handled
+
+    def claim(self, row, now):
+        """Lease `row`. False if another worker holds it, or it is finished."""
+        claimed = (
+            self.pending().filter(pk=row.pk)
+            .filter(Q(locked_until__isnull=True) | Q(locked_until__lte=now))
+            .update(locked_until=now + LEASE)
+        )
+        return claimed == 1
+
+    def run(self, row, final=False):
+        """Run the handler on a claimed row and record the outcome. True if it
+        succeeded. With `final`, a failure is not retried."""
+        try:
+            self.handler(row)
+        except Exception as exc:
+            self._record_failure(row, exc, final=final or self.is_permanent(exc))
+            return False
+        setattr(row, self.done_field, timezone.now())
+        row.locked_until = None
+        row.save(update_fields=[*self.save_fields, self.done_field, 'locked_until'])
+        return True
+
+    def _record_failure(self, row, exc, final):
+        now = timezone.now()
+        row.attempts += 1
+        row.error = str(exc)[:1000]
+        row.locked_until = None
+        if final or row.attempts >= getattr(settings, self.max_attempts_setting):
+            row.failed_at = now
+            logger.error('%s failed after %d attempt(s), giving up: %s', row, row.attempts, exc)
+        else:
+            delay = min(RETRY_BASE_SECONDS * 2 ** (row.attempts - 1), self.retry_max_seconds)
+            row.next_attempt_at = now + timedelta(seconds=delay)
+            logger.warning('%s failed (attempt %d), retrying in %ds: %s', row, row.attempts, delay, exc)
+        row.save(update_fields=[
+            *self.save_fields, 'attempts', 'error', 'locked_until', 'next_attempt_at', 'failed_at',
+        ])
+        if row.failed_at is not None and self.give_up:
+            try:
+                self.give_up(row, exc)
+            except Exception:
+                logger.exception('Could not clean up after failed %s', row)
+
+
+def drain(queues, concurrency, name):
+    """Handle every row that is due now across `queues`, up to `concurrency`
+    keys at once on threads named after `name`. Returns how many were handled."""
+    now = timezone.now()
+    jobs = [(queue, key) for queue in queues for key in queue.due_keys(now)]
+    return sum(pool_map(lambda job: job[0].process_key(job[1]), jobs, concurrency, name))
@@ -1,6 +1,7 @@
 from django.contrib.contenttypes.models import ContentType
 from django.db import transaction
 
+from bookings.activity import save_logs
 from bookings.models import Lead, ProductLine
 from bookings.models.activity import ActivityLog
 
@@ -76,6 +77,7 @@ def run_round_robin(triggered_by_user, org=None, dry_run=False):
                 activity_logs.append(ActivityLog(
                     content_type=ct,
                     object_id=lead.pk,
+                    organisation_id=lead.organisation_id,
                     action='updated',
                     field_name='assigned_to',
                     old_value='',
@@ -93,7 +95,7 @@ def run_round_robin(triggered_by_user, org=None, dry_run=False):
             product_line.save(update_fields=['round_robin_index'])
 
     if not dry_run and activity_logs:
-        ActivityLog.objects.bulk_create(activity_logs)
+        save_logs(activity_logs)
 
     # Build assignments list grouped by salesperson + product line
     assignments = [
@@ -0,0 +1,87 @@
+"""Drain stored inbound-webhook events: Meta lead ads and Twilio callbacks.
+
+The webhook views only check the caller's signature, write the raw event
+(`MetaWebhookEvent`, `TwilioWebhookEvent`) and answer 200 — Meta throttles a
+subscription whose endpoint is slow, and a burst of ad leads is hundreds of
+Graph fetches, dedups and round-robin assignments. The work happens here:
+
+- **Ordering.** Each model names a `QUEUE_KEY` (the page, the message SID or
+  customer number). A key's events are handled one at a time, oldest first; a
+  failed event holds back the ones behind it until it succeeds or is given up.
+- **Concurrency.** Different keys run in parallel, at most
+  WEBHOOK_WORKER_CONCURRENCY at once.
+- **Claims and retries** are the shared queue engine's (`retry_queue`). A
+  handler that raises is retried with backoff; after WEBHOOK_MAX_ATTEMPTS the
+  event is marked failed and left for a human (and, for Meta, the hourly
+  backfill).
+
+Who drains is WEBHOOK_QUEUE_MODE: ``thread`` wakes a worker thread in the web
+process once the event commits (production: one gunicorn process, no separate
+worker); ``inline`` handles it inside the webhook request (the test runner);
+``off`` leaves it for ``manage.py process_webhook_events``.
+"""
+from django.conf import settings
+from django.db import transaction
+
+from bookings.models import MetaWebhookEvent, TwilioWebhookEvent
+from bookings.services import meta_leads, retry_queue, whatsapp
+from bookings.services.local_worker import LocalWorker
+
+# What handles each queue's events. A handler that returns has handled the
+# event (including deciding to ignore it); one that raises gets a retry. Each
+# handler opens its own transaction around its writes — the Meta one fetches
+# from Graph first, and no transaction is held open across that.
+HANDLERS = {
+    MetaWebhookEvent: meta_leads.process_webhook_event,
+    TwilioWebhookEvent: whatsapp.process_webhook_event,
+}
+
+RETRY_MAX_SECONDS = 3600
+# How often the worker thread wakes on its own, to pick up retries that have
+# come due and anything left over from before a restart.
+POLL_SECONDS = 30
+
+# The handlers set the event's organisation once they know it.
+QUEUES = {
+    model: retry_queue.RetryQueue(
+        model,
+        key=model.QUEUE_KEY,
+        handler=handler,
+        done_field='processed_at',
+        order_by=('received_at', 'pk'),
+        save_fields=('organisation',),
+        max_attempts_setting='WEBHOOK_MAX_ATTEMPTS',
+        retry_max_seconds=RETRY_MAX_SECONDS,
+    )
+    for model, handler in HANDLERS.items()
+}
+
+
+def enqueue(events):
+    """Hand freshly stored events on, as WEBHOOK_QUEUE_MODE says."""
+    mode = settings.WEBHOOK_QUEUE_MODE
+    if mode == 'inline':
+        keys = {(type(e), getattr(e, e.QUEUE_KEY)) for e in events}
+        for model, key in keys:
+            process_key(model, key)
+    elif mode == 'thread':
+        transaction.on_commit(worker.wake)
+
+
+def pending(model):
+    """`model`'s events that are neither handled nor given up on."""
+    return QUEUES[model].pending()
+
+
+def drain(concurrency=None):
+    """Handle every event that is due now. Returns how many were handled."""
+    concurrency = concurrency or settings.WEBHOOK_WORKER_CONCURRENCY
+    return retry_queue.drain(QUEUES.values(), concurrency, 'webhook-queue')
+
+
+def process_key(model, key):
+    """Handle `key`'s events oldest first. Returns how many were handled."""
+    return QUEUES[model].process_key(key)
+
+
+worker = LocalWorker(drain, 'webhook-queue', POLL_SECONDS)
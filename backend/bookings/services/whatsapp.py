@@ -2,8 +2,12 @@ import logging
 
 from django.conf import settings
 from django.contrib.contenttypes.models import ContentType
+from django.db import transaction
 
-from bookings.models import OrgSettings, WhatsAppMessage, ActivityLog
+from bookings.activity import save_logs
+from bookings.models import ActivityLog, Lead, OrgSettings, TwilioWebhookEvent, WhatsAppMessage
+from bookings.phones import phone_digits
+from portioning import outbound
 
 logger = logging.getLogger(__name__)
 
@@ -20,6 +24,86 @@ def normalize_whatsapp_address(phone):
     return phone if phone.startswith('whatsapp:') else f'whatsapp:{phone}'
 
 
+def org_settings_for_number(to_number):
+    """The OrgSettings whose WhatsApp sender number is `to_number`, or None."""
+    digits = phone_digits(to_number.replace('whatsapp:', ''))
+    if not digits:
+        return None
+    return (
+        OrgSettings.objects
+        .filter(whatsapp_enabled=True, twilio_whatsapp_number_digits=digits)
+        .select_related('organisation')
+        .first()
+    )
+
+
+def process_webhook_event(event):
+    """Handle one stored TwilioWebhookEvent (the webhook queue's Twilio handler).
+
+    Raising leaves the event for a retry; returning marks it processed.
+    """
+    data = event.payload
+    with transaction.atomic():
+        if event.kind == TwilioWebhookEvent.INBOUND:
+            _receive_inbound(event, data)
+        else:
+            _apply_status(event, data)
+
+
+def _receive_inbound(event, data):
+    """Record an inbound WhatsApp message against the lead it came from."""
+    to_number = data.get('To', '')
+    from_number = data.get('From', '')
+    org_settings = org_settings_for_number(to_number)
+    if not org_settings:
+        logger.warning('Inbound WhatsApp to unknown number: %s', to_number)
+        return
+    org = org_settings.organisation
+    event.organisation = org
+
+    # Find the lead by its phone — the newest one if several share it.
+    from_digits = phone_digits(from_number)
+    lead = (
+        Lead.objects.filter(organisation=org, phone_digits=from_digits).first()
+        if from_digits else None
+    )
+    if not lead:
+        logger.info('Inbound WhatsApp from %s — no matching lead in org %s', from_number, org.pk)
+        return
+
+    WhatsAppMessage.objects.create(
+        organisation=org,
+        lead=lead,
+        to_phone=to_number,
+        from_phone=from_number,
+        body=data.get('Body', ''),
+        direction='inbound',
+        status='received',
+        twilio_sid=event.message_sid,
+    )
+
+
+def _apply_status(event, data):
+    """Apply a delivery-status callback to the outbound message it reports on."""
+    msg = WhatsAppMessage.objects.filter(twilio_sid=event.message_sid).first()
+    if msg is None:
+        # Usually a callback that beat the send's own write of the SID; the
+        # retry finds it. A SID we never sent runs out of attempts instead.
+        raise LookupError(f'No message with Twilio SID {event.message_sid}')
+    event.organisation_id = msg.organisation_id
+
+    message_status = data.get('MessageStatus', '')
+    error_code = data.get('ErrorCode', '')
+    error_message = data.get('ErrorMessage', '')
+    if message_status:
+        msg.status = message_status
+    if error_code:
+        msg.error_code = error_code
+    if error_message:
+        msg.error_message = error_message
+    msg.save(update_fields=['status', 'error_code', 'error_message', 'updated_at'])
+
+
 def send_via_twilio(org, *, to_phone, body, parent, reminder=None, sent_by=None):
     """Platform-send one WhatsApp message and record it in the ledger.
 
@@ -31,20 +115,37 @@ def send_via_twilio(org, *, to_phone, body, parent, reminder=None, sent_by=None)
     A failed send is recorded, not raised — the row IS the report. Callers that
     must know check ``msg.status``.
     """
+    msg = record_twilio_message(
+        org, to_phone=to_phone, body=body, parent=parent, reminder=reminder, sent_by=sent_by,
+    )
+    try:
+        deliver_via_twilio(msg)
+    except Exception as exc:
+        logger.exception('Failed to send WhatsApp message: %s', exc)
+        msg.status = 'failed'
+        msg.error_message = str(exc)[:500]
+        msg.save(update_fields=['status', 'error_message', 'updated_at'])
+    return msg
+
+
+def record_twilio_message(org, *, to_phone, body, parent, reminder=None, sent_by=None):
+    """Write the `queued` ledger row for a Twilio send, without sending it.
+
+    Raises ValueError when the org can't platform-send or there is no number,
+    so a caller queueing the send (the outbox) refuses it up front exactly as
+    an inline send would.
+    """
     org_settings = OrgSettings.for_org(org)
     if not platform_sending_available(org_settings):
         raise ValueError('WhatsApp is not configured for this organisation.')
     if not to_phone:
         raise ValueError('No contact phone number.')
 
-    from_phone = f'whatsapp:{org_settings.twilio_whatsapp_number}'
-    to_address = normalize_whatsapp_address(to_phone)
-
-    msg = WhatsAppMessage.objects.create(
+    return WhatsAppMessage.objects.create(
         organisation=org,
         reminder=reminder,
-        to_phone=to_address,
-        from_phone=from_phone,
+        to_phone=normalize_whatsapp_address(to_phone),
+        from_phone=f'whatsapp:{org_settings.twilio_whatsapp_number}',
         body=body,
         channel=WhatsAppMessage.CHANNEL_WHATSAPP,
         direction='outbound',
@@ -53,31 +154,34 @@ def send_via_twilio(org, *, to_phone, body, parent, reminder=None, sent_by=None)
         **parent,
     )
 
-    try:
-        from twilio.rest import Client
-        from twilio.http.http_client import TwilioHttpClient
-        # Twilio's default client sets no timeout at all, so a hung provider
-        # hangs whatever is calling us — including a client's own request on the
-        # public sign page, where the signed-copy send runs (REL-474).
-        client = Client(
-            settings.TWILIO_ACCOUNT_SID, settings.TWILIO_AUTH_TOKEN,
-            http_client=TwilioHttpClient(timeout=settings.OUTBOUND_SEND_TIMEOUT),
-        )
-        twilio_msg = client.messages.create(
-            body=body,
-            from_=from_phone,
-            to=to_address,
-        )
-        msg.twilio_sid = twilio_msg.sid
-        msg.status = 'sent'
-        msg.save(update_fields=['twilio_sid', 'status', 'updated_at'])
-    except Exception as exc:
-        logger.exception('Failed to send WhatsApp message: %s', exc)
-        msg.status = 'failed'
-        msg.error_message = str(exc)[:500]
-        msg.save(update_fields=['status', 'error_message', 'updated_at'])
 
-    return msg
+def deliver_via_twilio(msg):
+    """Hand a `queued` ledger row to Twilio and mark it sent.
+
+    Raises whatever Twilio raised and leaves the row as it was — recording the
+    failure is the caller's decision (send_via_twilio records it at once; the
+    outbox may retry first).
+    """
+    from twilio.rest import Client
+    from twilio.http.http_client import TwilioHttpClient
+    # Twilio's default client sets no timeout at all, so a hung provider
+    # hangs whatever is calling us — including a client's own request on the
+    # public sign page, where the signed-copy send runs (REL-474).
+    http_client = TwilioHttpClient(timeout=settings.OUTBOUND_SEND_TIMEOUT)
+    # Send over the shared, kept-alive Twilio session, not a fresh one per message.
+    http_client.session = outbound.session(outbound.TWILIO)
+    client = Client(
+        settings.TWILIO_ACCOUNT_SID, settings.TWILIO_AUTH_TOKEN,
+        http_client=http_client,
+    )
+    twilio_msg = client.messages.create(
+        body=msg.body,
+        from_=msg.from_phone,
+        to=msg.to_phone,
+    )
+    msg.twilio_sid = twilio_msg.sid
+    msg.status = 'sent'
+    msg.save(update_fields=['twilio_sid', 'status', 'updated_at'])
 
 
 class WhatsAppService:
@@ -108,14 +212,15 @@ class WhatsAppService:
 
         # Log activity on the lead
         ct = ContentType.objects.get_for_model(lead)
-        ActivityLog.objects.create(
+        save_logs([ActivityLog(
             content_type=ct,
             object_id=lead.pk,
+            organisation_id=lead.organisation_id,
             action='updated',
             field_name='whatsapp',
             new_value=f'Message {msg.status}',
             description=f'WhatsApp message {msg.status} to {msg.to_phone}',
             user=sent_by,
-        )
+        )])
 
         return msg
@@ -0,0 +1,109 @@
+"""Daily lead-activity rollups (bookings.activity.roll_up) and the dashboard reading them."""
+from datetime import timedelta
+
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from bookings.activity import log_activity, rebuild_rollups
+from bookings.models import Lead
+from bookings.models.activity import ActivityLog, LeadActivityRollup
+from bookings.tests import _make_org
+from users.models import User
+
+
+class RollUpTests(TestCase):
+    def setUp(self):
+        self.org = _make_org()
+        self.rep = User.objects.create(
+            email="roll@example.com", role="salesperson", organisation=self.org,
+        )
+        self.lead = Lead.objects.create(organisation=self.org, contact_name="Rolled Lead")
+
+    def test_log_activity_bumps_one_row_per_key(self):
+        log_activity(self.lead, 'status_change', user=self.rep, old_value='new', new_value='won')
+        log_activity(self.lead, 'status_change', user=self.rep, old_value='new', new_value='won')
+        log_activity(self.lead, 'created', user=self.rep)
+
+        won = LeadActivityRollup.objects.get(action='status_change')
+        self.assertEqual((won.status, won.count, won.user), ('won', 2, self.rep))
+        self.assertEqual(won.day, timezone.localdate())
+        self.assertEqual(LeadActivityRollup.objects.get(action='created').status, '')
+
+    def test_a_key_with_a_row_is_bumped_by_one_update(self):
+        log_activity(self.lead, 'created', user=self.rep)
+        with CaptureQueriesContext(connection) as ctx:
+            log_activity(self.lead, 'created', user=self.rep)
+        rollup_sql = [q['sql'] for q in ctx.captured_queries if 'bookings_leadactivityrollup' in q['sql']]
+        self.assertEqual(len(rollup_sql), 1)
+        self.assertTrue(rollup_sql[0].startswith('UPDATE'))
+        self.assertEqual(LeadActivityRollup.objects.get().count, 2)
+
+    def test_rebuild_repairs_counts_stale_keys_and_twins(self):
+        log_activity(self.lead, 'created', user=self.rep)
+        log_activity(self.lead, 'status_change', new_value='won')
+        today = timezone.localdate()
+        LeadActivityRollup.objects.filter(action='created').update(count=7)
+        LeadActivityRollup.objects.create(
+            organisation=self.org, day=today, user=self.rep, action='updated', count=3,
+        )
+        LeadActivityRollup.objects.create(
+            organisation=self.org, day=today, action='status_change', status='won', count=1,
+        )
+        self.assertEqual(rebuild_rollups(self.org), 2)
+        self.assertEqual(
+            set(LeadActivityRollup.objects.values_list('user_id', 'action', 'status', 'count')),
+            {(self.rep.pk, 'created', '', 1), (None, 'status_change', 'won', 1)},
+        )
+
+    def test_other_targets_are_not_rolled_up(self):
+        log_activity(self.org, 'updated')
+        self.assertFalse(LeadActivityRollup.objects.exists())
+
+    def test_rebuild_matches_incremental_rollups(self):
+        log_activity(self.lead, 'created', user=self.rep)
+        log_activity(self.lead, 'status_change', new_value='lost')
+        log_activity(self.lead, 'status_change', new_value='lost')
+        fields = ('day', 'user_id', 'action', 'status', 'count')
+        incremental = set(LeadActivityRollup.objects.values_list(*fields))
+        call_command('rebuild_activity_rollups', verbosity=0)
+        self.assertEqual(set(LeadActivityRollup.objects.values_list(*fields)), incremental)
+
+
+class DashboardRollupTests(TestCase):
+    URL = "/api/bookings/dashboard/stats/"
+
+    def setUp(self):
+        self.org = _make_org()
+        self.owner = User.objects.create(
+            email="rollowner@example.com", first_name="Own", last_name="Er",
+            role="owner", organisation=self.org,
+        )
+        now = timezone.now()
+        # One lead created outside the week, one just inside it (on the
+        # window's part-day) and one now.
+        for age in (timedelta(days=8), timedelta(days=7) - timedelta(minutes=1), timedelta(0)):
+            lead = Lead.objects.create(organisation=self.org, contact_name="Lead")
+            log_activity(lead, 'created', user=self.owner)
+            ActivityLog.objects.filter(object_id=lead.pk).update(created_at=now - age)
+        log_activity(lead, 'status_change', user=self.owner, new_value='won')
+        rebuild_rollups(self.org)
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.owner)
+
+    def test_open_ended_periods_match_the_log(self):
+        for period, created in (('all', 3), ('month', 3), ('week', 2), ('today', 1)):
+            with self.subTest(period=period):
+                data = self.client.get(self.URL, {'period': period}).json()
+                self.assertEqual(data['lead_summary']['new_leads'], created)
+                self.assertEqual(data['lead_summary']['won'], 1)
+                [row] = data['team_activity']
+                self.assertEqual((row['user_id'], row['leads_created']), (self.owner.id, created))
+
+    def test_all_time_totals_do_not_read_the_log(self):
+        ActivityLog.objects.all().delete()
+        data = self.client.get(self.URL, {'period': 'all'}).json()
+        self.assertEqual(data['lead_summary']['new_leads'], 3)
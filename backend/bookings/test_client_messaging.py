@@ -357,11 +357,11 @@ class SignLinkEmailTests(MessagingTestBase):
     def test_a_failed_send_leaves_a_failed_row_and_does_not_move_the_quote(self):
         quote = self.make_quote(status=QuoteStatus.DRAFT)
         with patch('bookings.services.email.send_via_mailbox',
-                   side_effect=email_service.MailboxSendFailed('provider refused')), \
-             self.assertRaises(email_service.MailboxError):
-            messaging.send_booking_link(quote, KIND_SIGN_LINK, channel='email')
+                   side_effect=email_service.MailboxSendFailed('provider refused')):
+            returned = messaging.send_booking_link(quote, KIND_SIGN_LINK, channel='email')
 
         row = WhatsAppMessage.objects.get(quote=quote)
+        self.assertEqual(returned, row)
         self.assertEqual(row.status, 'failed')
         self.assertTrue(row.error_message)
         quote.refresh_from_db()
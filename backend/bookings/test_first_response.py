@@ -5,6 +5,7 @@ and Meta lead-ads ingestion), a frequent cron drafts a first reply into the same
 approve-and-send queue as follow-ups (a FollowUpDraft with kind='first_response'),
 and a human always approves. Nothing is auto-sent.
 """
+import json
 from datetime import timedelta
 from unittest.mock import patch
 
@@ -12,7 +13,7 @@ from django.test import TestCase, override_settings
 from django.utils import timezone
 from rest_framework.test import APIClient
 
-from bookings.models import FollowUpDraft, Lead, OrgSettings, WhatsAppMessage
+from bookings.models import DraftBatch, FollowUpDraft, Lead, OrgSettings, WhatsAppMessage
 from bookings.models.choices import LeadStatusOption
 from bookings.services import first_response, followup_scheduler
 from tests.base import get_test_user
@@ -147,6 +148,60 @@ class TestMetaIngestionFlags(TestCase):
 
 # ── Eligibility + drafting ──
 
+@platform_creds
+class TestFirstResponseBatch(TestCase):
+    def setUp(self):
+        self.org = get_test_user().organisation
+        _enable(self.org)
+
+    def test_a_batch_run_drafts_and_clears_the_flags(self):
+        leads = [_new_lead(self.org, contact_email=''), _new_lead(self.org, contact_name='Jo', contact_email='')]
+        answer = json.dumps({'should_follow_up': True, 'message': 'Hello, thanks!', 'reasoning': 'New.'})
+        with patch('portioning.llm._call_openai', return_value=answer):
+            summaries = first_response.run_all(batch=True)
+        self.assertEqual(summaries[0]['created'], 2)
+        for lead in leads:
+            self.assertEqual(FollowUpDraft.objects.get(lead=lead).kind, FollowUpDraft.KIND_FIRST_RESPONSE)
+            self.assertFalse(Lead.objects.get(pk=lead.pk).needs_first_response)
+
+    def test_a_failed_request_keeps_the_flag_for_the_next_tick(self):
+        lead = _new_lead(self.org, contact_email='')
+        with patch('portioning.llm._call_openai', return_value='not json'):
+            summary = first_response.run_for_org(self.org, batch=True)
+        self.assertEqual((summary['created'], summary['skipped']), (0, 1))
+        self.assertTrue(Lead.objects.get(pk=lead.pk).needs_first_response)
+
+    def test_a_lead_contacted_while_the_batch_ran_is_not_drafted(self):
+        lead = _new_lead(self.org, contact_email='')
+        answer = json.dumps({'should_follow_up': True, 'message': 'Hello!', 'reasoning': 'New.'})
+
+        def contacted_meanwhile(*args):
+            WhatsAppMessage.objects.create(
+                organisation=self.org, lead=lead, direction='outbound',
+                to_phone='x', from_phone='y', body='Hi, calling you now', status='sent',
+            )
+            return answer
+
+        with patch('portioning.llm._call_openai', side_effect=contacted_meanwhile):
+            summary = first_response.run_for_org(self.org, batch=True)
+        self.assertEqual(summary['created'], 0)
+        self.assertFalse(FollowUpDraft.objects.filter(lead=lead).exists())
+
+    def test_later_ticks_leave_a_flagged_lead_in_a_running_batch_alone(self):
+        lead = _new_lead(self.org, contact_email='')
+        DraftBatch.objects.create(
+            kind=FollowUpDraft.KIND_FIRST_RESPONSE, leads=[[lead.pk, 'whatsapp']],
+            job={'batch_id': 'elsewhere'}, locked_until=timezone.now() + timedelta(hours=1),
+        )
+        with patch('portioning.llm_batch.submit') as submit, \
+                patch('bookings.services.first_response.draft_first_response') as draft:
+            first_response.run_for_org(self.org, batch=True)
+            first_response.run_for_org(self.org)
+        submit.assert_not_called()
+        draft.assert_not_called()
+        self.assertTrue(Lead.objects.get(pk=lead.pk).needs_first_response)
+
+
 @platform_creds
 class TestFirstResponseRun(TestCase):
     def setUp(self):
@@ -259,7 +314,7 @@ class TestFirstResponseRun(TestCase):
         make the loser create NO draft — never a duplicate first response."""
         lead = _new_lead(self.org)
 
-        def steal_then_return(_lead, channel):
+        def steal_then_return(_lead, channel, context=None):
             # Simulate the other tick winning the claim mid-LLM-call.
             Lead.objects.filter(pk=lead.pk).update(needs_first_response=False)
             return DRAFT_OK
@@ -27,6 +27,7 @@ from bookings.services.followup_drafter import (
 )
 from bookings.services.message_templates import format_event_date
 from bookings.services.whatsapp_templates import TEMPLATES, render_template
+from bookings.test_client_messaging import twilio_ok
 from bookings.tests import _authenticated_client
 from tests.base import get_test_user
 from users.country_defaults import language_rule_for_country
@@ -334,11 +335,7 @@ class ApproveEmailTests(TestCase):
 
     def test_switching_to_whatsapp_sends_by_whatsapp(self):
         """AC4: the rep's override wins over the drafted channel."""
-        with patch('bookings.views.followups.WhatsAppService') as MockSvc:
-            MockSvc.return_value.send_message.return_value = WhatsAppMessage.objects.create(
-                organisation=self.org, lead=self.lead, to_phone='x', from_phone='y',
-                body='Hello Sam,', direction='outbound', status='sent',
-            )
+        with patch('twilio.rest.Client', return_value=twilio_ok()):
             res = self.client.post(
                 f'{self.BASE}{self.draft.id}/approve/',
                 {'channel': 'whatsapp'}, format='json',
@@ -484,11 +481,7 @@ class ApproveEmailTests(TestCase):
             organisation=self.org, lead=other, channel=CHANNEL_WHATSAPP,
             body='Hi Pat!', status='pending',
         )
-        with patch('bookings.views.followups.WhatsAppService') as MockSvc:
-            MockSvc.return_value.send_message.return_value = WhatsAppMessage.objects.create(
-                organisation=self.org, lead=other, to_phone='x', from_phone='y',
-                body='Hi Pat!', direction='outbound', status='sent',
-            )
+        with patch('twilio.rest.Client', return_value=twilio_ok()):
             res = self.client.post(f'{self.BASE}bulk-approve/', {}, format='json')
 
         self.assertEqual(res.status_code, 200, res.content)
@@ -521,17 +514,14 @@ class ExistingDraftTests(TestCase):
     def test_still_sends_by_whatsapp(self):
         connect_mailbox(self.org)   # even with email now available
         email_service.outbox.clear()
-        with patch('bookings.views.followups.WhatsAppService') as MockSvc:
-            msg = WhatsAppMessage.objects.create(
-                organisation=self.org, lead=self.lead, to_phone='x', from_phone='y',
-                body='Hi Sam!', direction='outbound', status='sent',
-            )
-            MockSvc.return_value.send_message.return_value = msg
+        with patch('twilio.rest.Client', return_value=twilio_ok()):
             res = self.client.post(f'{self.BASE}{self.draft.id}/approve/', {}, format='json')
 
         self.assertEqual(res.status_code, 200, res.content)
         self.assertEqual(email_service.outbox, [])
         self.draft.refresh_from_db()
+        msg = WhatsAppMessage.objects.get(lead=self.lead)
+        self.assertEqual(msg.channel, CHANNEL_WHATSAPP)
         self.assertEqual(self.draft.whatsapp_message_id, msg.id)
 
     def test_still_marks_sent_through_the_shortcut(self):
@@ -704,6 +694,14 @@ class PromptRegionTests(TestCase):
                 self.assertNotIn('enquiry', prompt)
                 self.assertNotIn('inquiry', prompt)
 
+    def test_every_org_shares_the_leading_rules_block(self):
+        # The fixed rules lead as one block, so the provider's prompt cache
+        # serves them to every org; only the language rule differs.
+        us = build_system_prompt(self.us_org, CHANNEL_EMAIL)
+        gb = build_system_prompt(self.gb_org, CHANNEL_EMAIL)
+        self.assertEqual(us.blocks[0], gb.blocks[0])
+        self.assertNotEqual(us.blocks[-1], gb.blocks[-1])
+
     def test_client_message_prompt_follows_the_org_too(self):
         from bookings.services.message_drafter import build_system_prompt as build_client_prompt
         self.assertIn('inquiry', build_client_prompt(self.us_org))
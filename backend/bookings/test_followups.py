@@ -1,15 +1,21 @@
 """AI follow-up drafts: stale detection, agent loop, review/approve API."""
+import json
+import threading
+import time
+from collections import defaultdict
 from datetime import timedelta
-from unittest.mock import patch
+from io import StringIO
+from unittest.mock import MagicMock, patch
 
 from django.core.management import call_command
-from django.test import TestCase, override_settings
+from django.test import SimpleTestCase, TestCase, override_settings
 from django.utils import timezone
 from rest_framework.test import APIClient
 
-from bookings.models import FollowUpDraft, Lead, OrgSettings, WhatsAppMessage
-from bookings.services import followup_scheduler
+from bookings.models import DraftBatch, FollowUpDraft, Lead, OrgSettings, WhatsAppMessage
+from bookings.services import draft_batches, draft_context, drafting, followup_scheduler
 from bookings.tests import _authenticated_client
+from portioning import llm_batch
 from tests.base import get_test_user
 from users.models import Organisation, User
 
@@ -277,9 +283,181 @@ class FollowupSchedulerTests(TestCase):
         self.assertNotIn(other.id, org_ids)
 
 
-def _fake_send(view_path='bookings.views.followups.WhatsAppService'):
-    """Patch WhatsAppService so approve doesn't call Twilio; returns a real msg."""
-    return patch(view_path)
+@platform_creds
+class BatchDraftingTests(TestCase):
+    """`run_followups --batch`: one provider batch job, through the local fake."""
+
+    def setUp(self):
+        self.org = get_test_user().organisation
+        _configure_ai(self.org)
+
+    def test_drafts_every_lead_through_one_batch(self):
+        leads = [_stale_lead(self.org, contact_name=name) for name in ('Sam', 'Jo')]
+        answer = json.dumps({'should_follow_up': True, 'message': 'Hi \u2014 checking in', 'reasoning': 'Quiet.'})
+        with patch('portioning.llm._call_openai', return_value=answer) as call, \
+                patch('portioning.llm_batch._submit_fake', wraps=llm_batch._submit_fake) as submit:
+            summary = followup_scheduler.run_for_org(self.org, batch=True)
+        self.assertEqual(summary['created'], 2)
+        submit.assert_called_once()
+        self.assertEqual(call.call_count, 2)
+        for lead in leads:
+            draft = FollowUpDraft.objects.get(lead=lead)
+            self.assertEqual((draft.status, draft.model_used), ('pending', 'openai:gpt-test'))
+            self.assertEqual(draft.body, 'Hi, checking in')  # same clean-up as a single draft
+
+    def test_a_lead_that_replies_while_the_batch_runs_is_skipped(self):
+        quiet = _stale_lead(self.org)
+        replied = _stale_lead(self.org, contact_name='Jo')
+        answer = json.dumps({'should_follow_up': True, 'message': 'Hi', 'reasoning': 'Quiet.'})
+
+        def reply_meanwhile(*args):
+            WhatsAppMessage.objects.get_or_create(
+                organisation=self.org, lead=replied, direction='inbound',
+                defaults=dict(to_phone='x', from_phone='y', body='Still keen!', status='received'),
+            )
+            return answer
+
+        with patch('portioning.llm._call_openai', side_effect=reply_meanwhile):
+            summary = followup_scheduler.run_for_org(self.org, batch=True)
+        self.assertEqual((summary['created'], summary['skipped']), (1, 1))
+        self.assertTrue(FollowUpDraft.objects.filter(lead=quiet).exists())
+        self.assertFalse(FollowUpDraft.objects.filter(lead=replied).exists())
+
+    def test_one_failed_request_does_not_sink_the_batch(self):
+        _stale_lead(self.org)
+        _stale_lead(self.org, contact_name='Jo')
+        answer = json.dumps({'should_follow_up': True, 'message': 'Hi', 'reasoning': 'Quiet.'})
+        with patch('portioning.llm._call_openai', side_effect=['not json', answer]):
+            summary = followup_scheduler.run_for_org(self.org, batch=True)
+        self.assertEqual((summary['created'], summary['skipped']), (1, 1))
+
+    def test_a_lead_in_a_running_batch_is_not_submitted_again(self):
+        lead = _stale_lead(self.org)
+        DraftBatch.objects.create(
+            kind=FollowUpDraft.KIND_FOLLOWUP, leads=[[lead.pk, 'whatsapp']],
+            job={'batch_id': 'elsewhere'}, locked_until=timezone.now() + timedelta(hours=1),
+        )
+        with patch('portioning.llm_batch.submit') as submit:
+            summary = followup_scheduler.run_for_org(self.org, batch=True)
+        submit.assert_not_called()
+        self.assertEqual(summary['created'], 0)
+
+    def test_a_batch_left_by_a_dead_run_is_collected_not_resubmitted(self):
+        lead = _stale_lead(self.org)
+        answer = json.dumps({'should_follow_up': True, 'message': 'Hi', 'reasoning': 'Quiet.'})
+        with patch('portioning.llm._call_openai', return_value=answer):
+            job = llm_batch.submit('LLM_FOLLOWUP_DRAFTER', [('system', 'user', {'type': 'object'})])
+            # The run that submitted it died: its lease has run out.
+            batch = DraftBatch.objects.create(
+                kind=FollowUpDraft.KIND_FOLLOWUP, leads=[[lead.pk, 'whatsapp']],
+                job=job, locked_until=timezone.now() - timedelta(minutes=1),
+            )
+            with patch('portioning.llm_batch.submit') as submit:
+                followup_scheduler.run_for_org(self.org, batch=True)  # still running
+                self.assertFalse(FollowUpDraft.objects.filter(lead=lead).exists())
+                DraftBatch.objects.filter(pk=batch.pk).update(locked_until=None)
+                followup_scheduler.run_for_org(self.org, batch=True)
+        submit.assert_not_called()
+        self.assertTrue(FollowUpDraft.objects.filter(lead=lead, status='pending').exists())
+        batch.refresh_from_db()
+        self.assertIsNotNone(batch.finished_at)
+
+    def test_a_waiter_that_dies_leaves_its_batch_to_the_next_tick_within_the_lease(self):
+        lead = _stale_lead(self.org)
+        answer = json.dumps({'should_follow_up': True, 'message': 'Hi', 'reasoning': 'Quiet.'})
+        with patch('portioning.llm._call_openai', return_value=answer):
+            # The process dies while waiting between polls.
+            with patch('portioning.llm_batch.time.sleep', side_effect=_WorkerDied), \
+                    self.assertRaises(_WorkerDied):
+                followup_scheduler.run_for_org(self.org, batch=True)
+            batch = DraftBatch.objects.get()
+            self.assertLessEqual(batch.locked_until, timezone.now() + draft_batches.LEASE)
+
+            with patch('portioning.llm_batch.submit') as submit:
+                followup_scheduler.run_for_org(self.org, batch=True)  # lease still held
+                self.assertFalse(FollowUpDraft.objects.filter(lead=lead).exists())
+                later = timezone.now() + draft_batches.LEASE + timedelta(minutes=1)
+                with patch('bookings.services.draft_batches.timezone') as clock:
+                    clock.now.return_value = later
+                    followup_scheduler.run_for_org(self.org, batch=True)
+        submit.assert_not_called()
+        self.assertTrue(FollowUpDraft.objects.filter(lead=lead, status='pending').exists())
+        batch.refresh_from_db()
+        self.assertIsNotNone(batch.finished_at)
+
+    def test_the_command_flag(self):
+        _stale_lead(self.org)
+        with patch('bookings.services.followup_scheduler._draft_in_batch', return_value=['created']) as batch:
+            call_command('run_followups', '--batch', stdout=StringIO())
+        batch.assert_called_once()
+
+
+class _WorkerDied(BaseException):
+    """Stands in for a process killed mid-run (a deploy, the OOM killer)."""
+
+
+@platform_creds
+class DraftingPoolTests(TestCase):
+    """Drafts go through the bounded drafting pool, and a lead still never
+    ends up with two pending drafts."""
+
+    def setUp(self):
+        self.org = get_test_user().organisation
+        _configure_ai(self.org)
+
+    def test_a_pending_draft_that_appears_mid_call_wins(self):
+        lead = _stale_lead(self.org)
+
+        def draft_meanwhile(lead, channel, context=None):
+            # Another run drafted this lead while our LLM call was in flight.
+            FollowUpDraft.objects.create(organisation=self.org, lead=lead, body='theirs')
+            return DRAFT_OK
+
+        with patch('bookings.services.followup_scheduler.draft_followup', side_effect=draft_meanwhile):
+            summary = followup_scheduler.run_for_org(self.org)
+        self.assertEqual((summary['created'], summary['skipped']), (0, 1))
+        self.assertEqual(list(FollowUpDraft.objects.filter(lead=lead).values_list('body', flat=True)), ['theirs'])
+
+    @patch('bookings.services.followup_scheduler.draft_followup', return_value=DRAFT_OK)
+    def test_every_org_is_summarised_from_one_pool(self, mock_draft):
+        _stale_lead(self.org)
+        _stale_lead(self.org, contact_name='Alex')
+        summaries = followup_scheduler.run_orgs([self.org])
+        self.assertEqual(summaries, [{'org': self.org.pk, 'created': 2, 'skipped': 0}])
+        self.assertEqual(mock_draft.call_count, 2)
+
+
+class DraftingExecutorTests(SimpleTestCase):
+    def _job(self, org_id, value, running, peaks, lock):
+        def work():
+            with lock:
+                running[org_id] += 1
+                peaks[org_id] = max(peaks[org_id], running[org_id])
+            time.sleep(0.02)
+            with lock:
+                running[org_id] -= 1
+            return value
+        return (Organisation(pk=org_id), work)
+
+    @override_settings(FOLLOWUP_DRAFT_PER_ORG=2)
+    def test_results_keep_their_order_and_orgs_their_limit(self):
+        running, peaks, lock = defaultdict(int), defaultdict(int), threading.Lock()
+        jobs = [self._job(1, n, running, peaks, lock) for n in range(6)]
+        jobs += [self._job(2, n, running, peaks, lock) for n in range(6, 8)]
+        results = drafting.run(jobs, concurrency=6)
+        self.assertEqual(results, list(range(8)))
+        self.assertEqual(peaks[1], 2)
+
+    def test_jobs_are_interleaved_across_orgs(self):
+        jobs = [(Organisation(pk=org_id), None) for org_id in (1, 1, 1, 2, 3, 3)]
+        self.assertEqual(drafting._round_robin(jobs), [0, 3, 4, 1, 5, 2])
+
+
+def _fake_send(sid='SM123'):
+    """Patch the Twilio client so approve doesn't reach Twilio; the send succeeds."""
+    client = MagicMock()
+    client.messages.create.return_value = MagicMock(sid=sid)
+    return patch('twilio.rest.Client', return_value=client)
 
 
 @platform_creds
@@ -354,31 +532,35 @@ class FollowupApiTests(TestCase):
         self.assertGreaterEqual(by_id[self.draft.id]['lead_days_stale'], 29)
 
     def test_approve_sends_and_marks_sent(self):
-        with _fake_send() as MockSvc:
-            msg = WhatsAppMessage.objects.create(
-                organisation=self.org, lead=self.lead, to_phone='x', from_phone='y',
-                body='Hi Sam!', direction='outbound', status='sent',
-            )
-            MockSvc.return_value.send_message.return_value = msg
+        with _fake_send('SMok'):
             res = self.client.post(f'{self.BASE}{self.draft.id}/approve/', {}, format='json')
         self.assertEqual(res.status_code, 200, res.content)
         self.draft.refresh_from_db()
+        msg = WhatsAppMessage.objects.get(lead=self.lead)
+        self.assertEqual((msg.status, msg.twilio_sid, msg.body), ('sent', 'SMok', 'Hi Sam!'))
         self.assertEqual(self.draft.status, 'sent')
         self.assertEqual(self.draft.whatsapp_message_id, msg.id)
         self.assertEqual(self.draft.reviewed_by, self.user)
 
     def test_approve_with_edited_body(self):
-        with _fake_send() as MockSvc:
-            MockSvc.return_value.send_message.return_value = WhatsAppMessage.objects.create(
-                organisation=self.org, lead=self.lead, to_phone='x', from_phone='y',
-                body='edited', direction='outbound', status='sent',
-            )
+        with _fake_send() as client:
             self.client.post(f'{self.BASE}{self.draft.id}/approve/', {'body': 'Edited text'}, format='json')
-            sent_body = MockSvc.return_value.send_message.call_args.args[1]
+            sent_body = client.return_value.messages.create.call_args.kwargs['body']
         self.assertEqual(sent_body, 'Edited text')
         self.draft.refresh_from_db()
         self.assertEqual(self.draft.body, 'Edited text')
 
+    def test_a_send_that_fails_puts_the_draft_back_for_review(self):
+        with _fake_send() as client:
+            client.return_value.messages.create.side_effect = RuntimeError('twilio down')
+            res = self.client.post(f'{self.BASE}{self.draft.id}/approve/', {}, format='json')
+        self.assertEqual(res.status_code, 400)
+        self.assertIn('twilio down', res.json()['detail'])
+        self.draft.refresh_from_db()
+        self.assertEqual(self.draft.status, 'pending')
+        self.assertIsNone(self.draft.whatsapp_message_id)
+        self.assertEqual(WhatsAppMessage.objects.get(lead=self.lead).status, 'failed')
+
     @override_settings(TWILIO_ACCOUNT_SID='', TWILIO_AUTH_TOKEN='')
     def test_approve_without_whatsapp_fails_gracefully(self):
         # Draft exists but Twilio isn't configured: approve returns a clear
@@ -406,13 +588,7 @@ class FollowupApiTests(TestCase):
         draft2 = FollowUpDraft.objects.create(
             organisation=self.org, lead=lead2, body='Hi Jo!', status='pending',
         )
-        with _fake_send() as MockSvc:
-            MockSvc.return_value.send_message.side_effect = lambda lead, body, sent_by=None: (
-                WhatsAppMessage.objects.create(
-                    organisation=self.org, lead=lead, to_phone='x', from_phone='y',
-                    body=body, direction='outbound', status='sent',
-                )
-            )
+        with _fake_send():
             res = self.client.post(f'{self.BASE}bulk-approve/', {}, format='json')
         self.assertEqual(res.status_code, 200)
         self.assertEqual(set(res.json()['sent']), {self.draft.id, draft2.id})
@@ -757,6 +933,53 @@ class DrafterQuoteContextTests(TestCase):
         self.assertNotIn('Quotations', _build_context(lead))
 
 
+class BulkDraftContextTests(TestCase):
+    """`draft_context.load` reads many leads' facts in a fixed number of queries."""
+
+    def setUp(self):
+        self.org = get_test_user().organisation
+
+    def _busy_lead(self, n):
+        from bookings.activity import log_activity
+        from bookings.tests import make_account, make_contact, make_quote
+        lead = _stale_lead(self.org, contact_name=f'Busy {n}')
+        account = make_account(org=self.org)
+        contact = make_contact(account=account, org=self.org)
+        for status in ('draft', 'sent'):
+            make_quote(org=self.org, account=account, primary_contact=contact, lead=lead, status=status)
+        for i in range(draft_context.ACTIVITY_LIMIT + 2):
+            log_activity(lead, 'updated', description=f'change {i}')
+        WhatsAppMessage.objects.create(organisation=self.org, lead=lead, direction='inbound', body='Any news?')
+        FollowUpDraft.objects.create(organisation=self.org, lead=lead, body='x', status='sent',
+                                     reviewed_at=timezone.now())
+        return Lead.objects.get(pk=lead.pk)
+
+    def test_query_count_does_not_grow_with_the_leads(self):
+        few = [self._busy_lead(n) for n in range(2)]
+        with self.assertNumQueries(7):
+            draft_context.load(few)
+        many = [self._busy_lead(n) for n in range(2, 8)]
+        with self.assertNumQueries(7):
+            contexts = draft_context.load(few + many)
+
+        context = contexts[many[0].pk]
+        self.assertEqual(len(context.activity), draft_context.ACTIVITY_LIMIT)
+        self.assertEqual(len(context.quotes), 2)
+        self.assertEqual(context.followups_sent, 1)
+        self.assertIsNotNone(context.last_reply_at)
+        self.assertEqual([m.body for m in context.messages], ['Any news?'])
+
+    def test_bulk_and_single_lead_prompts_state_the_same_facts(self):
+        from bookings.services.followup_drafter import _build_context
+        leads = [self._busy_lead(n) for n in range(3)]
+        contexts = draft_context.load(leads)
+        for lead in leads:
+            self.assertEqual(
+                _build_context(lead, 'whatsapp', contexts[lead.pk]),
+                _build_context(Lead.objects.get(pk=lead.pk), 'whatsapp'),
+            )
+
+
 class DraftSerializerSummaryTests(TestCase):
     """The review queue carries a compact lead summary per draft."""
 
@@ -883,7 +1106,7 @@ class WhatsAppShortcutEndpointTests(TestCase):
         msg = WhatsAppMessage.objects.get(lead=lead)
         self.assertEqual(msg.direction, 'inbound')
         # the lead spoke last → excluded from generation
-        from bookings.services import followup_scheduler
+        from bookings.services import drafting, followup_scheduler
         s = OrgSettings.for_org(self.org)
         self.assertNotIn(lead.id, [
             l.id for l in followup_scheduler.find_stale_leads(self.org, s)])
@@ -1038,6 +1261,29 @@ class ScheduledRunTests(TestCase):
         # the pending draft blocks that lead, but the org itself runs again
         self.assertEqual(len(followup_scheduler.run_scheduled(now=self._at(8))), 1)
 
+    def test_an_overlapping_tick_does_not_draft_the_org_again(self):
+        # The org is claimed before its drafts are made: a tick that starts
+        # while the first is still drafting finds nothing due.
+        _stale_lead(self.org)
+        overlapping = []
+
+        def draft_during_another_tick(lead, channel, context=None):
+            overlapping.extend(followup_scheduler.run_scheduled(now=self._at(9)))
+            return DRAFT_OK
+
+        with patch('bookings.services.followup_scheduler.draft_followup',
+                   side_effect=draft_during_another_tick) as mock_draft:
+            self.assertEqual(len(followup_scheduler.run_scheduled(now=self._at(9))), 1)
+        self.assertEqual(overlapping, [])
+        self.assertEqual(mock_draft.call_count, 1)
+
+    def test_a_stale_read_loses_the_claim(self):
+        now = self._at(9)
+        first = OrgSettings.objects.get(organisation=self.org)
+        second = OrgSettings.objects.get(organisation=self.org)
+        self.assertTrue(followup_scheduler._claim_auto_run(first, now))
+        self.assertFalse(followup_scheduler._claim_auto_run(second, now))
+
 
 @platform_creds
 @override_settings(CRON_SECRET='s3cret')
@@ -0,0 +1,29 @@
+"""The thread-pool helpers the background drains fan out with."""
+import threading
+from unittest.mock import patch
+
+from django.test import SimpleTestCase
+
+from bookings.services.local_worker import pool_map
+
+
+class PoolMapTests(SimpleTestCase):
+    @patch('bookings.services.local_worker.connection')
+    def test_a_pool_keeps_the_order_and_closes_each_threads_connection(self, connection):
+        names = []
+
+        def work(item):
+            names.append(threading.current_thread().name)
+            return item * 2
+
+        self.assertEqual(pool_map(work, [1, 2, 3], 2, 'drain'), [2, 4, 6])
+        self.assertTrue(all(name.startswith('drain') for name in names))
+        self.assertEqual(connection.close.call_count, 3)
+
+    @patch('bookings.services.local_worker.connection')
+    def test_a_concurrency_of_one_runs_on_the_calling_thread(self, connection):
+        caller = threading.current_thread().name
+        names = []
+        pool_map(lambda item: names.append(threading.current_thread().name), [1, 2], 1, 'drain')
+        self.assertEqual(names, [caller, caller])
+        connection.close.assert_not_called()
@@ -1,7 +1,8 @@
 """The caterer's connected mailbox: OAuth connect/disconnect + send transport (REL-460).
 
 No real Google/Microsoft app is ever contacted — every provider HTTP call is
-patched at the `requests` boundary inside `bookings.services.mailbox_oauth`.
+patched at the `requests.Session` boundary the provider sessions
+(`portioning.outbound`) share.
 """
 import base64
 import email as email_lib
@@ -461,7 +462,7 @@ class TestMailboxCallback(TestCase):
         return self.client.get(CALLBACK_URL, params)
 
     @override_settings(**GOOGLE_CONFIGURED)
-    @patch('bookings.services.mailbox_oauth.requests.post')
+    @patch('requests.Session.post')
     def test_google_callback_stores_an_encrypted_mailbox_and_returns_to_settings(self, post):
         post.return_value = _response(200, {
             'access_token': 'ya29-access', 'refresh_token': '1//refresh',
@@ -485,8 +486,8 @@ class TestMailboxCallback(TestCase):
         self.assertTrue(mailbox.access_token_valid)
 
     @override_settings(**MICROSOFT_CONFIGURED)
-    @patch('bookings.services.mailbox_oauth.requests.get')
-    @patch('bookings.services.mailbox_oauth.requests.post')
+    @patch('requests.Session.get')
+    @patch('requests.Session.post')
     def test_microsoft_callback_reads_the_address_from_graph_when_there_is_no_id_token(
         self, post, get,
     ):
@@ -504,8 +505,8 @@ class TestMailboxCallback(TestCase):
         self.assertEqual(mailbox.refresh_token, 'ms-refresh')
 
     @override_settings(**MICROSOFT_CONFIGURED)
-    @patch('bookings.services.mailbox_oauth.requests.get')
-    @patch('bookings.services.mailbox_oauth.requests.post')
+    @patch('requests.Session.get')
+    @patch('requests.Session.post')
     def test_microsoft_falls_back_to_the_user_principal_name(self, post, get):
         post.return_value = _response(200, {
             'access_token': 'a', 'refresh_token': 'r', 'expires_in': 3600,
@@ -519,7 +520,7 @@ class TestMailboxCallback(TestCase):
         )
 
     @override_settings(**GOOGLE_CONFIGURED)
-    @patch('bookings.services.mailbox_oauth.requests.post')
+    @patch('requests.Session.post')
     def test_a_tampered_state_is_refused(self, post):
         response = self._call(self._state('google') + 'tampered')
 
@@ -528,7 +529,7 @@ class TestMailboxCallback(TestCase):
         post.assert_not_called()
 
     @override_settings(**GOOGLE_CONFIGURED)
-    @patch('bookings.services.mailbox_oauth.requests.post')
+    @patch('requests.Session.post')
     def test_a_state_from_another_browser_is_refused(self, post):
         """Without the nonce binding, an admin of org A could hand this link to
         an admin of org B and capture B's mailbox onto A."""
@@ -540,7 +541,7 @@ class TestMailboxCallback(TestCase):
         post.assert_not_called()
 
     @override_settings(**GOOGLE_CONFIGURED)
-    @patch('bookings.services.mailbox_oauth.requests.post')
+    @patch('requests.Session.post')
     def test_a_state_carrying_no_binding_is_refused_rather_than_matching_nothing(self, post):
         """Fail closed: an absent hash and an absent cookie must not compare
         equal, or the one control stopping cross-org capture evaporates."""
@@ -554,7 +555,7 @@ class TestMailboxCallback(TestCase):
         post.assert_not_called()
 
     @override_settings(**GOOGLE_CONFIGURED)
-    @patch('bookings.services.mailbox_oauth.requests.post')
+    @patch('requests.Session.post')
     def test_a_callback_with_no_nonce_cookie_at_all_is_refused(self, post):
         self.client.cookies.pop(NONCE_COOKIE, None)
         response = self.client.get(CALLBACK_URL, {
@@ -581,7 +582,7 @@ class TestMailboxCallback(TestCase):
         self.assertFalse(ConnectedMailbox.objects.exists())
 
     @override_settings(**GOOGLE_CONFIGURED)
-    @patch('bookings.services.mailbox_oauth.requests.post')
+    @patch('requests.Session.post')
     def test_a_refused_code_exchange_does_not_half_create_a_mailbox(self, post):
         post.return_value = _response(400, {'error': 'invalid_grant'})
 
@@ -591,7 +592,7 @@ class TestMailboxCallback(TestCase):
         self.assertFalse(ConnectedMailbox.objects.exists())
 
     @override_settings(**GOOGLE_CONFIGURED)
-    @patch('bookings.services.mailbox_oauth.requests.post')
+    @patch('requests.Session.post')
     def test_an_exchange_without_a_refresh_token_is_rejected_rather_than_stored(self, post):
         """A mailbox we can't renew would die silently in an hour."""
         post.return_value = _response(200, {
@@ -605,8 +606,8 @@ class TestMailboxCallback(TestCase):
         self.assertFalse(ConnectedMailbox.objects.exists())
 
     @override_settings(**GOOGLE_CONFIGURED)
-    @patch('bookings.services.mailbox_oauth.requests.get')
-    @patch('bookings.services.mailbox_oauth.requests.post')
+    @patch('requests.Session.get')
+    @patch('requests.Session.post')
     def test_an_exchange_that_yields_no_address_is_rejected(self, post, get):
         post.return_value = _response(200, {
             'access_token': 'a', 'refresh_token': 'r', 'expires_in': 3600,
@@ -619,8 +620,8 @@ class TestMailboxCallback(TestCase):
         self.assertFalse(ConnectedMailbox.objects.exists())
 
     @override_settings(**GOOGLE_CONFIGURED)
-    @patch('bookings.services.mailbox_oauth.requests.get')
-    @patch('bookings.services.mailbox_oauth.requests.post')
+    @patch('requests.Session.get')
+    @patch('requests.Session.post')
     def test_an_address_too_long_for_the_column_is_refused_not_written(self, post, get):
         """Postgres would raise DataError mid-callback; SQLite would store a
         value we could never send from."""
@@ -635,8 +636,8 @@ class TestMailboxCallback(TestCase):
         self.assertFalse(ConnectedMailbox.objects.exists())
 
     @override_settings(**MICROSOFT_CONFIGURED)
-    @patch('bookings.services.mailbox_oauth.requests.get')
-    @patch('bookings.services.mailbox_oauth.requests.post')
+    @patch('requests.Session.get')
+    @patch('requests.Session.post')
     def test_a_principal_name_that_is_not_an_address_is_refused(self, post, get):
         post.return_value = _response(200, {
             'access_token': 'a', 'refresh_token': 'r', 'expires_in': 3600,
@@ -649,7 +650,7 @@ class TestMailboxCallback(TestCase):
         self.assertFalse(ConnectedMailbox.objects.exists())
 
     @override_settings(**GOOGLE_CONFIGURED)
-    @patch('bookings.services.mailbox_oauth.requests.post')
+    @patch('requests.Session.post')
     def test_a_failure_storing_tokens_leaves_no_half_connected_mailbox(self, post):
         """The row and its credentials commit together — otherwise Settings
         shows a green "Connected" badge over a mailbox that cannot send."""
@@ -668,7 +669,7 @@ class TestMailboxCallback(TestCase):
         self.assertFalse(ConnectedMailbox.objects.exists())
 
     @override_settings(**GOOGLE_CONFIGURED)
-    @patch('bookings.services.mailbox_oauth.requests.post')
+    @patch('requests.Session.post')
     def test_reconnecting_replaces_the_previous_connection_and_clears_the_error(self, post):
         _make_mailbox(self.org, provider=ConnectedMailbox.MICROSOFT,
                       email_address='old@acme.com',
@@ -711,7 +712,7 @@ class TestMailboxCallback(TestCase):
         return sub
 
     @override_settings(**GOOGLE_CONFIGURED)
-    @patch('bookings.services.mailbox_oauth.requests.post')
+    @patch('requests.Session.post')
     def test_a_lapsed_org_cannot_connect_when_the_gate_never_saw_the_request(self, post):
         """AC2 — the provider redirect can arrive with no session cookie at all,
         and the middleware leaves unauthenticatable requests alone. The signed
@@ -727,7 +728,7 @@ class TestMailboxCallback(TestCase):
         post.assert_not_called()
 
     @override_settings(**GOOGLE_CONFIGURED)
-    @patch('bookings.services.mailbox_oauth.requests.post')
+    @patch('requests.Session.post')
     def test_a_lapsed_org_cannot_connect_on_a_stale_access_token(self, post):
         """AC1 — the real case: the token expires during the consent screen.
         `_resolve_user` can't read it, so the gate skips; without this check
@@ -742,7 +743,7 @@ class TestMailboxCallback(TestCase):
         post.assert_not_called()
 
     @override_settings(**GOOGLE_CONFIGURED)
-    @patch('bookings.services.mailbox_oauth.requests.post')
+    @patch('requests.Session.post')
     def test_an_org_in_good_standing_connects_exactly_as_before(self, post):
         """AC3 — the check must not cost REL-460 its happy path."""
         post.return_value = _response(200, {
@@ -756,7 +757,7 @@ class TestMailboxCallback(TestCase):
         self.assertTrue(ConnectedMailbox.objects.filter(organisation=self.org).exists())
 
     @override_settings(**GOOGLE_CONFIGURED)
-    @patch('bookings.services.mailbox_oauth.requests.post')
+    @patch('requests.Session.post')
     def test_a_lapsed_org_is_blocked_before_the_code_is_ever_exchanged(self, post):
         """No provider round trip, so the authorisation code stays unspent."""
         self._lapse(self.org)
@@ -764,7 +765,7 @@ class TestMailboxCallback(TestCase):
         post.assert_not_called()
 
     @override_settings(**GOOGLE_CONFIGURED)
-    @patch('bookings.services.mailbox_oauth.requests.post')
+    @patch('requests.Session.post')
     def test_the_mailbox_lands_on_the_org_named_in_the_state(self, post):
         """AC8 — the callback is unauthenticated, so the signed state is the
         only thing that decides whose mailbox this is."""
@@ -802,7 +803,7 @@ class TestMailboxDisconnect(TestCase):
         self.assertFalse(ConnectedMailbox.objects.filter(organisation=self.org).exists())
 
     @override_settings(**GOOGLE_CONFIGURED)
-    @patch('bookings.services.mailbox_oauth.requests.post')
+    @patch('requests.Session.post')
     def test_disconnect_also_asks_google_to_drop_the_grant(self, post):
         _make_mailbox(self.org)
         self.client.post(DISCONNECT_URL)
@@ -812,7 +813,7 @@ class TestMailboxDisconnect(TestCase):
         self.assertEqual(post.call_args[1]['data']['token'], 'refresh-token-abc')
 
     @override_settings(**GOOGLE_CONFIGURED)
-    @patch('bookings.services.mailbox_oauth.requests.post',
+    @patch('requests.Session.post',
            side_effect=RuntimeError('google is down'))
     def test_a_failed_revoke_still_disconnects_locally(self, post):
         _make_mailbox(self.org)
@@ -866,7 +867,7 @@ class TestMailboxSend(TestCase):
     # ── Google ──
 
     @override_settings(**GOOGLE_CONFIGURED)
-    @patch('bookings.services.mailbox_oauth.requests.post')
+    @patch('requests.Session.post')
     def test_google_send_posts_a_raw_mime_message_with_the_attachment_intact(self, post):
         """AC3."""
         _make_mailbox(self.org, email_address='owner@acme.com')
@@ -891,7 +892,7 @@ class TestMailboxSend(TestCase):
         self.assertEqual(parts['quote.pdf'].get_content_type(), 'application/pdf')
 
     @override_settings(**GOOGLE_CONFIGURED)
-    @patch('bookings.services.mailbox_oauth.requests.post')
+    @patch('requests.Session.post')
     def test_a_send_with_no_attachment_still_carries_the_body(self, post):
         _make_mailbox(self.org)
         post.return_value = _response(200, {'id': 'gmail-2'})
@@ -902,7 +903,7 @@ class TestMailboxSend(TestCase):
         self.assertIn(b'Hi', raw)
 
     @override_settings(**GOOGLE_CONFIGURED)
-    @patch('bookings.services.mailbox_oauth.requests.post')
+    @patch('requests.Session.post')
     def test_several_recipients_all_make_it_onto_the_message(self, post):
         _make_mailbox(self.org)
         post.return_value = _response(200, {'id': 'gmail-3'})
@@ -917,7 +918,7 @@ class TestMailboxSend(TestCase):
     # ── Microsoft ──
 
     @override_settings(**MICROSOFT_CONFIGURED)
-    @patch('bookings.services.mailbox_oauth.requests.post')
+    @patch('requests.Session.post')
     def test_microsoft_send_posts_graph_json_with_a_base64_attachment(self, post):
         """AC3, mirrored for the other provider."""
         _make_mailbox(self.org, provider=ConnectedMailbox.MICROSOFT)
@@ -943,7 +944,7 @@ class TestMailboxSend(TestCase):
     # ── Token refresh (AC4) ──
 
     @override_settings(**GOOGLE_CONFIGURED)
-    @patch('bookings.services.mailbox_oauth.requests.post')
+    @patch('requests.Session.post')
     def test_an_expired_access_token_is_renewed_silently_mid_send(self, post):
         """AC4."""
         mailbox = _make_mailbox(
@@ -968,7 +969,7 @@ class TestMailboxSend(TestCase):
         self.assertEqual(mailbox.status, ConnectedMailbox.CONNECTED)
 
     @override_settings(**MICROSOFT_CONFIGURED)
-    @patch('bookings.services.mailbox_oauth.requests.post')
+    @patch('requests.Session.post')
     def test_microsofts_rotated_refresh_token_is_stored(self, post):
         """Graph hands back a new refresh token each time; keeping the old one
         would break the *next* send, not this one."""
@@ -988,7 +989,7 @@ class TestMailboxSend(TestCase):
         self.assertEqual(mailbox.refresh_token, 'rotated-refresh')
 
     @override_settings(**GOOGLE_CONFIGURED)
-    @patch('bookings.services.mailbox_oauth.requests.post')
+    @patch('requests.Session.post')
     def test_a_still_valid_token_is_reused_without_a_refresh_round_trip(self, post):
         _make_mailbox(self.org)
         post.return_value = _response(200, {'id': 'gmail-4'})
@@ -1000,7 +1001,7 @@ class TestMailboxSend(TestCase):
     # ── Revoked / broken connection (AC5) ──
 
     @override_settings(**GOOGLE_CONFIGURED)
-    @patch('bookings.services.mailbox_oauth.requests.post')
+    @patch('requests.Session.post')
     def test_a_revoked_grant_flips_to_needs_reconnect_and_never_retries(self, post):
         """AC5."""
         mailbox = _make_mailbox(
@@ -1018,7 +1019,7 @@ class TestMailboxSend(TestCase):
         self.assertEqual(post.call_count, 1)
 
     @override_settings(**GOOGLE_CONFIGURED)
-    @patch('bookings.services.mailbox_oauth.requests.post')
+    @patch('requests.Session.post')
     def test_a_401_from_the_send_itself_also_flips_to_needs_reconnect(self, post):
         """AC5 — the grant can die between the refresh and the send."""
         mailbox = _make_mailbox(self.org)
@@ -1031,7 +1032,7 @@ class TestMailboxSend(TestCase):
         self.assertEqual(mailbox.status, ConnectedMailbox.NEEDS_RECONNECT)
 
     @override_settings(**GOOGLE_CONFIGURED)
-    @patch('bookings.services.mailbox_oauth.requests.post')
+    @patch('requests.Session.post')
     def test_a_withdrawn_scope_403_also_needs_a_reconnect(self, post):
         mailbox = _make_mailbox(self.org)
         post.return_value = _response(403, {'error': {'message': 'insufficient scope'}})
@@ -1043,7 +1044,7 @@ class TestMailboxSend(TestCase):
         self.assertEqual(mailbox.status, ConnectedMailbox.NEEDS_RECONNECT)
 
     @override_settings(**GOOGLE_CONFIGURED)
-    @patch('bookings.services.mailbox_oauth.requests.post')
+    @patch('requests.Session.post')
     def test_a_gmail_rate_limit_403_is_transient_and_keeps_the_connection(self, post):
         """Gmail answers 403 for usage limits as well as for lost permission.
         Treating a burst of quotes as a revoked grant would make the caterer
@@ -1062,7 +1063,7 @@ class TestMailboxSend(TestCase):
         self.assertEqual(mailbox.status, ConnectedMailbox.CONNECTED)
 
     @override_settings(**GOOGLE_CONFIGURED)
-    @patch('bookings.services.mailbox_oauth.requests.post')
+    @patch('requests.Session.post')
     def test_a_daily_quota_403_also_keeps_the_connection(self, post):
         mailbox = _make_mailbox(self.org)
         post.return_value = _response(403, {'error': {
@@ -1077,7 +1078,7 @@ class TestMailboxSend(TestCase):
         self.assertEqual(mailbox.status, ConnectedMailbox.CONNECTED)
 
     @override_settings(**GOOGLE_CONFIGURED)
-    @patch('bookings.services.mailbox_oauth.requests.post')
+    @patch('requests.Session.post')
     def test_unreadable_stored_credentials_ask_for_a_reconnect_not_a_500(self, post):
         """If the encryption key changes without the old one kept as a
         fallback, every token becomes unreadable. REL-445 must get a typed
@@ -1096,7 +1097,7 @@ class TestMailboxSend(TestCase):
         post.assert_not_called()
 
     @override_settings(**GOOGLE_CONFIGURED)
-    @patch('bookings.services.mailbox_oauth.requests.post')
+    @patch('requests.Session.post')
     def test_a_mailbox_with_no_refresh_token_asks_for_a_reconnect(self, post):
         mailbox = _make_mailbox(
             self.org, access_token_expires_at=timezone.now() - timedelta(minutes=5),
@@ -1111,7 +1112,7 @@ class TestMailboxSend(TestCase):
         post.assert_not_called()
 
     @override_settings(**GOOGLE_CONFIGURED)
-    @patch('bookings.services.mailbox_oauth.requests.post')
+    @patch('requests.Session.post')
     def test_a_provider_outage_does_not_burn_the_connection(self, post):
         """A 500 is Google's problem, not a revoked grant — flipping the mailbox
         would make every caterer reconnect over a blip."""
@@ -1127,7 +1128,7 @@ class TestMailboxSend(TestCase):
         self.assertEqual(mailbox.status, ConnectedMailbox.CONNECTED)
 
     @override_settings(**GOOGLE_CONFIGURED)
-    @patch('bookings.services.mailbox_oauth.requests.post',
+    @patch('requests.Session.post',
            side_effect=RuntimeError('connection reset'))
     def test_a_network_error_is_a_send_failure_not_a_reconnect(self, post):
         mailbox = _make_mailbox(self.org)
@@ -1139,7 +1140,7 @@ class TestMailboxSend(TestCase):
         self.assertEqual(mailbox.status, ConnectedMailbox.CONNECTED)
 
     @override_settings(**GOOGLE_CONFIGURED)
-    @patch('bookings.services.mailbox_oauth.requests.post')
+    @patch('requests.Session.post')
     def test_a_provider_error_never_echoes_the_client_secret(self, post):
         _make_mailbox(
             self.org, access_token_expires_at=timezone.now() - timedelta(minutes=5),
@@ -1158,7 +1159,7 @@ class TestMailboxSend(TestCase):
             self._send()
 
     @override_settings(**GOOGLE_CONFIGURED)
-    @patch('bookings.services.mailbox_oauth.requests.post')
+    @patch('requests.Session.post')
     def test_a_mailbox_already_needing_reconnect_refuses_before_any_network_call(self, post):
         _make_mailbox(self.org, status=ConnectedMailbox.NEEDS_RECONNECT)
 
@@ -1177,7 +1178,7 @@ class TestMailboxSend(TestCase):
         self.assertFalse(email_service.mailbox_is_usable(self.org))
 
     @override_settings(**GOOGLE_CONFIGURED)
-    @patch('bookings.services.mailbox_oauth.requests.post')
+    @patch('requests.Session.post')
     def test_one_orgs_send_never_uses_another_orgs_mailbox(self, post):
         """AC8."""
         _make_mailbox(_other_org(), email_address='rival@rival.com')
@@ -1190,7 +1191,7 @@ class TestMailboxSend(TestCase):
     # ── Fake transport (AC9) ──
 
     @override_settings(**NOTHING_CONFIGURED)
-    @patch('bookings.services.mailbox_oauth.requests.post')
+    @patch('requests.Session.post')
     def test_without_an_oauth_app_the_send_is_captured_instead_of_posted(self, post):
         """AC9."""
         _make_mailbox(self.org, email_address='owner@acme.com')
@@ -1215,7 +1216,7 @@ class TestMailboxSend(TestCase):
         self.assertEqual(email_service.outbox, [])
 
     @override_settings(**MISCONFIGURED_PROD)
-    @patch('bookings.services.mailbox_oauth.requests.post')
+    @patch('requests.Session.post')
     def test_a_production_box_missing_its_oauth_app_fails_loudly(self, post):
         """The regression this pins: with fake mode keyed only off "is the
         client id set", a credential that never reached production turned every
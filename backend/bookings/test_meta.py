@@ -1,7 +1,7 @@
 """The org's connected Meta Pages: OAuth connect, picker, disconnect (REL-506).
 
 No real Meta app is ever contacted — every Graph HTTP call is patched at the
-`requests` boundary inside `bookings.services.meta`. The whole surface is gated
+`requests.Session` boundary of the shared Graph session. The whole surface is gated
 by META_LEADS_ENABLED, so most tests turn it on; the flag-off case is asserted
 explicitly.
 """
@@ -334,7 +334,7 @@ class TestMetaCallback(TestCase):
         self.assertEqual(connection.connected_by, self.user)
 
     @override_settings(**APP_CONFIGURED)
-    @patch('bookings.services.meta.requests.post')
+    @patch('requests.Session.post')
     def test_configured_callback_exchanges_for_a_long_lived_user_token(self, post):
         # Token exchange goes over POST (secret in the body), so both the
         # short- and long-lived exchanges are POSTs.
@@ -351,7 +351,7 @@ class TestMetaCallback(TestCase):
         self.assertNotIn('long-user-token', connection.user_access_token_encrypted)
 
     @override_settings(**APP_CONFIGURED)
-    @patch('bookings.services.meta.requests.post')
+    @patch('requests.Session.post')
     def test_a_tampered_state_is_refused(self, post):
         response = self._call(self._state() + 'tampered')
         self.assertIn('meta_error=invalid_state', response['Location'])
@@ -359,7 +359,7 @@ class TestMetaCallback(TestCase):
         post.assert_not_called()
 
     @override_settings(**APP_CONFIGURED)
-    @patch('bookings.services.meta.requests.post')
+    @patch('requests.Session.post')
     def test_a_state_from_another_browser_is_refused(self, post):
         """AC7 — without the nonce binding, an admin of org A could hand this
         link to org B and capture B's connection onto A."""
@@ -369,7 +369,7 @@ class TestMetaCallback(TestCase):
         post.assert_not_called()
 
     @override_settings(**APP_CONFIGURED)
-    @patch('bookings.services.meta.requests.post')
+    @patch('requests.Session.post')
     def test_a_state_with_no_binding_is_refused_rather_than_matching_nothing(self, post):
         self.client.cookies.pop(NONCE_COOKIE, None)
         response = self.client.get(CALLBACK_URL, {
@@ -395,7 +395,7 @@ class TestMetaCallback(TestCase):
         self.assertFalse(MetaAccountConnection.objects.exists())
 
     @override_settings(**APP_CONFIGURED)
-    @patch('bookings.services.meta.requests.post')
+    @patch('requests.Session.post')
     def test_a_refused_exchange_does_not_half_create_a_connection(self, post):
         post.return_value = _response(400, {'error': {'message': 'bad code'}})
         response = self._call(self._state())
@@ -464,7 +464,7 @@ class TestMetaPagesList(TestCase):
         self.assertNotIn('token', json.dumps(body))
 
     @override_settings(**APP_CONFIGURED)
-    @patch('bookings.services.meta.requests.get')
+    @patch('requests.Session.get')
     def test_configured_mode_lists_live_pages_and_marks_connected(self, get):
         """AC3, AC4 — already-connected Pages come back flagged."""
         connection = _make_connection(self.org)
@@ -479,7 +479,7 @@ class TestMetaPagesList(TestCase):
         self.assertNotIn('page-token-1', json.dumps(body))
 
     @override_settings(**APP_CONFIGURED)
-    @patch('bookings.services.meta.requests.get')
+    @patch('requests.Session.get')
     def test_a_graph_failure_surfaces_as_a_bad_gateway_not_a_500(self, get):
         _make_connection(self.org)
         get.return_value = _response(400, {'error': {'message': 'token expired'}})
@@ -523,8 +523,8 @@ class TestMetaPagesConnect(TestCase):
         self.assertNotIn('token', json.dumps(response.json()))
 
     @override_settings(**APP_CONFIGURED)
-    @patch('bookings.services.meta.requests.post')
-    @patch('bookings.services.meta.requests.get')
+    @patch('requests.Session.post')
+    @patch('requests.Session.get')
     def test_configured_connect_subscribes_the_page_then_stores_the_row(self, get, post):
         """AC4, AC5 (subscription created)."""
         _make_connection(self.org)
@@ -545,8 +545,8 @@ class TestMetaPagesConnect(TestCase):
         self.assertEqual(page.instagram_account_id, 'IG1')
 
     @override_settings(**APP_CONFIGURED)
-    @patch('bookings.services.meta.requests.post')
-    @patch('bookings.services.meta.requests.get')
+    @patch('requests.Session.post')
+    @patch('requests.Session.get')
     def test_a_failed_subscription_reports_an_error_and_stores_no_row(self, get, post):
         """A row must never exist for a Page whose webhook subscription failed."""
         _make_connection(self.org)
@@ -559,8 +559,8 @@ class TestMetaPagesConnect(TestCase):
         self.assertFalse(ConnectedMetaPage.objects.filter(page_id='PAGE1').exists())
 
     @override_settings(**APP_CONFIGURED)
-    @patch('bookings.services.meta.requests.post')
-    @patch('bookings.services.meta.requests.get')
+    @patch('requests.Session.post')
+    @patch('requests.Session.get')
     def test_an_unknown_page_id_is_reported_not_connected(self, get, post):
         _make_connection(self.org)
         get.return_value = _response(200, _pages_payload())
@@ -613,7 +613,7 @@ class TestMetaDisconnect(TestCase):
         self.assertFalse(ConnectedMetaPage.objects.filter(page_id='PAGE1').exists())
 
     @override_settings(**APP_CONFIGURED)
-    @patch('bookings.services.meta.requests.delete')
+    @patch('requests.Session.delete')
     def test_disconnect_also_asks_meta_to_drop_the_subscription(self, delete):
         """AC5."""
         _make_page(self.org, page_id='PAGE1', token='page-token-1')
@@ -624,7 +624,7 @@ class TestMetaDisconnect(TestCase):
         self.assertEqual(delete.call_args[1]['params']['access_token'], 'page-token-1')
 
     @override_settings(**APP_CONFIGURED)
-    @patch('bookings.services.meta.requests.delete', side_effect=RuntimeError('meta down'))
+    @patch('requests.Session.delete', side_effect=RuntimeError('meta down'))
     def test_a_failed_unsubscribe_still_disconnects_locally(self, delete):
         _make_page(self.org, page_id='PAGE1')
         self.assertEqual(
@@ -685,7 +685,7 @@ class TestMetaDisconnectAccount(TestCase):
         self.assertFalse(ConnectedMetaPage.objects.filter(organisation=self.org).exists())
 
     @override_settings(**APP_CONFIGURED)
-    @patch('bookings.services.meta.requests.delete')
+    @patch('requests.Session.delete')
     def test_unsubscribes_each_page_and_revokes_the_grant(self, delete):
         connection = _make_connection(self.org)
         _make_page(self.org, connection=connection, page_id='PAGE1', token='page-token-1')
@@ -733,7 +733,7 @@ class TestMetaDisconnectAccount(TestCase):
 class TestMetaService(TestCase):
     @override_settings(**APP_CONFIGURED)
     @patch('bookings.services.meta._business_pages', return_value=[])
-    @patch('bookings.services.meta.requests.get')
+    @patch('requests.Session.get')
     def test_list_pages_follows_paging(self, get, _biz):
         get.side_effect = [
             _response(200, {
@@ -748,9 +748,32 @@ class TestMetaService(TestCase):
         self.assertEqual([p['page_id'] for p in pages], ['P1', 'P2'])
         self.assertEqual(get.call_count, 2)
 
+    def test_form_leads_since_filters_on_time_created_through_the_session(self):
+        from datetime import datetime, timezone
+        session = MagicMock()
+        session.get.return_value = _response(200, {'data': [{'id': 'L1'}]})
+        since = datetime(2026, 8, 16, 10, 0, tzinfo=timezone.utc)
+        leads = meta.list_form_leads('FORM1', 'page-token', since=since, session=session)
+        self.assertEqual(leads, [{'id': 'L1'}])
+        params = session.get.call_args.kwargs['params']
+        self.assertEqual(json.loads(params['filtering']), [{
+            'field': 'time_created', 'operator': 'GREATER_THAN', 'value': int(since.timestamp()),
+        }])
+
+    @patch('bookings.services.meta.time.sleep')
+    @patch('bookings.services.meta.time.monotonic')
+    def test_paced_session_spaces_its_calls(self, monotonic, sleep):
+        monotonic.side_effect = [100.0, 100.0, 100.1, 100.5]
+        paced = meta.PacedSession(MagicMock(), calls_per_second=2)
+        paced.get('https://graph.facebook.com/a')
+        sleep.assert_not_called()
+        paced.get('https://graph.facebook.com/b')
+        sleep.assert_called_once()
+        self.assertAlmostEqual(sleep.call_args.args[0], 0.4)
+
     @override_settings(**APP_CONFIGURED)
     @patch('bookings.services.meta._business_pages', return_value=[])
-    @patch('bookings.services.meta.requests.get')
+    @patch('requests.Session.get')
     def test_a_graph_error_never_echoes_the_app_secret(self, get, _biz):
         get.return_value = _response(400, {'error': {'message': 'bad'}})
         with self.assertRaises(meta.MetaApiError) as caught:
@@ -778,7 +801,7 @@ class TestMetaService(TestCase):
         self.assertEqual(pages['A']['page_access_token'], 'direct-tok')  # direct wins
 
     @override_settings(**APP_CONFIGURED)
-    @patch('bookings.services.meta.requests.get')
+    @patch('requests.Session.get')
     def test_business_pages_span_owned_and_client_and_skip_tokenless(self, get):
         get.side_effect = [
             _response(200, {'data': [{'id': 'B1'}]}),  # /me/businesses
@@ -795,7 +818,7 @@ class TestMetaService(TestCase):
 
     @override_settings(**APP_CONFIGURED)
     @patch('bookings.services.meta._accounts_pages')
-    @patch('bookings.services.meta.requests.get')
+    @patch('requests.Session.get')
     def test_business_lookup_degrades_gracefully_when_not_granted(self, get, accounts):
         """REL-513 AC2 — if business_management isn't granted, the picker still
         returns directly-owned Pages instead of erroring."""
@@ -814,8 +837,8 @@ class TestMetaService(TestCase):
             self.assertTrue(meta.app_configured())
 
     @override_settings(**APP_CONFIGURED)
-    @patch('bookings.services.meta.requests.get')
-    @patch('bookings.services.meta.requests.post')
+    @patch('requests.Session.get')
+    @patch('requests.Session.post')
     def test_token_exchange_posts_the_secret_in_the_body_not_the_url(self, post, get):
         """The app secret must never travel in a URL query string, where a
         proxy log or a network-error traceback could capture it."""
@@ -829,7 +852,7 @@ class TestMetaService(TestCase):
         self.assertEqual(post.call_args[1]['data']['client_secret'], 'app-secret')
 
     @override_settings(**APP_CONFIGURED)
-    @patch('bookings.services.meta.requests.post',
+    @patch('requests.Session.post',
            side_effect=meta.requests.ConnectionError('Max retries: /oauth?client_secret=app-secret'))
     def test_a_transport_error_never_carries_the_secret_out_of_the_service(self, post):
         """A raw requests error stringifies with the full URL; collapse it to a
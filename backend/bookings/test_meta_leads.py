@@ -14,7 +14,7 @@ from django.test import TestCase, override_settings
 from rest_framework.test import APIClient
 
 from bookings.models import (
-    ConnectedMetaPage, Lead, MetaAccountConnection, MetaWebhookEvent,
+    ConnectedMetaPage, Lead, MetaAccountConnection, MetaFormCursor, MetaWebhookEvent,
 )
 from bookings.models.activity import ActivityLog
 from bookings.services import meta_leads
@@ -274,6 +274,35 @@ class TestMetaLeadBackfill(TestCase):
         self.assertEqual(second, 0)
         self.assertEqual(Lead.objects.filter(meta_leadgen_id='BACKFILL1').count(), 1)
 
+    @patch('bookings.services.meta.list_form_leads')
+    @patch('bookings.services.meta.list_lead_forms')
+    def test_each_form_is_read_from_its_high_water_mark(self, forms, form_leads):
+        forms.return_value = ['FORM1']
+        older = _lead_object(leadgen_id='OLD')
+        newer = dict(_lead_object(leadgen_id='NEW'), created_time='2026-08-17T09:30:00+0000')
+        form_leads.return_value = [newer, older]
+
+        meta_leads.backfill_all()
+        self.assertIsNone(form_leads.call_args.kwargs['since'])
+        cursor = MetaFormCursor.objects.get(page=self.page, form_id='FORM1')
+        self.assertEqual(cursor.last_created_time.isoformat(), '2026-08-17T09:30:00+00:00')
+
+        form_leads.return_value = []
+        meta_leads.backfill_all()
+        self.assertEqual(
+            form_leads.call_args.kwargs['since'],
+            cursor.last_created_time - meta_leads.CURSOR_OVERLAP,
+        )
+
+    @patch('bookings.services.meta_leads._build_lead', side_effect=RuntimeError('db hiccup'))
+    @patch('bookings.services.meta.list_form_leads')
+    @patch('bookings.services.meta.list_lead_forms')
+    def test_a_failed_sweep_leaves_the_mark_where_it_was(self, forms, form_leads, _build):
+        forms.return_value = ['FORM1']
+        form_leads.return_value = [_lead_object()]
+        self.assertEqual(meta_leads.backfill_all(), 0)
+        self.assertFalse(MetaFormCursor.objects.exists())
+
     @patch('bookings.services.meta.list_lead_forms', return_value=[])
     def test_cron_endpoint_requires_the_secret(self, _forms):
         # list_lead_forms mocked so the authorised call can't reach the network.
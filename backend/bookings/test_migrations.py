@@ -75,3 +75,39 @@ class TestPersonFirstBackfill(TransactionTestCase):
         # Every contact created during backfill is org-scoped.
         self.assertTrue(Contact2.objects.exists())
         self.assertFalse(Contact2.objects.filter(organisation__isnull=True).exists())
+
+
+class TestActivityLogOrganisationBackfill(TransactionTestCase):
+    """bookings.0091 copies each log's organisation from the object it points at."""
+    migrate_from = [('bookings', '0090_activitylog_organisation')]
+    migrate_to = [('bookings', '0091_backfill_activitylog_organisation')]
+
+    def _migrate(self, targets):
+        executor = MigrationExecutor(connection)
+        executor.loader.build_graph()
+        executor.migrate(targets)
+        return executor.loader.project_state(targets).apps
+
+    def tearDown(self):
+        from django.core.management import call_command
+        call_command("migrate", verbosity=0)
+
+    def test_backfill(self):
+        old = self._migrate(self.migrate_from)
+        Org = old.get_model('users', 'Organisation')
+        Lead = old.get_model('bookings', 'Lead')
+        ActivityLog = old.get_model('bookings', 'ActivityLog')
+        ContentType = old.get_model('contenttypes', 'ContentType')
+
+        org = Org.objects.create(name='LogOrg', slug='log-org', country='PK')
+        lead = Lead.objects.create(organisation=org, contact_name='Logged Lead')
+        lead_ct, _ = ContentType.objects.get_or_create(app_label='bookings', model='lead')
+        org_ct, _ = ContentType.objects.get_or_create(app_label='users', model='organisation')
+        lead_log = ActivityLog.objects.create(content_type=lead_ct, object_id=lead.pk, action='created')
+        # A target with no organisation field stays null.
+        other_log = ActivityLog.objects.create(content_type=org_ct, object_id=org.pk, action='updated')
+
+        new = self._migrate(self.migrate_to)
+        ActivityLog2 = new.get_model('bookings', 'ActivityLog')
+        self.assertEqual(ActivityLog2.objects.get(pk=lead_log.pk).organisation_id, org.pk)
+        self.assertIsNone(ActivityLog2.objects.get(pk=other_log.pk).organisation_id)
@@ -0,0 +1,219 @@
+"""The outbound-message outbox: queued sends, per-route delivery, retries."""
+from io import StringIO
+from unittest.mock import patch
+
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from twilio.base.exceptions import TwilioRestException
+
+from bookings.models import ActivityLog, FollowUpDraft, OutboxMessage, WhatsAppMessage
+from bookings.models.quotes import QuoteStatus
+from bookings.services import email as email_service
+from bookings.services import outbox
+from bookings.test_client_messaging import (
+    MessagingTestBase, TWILIO_ACCOUNT, connect_mailbox, enable_twilio, twilio_ok,
+)
+from bookings.test_followups import _configure_ai, _stale_lead, platform_creds
+from bookings.tests import _authenticated_client
+from bookings.views.public_sign import sign_booking
+from tests.base import get_test_user
+
+
+@platform_creds
+@override_settings(OUTBOX_MODE='off')
+class QueuedApprovalTests(TestCase):
+    BASE = '/api/bookings/followup-drafts/'
+
+    def setUp(self):
+        self.org = get_test_user().organisation
+        _configure_ai(self.org)
+        self.client = _authenticated_client()
+        self.drafts = [
+            FollowUpDraft.objects.create(
+                organisation=self.org, lead=_stale_lead(self.org, contact_name=name),
+                body=f'Hi {name}!', status='pending',
+            )
+            for name in ('Sam', 'Jo')
+        ]
+
+    def test_bulk_approve_queues_and_a_drain_delivers(self):
+        with patch('twilio.rest.Client', return_value=twilio_ok()) as client:
+            res = self.client.post(f'{self.BASE}bulk-approve/', {}, format='json')
+            self.assertEqual(res.status_code, 200)
+            client.return_value.messages.create.assert_not_called()
+            self.assertEqual(
+                set(WhatsAppMessage.objects.values_list('status', flat=True)), {'queued'},
+            )
+            self.assertEqual(FollowUpDraft.objects.filter(status='sent').count(), 2)
+
+            self.assertEqual(outbox.drain(concurrency=1), 2)
+        self.assertEqual(client.return_value.messages.create.call_count, 2)
+        self.assertEqual(
+            set(WhatsAppMessage.objects.values_list('status', flat=True)), {'sent'},
+        )
+        self.assertFalse(outbox.pending().exists())
+
+    def _draft_activity(self, draft):
+        return list(
+            ActivityLog.objects.filter(object_id=draft.lead_id, field_name='followup_draft')
+            .order_by('pk').values_list('description', flat=True)
+        )
+
+    def test_an_approval_is_logged_as_queued_and_the_send_once_it_goes(self):
+        draft = self.drafts[0]
+        res = self.client.post(f'{self.BASE}{draft.id}/approve/', {}, format='json')
+        self.assertEqual(res.data['message_status'], 'queued')
+        self.assertEqual(self._draft_activity(draft), ['Approved & queued an AI-drafted follow-up'])
+
+        with patch('twilio.rest.Client', return_value=twilio_ok()):
+            outbox.drain(concurrency=1)
+        self.assertEqual(self._draft_activity(draft), [
+            'Approved & queued an AI-drafted follow-up', 'Sent an AI-drafted follow-up',
+        ])
+        res = self.client.get(f'{self.BASE}?status=sent')
+        self.assertEqual([d['message_status'] for d in res.data['results']], ['sent'])
+
+    def test_a_transient_failure_backs_off_and_holds_back_the_number(self):
+        self.client.post(f'{self.BASE}bulk-approve/', {}, format='json')
+        first, second = OutboxMessage.objects.order_by('created_at', 'pk')
+        self.assertEqual(first.route, second.route)
+
+        client = twilio_ok()
+        client.messages.create.side_effect = RuntimeError('twilio timed out')
+        with patch('twilio.rest.Client', return_value=client):
+            self.assertEqual(outbox.drain(concurrency=1), 0)
+        first.refresh_from_db()
+        second.refresh_from_db()
+        self.assertEqual(first.attempts, 1)
+        self.assertIn('timed out', first.error)
+        self.assertGreater(first.next_attempt_at, timezone.now())
+        self.assertIsNone(first.failed_at)
+        self.assertEqual(first.message.status, 'queued')
+        # Same number, so not even tried.
+        self.assertEqual(second.attempts, 0)
+
+        # Once it is due again, the route goes out in order.
+        OutboxMessage.objects.filter(pk=first.pk).update(next_attempt_at=timezone.now())
+        with patch('twilio.rest.Client', return_value=twilio_ok()):
+            self.assertEqual(outbox.drain(concurrency=1), 2)
+
+    def test_a_refused_message_fails_at_once_and_returns_its_draft(self):
+        self.client.post(f'{self.BASE}bulk-approve/', {}, format='json')
+        first, second = OutboxMessage.objects.order_by('created_at', 'pk')
+
+        client = twilio_ok()
+        client.messages.create.side_effect = [
+            TwilioRestException(400, 'https://api.twilio.com', 'not a WhatsApp number'),
+            twilio_ok('SM2').messages.create.return_value,
+        ]
+        with patch('twilio.rest.Client', return_value=client):
+            self.assertEqual(outbox.drain(concurrency=1), 1)
+        first.refresh_from_db()
+        self.assertIsNotNone(first.failed_at)
+        self.assertEqual(first.attempts, 1)
+        self.assertEqual(first.message.status, 'failed')
+        self.assertIn('not a WhatsApp number', first.message.error_message)
+        draft = FollowUpDraft.objects.get(pk=first.draft_id)
+        self.assertEqual(draft.status, 'pending')
+        self.assertIsNone(draft.whatsapp_message_id)
+        # The route moved on to the next message.
+        second.refresh_from_db()
+        self.assertEqual(second.message.status, 'sent')
+
+    @override_settings(OUTBOX_MAX_ATTEMPTS=2)
+    def test_the_last_attempt_is_final(self):
+        self.drafts[1].delete()
+        self.client.post(f'{self.BASE}bulk-approve/', {}, format='json')
+        entry = OutboxMessage.objects.get()
+        client = twilio_ok()
+        client.messages.create.side_effect = RuntimeError('twilio down')
+        with patch('twilio.rest.Client', return_value=client):
+            outbox.drain(concurrency=1)
+            OutboxMessage.objects.filter(pk=entry.pk).update(next_attempt_at=timezone.now())
+            outbox.drain(concurrency=1)
+        entry.refresh_from_db()
+        self.assertEqual(entry.attempts, 2)
+        self.assertIsNotNone(entry.failed_at)
+        self.assertEqual(entry.message.status, 'failed')
+
+    def test_a_claimed_entry_is_not_sent_twice(self):
+        self.drafts[1].delete()
+        self.client.post(f'{self.BASE}bulk-approve/', {}, format='json')
+        entry = OutboxMessage.objects.get()
+        self.assertTrue(outbox.queue.claim(entry, timezone.now()))
+        self.assertFalse(outbox.queue.claim(entry, timezone.now()))
+        with patch('twilio.rest.Client', return_value=twilio_ok()) as client:
+            self.assertEqual(outbox.drain(concurrency=1), 0)
+        client.return_value.messages.create.assert_not_called()
+
+    def test_the_command_drains_the_outbox(self):
+        self.client.post(f'{self.BASE}bulk-approve/', {}, format='json')
+        out = StringIO()
+        with patch('twilio.rest.Client', return_value=twilio_ok()):
+            call_command('process_outbox', '--concurrency', '1', stdout=out)
+        self.assertIn('2 message(s) delivered', out.getvalue())
+
+
+@platform_creds
+@override_settings(OUTBOX_MODE='thread')
+class ThreadModeTests(TestCase):
+    def test_the_worker_is_woken_once_the_send_commits(self):
+        org = get_test_user().organisation
+        _configure_ai(org)
+        draft = FollowUpDraft.objects.create(
+            organisation=org, lead=_stale_lead(org), body='Hi!', status='pending',
+        )
+        with patch.object(outbox.worker, 'wake') as wake:
+            with self.captureOnCommitCallbacks(execute=False) as callbacks:
+                _authenticated_client().post(
+                    f'/api/bookings/followup-drafts/{draft.id}/approve/', {}, format='json',
+                )
+            wake.assert_not_called()
+            for callback in callbacks:
+                callback()
+            wake.assert_called_once()
+        self.assertEqual(WhatsAppMessage.objects.get().status, 'queued')
+
+
+@override_settings(**TWILIO_ACCOUNT, OUTBOX_MODE='off')
+class QueuedSignedCopyTests(MessagingTestBase):
+    def _sign(self, booking):
+        return sign_booking(
+            booking, signer_name='Nadia Okonjo', signer_email='',
+            signature_image='', ip='127.0.0.1', user_agent='tests',
+        )
+
+    def test_signing_queues_the_copy_and_a_drain_sends_the_signed_pdf(self):
+        connect_mailbox(self.org)
+        sig = self._sign(self.make_quote(status=QuoteStatus.SENT))
+        self.assertEqual(email_service.outbox, [])
+        entry = OutboxMessage.objects.get()
+        self.assertEqual((entry.route, entry.signature_id), (f'mailbox:{self.org.pk}', sig.pk))
+
+        self.assertEqual(outbox.drain(concurrency=1), 1)
+        filename, content, _ = email_service.outbox[0]['attachments'][0]
+        self.assertTrue(filename.endswith('-signed.pdf'))
+        self.assertEqual(content, bytes(sig.signed_pdf))
+        entry.message.refresh_from_db()
+        self.assertEqual(entry.message.status, 'sent')
+
+    def test_one_channel_failing_is_not_an_undelivered_copy(self):
+        connect_mailbox(self.org)
+        enable_twilio(self.org)
+        self._sign(self.make_quote(status=QuoteStatus.SENT))
+        self.assertEqual(
+            sorted(OutboxMessage.objects.values_list('route', flat=True)),
+            [f'mailbox:{self.org.pk}', 'twilio:whatsapp:+14155238886'],
+        )
+        client = twilio_ok()
+        client.messages.create.side_effect = TwilioRestException(
+            400, 'https://api.twilio.com', 'refused',
+        )
+        with patch('twilio.rest.Client', return_value=client):
+            self.assertEqual(outbox.drain(concurrency=1), 1)
+        self.assertEqual(len(email_service.outbox), 1)
+        statuses = dict(WhatsAppMessage.objects.values_list('channel', 'status'))
+        self.assertEqual(statuses, {'email': 'sent', 'whatsapp': 'failed'})
+        # No task row: the email got through.
+        self.assertFalse(WhatsAppMessage.objects.filter(status=WhatsAppMessage.TO_SEND).exists())
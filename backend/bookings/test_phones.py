@@ -1,7 +1,7 @@
 """Phone normalization: the inference rules and the save hooks."""
-from django.test import TestCase
+from django.test import TestCase, override_settings
 
-from bookings.models import Contact, Lead, OrgSettings
+from bookings.models import Contact, Lead, OrgSettings, TwilioWebhookEvent
 from bookings.phones import normalize_phone
 from tests.base import get_test_user
 
@@ -66,3 +66,75 @@ class SaveHookTests(TestCase):
         mod.normalize_existing(django_apps, None)
         lead.refresh_from_db()
         self.assertEqual(lead.contact_phone, '+923334455667')
+
+
+class PhoneDigitsTests(TestCase):
+    """The indexed digits columns inbound WhatsApp matches on."""
+    WEBHOOK_URL = '/api/bookings/whatsapp/webhook/'
+
+    def setUp(self):
+        self.org = get_test_user().organisation
+        self.org.country = 'PK'
+        self.org.save()
+        self.settings = OrgSettings.for_org(self.org)
+        self.settings.whatsapp_enabled = True
+        self.settings.twilio_whatsapp_number = '+14155238886'
+        self.settings.save()
+
+    def test_kept_on_save(self):
+        lead = Lead.objects.create(
+            organisation=self.org, contact_name='Sam Jones', contact_phone='0300 1269792',
+        )
+        self.assertEqual(lead.phone_digits, '923001269792')
+        lead.contact_phone = '+447911123456'
+        lead.save(update_fields=['contact_phone'])
+        lead.refresh_from_db()
+        self.assertEqual(lead.phone_digits, '447911123456')
+        self.assertEqual(
+            OrgSettings.objects.get(pk=self.settings.pk).twilio_whatsapp_number_digits, '14155238886',
+        )
+
+    def test_command_backfills_stale_rows(self):
+        from io import StringIO
+        from django.core.management import call_command
+        lead = Lead.objects.create(organisation=self.org, contact_name='Old Row')
+        Lead.objects.filter(pk=lead.pk).update(contact_phone='+923334455667')
+        out = StringIO()
+        call_command('backfill_phone_digits', stdout=out)
+        self.assertIn('1 lead(s)', out.getvalue())
+        lead.refresh_from_db()
+        self.assertEqual(lead.phone_digits, '923334455667')
+
+    def _inbound(self, from_number):
+        from unittest.mock import patch
+        from rest_framework.test import APIClient
+        from bookings.views.whatsapp import TwilioWebhookView
+        with patch.object(TwilioWebhookView, '_validate_signature', return_value=True):
+            return APIClient().post(self.WEBHOOK_URL, {
+                'MessageSid': 'SM1', 'Body': 'Hi there',
+                'From': from_number, 'To': 'whatsapp:+14155238886',
+            })
+
+    def test_inbound_matches_lead_in_one_indexed_lookup(self):
+        from bookings.models import WhatsAppMessage
+        from bookings.services.whatsapp import process_webhook_event
+        lead = Lead.objects.create(
+            organisation=self.org, contact_name='Sam Jones', contact_phone='03001269792',
+        )
+        with override_settings(WEBHOOK_QUEUE_MODE='off'):
+            res = self._inbound('whatsapp:+923001269792')
+        self.assertEqual(res.status_code, 200)
+        event = TwilioWebhookEvent.objects.get()
+        # org settings, lead, the message's same-org check, message insert,
+        # inside the handler's savepoint
+        with self.assertNumQueries(6):
+            process_webhook_event(event)
+        self.assertEqual(WhatsAppMessage.objects.get().lead, lead)
+
+    def test_inbound_to_an_unknown_number_is_accepted_and_dropped(self):
+        from bookings.models import WhatsAppMessage
+        self.settings.twilio_whatsapp_number = '+15550000000'
+        self.settings.save()
+        self.assertEqual(self._inbound('whatsapp:+923001269792').status_code, 200)
+        self.assertFalse(WhatsAppMessage.objects.exists())
+        self.assertIsNotNone(TwilioWebhookEvent.objects.get().processed_at)
@@ -20,6 +20,7 @@ from bookings.models import ConnectedMailbox, OrgSettings
 from bookings.services import email as email_service
 from bookings.services import mailbox_oauth
 from bookings.tests import _make_org, make_lead
+from portioning import outbound
 from users.models import Organisation
 
 GOOGLE_CONFIGURED = dict(
@@ -63,7 +64,7 @@ class MailboxSendTimeoutTests(TestCase):
             self.org, to='client@example.com', subject='s', body='b',
         )
 
-    @patch('bookings.services.mailbox_oauth.requests.post')
+    @patch('requests.Session.post')
     def test_the_send_call_is_bounded_by_the_send_budget(self, post):
         _mailbox(self.org)
         post.return_value = _response(json_data={'id': 'gmail-1'})
@@ -74,7 +75,7 @@ class MailboxSendTimeoutTests(TestCase):
         # Not the interactive budget — that's the bug this pins.
         self.assertNotEqual(post.call_args.kwargs['timeout'], mailbox_oauth.HTTP_TIMEOUT)
 
-    @patch('bookings.services.mailbox_oauth.requests.post')
+    @patch('requests.Session.post')
     def test_a_token_refresh_on_the_way_to_a_send_is_bounded_too(self, post):
         """Otherwise a stale token silently doubles what the client waits."""
         _mailbox(self.org, expired=True)
@@ -90,7 +91,7 @@ class MailboxSendTimeoutTests(TestCase):
         for call in post.call_args_list:
             self.assertEqual(call.kwargs['timeout'], 8)
 
-    @patch('bookings.services.mailbox_oauth.requests.post')
+    @patch('requests.Session.post')
     def test_the_interactive_connect_flow_keeps_its_generous_budget(self, post):
         """A caterer watching a consent redirect would rather wait than restart,
         so shortening the send path must not shorten this one."""
@@ -105,7 +106,7 @@ class MailboxSendTimeoutTests(TestCase):
         self.assertEqual(mailbox_oauth.HTTP_TIMEOUT, 20)
 
     @override_settings(OUTBOUND_SEND_TIMEOUT=3)
-    @patch('bookings.services.mailbox_oauth.requests.post')
+    @patch('requests.Session.post')
     def test_the_bound_is_configurable_per_deployment(self, post):
         _mailbox(self.org)
         post.return_value = _response(json_data={'id': 'gmail-1'})
@@ -141,8 +142,9 @@ class TwilioSendTimeoutTests(TestCase):
 
         http_client_cls.assert_called_once_with(timeout=8)
         # And that client is the one actually handed to Twilio, not built and
-        # dropped on the floor.
+        # dropped on the floor — sending over the shared Twilio session.
         self.assertIs(
             client_cls.call_args.kwargs['http_client'],
             http_client_cls.return_value,
         )
+        self.assertIs(http_client_cls.return_value.session, outbound.session(outbound.TWILIO))
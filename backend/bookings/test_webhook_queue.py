@@ -0,0 +1,193 @@
+"""The inbound-webhook queue: store-and-answer views, ordered retrying drain."""
+from datetime import timedelta
+from io import StringIO
+from unittest.mock import patch
+
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from bookings.models import Lead, MetaWebhookEvent, OrgSettings, TwilioWebhookEvent, WhatsAppMessage
+from bookings.services import meta_leads, webhook_queue
+from bookings.test_meta_leads import APP, _connect_page, _lead_object, _leadgen_payload, _post
+from tests.base import get_test_user
+
+
+def _leadgen_event(page_id='PAGE1', leadgen_id='LEAD1', **fields):
+    return MetaWebhookEvent.objects.create(
+        page_id=page_id, field='leadgen',
+        payload={'field': 'leadgen', 'value': {'leadgen_id': leadgen_id}}, **fields,
+    )
+
+
+@override_settings(**APP, WEBHOOK_QUEUE_MODE='off')
+class MetaWebhookQueueTests(TestCase):
+    def setUp(self):
+        self.org = get_test_user().organisation
+        _connect_page(self.org)
+
+    @patch('bookings.services.meta.fetch_lead')
+    def test_the_webhook_only_stores_the_event(self, fetch):
+        payload = _leadgen_payload()
+        payload['entry'][0]['changes'].append(dict(payload['entry'][0]['changes'][0]))
+        # signature aside: one bulk insert, nothing fetched
+        with self.assertNumQueries(1):
+            resp = _post(APIClient(), payload)
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(MetaWebhookEvent.objects.filter(processed_at__isnull=True).count(), 2)
+        fetch.assert_not_called()
+
+        fetch.return_value = _lead_object()
+        self.assertEqual(webhook_queue.drain(concurrency=1), 2)
+        self.assertEqual(Lead.objects.get(meta_leadgen_id='LEAD1').organisation, self.org)
+        self.assertEqual(MetaWebhookEvent.objects.first().organisation, self.org)
+
+    @patch('bookings.services.meta.fetch_lead')
+    def test_a_failure_backs_off_and_holds_back_the_page(self, fetch):
+        first = _leadgen_event(leadgen_id='LEAD1')
+        second = _leadgen_event(leadgen_id='LEAD2')
+        fetch.side_effect = meta_leads.meta.MetaApiError('graph down')
+
+        self.assertEqual(webhook_queue.drain(concurrency=1), 0)
+        first.refresh_from_db()
+        second.refresh_from_db()
+        self.assertEqual(first.attempts, 1)
+        self.assertIn('graph down', first.error)
+        self.assertGreater(first.next_attempt_at, timezone.now())
+        self.assertIsNone(first.locked_until)
+        # LEAD2 waits behind LEAD1 — same page, so not even tried.
+        self.assertEqual(second.attempts, 0)
+        self.assertEqual(fetch.call_count, 1)
+
+        # Not due yet: a drain leaves the page alone.
+        webhook_queue.drain(concurrency=1)
+        self.assertEqual(fetch.call_count, 1)
+
+        MetaWebhookEvent.objects.filter(pk=first.pk).update(next_attempt_at=timezone.now())
+        fetch.side_effect = lambda leadgen_id, token: _lead_object(leadgen_id=leadgen_id)
+        self.assertEqual(webhook_queue.drain(concurrency=1), 2)
+        fetched = [c.args[0] for c in fetch.call_args_list]
+        self.assertEqual(fetched, ['LEAD1', 'LEAD1', 'LEAD2'])
+
+    @patch('bookings.services.meta.fetch_lead')
+    def test_backoff_doubles_and_gives_up_after_max_attempts(self, fetch):
+        fetch.side_effect = meta_leads.meta.MetaApiError('graph down')
+        event = _leadgen_event()
+        later = _leadgen_event(leadgen_id='LEAD2')
+        delays = []
+        with override_settings(WEBHOOK_MAX_ATTEMPTS=3):
+            for _ in range(3):
+                MetaWebhookEvent.objects.filter(pk=event.pk).update(next_attempt_at=None)
+                before = timezone.now()
+                webhook_queue.process_key(MetaWebhookEvent, 'PAGE1')
+                event.refresh_from_db()
+                if event.failed_at is None:
+                    delays.append(round((event.next_attempt_at - before).total_seconds()))
+        self.assertEqual(delays, [30, 60])
+        self.assertIsNotNone(event.failed_at)
+        self.assertIsNone(event.processed_at)
+        # Giving up on the head releases the events behind it.
+        later.refresh_from_db()
+        self.assertEqual(later.attempts, 1)
+
+    @patch('bookings.services.meta.fetch_lead')
+    def test_the_graph_fetch_holds_no_transaction_open(self, fetch):
+        # The test case's own transactions are the only ones open during it.
+        depth = len(connection.atomic_blocks)
+        open_during_fetch = []
+
+        def fetch_lead(leadgen_id, token):
+            open_during_fetch.append(len(connection.atomic_blocks) - depth)
+            return _lead_object(leadgen_id=leadgen_id)
+
+        fetch.side_effect = fetch_lead
+        _leadgen_event()
+        self.assertEqual(webhook_queue.drain(concurrency=1), 1)
+        self.assertEqual(open_during_fetch, [0])
+        self.assertTrue(Lead.objects.filter(meta_leadgen_id='LEAD1').exists())
+
+    @patch('bookings.services.meta.fetch_lead')
+    def test_a_claimed_event_is_left_to_its_worker(self, fetch):
+        event = _leadgen_event(locked_until=timezone.now() + timedelta(minutes=1))
+        self.assertEqual(webhook_queue.drain(concurrency=1), 0)
+        fetch.assert_not_called()
+        # A lapsed lease is taken over.
+        MetaWebhookEvent.objects.filter(pk=event.pk).update(locked_until=timezone.now() - timedelta(seconds=1))
+        fetch.return_value = _lead_object()
+        self.assertEqual(webhook_queue.drain(concurrency=1), 1)
+
+    @patch('bookings.services.meta.fetch_lead')
+    def test_command_drains_the_queue(self, fetch):
+        fetch.return_value = _lead_object()
+        _leadgen_event()
+        out = StringIO()
+        call_command('process_webhook_events', '--concurrency', '1', stdout=out)
+        self.assertIn('1 event(s) handled', out.getvalue())
+        self.assertTrue(Lead.objects.filter(meta_leadgen_id='LEAD1').exists())
+
+    def test_thread_mode_wakes_the_worker_once_the_event_commits(self):
+        with override_settings(WEBHOOK_QUEUE_MODE='thread'), \
+                patch.object(webhook_queue.worker, 'wake') as wake:
+            with self.captureOnCommitCallbacks(execute=True):
+                _post(APIClient(), _leadgen_payload())
+                wake.assert_not_called()
+        wake.assert_called_once()
+
+
+@override_settings(WEBHOOK_QUEUE_MODE='off')
+class TwilioWebhookQueueTests(TestCase):
+    WEBHOOK_URL = '/api/bookings/whatsapp/webhook/'
+
+    def setUp(self):
+        self.org = get_test_user().organisation
+        org_settings = OrgSettings.for_org(self.org)
+        org_settings.whatsapp_enabled = True
+        org_settings.twilio_whatsapp_number = '+14155238886'
+        org_settings.save()
+        self.lead = Lead.objects.create(
+            organisation=self.org, contact_name='Sam Jones', contact_phone='+923001269792',
+        )
+
+    def _post(self, data, valid=True):
+        from bookings.views.whatsapp import TwilioWebhookView
+        with patch.object(TwilioWebhookView, '_validate_signature', return_value=valid):
+            return APIClient().post(self.WEBHOOK_URL, data)
+
+    def test_a_bad_signature_stores_nothing(self):
+        resp = self._post({'MessageSid': 'SM1', 'MessageStatus': 'delivered'}, valid=False)
+        self.assertEqual(resp.status_code, 403)
+        self.assertFalse(TwilioWebhookEvent.objects.exists())
+
+    def test_status_callbacks_are_applied_in_order(self):
+        msg = WhatsAppMessage.objects.create(
+            organisation=self.org, lead=self.lead, body='Hello', twilio_sid='SM1',
+        )
+        for state in ('sent', 'delivered', 'read'):
+            self.assertEqual(self._post({'MessageSid': 'SM1', 'MessageStatus': state}).status_code, 200)
+        self.assertEqual(set(TwilioWebhookEvent.objects.values_list('sequence_key', flat=True)), {'SM1'})
+
+        webhook_queue.drain(concurrency=1)
+        msg.refresh_from_db()
+        self.assertEqual(msg.status, 'read')
+        self.assertFalse(TwilioWebhookEvent.objects.filter(processed_at__isnull=True).exists())
+        self.assertEqual(TwilioWebhookEvent.objects.first().organisation, self.org)
+
+    def test_a_status_for_an_unknown_sid_is_retried(self):
+        self._post({'MessageSid': 'SM404', 'MessageStatus': 'delivered'})
+        webhook_queue.drain(concurrency=1)
+        event = TwilioWebhookEvent.objects.get()
+        self.assertEqual(event.attempts, 1)
+        self.assertIsNotNone(event.next_attempt_at)
+        self.assertIsNone(event.processed_at)
+
+    def test_inbound_messages_are_keyed_on_the_sender(self):
+        self._post({
+            'MessageSid': 'SM2', 'Body': 'Hi there',
+            'From': 'whatsapp:+923001269792', 'To': 'whatsapp:+14155238886',
+        })
+        event = TwilioWebhookEvent.objects.get()
+        self.assertEqual((event.kind, event.sequence_key), (TwilioWebhookEvent.INBOUND, '923001269792'))
+        webhook_queue.drain(concurrency=1)
+        self.assertEqual(WhatsAppMessage.objects.get(direction='inbound').lead, self.lead)
@@ -1,6 +1,8 @@
+from datetime import timedelta
 from decimal import Decimal
 
 from django.test import TestCase
+from django.utils import timezone
 from rest_framework.test import APIClient
 
 from bookings.models import (
@@ -735,6 +737,84 @@ class TestLeadKanbanCounts(TestCase):
         self.assertEqual(res.json()["columns"]["new"]["count"], 3)
 
 
+class TestLeadKanbanPaging(TestCase):
+    """The board is two lead queries whatever the number of stages, and each
+    column pages on with a keyset cursor."""
+
+    URL = "/api/bookings/leads/kanban/"
+
+    def setUp(self):
+        self.org = _make_org()
+        self.client = _authenticated_client()
+        self.new_leads = [make_lead(org=self.org, contact_name=f"n{i}") for i in range(5)]
+        for i, lead in enumerate(self.new_leads):
+            Lead.objects.filter(pk=lead.pk).update(created_at=timezone.now() - timedelta(minutes=i))
+
+    def _walk(self, params):
+        """Every lead name in the 'new' column, following next_cursor."""
+        body = self.client.get(self.URL, params).json()
+        column = body["columns"]["new"]
+        names = [l["contact_name"] for l in column["results"]]
+        cursor = column["next_cursor"]
+        while cursor:
+            page = self.client.get(self.URL, {**params, "status": "new", "cursor": cursor}).json()
+            names += [l["contact_name"] for l in page["results"]]
+            cursor = page["next_cursor"]
+        return column["count"], names
+
+    def test_cursor_walks_the_column_in_order(self):
+        count, names = self._walk({"page_size": 2})
+        self.assertEqual(count, 5)
+        self.assertEqual(names, ["n0", "n1", "n2", "n3", "n4"])
+
+    def test_cursor_on_a_nullable_ordering(self):
+        Lead.objects.filter(pk__in=[self.new_leads[1].pk, self.new_leads[3].pk]).update(event_date=None)
+        Lead.objects.filter(pk=self.new_leads[4].pk).update(event_date="2026-01-01")
+        _, names = self._walk({"page_size": 2, "ordering": "event_date"})
+        self.assertEqual(names[0], "n4")
+        self.assertEqual(sorted(names), ["n0", "n1", "n2", "n3", "n4"])
+        self.assertEqual(set(names[3:]), {"n1", "n3"})  # NULL dates last
+
+    def test_the_lead_queries_do_not_grow_with_stages(self):
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+        from bookings.models.choices import LeadStatusOption
+
+        with CaptureQueriesContext(connection) as few:
+            self.client.get(self.URL)
+        for i in range(8):
+            LeadStatusOption.objects.create(organisation=self.org, value=f"stage{i}", label=f"Stage {i}", sort_order=100 + i)
+        lead = make_lead(org=self.org, contact_name="staged")
+        Lead.objects.filter(pk=lead.pk).update(status="stage3")
+        with CaptureQueriesContext(connection) as many:
+            body = self.client.get(self.URL).json()
+        self.assertEqual(len(few.captured_queries), len(many.captured_queries))
+        self.assertEqual(body["columns"]["stage3"]["count"], 1)
+        self.assertEqual(body["columns"]["stage5"], {"count": 0, "results": [], "next_cursor": None})
+
+    def test_the_windows_run_over_bare_keys_and_only_the_picked_leads_are_joined(self):
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+
+        with CaptureQueriesContext(connection) as ctx:
+            body = self.client.get(self.URL, {"page_size": 2}).json()
+        lead_sql = [q["sql"] for q in ctx.captured_queries if 'FROM "bookings_lead"' in q["sql"]]
+        self.assertEqual(len(lead_sql), 2)
+        window, fetch = lead_sql
+        self.assertIn("ROW_NUMBER()", window)
+        self.assertNotIn("JOIN", window)
+        self.assertNotIn("bookings_whatsappmessage", window)
+        self.assertNotIn("ROW_NUMBER()", fetch)
+        self.assertIn("JOIN", fetch)
+        self.assertIn("bookings_whatsappmessage", fetch)
+        self.assertEqual([l["contact_name"] for l in body["columns"]["new"]["results"]], ["n0", "n1"])
+        self.assertEqual(body["columns"]["new"]["count"], 5)
+
+    def test_bad_cursor_is_rejected(self):
+        res = self.client.get(self.URL, {"status": "new", "cursor": "not-a-cursor"})
+        self.assertEqual(res.status_code, 400)
+
+
 class TestLeadSearch(TestCase):
     def setUp(self):
         self.org = _make_org()
@@ -788,6 +868,38 @@ class TestLeadSearch(TestCase):
         res = self.client.get("/api/bookings/leads/?search=alice&status=new&page_size=all")
         self.assertEqual(len(res.json()), 0)  # Alice is now 'contacted', not 'new'
 
+    def test_search_by_phone_with_plus_or_trunk_zero(self):
+        lead = make_lead(org=self.org, contact_name="Dana Khan", contact_phone="+923001269792")
+        for term in ("%2B92 300 1269792", "0300-1269792"):
+            with self.subTest(term=term):
+                self.assertEqual([r["id"] for r in self._search(term).json()], [lead.id])
+
+    def test_name_matches_rank_first(self):
+        # 'bob' is in Bob's name and inside another lead's email.
+        make_lead(org=self.org, contact_name="Zed Young", contact_email="zbob@x.com")
+        names = [r["contact_name"] for r in self._search("bob").json()]
+        self.assertEqual(names, ["Bob Williams", "Zed Young"])
+
+    def test_account_rename_reaches_search(self):
+        self.acct.name = "Moonrise Events"
+        self.acct.save()
+        self.assertEqual(len(self._search("sunrise").json()), 0)
+        self.assertEqual(self._search("moonrise").json()[0]["contact_name"], "Bob Williams")
+
+    def test_saving_an_account_without_renaming_it_leaves_its_leads_alone(self):
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+        self.acct.billing_city = "Leeds"
+        with CaptureQueriesContext(connection) as queries:
+            self.acct.save()
+        self.assertFalse(any("bookings_lead" in q["sql"] for q in queries.captured_queries))
+
+    def test_a_partial_lead_save_skips_the_search_sources(self):
+        lead = Lead.objects.get(contact_name="Bob Williams")  # account not loaded
+        lead.notes = "Called back"
+        lead.save(update_fields=["notes"])
+        self.assertFalse(Lead.account.is_cached(lead))
+
 
 class TestQuoteAPI(TestCase):
     def setUp(self):
@@ -8,7 +8,7 @@ from rest_framework.test import APIClient
 
 from bookings.commission import compute_commission, FLAT, ACCELERATED
 from bookings.models import CommissionPlan, CommissionBand, OrgSettings, SalesTarget, RepCommissionPlan
-from bookings.services.commission import commission_summary, period_bounds, period_position
+from bookings.services.commission import commission_summaries, commission_summary, period_bounds, period_position
 from bookings.tests import _make_org
 from events.models import Event
 from users.models import User
@@ -322,6 +322,39 @@ class CommissionSummaryTests(TestCase):
         self.assertEqual(s["plan"], "Default")
 
 
+class CommissionSummariesTests(TestCase):
+    """The batched form agrees with the per-rep one, in a fixed number of queries."""
+
+    def setUp(self):
+        self.org = _make_org()
+        self.today = timezone.now().date()
+        _set_commission(self.org, model="accelerated", bands=[("0", "4"), ("100", "7")])
+        senior = _set_plan(self.org, name="Senior", model="flat", flat_rate="10")
+        self.reps = []
+        for i in range(3):
+            rep = User.objects.create(
+                email=f"batch{i}@example.com", role="salesperson", organisation=self.org,
+            )
+            _set_target(self.org, rep, 1000000 * (i + 1))
+            _event(self.org, rep, 1500000 * i, date=self.today)
+            self.reps.append(rep)
+        _assign_plan(self.org, self.reps[0], senior)
+
+    def test_matches_commission_summary(self):
+        summaries = commission_summaries(self.org, self.reps, today=self.today)
+        for rep in self.reps:
+            self.assertEqual(summaries[rep.pk], commission_summary(self.org, rep, today=self.today))
+        self.assertEqual(summaries[self.reps[0].pk]["plan"], "Senior")
+        self.assertEqual(summaries[self.reps[2].pk]["deals"], 1)
+
+    def test_query_count_does_not_grow_with_reps(self):
+        OrgSettings.for_org(self.org)
+        with self.assertNumQueries(6):
+            commission_summaries(self.org, self.reps[:1], today=self.today)
+        with self.assertNumQueries(6):
+            commission_summaries(self.org, self.reps, today=self.today)
+
+
 class MyCommissionAPITests(TestCase):
     URL = "/api/bookings/commission/me/"
 
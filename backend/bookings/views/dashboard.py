@@ -2,17 +2,18 @@ from datetime import datetime, timedelta
 
 from django.contrib.contenttypes.models import ContentType
 from django.db.models import Count, Q, Avg, Sum, F
+from django.db.models.functions import Coalesce
 from django.utils import timezone
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
 from bookings.models import Lead
-from bookings.models.activity import ActivityLog
+from bookings.models.activity import ActivityLog, LeadActivityRollup
 from bookings.models.choices import LeadStatusOption
 from bookings.models import Reminder
 from bookings.permissions import IsManagerOrOwner
 from bookings.models import SalesTarget, OrgSettings
-from bookings.services.commission import commission_summary, period_position
+from bookings.services.commission import commission_summaries, period_position
 from bookings.views.commission import _money, _pct
 from users.mixins import get_request_org, apply_org_filter
 
@@ -123,6 +124,63 @@ def parse_period_window(request):
     return since, until
 
 
+def _tallies(count, status_field):
+    """The dashboard's activity counts as aggregate expressions. `count` builds
+    one count from a filter; `status_field` holds the status moved to."""
+    return {
+        'leads_created': count(Q(action='created')),
+        'transitions_made': count(Q(action='status_change')),
+        'won': count(Q(action='status_change', **{status_field: 'won'})),
+        'lost': count(Q(action='status_change', **{status_field: 'lost'})),
+    }
+
+
+USER_FIELDS = ('user__id', 'user__first_name', 'user__last_name', 'user__email')
+
+
+def activity_tallies(org, period_logs, since, until):
+    """(totals, per-user rows) of lead activity in the period.
+
+    Open-ended periods (all/today/week/month) read the daily rollups for every
+    whole day in the window, plus the raw log for the part-day at its start,
+    so the cost doesn't grow with the org's history. A custom range with an end
+    date reads the log directly.
+    """
+    sources = []
+    if until is None:
+        rollups = LeadActivityRollup.objects.all()
+        if org is not None:
+            rollups = rollups.filter(organisation=org)
+        if since is not None:
+            first_day = timezone.localdate(since)
+            day_start = timezone.make_aware(datetime.combine(first_day, datetime.min.time()))
+            if since > day_start:
+                first_day += timedelta(days=1)
+                day_start += timedelta(days=1)
+                sources.append((
+                    period_logs.filter(created_at__lt=day_start),
+                    _tallies(lambda q: Count('id', filter=q), 'new_value'),
+                ))
+            rollups = rollups.filter(day__gte=first_day)
+        sources.append((rollups, _tallies(lambda q: Coalesce(Sum('count', filter=q), 0), 'status')))
+    else:
+        sources.append((period_logs, _tallies(lambda q: Count('id', filter=q), 'new_value')))
+
+    totals = dict.fromkeys(('leads_created', 'transitions_made', 'won', 'lost'), 0)
+    per_user = {}
+    for qs, tallies in sources:
+        for key, value in qs.aggregate(**tallies).items():
+            totals[key] += value
+        user_rows = qs.filter(user__isnull=False).values(*USER_FIELDS).annotate(**tallies).order_by()
+        for row in user_rows:
+            merged = per_user.setdefault(row['user__id'], dict.fromkeys(totals, 0) | {
+                f: row[f] for f in USER_FIELDS
+            })
+            for key in totals:
+                merged[key] += row[key]
+    return totals, list(per_user.values())
+
+
 class DashboardStatsView(APIView):
     """GET /api/bookings/dashboard/stats/?period=all|today|week|month|custom"""
     permission_classes = [IsManagerOrOwner]
@@ -135,40 +193,26 @@ class DashboardStatsView(APIView):
         base_leads = apply_org_filter(Lead.objects.all(), request)
         ct = ContentType.objects.get_for_model(Lead)
 
-        # Restrict activity logs to leads in this org
-        org_lead_ids = base_leads.values_list('id', flat=True)
-        period_logs = ActivityLog.objects.filter(content_type=ct, object_id__in=org_lead_ids)
+        # Lead activity in this org — a range scan on the (organisation,
+        # content_type, created_at) index.
+        period_logs = ActivityLog.objects.filter(content_type=ct)
+        if org is not None:
+            period_logs = period_logs.filter(organisation=org)
         if since:
             period_logs = period_logs.filter(created_at__gte=since)
         if until:
             period_logs = period_logs.filter(created_at__lt=until)
 
-        # Lead summary (single aggregate instead of 4 separate counts)
-        summary = period_logs.aggregate(
-            new_leads=Count('id', filter=Q(action='created')),
-            status_transitions=Count('id', filter=Q(action='status_change')),
-            won=Count('id', filter=Q(action='status_change', new_value='won')),
-            lost=Count('id', filter=Q(action='status_change', new_value='lost')),
-        )
-        new_leads = summary['new_leads']
-        status_transitions = summary['status_transitions']
+        # Lead summary and team activity — from the daily rollups where possible
+        summary, team_raw = activity_tallies(org, period_logs, since, until)
+        new_leads = summary['leads_created']
+        status_transitions = summary['transitions_made']
         won = summary['won']
         lost = summary['lost']
         total_active = base_leads.exclude(status__in=['won', 'lost']).count()
 
-        # Team activity — per user (period-scoped from activity logs)
-        team_raw = (
-            period_logs
-            .filter(user__isnull=False)
-            .values('user__id', 'user__first_name', 'user__last_name', 'user__email')
-            .annotate(
-                leads_created=Count('id', filter=Q(action='created')),
-                transitions_made=Count('id', filter=Q(action='status_change')),
-                won=Count('id', filter=Q(action='status_change', new_value='won')),
-                lost=Count('id', filter=Q(action='status_change', new_value='lost')),
-            )
-            .order_by('-leads_created')
-        )
+        # Team activity — per user
+        team_raw.sort(key=lambda row: row['leads_created'], reverse=True)
         team_activity = []
         for row in team_raw:
             name = f"{row['user__first_name']} {row['user__last_name']}".strip() or row['user__email']
@@ -363,13 +407,14 @@ class DashboardStatsView(APIView):
         org_settings = OrgSettings.for_org(org)
         pt = org_settings.target_period
         cur_fy, cur_idx, _ = period_position(today, pt, org_settings.fiscal_year_start_month)
-        target_users = (
+        target_users = list(
             apply_org_filter(SalesTarget.objects.select_related('user'), request)
             .filter(period_type=pt, fiscal_year=cur_fy, period_index=cur_idx, amount__gt=0)
         )
+        summaries = commission_summaries(org, [t.user for t in target_users], today)
         target_attainment = []
         for t in target_users:
-            s = commission_summary(org, t.user, today)
+            s = summaries[t.user_id]
             name = f"{t.user.first_name} {t.user.last_name}".strip() or t.user.email
             target_attainment.append({
                 'user_id': t.user_id,
@@ -1,3 +1,4 @@
+from django.db import transaction
 from django.db.models import DateTimeField, Max, OuterRef, Q, Subquery
 from django.conf import settings as django_settings
 from django.utils import timezone
@@ -9,12 +10,11 @@ from bookings.models import FollowUpDraft, Lead, OrgSettings, WhatsAppMessage
 from bookings.permissions import is_salesperson
 from bookings.serializers.followups import FollowUpDraftSerializer
 from bookings.services import email as email_service
-from bookings.services import messaging
+from bookings.services import messaging, outbox
 from bookings.services.followup_scheduler import (
     choose_channel, find_stale_leads, lead_last_touch, run_scheduled,
 )
 from bookings.services.followup_drafter import draft_followup, fallback_subject
-from bookings.services.whatsapp import WhatsAppService
 from bookings.views.dashboard import parse_period_window
 from users.mixins import (
     get_request_org, is_superuser_without_org, get_org_object_or_404,
@@ -50,7 +50,9 @@ def _scoped_drafts(request):
     salespeople only ever touch drafts for their own leads (assigned to them
     or created by them) — same rule as the lead list. Approve/dismiss resolve
     drafts through this, so the scope is also the permission boundary."""
-    qs = FollowUpDraft.objects.select_related('lead', 'lead__assigned_to', 'reviewed_by').all()
+    qs = FollowUpDraft.objects.select_related(
+        'lead', 'lead__assigned_to', 'reviewed_by', 'whatsapp_message',
+    ).all()
     if not is_superuser_without_org(request):
         org = get_request_org(request)
         if org is None:
@@ -98,44 +100,54 @@ def _apply_overrides(draft, data):
 
 
 def _approve_draft(draft, user):
-    """Send a draft on its own channel and mark it sent. Returns (ok, error).
+    """Approve a draft and queue it on its own channel. Returns (ok, error).
 
     Email goes through the same service quotes and events send through, so a
     follow-up lands in the lead's history next to everything else we ever told
-    them. A failure returns its real reason and leaves the draft pending, which
-    is what makes "reconnect your mailbox, then press send again" possible
-    rather than a dead end (REL-501 AC7).
+    them. Sending is left to the outbox, so approving a whole page of drafts
+    doesn't wait on a mailbox or Twilio per draft. Anything that stops the send
+    before it starts (no mailbox, no address, no number) returns its real reason
+    and leaves the draft pending; a send that fails later puts the draft back in
+    the queue (`messaging.queued_send_failed`). Either way "reconnect your
+    mailbox, then press send again" stays possible rather than a dead end
+    (REL-501 AC7).
     """
-    org = draft.organisation
-    if draft.channel == WhatsAppMessage.CHANNEL_EMAIL:
+    with transaction.atomic():
         try:
-            msg = messaging.send_client_email(
-                draft.lead,
-                subject=draft.subject or fallback_subject(draft.lead),
-                body=draft.body,
-                sent_by=user,
-            )
-        except (messaging.ChannelUnavailable, email_service.MailboxError) as exc:
-            return False, str(exc)
-        description = 'Approved & sent an AI-drafted follow-up by email'
-    else:
-        try:
-            msg = WhatsAppService(org).send_message(draft.lead, draft.body, sent_by=user)
-        except ValueError as exc:
+            if draft.channel == WhatsAppMessage.CHANNEL_EMAIL:
+                entry = messaging.queue_client_email(
+                    draft.lead,
+                    subject=draft.subject or fallback_subject(draft.lead),
+                    body=draft.body,
+                    sent_by=user,
+                    draft=draft,
+                )
+                description = 'Approved & queued an AI-drafted follow-up by email'
+            else:
+                entry = messaging.queue_whatsapp(draft.lead, body=draft.body, sent_by=user, draft=draft)
+                description = 'Approved & queued an AI-drafted follow-up'
+        except (messaging.ChannelUnavailable, ValueError) as exc:
             return False, str(exc)
-        description = 'Approved & sent an AI-drafted follow-up'
-
-    draft.status = 'sent'
-    # Named for WhatsApp, holds either channel — see the model's own note.
-    draft.whatsapp_message = msg
-    draft.reviewed_by = user
-    draft.reviewed_at = timezone.now()
-    draft.save(update_fields=['status', 'whatsapp_message', 'reviewed_by', 'reviewed_at', 'updated_at'])
-    log_activity(
-        draft.lead, 'updated', user=user,
-        field_name='followup_draft',
-        description=description,
-    )
+
+        # Out of the review queue. Whether it has actually gone is the ledger
+        # row's status (queued, then sent), which the draft reports as
+        # `message_status`; the send itself is logged once it happens.
+        draft.status = 'sent'
+        # Named for WhatsApp, holds either channel — see the model's own note.
+        draft.whatsapp_message = entry.message
+        draft.reviewed_by = user
+        draft.reviewed_at = timezone.now()
+        draft.save(update_fields=['status', 'whatsapp_message', 'reviewed_by', 'reviewed_at', 'updated_at'])
+        log_activity(
+            draft.lead, 'updated', user=user,
+            field_name='followup_draft',
+            description=description,
+        )
+
+    outbox.enqueue([entry])
+    if entry.message.status == 'failed':
+        # Delivered inline (OUTBOX_MODE=inline) and refused.
+        return False, entry.message.error_message
     return True, None
 
 
@@ -181,7 +193,9 @@ class LeadFollowUpDraftListView(_DraftListContextMixin, generics.ListAPIView):
     def get_queryset(self):
         get_org_object_or_404(Lead, self.request, pk=self.kwargs['pk'])
         return _annotate_last_touch(
-            FollowUpDraft.objects.select_related('lead', 'lead__assigned_to', 'reviewed_by').filter(
+            FollowUpDraft.objects.select_related(
+                'lead', 'lead__assigned_to', 'reviewed_by', 'whatsapp_message',
+            ).filter(
                 lead_id=self.kwargs['pk'],
             )
         )
@@ -1,6 +1,7 @@
 from collections import defaultdict
 
-from django.db.models import Q
+from django.db.models import Count, F, Q, Window
+from django.db.models.functions import RowNumber
 from django.utils import timezone
 from rest_framework import generics, status
 from rest_framework.response import Response
@@ -13,8 +14,10 @@ from bookings.models import Lead, ProductLine, Quote
 from bookings.models.choices import LeadStatusOption
 from bookings.serializers import LeadSerializer, QuoteSerializer
 from bookings.serializers.leads import ProductLineSerializer, LeadListSerializer
-from bookings.activity import log_activity, log_field_changes, TRACKED_FIELDS
+from bookings.activity import log_activity, log_field_changes, save_logs, TRACKED_FIELDS
+from bookings.pagination import after_cursor, decode_cursor, encode_cursor, keyset_order, keyset_order_by
 from bookings.permissions import IsManagerOrOwner, IsAdminOrOwner, is_salesperson
+from bookings.search import apply_search
 
 
 class UserListView(generics.ListAPIView):
@@ -85,8 +88,9 @@ LEAD_ORDERING_FIELDS = {
 }
 
 
-def _apply_lead_filters(qs, request):
-    """Shared filter logic used by both list and kanban views."""
+def _apply_lead_filters(qs, request, rank_search=True):
+    """Shared filter logic used by both list and kanban views. `rank_search`
+    orders search hits best match first (the kanban keeps its column order)."""
     user = request.user
     if is_salesperson(user):
         qs = qs.filter(Q(assigned_to=user) | Q(created_by=user))
@@ -127,21 +131,8 @@ def _apply_lead_filters(qs, request):
 
     search = params.get('search')
     if search:
-        # Phones are stored E.164 (+923001269792); users search with dashes,
-        # spaces or a leading 0 — match on the cleaned digits too.
-        import re
-        phone_query = re.sub(r'[\s\-().]', '', search)
-        condition = (
-            Q(contact_name__icontains=search) |
-            Q(contact_email__icontains=search) |
-            Q(contact_phone__icontains=search) |
-            Q(account__name__icontains=search)
-        )
-        if phone_query and phone_query != search:
-            condition |= Q(contact_phone__icontains=phone_query)
-        if phone_query.startswith('0') and len(phone_query) > 1:
-            condition |= Q(contact_phone__icontains=phone_query.lstrip('0'))
-        qs = qs.filter(condition)
+        # Best match first unless the caller asked for an ordering below.
+        qs = apply_search(qs, search, rank=rank_search)
 
     ordering = params.get('ordering')
     if ordering and ordering in LEAD_ORDERING_FIELDS:
@@ -155,9 +146,8 @@ def _annotate_unread_whatsapp(qs):
 
     Uses a correlated subquery rather than Count('whatsapp_messages', ...),
     which would force a LEFT JOIN + GROUP BY on whatsapp_messages on every lead
-    query (the kanban runs the lead query 7x: 1 count + 6 per-status). The
-    subquery is a cheap per-row lookup and keeps the per-status count query
-    join-free.
+    query — and a GROUP BY would collide with the kanban's window functions.
+    The subquery is a cheap per-row lookup.
     """
     from django.db.models import Count, IntegerField, OuterRef, Subquery
     from django.db.models.functions import Coalesce
@@ -257,7 +247,7 @@ class LeadBulkUpdateView(APIView):
             return Response({'updated': deleted_count})
 
         # Capture old values for logging
-        lead_list = list(leads.values('id', 'assigned_to_id', 'status', 'product_id'))
+        lead_list = list(leads.values('id', 'organisation_id', 'assigned_to_id', 'status', 'product_id'))
 
         org = get_request_org(request)
 
@@ -303,6 +293,7 @@ class LeadBulkUpdateView(APIView):
             logs.append(ActivityLog(
                 content_type=ct,
                 object_id=ld['id'],
+                organisation_id=ld['organisation_id'],
                 action='status_change' if action == 'status' else 'updated',
                 field_name=field,
                 old_value=str(old_val) if old_val is not None else '',
@@ -311,7 +302,7 @@ class LeadBulkUpdateView(APIView):
                 user=user,
             ))
         if logs:
-            ActivityLog.objects.bulk_create(logs)
+            save_logs(logs)
 
         return Response({'updated': count})
 
@@ -685,44 +676,83 @@ class LeadKanbanView(APIView):
     Columns are driven by the org's active LeadStatusOption rows (in sort order),
     so each org sees its own customised pipeline. `order` returns the column keys
     in display order. Any status still present on leads but no longer an active
-    option is appended, so deactivating a status never hides its leads."""
+    option is appended, so deactivating a status never hides its leads.
+
+    The board is two lead queries however many stages the org has:
+    ROW_NUMBER() and COUNT(*) windows partitioned by status pick each column's
+    top `page_size` pks and its total — over the bare filter and sort columns,
+    so the windows never sort the joins or the unread subquery — then one read
+    of just those pks with everything the serializer needs. Each column carries
+    a `next_cursor`; "load more" is GET ?status=<column>&cursor=<next_cursor>, a
+    keyset read of the rows after the last one shown."""
 
     def get(self, request):
         from bookings.models.choices import LeadStatusOption
         page_size = int(request.query_params.get('page_size', 20))
         org = get_request_org(request)
 
-        qs = Lead.objects.select_related(
-            'account', 'won_quote', 'won_event', 'product', 'assigned_to',
-            'lost_reason_option', 'created_by',
-        )
-        qs = _annotate_unread_whatsapp(qs)
-        qs = apply_org_filter(qs, request)
-        qs = _apply_lead_filters(qs, request)
+        qs = apply_org_filter(Lead.objects.all(), request)
+        qs = _apply_lead_filters(qs, request, rank_search=False)
+        keys = keyset_order(qs)
+        order_by = keyset_order_by(keys)
+
+        cursor = request.query_params.get('cursor')
+        if cursor:
+            return self._next_page(request, self._with_card(qs), keys, order_by, cursor, page_size)
 
-        # Get counts per status in a single DB query.
-        # order_by() clears the inherited ordering (Lead.Meta + ?ordering param)
-        # so it doesn't leak into the GROUP BY (which would split each status
-        # into one row per created_at and break the per-column counts).
-        from django.db.models import Count as DbCount
-        count_rows = qs.order_by().values('status').annotate(n=DbCount('id'))
-        counts = {row['status']: row['n'] for row in count_rows}
+        picked = {
+            pk: (position, count)
+            for pk, position, count in qs.annotate(
+                column_position=Window(RowNumber(), partition_by=[F('status')], order_by=order_by),
+                column_count=Window(Count('id'), partition_by=[F('status')]),
+            )
+            .filter(column_position__lte=page_size)
+            .values_list('pk', 'column_position', 'column_count')
+        }
+        board = self._with_card(Lead.objects.filter(pk__in=picked)) if picked else []
+        by_status = defaultdict(list)
+        for lead in sorted(board, key=lambda lead: picked[lead.pk][0]):
+            lead.column_count = picked[lead.pk][1]
+            by_status[lead.status].append(lead)
 
         status_values = list(
             LeadStatusOption.objects.filter(organisation=org, is_active=True)
             .order_by('sort_order', 'pk').values_list('value', flat=True)
         )
-        for leftover in counts:
+        for leftover in by_status:
             if leftover not in status_values:
                 status_values.append(leftover)
 
-        # Fetch top N leads per status using per-status queries (avoids full table scan)
         columns = {}
         for status_val in status_values:
-            leads = list(qs.filter(status=status_val)[:page_size])
+            leads = by_status.get(status_val, [])
+            count = leads[0].column_count if leads else 0
             columns[status_val] = {
-                'count': counts.get(status_val, 0),
+                'count': count,
                 'results': LeadListSerializer(leads, many=True).data,
+                'next_cursor': encode_cursor(leads[-1], keys) if count > len(leads) else None,
             }
 
         return Response({'columns': columns, 'order': status_values})
+
+    @staticmethod
+    def _with_card(qs):
+        """`qs` with what a card shows: its relations and its unread count."""
+        return _annotate_unread_whatsapp(qs.select_related(
+            'account', 'won_quote', 'won_event', 'product', 'assigned_to',
+            'lost_reason_option', 'created_by',
+        ))
+
+    def _next_page(self, request, qs, keys, order_by, cursor, page_size):
+        status_val = request.query_params.get('status')
+        if not status_val:
+            return Response({'error': 'status is required with cursor'}, status=status.HTTP_400_BAD_REQUEST)
+        after = after_cursor(keys, decode_cursor(cursor, Lead, keys))
+        leads = list(qs.filter(after).order_by(*order_by)[:page_size + 1])
+        has_more = len(leads) > page_size
+        leads = leads[:page_size]
+        return Response({
+            'status': status_val,
+            'results': LeadListSerializer(leads, many=True).data,
+            'next_cursor': encode_cursor(leads[-1], keys) if has_more else None,
+        })
@@ -27,6 +27,7 @@ from bookings.serializers.mailbox import ConnectedMailboxSerializer
 from bookings.services import mailbox_oauth
 from bookings.services.email import get_mailbox, store_tokens
 from payments.access import org_has_access
+from portioning import outbound
 from users.mixins import get_request_org
 
 logger = logging.getLogger(__name__)
@@ -319,8 +320,7 @@ def _best_effort_revoke(mailbox):
     if not (mailbox_oauth.provider_configured(mailbox.provider) and mailbox.refresh_token_encrypted):
         return
     try:
-        import requests
-        requests.post(
+        outbound.session(mailbox_oauth.GOOGLE).post(
             'https://oauth2.googleapis.com/revoke',
             data={'token': mailbox.refresh_token},
             timeout=mailbox_oauth.HTTP_TIMEOUT,
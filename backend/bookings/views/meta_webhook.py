@@ -1,11 +1,13 @@
 """Meta webhook receiver + lead-backfill cron (REL-507).
 
 The webhook is public and unauthenticated by design — Meta calls it — so the
-POST is authenticated by its `X-Hub-Signature-256` HMAC instead. It always
-answers 200 quickly for accepted events (even when downstream processing fails):
-the raw event is persisted first, and the hourly backfill recovers anything that
-errored, so we never make Meta retry-then-disable the subscription over a
-transient failure. The endpoint is shared with REL-508 (DM `messages` routing).
+POST is authenticated by its `X-Hub-Signature-256` HMAC instead. An accepted
+POST does nothing but store its changes as raw events and answer 200: the
+Graph fetch, dedup and assignment run later on the webhook queue
+(bookings.services.webhook_queue), which retries failures, and the hourly
+backfill recovers anything that still errored. So a burst of ad leads never
+slows the response enough for Meta to throttle, retry or disable the
+subscription. The endpoint is shared with REL-508 (DM `messages` routing).
 """
 
 import hashlib
@@ -15,15 +17,13 @@ import logging
 
 from django.conf import settings
 from django.http import HttpResponse
-from django.utils import timezone
 from rest_framework import status
 from rest_framework.permissions import AllowAny
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
-from bookings.models import ConnectedMetaPage, MetaWebhookEvent
-from bookings.models.meta_webhook import LEADGEN
-from bookings.services import meta_leads
+from bookings.models import MetaWebhookEvent
+from bookings.services import meta_leads, webhook_queue
 
 logger = logging.getLogger(__name__)
 
@@ -56,10 +56,16 @@ class MetaWebhookView(APIView):
             # Nothing to act on; 200 so Meta doesn't retry an unparseable body.
             return Response(status=status.HTTP_200_OK)
 
-        for entry in payload.get('entry', []):
-            page_id = str(entry.get('id') or '')
-            for change in entry.get('changes', []):
-                self._handle_change(page_id, change)
+        events = MetaWebhookEvent.objects.bulk_create([
+            MetaWebhookEvent(
+                page_id=str(entry.get('id') or ''),
+                field=change.get('field', ''),
+                payload=change,
+            )
+            for entry in payload.get('entry', [])
+            for change in entry.get('changes', [])
+        ])
+        webhook_queue.enqueue(events)
         return Response(status=status.HTTP_200_OK)
 
     def _valid_signature(self, request):
@@ -71,40 +77,6 @@ class MetaWebhookView(APIView):
         expected = hmac.new(secret.encode(), request.body, hashlib.sha256).hexdigest()
         return hmac.compare_digest(header[len('sha256='):], expected)
 
-    def _handle_change(self, page_id, change):
-        field = change.get('field', '')
-        value = change.get('value') or {}
-        # Resolve the org by page_id (a Page belongs to whichever org connected
-        # it). Unknown page ⇒ record + ignore, never an error (AC6).
-        # Deterministic if the same Page were ever connected by two orgs (the
-        # unique constraint is per-(org, page_id)): oldest connection wins.
-        page = (
-            ConnectedMetaPage.objects.unscoped()
-            .filter(page_id=page_id).select_related('organisation')
-            .order_by('id').first()
-        )
-        org = page.organisation if page else None
-
-        event = MetaWebhookEvent.objects.create(
-            organisation=org, page_id=page_id, field=field, payload=change,
-        )
-        if page is None:
-            logger.info('Meta webhook for unconnected page %s — recorded, ignoring', page_id)
-            return
-        if field != LEADGEN:
-            # `messages` routing arrives with REL-508; the raw event is stored.
-            return
-        try:
-            meta_leads.ingest_from_webhook(page, value)
-        except Exception as exc:
-            # Persist the failure and move on — the backfill will recover it.
-            logger.warning('Meta leadgen processing failed for page %s: %s', page_id, exc)
-            event.error = str(exc)[:1000]
-            event.save(update_fields=['error'])
-            return
-        event.processed_at = timezone.now()
-        event.save(update_fields=['processed_at'])
-
 
 class MetaLeadsCronView(APIView):
     """POST /api/bookings/cron/sync-meta-leads/ — hourly backfill sweep.
@@ -1,5 +1,4 @@
 import logging
-import re
 
 from django.conf import settings
 from django.utils import timezone
@@ -8,8 +7,10 @@ from rest_framework.permissions import AllowAny, IsAuthenticated
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
-from bookings.models import WhatsAppMessage, OrgSettings, Lead
+from bookings.models import WhatsAppMessage, Lead, TwilioWebhookEvent
+from bookings.phones import phone_digits
 from bookings.serializers.whatsapp import WhatsAppMessageSerializer, WhatsAppSendSerializer
+from bookings.services import webhook_queue
 from bookings.services.whatsapp import WhatsAppService
 from bookings.services.whatsapp_templates import render_template
 from users.mixins import apply_org_filter, get_org_object_or_404, get_request_org
@@ -17,11 +18,6 @@ from users.mixins import apply_org_filter, get_org_object_or_404, get_request_or
 logger = logging.getLogger(__name__)
 
 
-def _normalize_phone(phone):
-    """Strip to digits only for comparison."""
-    return re.sub(r'\D', '', phone or '')
-
-
 class WhatsAppMessageListView(APIView):
     """GET /api/bookings/leads/<lead_pk>/whatsapp/ — list messages for a lead."""
     permission_classes = [IsAuthenticated]
@@ -80,7 +76,11 @@ class WhatsAppMarkReadView(APIView):
 
 
 class TwilioWebhookView(APIView):
-    """POST /api/bookings/whatsapp/webhook/ — Twilio status callbacks + inbound messages."""
+    """POST /api/bookings/whatsapp/webhook/ — Twilio status callbacks + inbound messages.
+
+    Checks the signature, stores the callback as a TwilioWebhookEvent and
+    answers; the webhook queue matches it to an org, lead or message afterwards.
+    """
     permission_classes = [AllowAny]
     authentication_classes = []
 
@@ -91,26 +91,24 @@ class TwilioWebhookView(APIView):
         if not message_sid:
             return Response(status=status.HTTP_400_BAD_REQUEST)
 
-        # Inbound message: has Body + From but no MessageStatus
-        body = request.data.get('Body', '')
-        from_number = request.data.get('From', '')
-        to_number = request.data.get('To', '')
-
-        if body and from_number and not message_status:
-            return self._handle_inbound(request, message_sid, body, from_number, to_number)
-
-        # Status callback for an outbound message
-        return self._handle_status_callback(request, message_sid, message_status)
+        if not self._validate_signature(request):
+            logger.warning('Invalid Twilio webhook signature')
+            return Response(status=status.HTTP_403_FORBIDDEN)
 
-    def _find_org_settings_for_number(self, to_number):
-        """Find the OrgSettings whose twilio_whatsapp_number matches the To number."""
-        # Strip 'whatsapp:' prefix if present
-        raw = to_number.replace('whatsapp:', '')
-        normalized = _normalize_phone(raw)
-        for org_settings in OrgSettings.objects.filter(whatsapp_enabled=True).exclude(twilio_whatsapp_number=''):
-            if _normalize_phone(org_settings.twilio_whatsapp_number) == normalized:
-                return org_settings
-        return None
+        # Inbound message: has Body + From but no MessageStatus. One customer's
+        # messages are kept in order; so are one message's status callbacks.
+        from_number = request.data.get('From', '')
+        if request.data.get('Body', '') and from_number and not message_status:
+            kind, sequence_key = TwilioWebhookEvent.INBOUND, phone_digits(from_number) or message_sid
+        else:
+            kind, sequence_key = TwilioWebhookEvent.STATUS, message_sid
+
+        event = TwilioWebhookEvent.objects.create(
+            kind=kind, message_sid=message_sid, sequence_key=sequence_key,
+            payload=dict(request.data.items()),
+        )
+        webhook_queue.enqueue([event])
+        return Response(status=status.HTTP_200_OK)
 
     def _validate_signature(self, request):
         """Validate the Twilio request signature against the platform auth token."""
@@ -126,66 +124,3 @@ class TwilioWebhookView(APIView):
         except Exception:
             logger.exception('Error validating Twilio signature')
             return False
-
-    def _handle_inbound(self, request, message_sid, body, from_number, to_number):
-        """Handle an inbound WhatsApp message from a customer."""
-        org_settings = self._find_org_settings_for_number(to_number)
-        if not org_settings:
-            logger.warning('Inbound WhatsApp to unknown number: %s', to_number)
-            return Response(status=status.HTTP_404_NOT_FOUND)
-
-        if not self._validate_signature(request):
-            logger.warning('Invalid Twilio webhook signature for inbound message')
-            return Response(status=status.HTTP_403_FORBIDDEN)
-
-        org = org_settings.organisation
-        from_normalized = _normalize_phone(from_number)
-
-        # Find the lead by matching contact_phone
-        lead = None
-        for candidate in Lead.objects.filter(organisation=org).exclude(contact_phone=''):
-            if _normalize_phone(candidate.contact_phone) == from_normalized:
-                lead = candidate
-                break
-
-        if not lead:
-            logger.info('Inbound WhatsApp from %s — no matching lead in org %s', from_number, org.pk)
-            return Response(status=status.HTTP_200_OK)
-
-        WhatsAppMessage.objects.create(
-            organisation=org,
-            lead=lead,
-            to_phone=to_number,
-            from_phone=from_number,
-            body=body,
-            direction='inbound',
-            status='received',
-            twilio_sid=message_sid,
-        )
-
-        return Response(status=status.HTTP_200_OK)
-
-    def _handle_status_callback(self, request, message_sid, message_status):
-        """Handle a status callback for an outbound message."""
-        try:
-            msg = WhatsAppMessage.objects.get(twilio_sid=message_sid)
-        except WhatsAppMessage.DoesNotExist:
-            logger.info('Webhook for unknown message SID: %s', message_sid)
-            return Response(status=status.HTTP_404_NOT_FOUND)
-
-        if not self._validate_signature(request):
-            logger.warning('Invalid Twilio webhook signature')
-            return Response(status=status.HTTP_403_FORBIDDEN)
-
-        error_code = request.data.get('ErrorCode', '')
-        error_message = request.data.get('ErrorMessage', '')
-
-        if message_status:
-            msg.status = message_status
-        if error_code:
-            msg.error_code = error_code
-        if error_message:
-            msg.error_message = error_message
-        msg.save(update_fields=['status', 'error_code', 'error_message', 'updated_at'])
-
-        return Response(status=status.HTTP_200_OK)
@@ -9,11 +9,28 @@ independent of any token, so it can ask here.
 
 Keeping both callers on this function is what stops the paywall meaning two
 subtly different things in two places.
+
+The answer is cached per org for SUBSCRIPTION_ACCESS_CACHE_TTL seconds, since
+the gate asks on every API request and the row changes a few times a year.
+Every write to a Subscription — the Stripe webhook handlers, a trial extension,
+comping an org in admin — drops the entry (`invalidate`), so the only thing the
+TTL can delay is a trial running out, and a trial's entry never outlives its
+`trial_ends_at`.
 """
+from django.conf import settings
+from django.core.cache import cache
+from django.utils import timezone
+
+from portioning import timing
+from portioning.cache import org_key
 
 from .models import Subscription
 
 
+def _key(org_id):
+    return org_key(org_id, 'subscription-access')
+
+
 def org_has_access(org):
     """True when `org` may use the product.
 
@@ -22,5 +39,24 @@ def org_has_access(org):
     """
     if org is None:
         return False
+    ttl = getattr(settings, 'SUBSCRIPTION_ACCESS_CACHE_TTL', 0)
+    if ttl > 0:
+        cached = cache.get(_key(org.pk))
+        timing.record_cache(cached is not None)
+        if cached is not None:
+            return cached
     subscription = Subscription.objects.filter(organisation=org).first()
-    return bool(subscription and subscription.has_access)
+    allowed = bool(subscription and subscription.has_access)
+    if ttl > 0:
+        if allowed and subscription.is_trialing and not subscription.comped:
+            # Access that ends on a clock must not be cached past that clock.
+            left = (subscription.trial_ends_at - timezone.now()).total_seconds()
+            ttl = min(ttl, int(left))
+        if ttl > 0:
+            cache.set(_key(org.pk), allowed, ttl)
+    return allowed
+
+
+def invalidate(org_id):
+    """Forget the cached answer for `org_id` — call after any Subscription write."""
+    cache.delete(_key(org_id))
@@ -23,6 +23,7 @@ from django.conf import settings
 from django.http import JsonResponse
 from django.shortcuts import redirect
 from django.utils.cache import patch_vary_headers
+from rest_framework.exceptions import AuthenticationFailed
 from rest_framework_simplejwt.authentication import JWTAuthentication
 from rest_framework_simplejwt.exceptions import InvalidToken, TokenError
 
@@ -33,7 +34,12 @@ _jwt = JWTAuthentication()
 
 def _resolve_user(request):
     """Best-effort: authenticate from the access-token cookie or Authorization
-    header. Returns None if there's no valid token (no CSRF check — read only)."""
+    header. Returns None if there's no valid token (no CSRF check — read only).
+
+    A success is left on the request as ``_verified_jwt`` — (raw token, user,
+    validated token) — so `CookieJWTAuthentication` can reuse it rather than
+    verify the same token and load the same user a second time in the view.
+    """
     raw = request.COOKIES.get('access_token')
     if not raw:
         header = _jwt.get_header(request)
@@ -41,9 +47,13 @@ def _resolve_user(request):
     if not raw:
         return None
     try:
-        return _jwt.get_user(_jwt.get_validated_token(raw))
-    except (InvalidToken, TokenError):
+        validated = _jwt.get_validated_token(raw)
+        user = _jwt.get_user(validated)
+    except (InvalidToken, TokenError, AuthenticationFailed):
+        # A deleted or deactivated user is the view's 401 to give, not ours.
         return None
+    request._verified_jwt = (raw, user, validated)
+    return user
 
 
 class SubscriptionGateMiddleware:
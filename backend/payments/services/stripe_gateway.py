@@ -12,6 +12,11 @@ from django.conf import settings
 from django.core.exceptions import ImproperlyConfigured
 
 from payments.models import Subscription
+from portioning import outbound
+
+# Stripe retries a failed call itself, POSTs included, under an idempotency key
+# it generates — so the shared session leaves Stripe's retries to Stripe.
+MAX_NETWORK_RETRIES = 2
 
 
 def _require_setting(name: str) -> str:
@@ -34,9 +39,18 @@ def _require_setting(name: str) -> str:
 def _client():
     """Return the configured ``stripe`` module."""
     stripe.api_key = _require_setting('STRIPE_SECRET_KEY')
+    if not isinstance(stripe.default_http_client, _OutboundClient):
+        stripe.default_http_client = _OutboundClient(
+            session=outbound.session(outbound.STRIPE), timeout=settings.OUTBOUND_HTTP_TIMEOUT,
+        )
+    stripe.max_network_retries = MAX_NETWORK_RETRIES
     return stripe
 
 
+class _OutboundClient(stripe.RequestsClient):
+    """Stripe's requests client, over the shared Stripe session."""
+
+
 def get_or_create_customer(subscription: Subscription) -> str:
     """Ensure the org has a Stripe Customer; return its id.
 
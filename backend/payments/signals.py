@@ -8,12 +8,16 @@ The free trial is **card-required**: a new org starts with no access
 (``status = NONE``) and the gate sends it to /billing, where the owner starts
 a Stripe-managed 7-day trial (card on file, auto-converts). So this signal only
 ensures the row exists — it does not grant a trial.
+
+It also drops the gate's cached access answer on every Subscription write, so
+a trial extension or comping an org in admin takes effect on the next request.
 """
-from django.db.models.signals import post_save
+from django.db.models.signals import post_delete, post_save
 from django.dispatch import receiver
 
 from users.models import Organisation
 
+from . import access
 from .models import Subscription
 
 
@@ -24,3 +28,9 @@ def create_subscription_for_new_org(sender, instance, created, **kwargs):
     if not created:
         return
     Subscription.objects.get_or_create(organisation=instance)
+
+
+@receiver(post_save, sender=Subscription)
+@receiver(post_delete, sender=Subscription)
+def invalidate_cached_access(sender, instance, **kwargs):
+    access.invalidate(instance.organisation_id)
@@ -11,6 +11,7 @@ from datetime import datetime, timedelta, timezone as dt_timezone
 from unittest.mock import patch
 
 from django.conf import settings
+from django.core.cache import cache
 from django.test import TestCase, override_settings
 from django.urls import reverse
 from django.utils import timezone
@@ -545,6 +546,80 @@ class OrgAccessHelperTests(TestCase):
         self.assertFalse(org_has_access(None))
 
 
+@override_settings(SUBSCRIPTION_ACCESS_CACHE_TTL=60)
+class CachedAccessTests(TestCase):
+    """The gate asks on every API request, so the answer is cached per org —
+    and every way a subscription changes has to drop it."""
+
+    def setUp(self):
+        cache.clear()
+        self.addCleanup(cache.clear)
+        self.org = Organisation.objects.create(name="CacheCo", slug="cacheco", country="PK")
+        self.sub = self.org.subscription
+        self.sub.status = SubscriptionStatus.ACTIVE
+        self.sub.stripe_customer_id = "cus_cache"
+        self.sub.save()
+
+    def test_second_check_does_not_query(self):
+        self.assertTrue(org_has_access(self.org))
+        with self.assertNumQueries(0):
+            self.assertTrue(org_has_access(self.org))
+
+    def test_webhook_cancellation_takes_effect_immediately(self):
+        self.assertTrue(org_has_access(self.org))
+        webhook_handlers.handle_event({
+            "id": "evt_1", "type": "customer.subscription.deleted",
+            "data": {"object": {"id": "sub_1", "customer": "cus_cache"}},
+        })
+        self.assertFalse(org_has_access(self.org))
+
+    def test_admin_comp_takes_effect_immediately(self):
+        self.sub.status = SubscriptionStatus.CANCELED
+        self.sub.save()
+        self.assertFalse(org_has_access(self.org))
+        self.sub.comped = True
+        self.sub.save()
+        self.assertTrue(org_has_access(self.org))
+
+    def test_trial_access_is_not_cached_past_the_trial_end(self):
+        self.sub.status = SubscriptionStatus.TRIALING
+        self.sub.trial_ends_at = timezone.now() + timedelta(seconds=20)
+        self.sub.save()
+        with patch("payments.access.cache.set") as mock_set:
+            self.assertTrue(org_has_access(self.org))
+        self.assertLessEqual(mock_set.call_args.args[2], 20)
+
+
+class GateSharesTheVerifiedTokenTests(TestCase):
+    """The gate has already verified the cookie's token and loaded its user;
+    the view's authentication reuses that instead of doing both again."""
+
+    def setUp(self):
+        self.org = Organisation.objects.create(name="ShareCo", slug="shareco", country="PK")
+        self.user = User.objects.create(email="share@x.com", role="owner",
+                                        organisation=self.org, is_active=True)
+        sub = self.org.subscription
+        sub.status = SubscriptionStatus.ACTIVE
+        sub.save()
+        self.client = APIClient()
+        self.client.cookies['access_token'] = str(RefreshToken.for_user(self.user).access_token)
+
+    def test_token_is_verified_once_per_request(self):
+        from rest_framework_simplejwt.authentication import JWTAuthentication
+        original = JWTAuthentication.get_validated_token
+        with patch.object(JWTAuthentication, "get_validated_token",
+                          autospec=True, side_effect=original) as mock_validate:
+            res = self.client.get(SubscriptionGateTests.GATED)
+        self.assertEqual(res.status_code, 200, res.content)
+        self.assertEqual(mock_validate.call_count, 1)
+
+    def test_a_deactivated_user_gets_the_views_401_not_a_crash(self):
+        self.user.is_active = False
+        self.user.save()
+        res = self.client.get(SubscriptionGateTests.GATED)
+        self.assertEqual(res.status_code, 401)
+
+
 class WebhookViewTests(TestCase):
     @patch("payments.views.stripe_gateway.verify_webhook_event")
     def test_bad_signature_returns_400(self, mock_verify):
@@ -653,6 +728,18 @@ class WebhookEmptySecretTests(TestCase):
                 stripe_gateway.verify_webhook_event(b"{}", "t=1,v1=x")
         mock_construct.assert_not_called()
 
+    @override_settings(STRIPE_SECRET_KEY="sk_test_x")
+    def test_api_calls_go_over_the_shared_stripe_session(self):
+        import stripe
+
+        from portioning import outbound
+
+        from .services import stripe_gateway
+
+        stripe_gateway._client()
+        self.assertIs(stripe.default_http_client._session, outbound.session(outbound.STRIPE))
+        self.assertEqual(stripe.max_network_retries, stripe_gateway.MAX_NETWORK_RETRIES)
+
     @override_settings(STRIPE_SECRET_KEY="")
     def test_api_calls_refuse_an_empty_secret_key(self):
         from django.core.exceptions import ImproperlyConfigured
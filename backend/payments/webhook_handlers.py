@@ -9,6 +9,7 @@ import json
 import logging
 from datetime import datetime, timezone as dt_timezone
 
+from payments import access
 from payments.models import Subscription, SubscriptionStatus
 
 logger = logging.getLogger('payments')
@@ -81,6 +82,9 @@ def _sync_from_stripe_subscription(stripe_sub):
         sub.plan_name = price.get('nickname') or sub.plan_name
 
     sub.save()
+    # The gate caches each org's access; a billing change must take effect on
+    # the very next request, not when the entry expires.
+    access.invalidate(sub.organisation_id)
     logger.info("Synced subscription for org=%s -> %s",
                 sub.organisation_id, sub.status)
 
@@ -95,6 +99,7 @@ def _handle_subscription_deleted(stripe_sub):
     sub.status = SubscriptionStatus.CANCELED
     sub.cancel_at_period_end = False
     sub.save(update_fields=['status', 'cancel_at_period_end', 'updated_at'])
+    access.invalidate(sub.organisation_id)
     logger.info("Subscription canceled for org=%s", sub.organisation_id)
 
 
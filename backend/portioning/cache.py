@@ -0,0 +1,38 @@
+"""Helpers over the shared default cache (CACHES in settings.py).
+
+Keys for tenant data go through `org_key`, so every org's entries sit under
+their own ``org:<id>:`` namespace: one org's key can never be built from
+another's parts, and an operator can see at a glance whose data an entry is.
+"""
+import logging
+import uuid
+
+from django.core.cache import cache, caches
+
+logger = logging.getLogger(__name__)
+
+
+def org_key(org_id, *parts):
+    """The cache key for `parts` inside `org_id`'s namespace."""
+    if org_id is None:
+        raise ValueError("org_key() requires an organisation id")
+    return ':'.join(['org', str(org_id), *(str(p) for p in parts)])
+
+
+def check():
+    """Round-trip a throwaway value through the default cache.
+
+    Returns (ok, backend_name). A failure is logged with its exception but not
+    returned, so a caller can expose the result without leaking connection
+    details.
+    """
+    backend = type(caches['default']).__name__
+    key = f'health:{uuid.uuid4().hex}'
+    try:
+        cache.set(key, 'ok', 10)
+        ok = cache.get(key) == 'ok'
+        cache.delete(key)
+    except Exception:
+        logger.exception("Cache health check failed (%s)", backend)
+        return False, backend
+    return ok, backend
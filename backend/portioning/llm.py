@@ -8,13 +8,41 @@ env var and only needs to be set if that provider is actually in use.
 
 Current task settings:
     LLM_FOLLOWUP_DRAFTER — the follow-up drafting agent
+
+The SDK clients are built once per (provider, API key) and shared by the whole
+process (`client`), so a cron tick's hundreds of completions reuse kept-alive
+connections instead of paying a TCP + TLS handshake each. Their pool size and
+timeout are LLM_HTTP_POOL_SIZE and LLM_HTTP_TIMEOUT.
+
+`complete_structured_async` is the same call for asyncio code, so a batch of
+drafts can be gathered at once (nothing in the app awaits it yet: the drafting
+and eval fan-outs run the sync call on threads). Both share the per-provider
+rate and concurrency limits and the token accounting in `portioning.llm_limits`. Work that can wait hours for its
+answers goes to the providers' batch APIs instead (`portioning.llm_batch`).
+
+A system prompt built as an `SystemPrompt` of blocks — fixed rules first, then
+what varies per org — has each block marked cacheable for Anthropic, and routes
+OpenAI calls sharing its first block to the same prompt cache. Either way the
+shared prefix is billed and processed at the cached rate; the tokens served
+from cache are logged with each call and counted by `llm_limits`.
+
+LLM_TRANSPORT can record the providers' answers, or replay them with no network
+at all (`portioning.llm_replay`), for offline evals and load tests.
 """
+import asyncio
+import hashlib
 import json
 import logging
+import threading
 import time
+from contextvars import ContextVar
+from typing import NamedTuple
 
 from django.conf import settings
 
+from bookings.services.local_worker import closing_connection
+from portioning import llm_cache, llm_limits, llm_replay, timing
+
 logger = logging.getLogger(__name__)
 
 PROVIDER_KEYS = {
@@ -23,6 +51,37 @@ PROVIDER_KEYS = {
 }
 
 
+_clients = {}
+_clients_lock = threading.Lock()
+_reported_usage = ContextVar('llm_reported_usage', default=None)
+
+
+class Prompt(NamedTuple):
+    """What one structured completion sends: `complete_structured(task, *prompt)`."""
+    system: str
+    user_content: str
+    schema: dict
+    max_tokens: int = 1024
+
+
+class SystemPrompt(str):
+    """A system prompt made of blocks, the most widely shared first: a task's
+    fixed rules, say, then one org's. It is the joined text wherever a string
+    is expected; the provider calls use the blocks to cache the prompt prefix
+    every call sharing the leading blocks has in common. Empty blocks are
+    dropped. A plain string is a prompt of one block."""
+
+    def __new__(cls, *blocks):
+        blocks = tuple(block for block in blocks if block)
+        prompt = super().__new__(cls, ''.join(blocks))
+        prompt.blocks = blocks
+        return prompt
+
+
+def _blocks(system):
+    return getattr(system, 'blocks', None) or ((system,) if system else ())
+
+
 class LLMError(Exception):
     """The call could not produce a usable structured response."""
 
@@ -47,70 +106,264 @@ def is_configured(task_setting):
     """True when the task names a valid model AND its provider key is set."""
     try:
         provider, _ = resolve(task_setting)
+        api_key(provider)
     except LLMNotConfigured:
         return False
-    return bool(getattr(settings, PROVIDER_KEYS[provider], ''))
+    return True
+
+
+def api_key(provider):
+    """`provider`'s API key. Raises LLMNotConfigured when it is not set, unless
+    calls are replayed from recordings (`llm_replay`), which need none."""
+    key = getattr(settings, PROVIDER_KEYS[provider], '')
+    if not key and llm_replay.mode() != llm_replay.REPLAY:
+        raise LLMNotConfigured(f"{PROVIDER_KEYS[provider]} is not set")
+    return key
+
 
+def request_hash(provider, model, system, user_content, schema, max_tokens):
+    """A hash of everything one completion sends: what the response cache
+    (`llm_cache`) and the recordings (`llm_replay`) key it by."""
+    payload = json.dumps([provider, model, system, user_content, schema, max_tokens], sort_keys=True)
+    return hashlib.sha256(payload.encode()).hexdigest()
 
-def complete_structured(task_setting, system, user_content, schema, max_tokens=1024):
+
+def complete_structured(task_setting, system, user_content, schema, max_tokens=1024, *, cache=None,
+                        validate=None):
     """Run a completion that must return JSON matching `schema`.
 
     Returns (data, model_used) where data is the parsed dict and model_used is
     the 'provider:model' string that produced it. Raises LLMError (or the
     provider SDK's own exceptions) on failure — callers decide how to degrade.
+
+    `cache` overrides whether the answer may come from the response cache
+    (`portioning.llm_cache`): None follows LLM_CACHE_TASKS, False always asks
+    the provider, True uses the cache even for a task not listed.
+
+    `validate(data)`, when given, checks a fresh answer before it is cached:
+    whatever it raises propagates, and an answer that fails it is never stored.
+
+    A call over the provider's rate limits (`portioning.llm_limits`) waits here
+    until it is within them, and then for one of its provider's call slots.
     """
-    provider, model = resolve(task_setting)
-    api_key = getattr(settings, PROVIDER_KEYS[provider], '')
-    if not api_key:
-        raise LLMNotConfigured(f"{PROVIDER_KEYS[provider]} is not set")
+    call = _Call(task_setting, system, user_content, schema, max_tokens, cache, validate)
+    if call.cached is not None:
+        return call.cached, call.model_used
+    delay = call.reserve()
+    if delay:
+        time.sleep(delay)
+    return call.send(), call.model_used
 
-    # Looked up at call time (not a dict frozen at import) so tests can patch
-    # the per-provider callers.
-    caller = globals()[f'_call_{provider}']
-    started = time.monotonic()
-    text = caller(model, api_key, system, user_content, schema, max_tokens)
-    logger.info(
-        "LLM call %s:%s took %.0f ms (in≈%d chars, out≈%d chars)",
-        provider, model, (time.monotonic() - started) * 1000,
-        len(system) + len(user_content), len(text),
+
+async def complete_structured_async(task_setting, system, user_content, schema, max_tokens=1024,
+                                    *, cache=None, validate=None):
+    """`complete_structured` for asyncio code: same arguments, result and errors.
+
+    Many calls can be gathered at once. Each waits out the provider's rate
+    limits without holding a thread; the cache lookup and the provider call
+    itself (through the same `_call_<provider>` seam, and the same provider
+    slots, as the sync path) run on the loop's worker threads.
+    """
+    call = await asyncio.to_thread(
+        closing_connection(_Call), task_setting, system, user_content, schema, max_tokens, cache, validate,
+    )
+    if call.cached is not None:
+        return call.cached, call.model_used
+    await asyncio.sleep(call.reserve())
+    return await asyncio.to_thread(closing_connection(call.send)), call.model_used
+
+
+class _Call:
+    """One structured completion: resolved, looked up in the cache, and sent."""
+
+    def __init__(self, task_setting, system, user_content, schema, max_tokens, cache, validate):
+        self.task_setting = task_setting
+        self.validate = validate
+        self.system, self.user_content, self.schema = system, user_content, schema
+        self.max_tokens = max_tokens
+        self.provider, self.model = resolve(task_setting)
+        self.model_used = f"{self.provider}:{self.model}"
+        self.api_key = api_key(self.provider)
+
+        self.cache_key = self.cached = None
+        if llm_cache.stores(task_setting, cache):
+            self.cache_key = llm_cache.key(
+                request_hash(self.provider, self.model, system, user_content, schema, max_tokens),
+            )
+        if self.cache_key and llm_cache.enabled(task_setting, cache):
+            self.cached = llm_cache.get(task_setting, self.cache_key)
+            if self.cached is not None:
+                logger.info("LLM call %s answered from cache", self.model_used)
+        self.reserved = llm_limits.estimate_tokens(system, user_content, max_tokens)
+
+    def reserve(self):
+        """Seconds to wait before sending, to stay within the rate limits."""
+        return llm_limits.reserve(self.provider, self.reserved)
+
+    def send(self):
+        # Looked up at call time (not a dict frozen at import) so tests can patch
+        # the per-provider callers.
+        caller = llm_replay.transport(self.provider, globals()[f'_call_{self.provider}'])
+        reported = {}
+        token = _reported_usage.set(reported)
+        started = time.monotonic()
+        try:
+            with llm_limits.slot(self.provider, self.task_setting), timing.span('llm'):
+                text = caller(
+                    self.model, self.api_key, self.system, self.user_content,
+                    self.schema, self.max_tokens,
+                )
+        finally:
+            _reported_usage.reset(token)
+        elapsed_ms = (time.monotonic() - started) * 1000
+        if reported:
+            logger.info(
+                "LLM call %s took %.0f ms (in=%d tokens, out=%d tokens, cached=%d tokens)",
+                self.model_used, elapsed_ms, reported['input_tokens'], reported['output_tokens'],
+                reported['cached_tokens'],
+            )
+            llm_limits.record(
+                self.task_setting, reported['input_tokens'], reported['output_tokens'],
+                reported['cached_tokens'],
+            )
+            llm_limits.settle(
+                self.provider, self.reserved, reported['input_tokens'] + reported['output_tokens'],
+            )
+        else:
+            logger.info(
+                "LLM call %s took %.0f ms (in≈%d chars, out≈%d chars)",
+                self.model_used, elapsed_ms, len(self.system) + len(self.user_content), len(text),
+            )
+        try:
+            data = json.loads(text)
+        except (ValueError, TypeError) as exc:
+            raise LLMError(f"{self.model_used} returned unparseable output") from exc
+        if self.validate:
+            self.validate(data)
+        if self.cache_key:
+            llm_cache.put(self.cache_key, data)
+        return data
+
+
+def _report_usage(input_tokens, output_tokens, cached_tokens=0):
+    """For a `_call_<provider>`: the token counts its response reported.
+    `input_tokens` is every prompt token, `cached_tokens` those of them read
+    from the provider's prompt cache."""
+    reported = _reported_usage.get()
+    if reported is not None:
+        reported.update(
+            input_tokens=input_tokens or 0, output_tokens=output_tokens or 0,
+            cached_tokens=cached_tokens or 0,
+        )
+
+
+def client(provider, api_key):
+    """The process-wide SDK client for `provider` and `api_key`, created on first use."""
+    key = (provider, api_key)
+    existing = _clients.get(key)
+    if existing is not None:
+        return existing
+    with _clients_lock:
+        if key not in _clients:
+            _clients[key] = _build_client(provider, api_key)
+        return _clients[key]
+
+
+def reset_clients():
+    """Close and forget every cached client (tests, or after rotating a key)."""
+    with _clients_lock:
+        for sdk_client in _clients.values():
+            sdk_client.close()
+        _clients.clear()
+
+
+def _build_client(provider, api_key):
+    import httpx
+
+    pool = settings.LLM_HTTP_POOL_SIZE
+    options = dict(
+        limits=httpx.Limits(max_connections=pool, max_keepalive_connections=pool),
+        timeout=settings.LLM_HTTP_TIMEOUT,
+    )
+    if provider == 'anthropic':
+        import anthropic
+        return anthropic.Anthropic(
+            api_key=api_key, timeout=settings.LLM_HTTP_TIMEOUT,
+            http_client=anthropic.DefaultHttpxClient(**options),
+        )
+    import openai
+    return openai.OpenAI(
+        api_key=api_key, timeout=settings.LLM_HTTP_TIMEOUT,
+        http_client=openai.DefaultHttpxClient(**options),
     )
-    try:
-        data = json.loads(text)
-    except (ValueError, TypeError) as exc:
-        raise LLMError(f"{provider}:{model} returned unparseable output") from exc
-    return data, f"{provider}:{model}"
 
 
 def _call_anthropic(model, api_key, system, user_content, schema, max_tokens):
-    import anthropic
+    response = client('anthropic', api_key).messages.create(
+        **_anthropic_params(model, system, user_content, schema, max_tokens),
+    )
+    usage = response.usage
+    # Anthropic counts cache reads and writes apart from input_tokens.
+    cached = usage.cache_read_input_tokens or 0
+    _report_usage(
+        usage.input_tokens + cached + (usage.cache_creation_input_tokens or 0),
+        usage.output_tokens, cached,
+    )
+    return _anthropic_text(model, response)
 
-    client = anthropic.Anthropic(api_key=api_key)
-    response = client.messages.create(
+
+def _anthropic_params(model, system, user_content, schema, max_tokens):
+    """The Messages API request — shared with the batch API (`llm_batch`)."""
+    return dict(
         model=model,
         max_tokens=max_tokens,
-        system=system,
+        system=_anthropic_system(system),
         messages=[{"role": "user", "content": user_content}],
         output_config={"format": {"type": "json_schema", "schema": schema}},
     )
-    if response.stop_reason == "refusal":
+
+
+def _anthropic_system(system):
+    """The system prompt as text blocks, each ending a cache breakpoint (the API
+    allows four, so only the last four blocks get one)."""
+    blocks = _blocks(system)
+    if not blocks:
+        return system
+    return [
+        {"type": "text", "text": block, **(
+            {"cache_control": {"type": "ephemeral"}} if index >= len(blocks) - 4 else {}
+        )}
+        for index, block in enumerate(blocks)
+    ]
+
+
+def _anthropic_text(model, message):
+    if message.stop_reason == "refusal":
         raise LLMError(f"anthropic:{model} refused the request")
-    return next((b.text for b in response.content if b.type == "text"), "")
+    return next((b.text for b in message.content if b.type == "text"), "")
 
 
 def _call_openai(model, api_key, system, user_content, schema, max_tokens):
-    from openai import OpenAI
+    response = client('openai', api_key).chat.completions.create(
+        **_openai_body(model, system, user_content, schema, max_tokens),
+    )
+    if response.usage is not None:
+        details = response.usage.prompt_tokens_details
+        _report_usage(
+            response.usage.prompt_tokens, response.usage.completion_tokens,
+            details.cached_tokens if details is not None else 0,
+        )
+    message = response.choices[0].message
+    if getattr(message, 'refusal', None):
+        raise LLMError(f"openai:{model} refused the request")
+    return message.content or ""
 
-    client = OpenAI(api_key=api_key)
-    kwargs = {}
-    if model.startswith('gpt-5'):
-        # GPT-5-family models can spend hidden 'reasoning' tokens before
-        # answering; drafting a 3-sentence message needs none of that, and the
-        # default has changed between 5.x releases — pin it off explicitly.
-        kwargs['reasoning_effort'] = 'none'
-    response = client.chat.completions.create(
+
+def _openai_body(model, system, user_content, schema, max_tokens):
+    """The Chat Completions request — shared with the batch API (`llm_batch`)."""
+    body = dict(
         model=model,
         max_completion_tokens=max_tokens,
-        **kwargs,
         messages=[
             {"role": "system", "content": system},
             {"role": "user", "content": user_content},
@@ -120,7 +373,14 @@ def _call_openai(model, api_key, system, user_content, schema, max_tokens):
             "json_schema": {"name": "structured_response", "strict": True, "schema": schema},
         },
     )
-    message = response.choices[0].message
-    if getattr(message, 'refusal', None):
-        raise LLMError(f"openai:{model} refused the request")
-    return message.content or ""
+    blocks = _blocks(system)
+    if blocks:
+        # OpenAI caches long prompt prefixes by itself; this key sends calls
+        # that share the first block to the same cache.
+        body['prompt_cache_key'] = hashlib.sha256(blocks[0].encode()).hexdigest()[:32]
+    if model.startswith('gpt-5'):
+        # GPT-5-family models can spend hidden 'reasoning' tokens before
+        # answering; drafting a 3-sentence message needs none of that, and the
+        # default has changed between 5.x releases — pin it off explicitly.
+        body['reasoning_effort'] = 'none'
+    return body
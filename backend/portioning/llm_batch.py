@@ -0,0 +1,261 @@
+"""Structured completions through the providers' batch APIs.
+
+A nightly drafting run isn't waiting on anyone: its answers can take minutes
+(or hours) to arrive. OpenAI's and Anthropic's batch APIs take a whole run's
+requests as one job, at half the per-call price and outside the interactive
+rate limits. `run` submits the prompts, polls until the job ends, and returns
+one result per prompt, in order. Each result is a ``(data, model_used)`` pair,
+as `llm.complete_structured` returns, or the `LLMError` for the request that
+failed. One failed request never fails the rest of the batch.
+
+The request bodies are the ones `llm._call_<provider>` sends, so a batch
+drafts exactly what the interactive call would.
+
+`run` is `submit`, then `wait`. A caller that must not lose a job it has paid
+for (a cron tick that may crash, or overlap the next one) keeps the job
+`submit` returns (a JSON-able dict) and can `poll` it from another process.
+
+Under the test runner (LLM_BATCH_FAKE), or when replaying recordings, a local
+fake stands in for the providers. It answers every request through
+`llm._call_<provider>`, the same seam the tests patch and `llm_replay` wraps,
+and reports the job as running for one poll first.
+"""
+import itertools
+import json
+import logging
+import threading
+import time
+
+from django.conf import settings
+
+from portioning import llm, llm_limits, llm_replay
+
+logger = logging.getLogger(__name__)
+
+RUNNING = None  # what a `_poll_*` returns while the job is still going
+
+
+def run(task_setting, prompts, *, poll_seconds=None, timeout=None):
+    """Complete every `llm.Prompt` in `prompts` as one batch job for
+    `task_setting`. Returns one result per prompt, in order: ``(data,
+    model_used)`` or an `LLMError`.
+
+    Blocks until the job ends, polling every LLM_BATCH_POLL_SECONDS. A job
+    still running after LLM_BATCH_TIMEOUT seconds is cancelled, and every prompt
+    without an answer by then gets an error. Raises LLMNotConfigured as
+    `complete_structured` does.
+    """
+    if not prompts:
+        return []
+    return wait(submit(task_setting, prompts), poll_seconds=poll_seconds, timeout=timeout)
+
+
+def submit(task_setting, prompts):
+    """Submit `prompts` as one batch job for `task_setting`, and return the job:
+    a JSON-able dict to hand to `poll`, `wait` or `cancel`."""
+    provider, model = llm.resolve(task_setting)
+    api_key = llm.api_key(provider)
+    replaying = llm_replay.mode() == llm_replay.REPLAY
+    backend = 'fake' if settings.LLM_BATCH_FAKE or replaying else provider
+    items = [(f'req-{index}', llm.Prompt(*prompt)) for index, prompt in enumerate(prompts)]
+    batch_id = globals()[f'_submit_{backend}'](provider, model, api_key, items)
+    logger.info("LLM batch %s submitted to %s:%s: %d request(s)", batch_id, provider, model, len(items))
+    return {
+        'task_setting': task_setting, 'backend': backend, 'provider': provider,
+        'model': model, 'batch_id': batch_id, 'count': len(items),
+    }
+
+
+def wait(job, *, poll_seconds=None, timeout=None, on_poll=None):
+    """`poll` `job` every LLM_BATCH_POLL_SECONDS until it ends, cancelling it
+    after LLM_BATCH_TIMEOUT seconds (see `run`). Returns its results.
+
+    `on_poll()`, if given, is called after each poll that finds the job still
+    running — a caller holding a lease on the job renews it there.
+    """
+    poll_seconds = settings.LLM_BATCH_POLL_SECONDS if poll_seconds is None else poll_seconds
+    timeout = settings.LLM_BATCH_TIMEOUT if timeout is None else timeout
+    started = time.monotonic()
+    while True:
+        results = poll(job)
+        if results is not RUNNING:
+            break
+        if time.monotonic() >= started + timeout:
+            results = cancel(job)
+            break
+        if on_poll:
+            on_poll()
+        time.sleep(poll_seconds)
+    logger.info("LLM batch %s ended after %.0f s", job['batch_id'], time.monotonic() - started)
+    return results
+
+
+def poll(job):
+    """`job`'s results, one per prompt in order (as `run` returns them), or
+    RUNNING while it is still going."""
+    provider, api_key = job['provider'], llm.api_key(job['provider'])
+    answers = globals()[f"_poll_{job['backend']}"](provider, job['model'], api_key, job['batch_id'])
+    if answers is RUNNING:
+        return RUNNING
+    return _results(job, answers)
+
+
+def cancel(job):
+    """Cancel `job`. Returns its results: an error for every prompt."""
+    logger.warning("LLM batch %s did not finish in time; cancelling it", job['batch_id'])
+    try:
+        globals()[f"_cancel_{job['backend']}"](job['provider'], llm.api_key(job['provider']), job['batch_id'])
+    except Exception:
+        logger.exception("Could not cancel LLM batch %s", job['batch_id'])
+    return _results(job, {})
+
+
+def _results(job, answers):
+    model_used = f"{job['provider']}:{job['model']}"
+    results = []
+    for index in range(job['count']):
+        custom_id = f'req-{index}'
+        answer = answers.get(custom_id)
+        if answer is None:
+            results.append(llm.LLMError(f"{model_used} batch {job['batch_id']} returned nothing for {custom_id}"))
+        elif isinstance(answer, Exception):
+            results.append(answer)
+        else:
+            results.append(_parse(job['task_setting'], model_used, *answer))
+    return results
+
+
+def _parse(task_setting, model_used, text, usage):
+    if usage:
+        llm_limits.record(task_setting, *usage)
+    try:
+        return json.loads(text), model_used
+    except (ValueError, TypeError) as exc:
+        return llm.LLMError(f"{model_used} returned unparseable output: {exc}")
+
+
+# ── OpenAI (Batch API over /v1/chat/completions) ──
+#
+# `_poll_*` returns RUNNING, or {custom_id: (text, (input_tokens,
+# output_tokens)) or LLMError} once the job has ended.
+
+_OPENAI_ENDPOINT = '/v1/chat/completions'
+_OPENAI_RUNNING = ('validating', 'in_progress', 'finalizing', 'cancelling')
+
+
+def _submit_openai(provider, model, api_key, items):
+    lines = '\n'.join(
+        json.dumps({
+            'custom_id': custom_id, 'method': 'POST', 'url': _OPENAI_ENDPOINT,
+            'body': llm._openai_body(model, *prompt),
+        })
+        for custom_id, prompt in items
+    )
+    sdk = llm.client(provider, api_key)
+    upload = sdk.files.create(file=('batch.jsonl', lines.encode()), purpose='batch')
+    return sdk.batches.create(
+        input_file_id=upload.id, endpoint=_OPENAI_ENDPOINT, completion_window='24h',
+    ).id
+
+
+def _poll_openai(provider, model, api_key, batch_id):
+    sdk = llm.client(provider, api_key)
+    batch = sdk.batches.retrieve(batch_id)
+    if batch.status in _OPENAI_RUNNING:
+        return RUNNING
+    answers = {}
+    for file_id in (batch.output_file_id, batch.error_file_id):
+        if not file_id:
+            continue
+        for line in sdk.files.content(file_id).text.splitlines():
+            if line.strip():
+                row = json.loads(line)
+                answers[row['custom_id']] = _openai_answer(model, row)
+    return answers
+
+
+def _openai_answer(model, row):
+    response = row.get('response') or {}
+    if row.get('error') or response.get('status_code') != 200:
+        detail = row.get('error') or response.get('body')
+        return llm.LLMError(f"openai:{model} batch request failed: {detail}")
+    body = response['body']
+    message = body['choices'][0]['message']
+    if message.get('refusal'):
+        return llm.LLMError(f"openai:{model} refused the request")
+    usage = body.get('usage') or {}
+    return message.get('content') or '', (usage.get('prompt_tokens', 0), usage.get('completion_tokens', 0))
+
+
+def _cancel_openai(provider, api_key, batch_id):
+    llm.client(provider, api_key).batches.cancel(batch_id)
+
+
+# ── Anthropic (Message Batches) ──
+
+def _submit_anthropic(provider, model, api_key, items):
+    return llm.client(provider, api_key).messages.batches.create(requests=[
+        {'custom_id': custom_id, 'params': llm._anthropic_params(model, *prompt)}
+        for custom_id, prompt in items
+    ]).id
+
+
+def _poll_anthropic(provider, model, api_key, batch_id):
+    batches = llm.client(provider, api_key).messages.batches
+    if batches.retrieve(batch_id).processing_status != 'ended':
+        return RUNNING
+    answers = {}
+    for entry in batches.results(batch_id):
+        if entry.result.type != 'succeeded':
+            answers[entry.custom_id] = llm.LLMError(f"anthropic:{model} batch request {entry.result.type}")
+            continue
+        message = entry.result.message
+        try:
+            text = llm._anthropic_text(model, message)
+        except llm.LLMError as exc:
+            answers[entry.custom_id] = exc
+            continue
+        answers[entry.custom_id] = text, (message.usage.input_tokens, message.usage.output_tokens)
+    return answers
+
+
+def _cancel_anthropic(provider, api_key, batch_id):
+    llm.client(provider, api_key).messages.batches.cancel(batch_id)
+
+
+# ── The local fake (LLM_BATCH_FAKE) ──
+
+_fake_jobs = {}
+_fake_ids = itertools.count(1)
+_fake_lock = threading.Lock()
+
+
+def _submit_fake(provider, model, api_key, items):
+    with _fake_lock:
+        batch_id = f'fakebatch-{next(_fake_ids)}'
+        _fake_jobs[batch_id] = {'items': items, 'polls': 0}
+    return batch_id
+
+
+def _poll_fake(provider, model, api_key, batch_id):
+    with _fake_lock:
+        job = _fake_jobs[batch_id]
+        job['polls'] += 1
+        if job['polls'] == 1:
+            return RUNNING
+        del _fake_jobs[batch_id]
+    caller = llm_replay.transport(provider, getattr(llm, f'_call_{provider}'))
+    answers = {}
+    for custom_id, prompt in job['items']:
+        try:
+            answers[custom_id] = caller(model, api_key, *prompt), None
+        except llm.LLMError as exc:
+            answers[custom_id] = exc
+        except Exception as exc:
+            answers[custom_id] = llm.LLMError(f"{provider}:{model} batch request failed: {exc}")
+    return answers
+
+
+def _cancel_fake(provider, api_key, batch_id):
+    with _fake_lock:
+        _fake_jobs.pop(batch_id, None)
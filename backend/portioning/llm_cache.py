@@ -0,0 +1,102 @@
+"""Cached answers for `llm.complete_structured`.
+
+The same prompt sent twice — a preview followed by the real draft, an eval
+dataset rerun after an unrelated change — costs two provider calls and two
+waits for one answer. A task listed in LLM_CACHE_TASKS keeps each parsed
+response for LLM_CACHE_TTL seconds, keyed by a hash of everything the provider
+is sent: provider, model, system prompt, user content, schema and max_tokens
+(`llm.request_hash`, which also names `llm_replay`'s recordings). Change any
+of them and it is a different entry.
+
+Entries live in CACHES['llm']: the shared store, unless LLM_CACHE_URL gives
+them one of their own (a local file directory, say) capped at
+LLM_CACHE_MAX_ENTRIES. Either way the backend culls entries past its cap.
+
+A call can opt out (`complete_structured(..., cache=False)` asks the provider
+and replaces the stored answer) or in (`cache=True`). `forced` does the same
+for a whole block, e.g. an eval run. `stats()` counts hits and misses per task
+for the process.
+"""
+import logging
+import threading
+from collections import defaultdict
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.core.cache import caches
+
+logger = logging.getLogger(__name__)
+
+ALIAS = 'llm'
+# Bump to orphan every stored entry, e.g. if what is stored changes shape.
+VERSION = 1
+
+_forced = ContextVar('llm_cache_forced', default=None)
+_stats_lock = threading.Lock()
+_stats = defaultdict(lambda: {'hits': 0, 'misses': 0})
+
+
+def _on_for(task_setting):
+    forced = _forced.get()
+    return task_setting in settings.LLM_CACHE_TASKS if forced is None else forced
+
+
+def enabled(task_setting, cache=None):
+    """Whether a call for `task_setting` may be answered from the cache."""
+    return _on_for(task_setting) if cache is None else cache
+
+
+def stores(task_setting, cache=None):
+    """Whether a fresh answer for `task_setting` is written to the cache.
+
+    As `enabled`, except that a ``cache=False`` call on a cached task still
+    stores: skipping the stored answer refreshes it.
+    """
+    return bool(cache) or _on_for(task_setting)
+
+
+@contextmanager
+def forced(cache):
+    """Within the block, treat every call as passing ``cache=<cache>``."""
+    token = _forced.set(cache)
+    try:
+        yield
+    finally:
+        _forced.reset(token)
+
+
+def key(request_hash):
+    """The cache key for a request's `llm.request_hash`."""
+    return f'llm:v{VERSION}:{request_hash}'
+
+
+def get(task_setting, cache_key):
+    """The stored answer for `cache_key`, or None. Counts the hit or miss."""
+    try:
+        data = caches[ALIAS].get(cache_key)
+    except Exception:
+        # A cache that's down costs a provider call, never the call itself.
+        logger.exception('LLM cache read failed')
+        data = None
+    with _stats_lock:
+        _stats[task_setting]['hits' if data is not None else 'misses'] += 1
+    return data
+
+
+def put(cache_key, data):
+    try:
+        caches[ALIAS].set(cache_key, data, settings.LLM_CACHE_TTL)
+    except Exception:
+        logger.exception('LLM cache write failed')
+
+
+def stats():
+    """{task_setting: {'hits', 'misses'}} since start (or `reset_stats`)."""
+    with _stats_lock:
+        return {task: dict(row) for task, row in _stats.items()}
+
+
+def reset_stats():
+    with _stats_lock:
+        _stats.clear()
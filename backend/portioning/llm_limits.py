@@ -0,0 +1,181 @@
+"""What the process may send each LLM provider, and what it has spent.
+
+- **Rate.** Each provider gets two token buckets: requests and tokens per
+  minute (LLM_RATE_LIMITS, matched to the account's tier; 0 = unlimited). A
+  call reserves one request and its estimated tokens before it goes. If that
+  leaves a bucket in debt, the call waits for the debt to refill instead of
+  drawing a 429. The estimate is settled against the provider's reported usage
+  afterwards. Every call in the process shares the buckets, sync and async
+  alike.
+- **Concurrency.** A call holds one of its provider's LLM_PROVIDER_CONCURRENCY
+  slots while it is in flight (`slot`), shared by every thread and event loop
+  in the process, so the cron endpoint and a management command drafting at
+  once can't exceed the supplier's limit between them. A task listed in
+  LLM_TASK_CONCURRENCY also holds one of its own slots, so one busy task
+  can't take every slot its provider has.
+- **Usage.** The input and output tokens each response reports (and how many
+  of the input tokens came from the provider's prompt cache) are added up per
+  task setting (`usage()`), and into every `tally()` open around the call, so a
+  caller can see what one run of something cost.
+"""
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager, nullcontext
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+
+from django.conf import settings
+
+# Characters per token, for estimating a request before it is sent.
+CHARS_PER_TOKEN = 4
+
+_buckets = {}
+_buckets_lock = threading.Lock()
+_slots = {}
+_slots_lock = threading.Lock()
+
+_usage_lock = threading.Lock()
+_usage = defaultdict(lambda: {'calls': 0, 'input_tokens': 0, 'output_tokens': 0, 'cached_tokens': 0})
+_tallies = ContextVar('llm_tallies', default=())
+
+
+# ── Rate ──
+
+class _Bucket:
+    """A token bucket refilling at `per_minute`, which callers may overdraw."""
+
+    def __init__(self, per_minute):
+        self.rate = per_minute / 60
+        self.capacity = per_minute
+        self.level = per_minute
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def take(self, amount):
+        """Take `amount`; returns how long to wait before using it."""
+        with self.lock:
+            now = time.monotonic()
+            self.level = min(self.capacity, self.level + (now - self.updated) * self.rate)
+            self.updated = now
+            self.level -= amount
+            return max(0.0, -self.level / self.rate)
+
+    def give_back(self, amount):
+        with self.lock:
+            self.level = min(self.capacity, self.level + amount)
+
+
+def _bucket(provider, kind, per_minute):
+    key = (provider, kind, per_minute)
+    with _buckets_lock:
+        if key not in _buckets:
+            _buckets[key] = _Bucket(per_minute)
+        return _buckets[key]
+
+
+def estimate_tokens(system, user_content, max_tokens):
+    """Tokens to reserve for a call: its prompt, plus the most it may write."""
+    return (len(system) + len(user_content)) // CHARS_PER_TOKEN + max_tokens
+
+
+def reserve(provider, tokens):
+    """Reserve one request and `tokens` with `provider`.
+
+    Returns the seconds the caller must wait before sending it (0 when within
+    the limits).
+    """
+    rpm, tpm = settings.LLM_RATE_LIMITS.get(provider, (0, 0))
+    delay = 0.0
+    if rpm:
+        delay = _bucket(provider, 'requests', rpm).take(1)
+    if tpm:
+        delay = max(delay, _bucket(provider, 'tokens', tpm).take(tokens))
+    return delay
+
+
+def settle(provider, reserved, used):
+    """Correct a reservation of `reserved` tokens to what was actually `used`."""
+    _, tpm = settings.LLM_RATE_LIMITS.get(provider, (0, 0))
+    if tpm and used is not None:
+        _bucket(provider, 'tokens', tpm).give_back(reserved - used)
+
+
+# ── Concurrency ──
+
+@contextmanager
+def slot(provider, task_setting=None):
+    """Hold one of `provider`'s call slots, and one of `task_setting`'s if it has
+    a cap, while a call is in flight.
+
+    The task's slot is taken first: a call waiting on its task's cap must not
+    sit on a provider slot another task could be using.
+    """
+    size = settings.LLM_TASK_CONCURRENCY.get(task_setting)
+    with _semaphore(('task', task_setting), size) if size else nullcontext():
+        with _semaphore(('provider', provider), settings.LLM_PROVIDER_CONCURRENCY):
+            yield
+
+
+def _semaphore(name, size):
+    with _slots_lock:
+        if (name, size) not in _slots:
+            _slots[name, size] = threading.BoundedSemaphore(size)
+        return _slots[name, size]
+
+
+# ── Usage ──
+
+@dataclass
+class Tally:
+    calls: int = 0
+    input_tokens: int = 0
+    output_tokens: int = 0
+    cached_tokens: int = 0  # of input_tokens, those read from the provider's prompt cache
+    # {task_setting: [input_tokens, output_tokens]}, for pricing by model.
+    by_task: dict = field(default_factory=dict)
+
+
+def record(task_setting, input_tokens, output_tokens, cached_tokens=0):
+    with _usage_lock:
+        row = _usage[task_setting]
+        row['calls'] += 1
+        row['input_tokens'] += input_tokens
+        row['output_tokens'] += output_tokens
+        row['cached_tokens'] += cached_tokens
+        for open_tally in _tallies.get():
+            open_tally.calls += 1
+            open_tally.input_tokens += input_tokens
+            open_tally.output_tokens += output_tokens
+            open_tally.cached_tokens += cached_tokens
+            task_tokens = open_tally.by_task.setdefault(task_setting, [0, 0])
+            task_tokens[0] += input_tokens
+            task_tokens[1] += output_tokens
+
+
+@contextmanager
+def tally():
+    """Count the provider calls made inside the block, and their tokens.
+
+    Covers calls on threads and tasks started from inside it too, as long as
+    they run in a copy of its context (`asyncio.to_thread`, tasks, and
+    `contextvars.copy_context`).
+    """
+    current = Tally()
+    token = _tallies.set((*_tallies.get(), current))
+    try:
+        yield current
+    finally:
+        _tallies.reset(token)
+
+
+def usage():
+    """{task_setting: {'calls', 'input_tokens', 'output_tokens', 'cached_tokens'}}
+    since start."""
+    with _usage_lock:
+        return {task: dict(row) for task, row in _usage.items()}
+
+
+def reset_usage():
+    with _usage_lock:
+        _usage.clear()
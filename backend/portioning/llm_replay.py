@@ -0,0 +1,141 @@
+"""Recorded provider answers, for running the LLM paths offline.
+
+LLM_TRANSPORT decides what answers a `llm._call_<provider>`:
+
+- ``live`` (the default): the provider.
+- ``record``: the provider, and every answer it gives is written to
+  LLM_RECORDINGS_DIR along with its token usage and how long it took.
+- ``replay``: the recordings only. Nothing goes over the network. A request
+  that was never recorded raises LLMError rather than reaching a provider.
+
+A recording is keyed by a hash of the whole request (provider, model, system
+prompt, user content, schema and max_tokens), one JSON file per request. A
+replayed answer reports its recorded usage, so rate limits, tallies and eval
+cost reports see what the real call cost. It also takes its recorded time
+again (LLM_REPLAY_LATENCY: ``recorded``, or a fixed number of seconds, ``0``
+for none). That way a load test of follow-up drafting or an agent graph
+queues and overlaps the way it would against the provider.
+
+The transport wraps the `_call_<provider>` seam, so the response cache, the
+rate limits and the batch fake all sit where they always do. `using` switches
+it for a block, e.g. one eval run.
+
+Recordings hold the prompts verbatim: record from seeded or synthetic data,
+not a production database.
+"""
+import json
+import logging
+import os
+import tempfile
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from pathlib import Path
+
+from django.conf import settings
+
+from portioning import llm
+
+logger = logging.getLogger(__name__)
+
+LIVE = 'live'
+RECORD = 'record'
+REPLAY = 'replay'
+
+_using = ContextVar('llm_transport', default=None)
+
+
+@contextmanager
+def using(mode, directory=None):
+    """Within the block, use `mode` (and `directory` for the recordings)
+    instead of LLM_TRANSPORT / LLM_RECORDINGS_DIR."""
+    token = _using.set((mode, directory))
+    try:
+        yield
+    finally:
+        _using.reset(token)
+
+
+def mode():
+    forced = _using.get()
+    return forced[0] if forced else settings.LLM_TRANSPORT
+
+
+def directory():
+    forced = _using.get()
+    return Path((forced and forced[1]) or settings.LLM_RECORDINGS_DIR)
+
+
+def transport(provider, live):
+    """What answers a call to `provider` under the current mode: `live` (a
+    `_call_<provider>`) itself, `live` with its answers recorded, or the
+    recordings. Each takes a `_call_<provider>`'s arguments."""
+    current = mode()
+    if current == LIVE:
+        return live
+    if current == RECORD:
+        return lambda *request: _record(provider, live, *request)
+    if current == REPLAY:
+        return lambda *request: _replay(provider, *request)
+    raise llm.LLMNotConfigured(f"LLM_TRANSPORT={current!r} — expected one of {LIVE}, {RECORD}, {REPLAY}")
+
+
+def path_for(provider, model, system, user_content, schema, max_tokens):
+    request_hash = llm.request_hash(provider, model, system, user_content, schema, max_tokens)
+    return directory() / f'{request_hash}.json'
+
+
+def _record(provider, live, model, api_key, system, user_content, schema, max_tokens):
+    started = time.monotonic()
+    text = live(model, api_key, system, user_content, schema, max_tokens)
+    seconds = time.monotonic() - started
+    reported = llm._reported_usage.get() or {}
+    entry = {
+        'provider': provider,
+        'model': model,
+        'system': system,
+        'user_content': user_content,
+        'max_tokens': max_tokens,
+        'text': text,
+        'usage': [
+            reported['input_tokens'], reported['output_tokens'], reported['cached_tokens'],
+        ] if reported else None,
+        'seconds': round(seconds, 3),
+    }
+    path = path_for(provider, model, system, user_content, schema, max_tokens)
+    try:
+        _write(path, entry)
+    except OSError:
+        # A recording that can't be written costs the recording, not the call.
+        logger.exception('Could not write LLM recording %s', path)
+    return text
+
+
+def _write(path, entry):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    # Written aside and renamed in, so a concurrent replay never reads half a file.
+    fd, tmp = tempfile.mkstemp(dir=path.parent, suffix='.tmp')
+    with os.fdopen(fd, 'w') as fh:
+        json.dump(entry, fh, indent=2)
+    os.replace(tmp, path)
+
+
+def _replay(provider, model, api_key, system, user_content, schema, max_tokens):
+    path = path_for(provider, model, system, user_content, schema, max_tokens)
+    try:
+        with open(path) as fh:
+            entry = json.load(fh)
+    except FileNotFoundError:
+        raise llm.LLMError(f"{provider}:{model} has no recording for this request ({path.name})")
+    delay = _latency(entry)
+    if delay:
+        time.sleep(delay)
+    if entry.get('usage'):
+        llm._report_usage(*entry['usage'])
+    return entry['text']
+
+
+def _latency(entry):
+    if settings.LLM_REPLAY_LATENCY == 'recorded':
+        return entry.get('seconds') or 0
+    return float(settings.LLM_REPLAY_LATENCY)
@@ -0,0 +1,226 @@
+"""Outbound HTTP to third parties: one pooled, instrumented session per provider.
+
+Every integration — the Meta Graph API, Google and Microsoft mail, Twilio,
+Stripe — makes its calls through `session(provider)`, a `requests.Session`
+shared by the whole process. Its adapter gives every provider the same things:
+
+- **keep-alive pools**, one per host, so a burst of sends or Graph reads reuses
+  connections instead of paying a TCP + TLS handshake per call;
+- **a timeout on every call**: whatever the caller passes (the send budget,
+  OUTBOUND_SEND_TIMEOUT, or an interactive budget), else OUTBOUND_HTTP_TIMEOUT —
+  so no SDK default can leave a call hanging forever;
+- **retries with backoff** for idempotent requests (GET/HEAD/DELETE) on a
+  connection error, 429 or 502–504, honouring Retry-After. A POST is never
+  retried here: for a send that would risk delivering it twice;
+- **metrics**: each call's time is added to the current request's
+  ``<provider>`` Server-Timing entry (`portioning.timing`), and `stats()` keeps
+  per-provider call, error and latency totals for the process.
+
+The SDKs are handed the same session: Twilio's `TwilioHttpClient` and Stripe's
+`RequestsClient` both accept one.
+
+Under the test runner (OUTBOUND_HTTP_FAKE) the sessions carry a fake transport
+instead, which refuses every request with `OutboundBlocked`: a test that forgot
+to patch a provider fails on the spot rather than reaching the network. A test
+that wants canned answers uses `fake_responses`.
+"""
+import json
+import logging
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+
+import requests
+from django.conf import settings
+from requests.adapters import BaseAdapter, HTTPAdapter
+from urllib3.util.retry import Retry
+
+from portioning import timing
+
+logger = logging.getLogger(__name__)
+
+META = 'meta'
+GOOGLE = 'google'
+MICROSOFT = 'microsoft'
+TWILIO = 'twilio'
+STRIPE = 'stripe'
+
+# Retries for idempotent requests, per provider. Stripe retries its own calls
+# (with idempotency keys, POSTs included — see payments.services.stripe_gateway),
+# so stacking ours on top would only multiply them.
+RETRIES = defaultdict(lambda: 2, {STRIPE: 0})
+RETRY_BACKOFF_SECONDS = 0.5
+RETRY_STATUSES = (429, 502, 503, 504)
+
+_sessions = {}
+_lock = threading.Lock()
+
+
+class OutboundBlocked(requests.ConnectionError):
+    """The fake transport refused a request nothing was set up to answer."""
+
+
+# ── Metrics ──
+
+class _Stats:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._by_provider = defaultdict(lambda: {'calls': 0, 'errors': 0, 'seconds': 0.0})
+
+    def record(self, provider, seconds, error):
+        with self._lock:
+            row = self._by_provider[provider]
+            row['calls'] += 1
+            row['errors'] += int(error)
+            row['seconds'] += seconds
+
+    def snapshot(self):
+        with self._lock:
+            return {
+                provider: {**row, 'avg_ms': round(row['seconds'] * 1000 / row['calls'], 1)}
+                for provider, row in self._by_provider.items() if row['calls']
+            }
+
+    def reset(self):
+        with self._lock:
+            self._by_provider.clear()
+
+
+_stats = _Stats()
+
+
+def stats():
+    """{provider: {'calls', 'errors', 'seconds', 'avg_ms'}} since start (or `reset_stats`)."""
+    return _stats.snapshot()
+
+
+def reset_stats():
+    _stats.reset()
+
+
+class _Instrumented:
+    """Adapter mixin: default timeout, Server-Timing span and stats per call."""
+
+    def __init__(self, provider, **kwargs):
+        self.provider = provider
+        super().__init__(**kwargs)
+
+    def send(self, request, timeout=None, **kwargs):
+        if timeout is None:
+            timeout = settings.OUTBOUND_HTTP_TIMEOUT
+        started = time.perf_counter()
+        error = True
+        try:
+            with timing.span(self.provider):
+                response = super().send(request, timeout=timeout, **kwargs)
+            error = response.status_code >= 500 or response.status_code == 429
+            return response
+        finally:
+            elapsed = time.perf_counter() - started
+            _stats.record(self.provider, elapsed, error)
+            logger.debug('%s %s %s %.0fms%s', self.provider, request.method,
+                         request.url.split('?')[0], elapsed * 1000, ' error' if error else '')
+
+
+class _ProviderAdapter(_Instrumented, HTTPAdapter):
+    pass
+
+
+# ── Fake transport ──
+
+_fake_handlers = []
+
+
+class _FakeSend:
+    """Answers from the innermost `fake_responses` handler, else refuses."""
+
+    def send(self, request, timeout=None, **kwargs):
+        for handler in reversed(_fake_handlers):
+            answer = handler(request)
+            if answer is not None:
+                return _response(request, *answer)
+        raise OutboundBlocked(
+            f'No outbound HTTP under the fake transport: {request.method} {request.url.split("?")[0]}'
+        )
+
+    def close(self):
+        pass
+
+
+class _FakeProviderAdapter(_Instrumented, _FakeSend, BaseAdapter):
+    pass
+
+
+def _response(request, status_code, body=b'', headers=None):
+    response = requests.Response()
+    response.status_code = status_code
+    response.request = request
+    response.url = request.url
+    response.headers.update(headers or {})
+    if isinstance(body, (dict, list)):
+        body = json.dumps(body).encode()
+        response.headers.setdefault('Content-Type', 'application/json')
+    elif isinstance(body, str):
+        body = body.encode()
+    response._content = body
+    return response
+
+
+@contextmanager
+def fake_responses(handler):
+    """Answer fake-transport requests with `handler(request)` inside the block.
+
+    `handler` returns ``(status, body[, headers])`` — a dict/list body is sent
+    as JSON — or None to fall through to the next handler out (and finally to
+    `OutboundBlocked`).
+    """
+    _fake_handlers.append(handler)
+    try:
+        yield
+    finally:
+        _fake_handlers.remove(handler)
+
+
+# ── Sessions ──
+
+def session(provider):
+    """The process-wide session for `provider`, created on first use."""
+    existing = _sessions.get(provider)
+    if existing is not None:
+        return existing
+    with _lock:
+        if provider not in _sessions:
+            _sessions[provider] = _build(provider)
+        return _sessions[provider]
+
+
+def _build(provider):
+    s = requests.Session()
+    if getattr(settings, 'OUTBOUND_HTTP_FAKE', False):
+        adapter = _FakeProviderAdapter(provider)
+    else:
+        adapter = _ProviderAdapter(
+            provider,
+            pool_connections=4,
+            pool_maxsize=settings.OUTBOUND_HTTP_POOL_SIZE,
+            max_retries=Retry(
+                total=RETRIES[provider],
+                backoff_factor=RETRY_BACKOFF_SECONDS,
+                status_forcelist=RETRY_STATUSES,
+                allowed_methods=frozenset({'GET', 'HEAD', 'DELETE', 'OPTIONS'}),
+                respect_retry_after_header=True,
+                raise_on_status=False,
+            ),
+        )
+    s.mount('https://', adapter)
+    s.mount('http://', adapter)
+    return s
+
+
+def close_all():
+    """Drop every pooled connection (sessions are rebuilt on next use)."""
+    with _lock:
+        for s in _sessions.values():
+            s.close()
+        _sessions.clear()
@@ -0,0 +1,130 @@
+"""Memoise the one-row-per-org settings models for the length of a request.
+
+`OrgSettings`, `GlobalConfig` and `GlobalConstraint` are each read from all over
+a single request — PDFs, commission summaries, messaging, follow-ups and the
+calculator all call `for_org` — and every `for_org` is a `get_or_create`, i.e. a
+SELECT (and on a first read an INSERT attempt). Two layers take that down to at
+most one fetch per row per request:
+
+- a **scope** (`request_scope()`): `RequestCacheMiddleware` opens one around
+  every HTTP request; management commands open their own. Inside it, each
+  org's row is fetched once and the same instance is handed back after that.
+- a short-TTL copy in the Django cache (`ORG_SETTINGS_CACHE_TTL` seconds, 0 =
+  off), so the next request usually doesn't go to the database either.
+
+Any save or delete of a tracked model drops both layers (`track`, connected in
+the owning app's `ready`). A queryset `.update()` bypasses model signals — call
+`invalidate` after one.
+
+Outside a scope nothing is memoised, so a script or test that never opens one
+sees exactly the old behaviour.
+"""
+import contextvars
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS, transaction
+from django.db.models.signals import post_delete, post_save
+
+from portioning import timing
+from portioning.cache import org_key
+
+_scope = contextvars.ContextVar('org_settings_scope', default=None)
+
+
+def _key(model, org_id):
+    return org_key(org_id, 'settings', model._meta.label_lower)
+
+
+@contextmanager
+def request_scope():
+    """Memoise `for_org` reads until the block exits. Nested scopes share the
+    outermost one. Usable as a decorator, e.g. on a command's `handle`."""
+    if _scope.get() is not None:
+        yield
+        return
+    token = _scope.set({})
+    try:
+        yield
+    finally:
+        _scope.reset(token)
+
+
+class RequestCacheMiddleware:
+    """Open a `request_scope` around every request."""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        with request_scope():
+            return self.get_response(request)
+
+
+def _ttl():
+    return getattr(settings, 'ORG_SETTINGS_CACHE_TTL', 0)
+
+
+def _load_shared(model, key):
+    """The cached row as a fresh, unsaved-changes-free instance, or None.
+
+    Stored as plain field values rather than a pickled instance, so nothing
+    hanging off the row (a cached `organisation`, a half-edited attribute) is
+    carried from one request into the next.
+    """
+    values = cache.get(key)
+    timing.record_cache(values is not None)
+    if values is None:
+        return None
+    return model.from_db(DEFAULT_DB_ALIAS, list(values), list(values.values()))
+
+
+def _store_shared(model, key, obj):
+    ttl = _ttl()
+    if ttl > 0:
+        values = {f.attname: getattr(obj, f.attname) for f in model._meta.concrete_fields}
+        cache.set(key, values, ttl)
+
+
+def get_for_org(model, org):
+    """`model`'s row for `org`, created with defaults on first read."""
+    key = _key(model, org.pk)
+    memo = _scope.get()
+    if memo is not None and key in memo:
+        return memo[key]
+
+    obj = _load_shared(model, key) if _ttl() > 0 else None
+    if obj is None:
+        obj, _ = model.objects.get_or_create(organisation=org)
+        _store_shared(model, key, obj)
+    # The caller already holds the org — don't let `obj.organisation` re-fetch it.
+    obj.organisation = org
+    if memo is not None:
+        memo[key] = obj
+    return obj
+
+
+def invalidate(model, org_id):
+    """Forget `model`'s row for `org_id` in this scope and in the shared cache."""
+    key = _key(model, org_id)
+    memo = _scope.get()
+    if memo is not None:
+        memo.pop(key, None)
+    cache.delete(key)
+    # Another request can re-cache the old row between this write and its
+    # commit; dropping the key again once it commits closes that window.
+    transaction.on_commit(lambda: cache.delete(key))
+
+
+def _on_change(sender, instance, **kwargs):
+    if instance.organisation_id is not None:
+        invalidate(sender, instance.organisation_id)
+
+
+def track(*models):
+    """Invalidate on every save/delete of `models`. Call from `AppConfig.ready`."""
+    for model in models:
+        uid = f'request_cache:{model._meta.label_lower}'
+        post_save.connect(_on_change, sender=model, dispatch_uid=uid)
+        post_delete.connect(_on_change, sender=model, dispatch_uid=uid)
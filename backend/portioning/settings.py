@@ -136,6 +136,61 @@ def _require_token_encryption_key(value, *, debug):
         )
     return value
 
+def _cache_config(url, *, key_prefix='', max_entries=None):
+    """One CACHES['default'] entry from a CACHE_URL.
+
+    Everything that counts across requests — DRF throttle buckets (including
+    `TrustedIdentThrottle.refund`), the per-org settings and subscription-access
+    caches — lives in the default cache, so it has to be one store that every
+    gunicorn worker and instance shares. Process-local memory (Django's implicit
+    default) gives each worker its own throttle allowance and its own stale copy.
+
+    - unset / ``db://``            — a table in the main database (zero extra
+      infrastructure; created by `migrate`, see users/0009)
+    - ``redis://`` / ``rediss://`` — Redis, when one is provisioned (needs the
+      `redis` package)
+    - ``memcached://host:port``    — Memcached (needs `pymemcache`)
+    - ``file:///path``             — a directory, shared by workers on one host
+    - ``locmem://``                — per-process memory; dev and tests only
+
+    `key_prefix` separates environments that share one store. `max_entries`
+    overrides the cap for the backends that cull their own entries (db, file,
+    locmem).
+    """
+    parsed = urlparse((url or 'db://').strip())
+    scheme = parsed.scheme
+    options = {}
+    if scheme == 'db':
+        backend = 'django.core.cache.backends.db.DatabaseCache'
+        location = parsed.netloc or 'django_cache'
+        # Django's default of 300 entries is smaller than one busy hour of
+        # throttle keys; culling that often would quietly reset rate limits.
+        options = {'MAX_ENTRIES': 20000}
+    elif scheme in ('redis', 'rediss'):
+        backend = 'django.core.cache.backends.redis.RedisCache'
+        location = url.strip()
+    elif scheme == 'memcached':
+        backend = 'django.core.cache.backends.memcached.PyMemcacheCache'
+        location = parsed.netloc
+    elif scheme == 'file':
+        backend = 'django.core.cache.backends.filebased.FileBasedCache'
+        location = parsed.path
+        options = {'MAX_ENTRIES': 20000}
+    elif scheme == 'locmem':
+        backend = 'django.core.cache.backends.locmem.LocMemCache'
+        location = parsed.netloc or 'default'
+    else:
+        raise ImproperlyConfigured(
+            f"CACHE_URL={url!r} — expected one of db://, redis://, rediss://, "
+            f"memcached://, file:// or locmem://"
+        )
+    if max_entries and scheme in ('db', 'file', 'locmem'):
+        options = {**options, 'MAX_ENTRIES': max_entries}
+    config = {'BACKEND': backend, 'LOCATION': location, 'KEY_PREFIX': key_prefix}
+    if options:
+        config['OPTIONS'] = options
+    return config
+
 # ── Platform integrations (shared across all orgs) ──
 # Twilio is the platform's single account; each org configures only its own
 # WhatsApp sender number (OrgSettings.twilio_whatsapp_number). LLM keys are
@@ -148,12 +203,83 @@ def _require_token_encryption_key(value, *, debug):
 # page for a booking they successfully signed (REL-474).
 OUTBOUND_SEND_TIMEOUT = int(os.environ.get('OUTBOUND_SEND_TIMEOUT', '8'))
 
+# Every provider call goes through portioning.outbound: a pooled session per
+# provider, with this timeout on any call that doesn't set its own and this many
+# kept-alive connections per host. Under the test runner the sessions get a fake
+# transport that refuses all traffic, so an unpatched call fails, not hangs.
+OUTBOUND_HTTP_TIMEOUT = int(os.environ.get('OUTBOUND_HTTP_TIMEOUT', '20'))
+OUTBOUND_HTTP_POOL_SIZE = int(os.environ.get('OUTBOUND_HTTP_POOL_SIZE', '10'))
+OUTBOUND_HTTP_FAKE = 'test' in sys.argv
+
 TWILIO_ACCOUNT_SID = os.environ.get('TWILIO_ACCOUNT_SID', '')
 TWILIO_AUTH_TOKEN = os.environ.get('TWILIO_AUTH_TOKEN', '')
 
 # One API key per LLM provider; only providers actually in use need a key.
 ANTHROPIC_API_KEY = os.environ.get('ANTHROPIC_API_KEY', '')
 OPENAI_API_KEY = os.environ.get('OPENAI_API_KEY', '')
+# The LLM SDK clients are shared per provider and key (portioning.llm.client):
+# this many kept-alive connections each, and this timeout on every call.
+LLM_HTTP_POOL_SIZE = int(os.environ.get('LLM_HTTP_POOL_SIZE', '10'))
+LLM_HTTP_TIMEOUT = int(os.environ.get('LLM_HTTP_TIMEOUT', '60'))
+# Tasks whose structured answers are cached (portioning.llm_cache), as a
+# comma-separated list of their settings, e.g.
+# "LLM_AGENT_INQUIRY_EXTRACTION,LLM_AGENT_EVAL_JUDGE". Entries live in
+# CACHES['llm'] for LLM_CACHE_TTL seconds.
+LLM_CACHE_TASKS = [t.strip() for t in os.environ.get('LLM_CACHE_TASKS', '').split(',') if t.strip()]
+LLM_CACHE_TTL = int(os.environ.get('LLM_CACHE_TTL', str(7 * 24 * 3600)))
+# Per-provider rate limits, as (requests, tokens) per minute for the account's
+# tier; 0 means unlimited. Calls over them wait rather than draw 429s
+# (portioning.llm_limits), and no more than LLM_PROVIDER_CONCURRENCY calls are
+# in flight to one supplier across the process, sync and async alike.
+LLM_RATE_LIMITS = {
+    'anthropic': (int(os.environ.get('ANTHROPIC_RPM', '0')), int(os.environ.get('ANTHROPIC_TPM', '0'))),
+    'openai': (int(os.environ.get('OPENAI_RPM', '0')), int(os.environ.get('OPENAI_TPM', '0'))),
+}
+LLM_PROVIDER_CONCURRENCY = int(os.environ.get('LLM_PROVIDER_CONCURRENCY', '8'))
+# Optional tighter caps for single tasks, held inside their provider's, as
+# "TASK=N,..." — e.g. LLM_TASK_CONCURRENCY="LLM_AGENT_EVAL_JUDGE=2".
+LLM_TASK_CONCURRENCY = {
+    task.strip(): int(size)
+    for task, _, size in (
+        entry.partition('=') for entry in os.environ.get('LLM_TASK_CONCURRENCY', '').split(',') if entry.strip()
+    )
+}
+# Batch-API runs (portioning.llm_batch, `run_followups --batch`): poll this
+# often, and give up on a job still running after LLM_BATCH_TIMEOUT seconds.
+# The test runner swaps in a local fake that answers through the per-call seam.
+LLM_BATCH_POLL_SECONDS = int(os.environ.get(
+    'LLM_BATCH_POLL_SECONDS', '0' if 'test' in sys.argv else '30',
+))
+LLM_BATCH_TIMEOUT = int(os.environ.get('LLM_BATCH_TIMEOUT', str(24 * 3600)))
+LLM_BATCH_FAKE = 'test' in sys.argv
+# What answers the LLM calls (portioning.llm_replay): 'live' providers,
+# 'record' (live, saving each answer to LLM_RECORDINGS_DIR) or 'replay' (the
+# recordings only, no network). Replayed answers take their recorded time, or
+# LLM_REPLAY_LATENCY seconds if that is a number.
+LLM_TRANSPORT = os.environ.get('LLM_TRANSPORT', 'live')
+LLM_RECORDINGS_DIR = os.environ.get('LLM_RECORDINGS_DIR', str(BASE_DIR / 'llm_recordings'))
+LLM_REPLAY_LATENCY = os.environ.get('LLM_REPLAY_LATENCY', 'recorded')
+
+# Inbound webhooks (Meta lead ads, Twilio callbacks) are stored and answered at
+# once, then handled by the webhook queue (bookings.services.webhook_queue).
+# 'thread' drains it on a worker thread in the web process — prod runs a single
+# gunicorn process and no separate worker; 'off' leaves it to
+# `manage.py process_webhook_events`; 'inline' handles each event inside its
+# webhook request, which is what the test runner uses.
+WEBHOOK_QUEUE_MODE = os.environ.get(
+    'WEBHOOK_QUEUE_MODE', 'inline' if 'test' in sys.argv else 'thread',
+)
+WEBHOOK_WORKER_CONCURRENCY = int(os.environ.get('WEBHOOK_WORKER_CONCURRENCY', '4'))
+WEBHOOK_MAX_ATTEMPTS = int(os.environ.get('WEBHOOK_MAX_ATTEMPTS', '8'))
+
+# Client sends that shouldn't hold up their caller (bulk follow-up approval,
+# sign links, the signed copy) are queued in the outbox and delivered by
+# bookings.services.outbox — same modes as the webhook queue: 'thread' on a
+# worker thread in the web process, 'off' for `manage.py process_outbox`,
+# 'inline' (the test runner) sends inside the call, once, as before the outbox.
+OUTBOX_MODE = os.environ.get('OUTBOX_MODE', 'inline' if 'test' in sys.argv else 'thread')
+OUTBOX_WORKER_CONCURRENCY = int(os.environ.get('OUTBOX_WORKER_CONCURRENCY', '4'))
+OUTBOX_MAX_ATTEMPTS = int(os.environ.get('OUTBOX_MAX_ATTEMPTS', '5'))
 
 # Shared secret for the scheduled-jobs endpoint (GitHub Actions cron). Unset = endpoint disabled.
 CRON_SECRET = os.environ.get('CRON_SECRET', '')
@@ -211,10 +337,21 @@ META_LEADS_ENABLED = os.environ.get(
 # Shared secret echoed back to Meta during the webhook verification handshake
 # (REL-507). Set the same value in the Meta app's webhook configuration.
 META_WEBHOOK_VERIFY_TOKEN = os.environ.get('META_WEBHOOK_VERIFY_TOKEN', '')
+# The hourly lead backfill sweeps this many Pages at once, and paces each
+# Page's Graph calls to this many a second (Graph rate-limits per Page token).
+META_BACKFILL_CONCURRENCY = int(os.environ.get('META_BACKFILL_CONCURRENCY', '4'))
+META_BACKFILL_PAGE_RATE = float(os.environ.get('META_BACKFILL_PAGE_RATE', '2'))
 
 # Which model each AI task runs on, as 'provider:model' — see portioning/llm.py.
 # Switching supplier or model per task is a one-env-var change, nothing else.
 LLM_FOLLOWUP_DRAFTER = os.environ.get('LLM_FOLLOWUP_DRAFTER', 'openai:gpt-5.4-nano')
+# Follow-up drafting runs this many LLM calls at once (bookings.services.drafting),
+# no more than FOLLOWUP_DRAFT_PER_ORG of them for one org. The test runner
+# drafts on the calling thread, where the test's data is visible.
+FOLLOWUP_DRAFT_CONCURRENCY = int(os.environ.get(
+    'FOLLOWUP_DRAFT_CONCURRENCY', '1' if 'test' in sys.argv else '6',
+))
+FOLLOWUP_DRAFT_PER_ORG = int(os.environ.get('FOLLOWUP_DRAFT_PER_ORG', '3'))
 # Drafts the client-facing message a rep reviews before sending (REL-445). Same
 # cheap-and-fast tier as follow-ups; a human always reads this one before it goes.
 LLM_CLIENT_MESSAGE_DRAFTER = os.environ.get(
@@ -231,6 +368,18 @@ LLM_AGENT_INQUIRY_EXTRACTION = os.environ.get(
 # Optional LLM-as-judge for prose/tone eval cases (REL-511). Only invoked by
 # cases that ask for it; deterministic assertion evaluators need no LLM.
 LLM_AGENT_EVAL_JUDGE = os.environ.get('LLM_AGENT_EVAL_JUDGE', 'openai:gpt-5.4-nano')
+# Eval cases graded at once by run_agent_evals (agents.evals.runner). One
+# under the test runner: pool threads can't see a test's uncommitted rows.
+AGENT_EVAL_WORKERS = int(os.environ.get('AGENT_EVAL_WORKERS', '1' if 'test' in sys.argv else '4'))
+# Prices for eval cost estimates, in USD per million input/output tokens, as
+# "provider:model=input/output" pairs, comma-separated, e.g.
+# "openai:gpt-5.4-nano=0.05/0.40". Unpriced models are reported as such.
+LLM_PRICES = {
+    model.strip(): tuple(float(p) for p in prices.split('/'))
+    for model, _, prices in (
+        entry.partition('=') for entry in os.environ.get('LLM_PRICES', '').split(',') if entry.strip()
+    )
+}
 
 # ── Agent tracing (REL-511, LangSmith) — dev/eval ONLY ──
 # LangSmith is a third-party SaaS and agent traces would carry org customer data
@@ -243,12 +392,53 @@ LANGSMITH_API_KEY = os.environ.get('LANGSMITH_API_KEY', '')
 LANGSMITH_PROJECT = os.environ.get('LANGSMITH_PROJECT', 'relogue-agents')
 LANGSMITH_ENDPOINT = os.environ.get('LANGSMITH_ENDPOINT', 'https://api.smith.langchain.com')
 
+# How long a copy of an org's OrgSettings / GlobalConfig / GlobalConstraint row
+# may be served from the cache across requests (portioning.request_cache).
+# Within one request the row is fetched once regardless; saves invalidate it.
+# Off under the test runner: test transactions roll back but the cache doesn't,
+# so a reused org pk would be handed the previous test's row.
+ORG_SETTINGS_CACHE_TTL = int(os.environ.get(
+    'ORG_SETTINGS_CACHE_TTL', '0' if 'test' in sys.argv else '60',
+))
+
 # Where LangGraph persists agent checkpoints in dev (SQLite). Prod uses the
 # Postgres checkpointer over DATABASE_URL instead — see agents/checkpointer.py.
 # Kept out of db.sqlite3 so it never collides with Django's test database.
 AGENT_CHECKPOINT_DB = os.environ.get(
     'AGENT_CHECKPOINT_DB', str(BASE_DIR / 'agent_checkpoints.sqlite3'),
 )
+# Connections in the process's shared Postgres checkpointer pool
+# (agents.checkpointer.shared_checkpointer).
+AGENT_CHECKPOINT_POOL_SIZE = int(os.environ.get('AGENT_CHECKPOINT_POOL_SIZE', '5'))
+# Agent runs started through agents.runner.queue_run (the HTTP start) — same
+# modes as the outbox: 'thread' starts them on a worker thread in the web
+# process, 'off' leaves them for `manage.py process_agent_runs`, 'inline' (the
+# test runner) starts them inside the call.
+AGENT_RUN_MODE = os.environ.get('AGENT_RUN_MODE', 'inline' if 'test' in sys.argv else 'thread')
+AGENT_RUN_CONCURRENCY = int(os.environ.get('AGENT_RUN_CONCURRENCY', '4'))
+# Longest a run's events request waits for something new before answering (a
+# long poll), or keeps its event stream open; a stream's client then waits
+# AGENT_EVENTS_RETRY_SECONDS (the SSE `retry:`) before reconnecting.
+#
+# Thread budget: the web process serves every request on 8 threads (Procfile:
+# one gthread worker, --threads 8), and an events request holds one for its
+# whole wait. At 2s open and 5s away, a watching stream holds a thread under a
+# third of the time, so a handful of open run pages leave most of the 8 for
+# everything else. Raise either only with the thread count in mind.
+AGENT_EVENTS_WAIT_SECONDS = float(os.environ.get(
+    'AGENT_EVENTS_WAIT_SECONDS', '0' if 'test' in sys.argv else '2',
+))
+AGENT_EVENTS_RETRY_SECONDS = float(os.environ.get('AGENT_EVENTS_RETRY_SECONDS', '5'))
+
+
+# Per-request performance telemetry (portioning.timing): a Server-Timing header
+# plus one JSON log line per request, with the slowest SQL attached when a
+# request crosses either threshold. Off by default; safe to switch on in prod.
+REQUEST_TIMING_ENABLED = os.environ.get(
+    'REQUEST_TIMING_ENABLED', 'False',
+).lower() in ('true', '1', 'yes')
+REQUEST_TIMING_SLOW_MS = int(os.environ.get('REQUEST_TIMING_SLOW_MS', '1000'))
+REQUEST_TIMING_SLOW_QUERIES = int(os.environ.get('REQUEST_TIMING_SLOW_QUERIES', '50'))
 
 
 # Application definition
@@ -321,7 +511,13 @@ AXES_ENABLE_ACCESS_FAILURE_LOG = True
 SILENCED_SYSTEM_CHECKS = ['axes.W006']
 
 MIDDLEWARE = [
+    # First, so its "total" covers every other middleware too. Inert unless
+    # REQUEST_TIMING_ENABLED (it removes itself via MiddlewareNotUsed).
+    'portioning.timing.ServerTimingMiddleware',
     'django.middleware.security.SecurityMiddleware',
+    # Early, so everything after it — org resolution included — shares one
+    # memo of the per-org settings rows (portioning.request_cache).
+    'portioning.request_cache.RequestCacheMiddleware',
     'whitenoise.middleware.WhiteNoiseMiddleware',
     'corsheaders.middleware.CorsMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
@@ -352,6 +548,13 @@ FRONTEND_BASE_URL = _require_public_url(
 )
 # Length of the no-card free trial granted to every new org on sign-up.
 DEFAULT_TRIAL_DAYS = int(os.environ.get('DEFAULT_TRIAL_DAYS', '7'))
+# How long the subscription gate may reuse an org's "has access" answer
+# (payments.access). Every Subscription write invalidates it, so this only
+# bounds staleness from outside the app. Off under the test runner for the same
+# reason as ORG_SETTINGS_CACHE_TTL.
+SUBSCRIPTION_ACCESS_CACHE_TTL = int(os.environ.get(
+    'SUBSCRIPTION_ACCESS_CACHE_TTL', '0' if 'test' in sys.argv else '60',
+))
 
 # CORS
 CORS_ALLOWED_ORIGINS = [
@@ -461,6 +664,31 @@ DATABASES = {
 }
 
 
+# Cache
+# Selected by CACHE_URL — see _cache_config for the schemes. Tests default to
+# per-process memory: each test's DB rollback would otherwise also have to roll
+# back cache rows, and query-count assertions would count throttle reads.
+
+CACHES = {
+    'default': _cache_config(
+        os.environ.get('CACHE_URL', 'locmem://' if 'test' in sys.argv else 'db://'),
+        key_prefix=os.environ.get('CACHE_KEY_PREFIX', ''),
+    ),
+}
+# Cached LLM answers (portioning.llm_cache) share the default store unless
+# LLM_CACHE_URL gives them their own (e.g. file:///var/cache/portioning-llm),
+# capped at LLM_CACHE_MAX_ENTRIES where that backend culls for itself. A shared
+# table keeps the default cap: the cull counts every row in it, throttle keys
+# included.
+if os.environ.get('LLM_CACHE_URL'):
+    CACHES['llm'] = _cache_config(
+        os.environ['LLM_CACHE_URL'], key_prefix=os.environ.get('CACHE_KEY_PREFIX', ''),
+        max_entries=int(os.environ.get('LLM_CACHE_MAX_ENTRIES', '5000')),
+    )
+else:
+    CACHES['llm'] = dict(CACHES['default'])
+
+
 # Password validation
 # https://docs.djangoproject.com/en/6.0/ref/settings/#auth-password-validators
 
@@ -0,0 +1,61 @@
+"""Shared cache configuration (settings._cache_config) and portioning.cache."""
+from unittest.mock import patch
+
+from django.core.exceptions import ImproperlyConfigured
+from django.test import SimpleTestCase, TestCase
+
+from portioning import cache
+from portioning.settings import _cache_config
+
+
+class CacheConfigTests(SimpleTestCase):
+    def test_database_table_is_the_default(self):
+        for url in ('', None, 'db://'):
+            with self.subTest(url=url):
+                config = _cache_config(url)
+                self.assertEqual(config['BACKEND'], 'django.core.cache.backends.db.DatabaseCache')
+                self.assertEqual(config['LOCATION'], 'django_cache')
+
+    def test_shared_backends_by_scheme(self):
+        cases = {
+            'redis://cache:6379/0': ('RedisCache', 'redis://cache:6379/0'),
+            'rediss://u:p@cache:6380': ('RedisCache', 'rediss://u:p@cache:6380'),
+            'memcached://cache:11211': ('PyMemcacheCache', 'cache:11211'),
+            'file:///var/tmp/relogue-cache': ('FileBasedCache', '/var/tmp/relogue-cache'),
+            'locmem://': ('LocMemCache', 'default'),
+        }
+        for url, (backend, location) in cases.items():
+            with self.subTest(url=url):
+                config = _cache_config(url)
+                self.assertTrue(config['BACKEND'].endswith(backend))
+                self.assertEqual(config['LOCATION'], location)
+
+    def test_key_prefix_is_passed_through(self):
+        self.assertEqual(_cache_config('db://', key_prefix='staging')['KEY_PREFIX'], 'staging')
+
+    def test_unknown_scheme_refuses_to_boot(self):
+        with self.assertRaises(ImproperlyConfigured):
+            _cache_config('mongodb://somewhere')
+
+
+class OrgKeyTests(SimpleTestCase):
+    def test_keys_are_namespaced_by_org(self):
+        self.assertEqual(cache.org_key(7, 'settings', 'x'), 'org:7:settings:x')
+        self.assertNotEqual(cache.org_key(7, 'a'), cache.org_key(70, 'a'))
+
+    def test_an_org_is_required(self):
+        with self.assertRaises(ValueError):
+            cache.org_key(None, 'a')
+
+
+class CacheHealthTests(TestCase):
+    def test_ok_when_a_value_round_trips(self):
+        resp = self.client.get('/api/health/cache/')
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(resp.json()['status'], 'ok')
+
+    def test_503_without_leaking_the_error(self):
+        with patch('portioning.cache.cache.set', side_effect=ConnectionError('redis://secret@host')):
+            resp = self.client.get('/api/health/cache/')
+        self.assertEqual(resp.status_code, 503)
+        self.assertNotIn('secret', resp.content.decode())
@@ -1,9 +1,16 @@
 """Central LLM registry: provider:model resolution and per-provider routing."""
-from unittest.mock import patch
+import threading
+import asyncio
+import json
+import os
+import tempfile
+import time
+from unittest.mock import MagicMock, patch
 
+from django.core.cache import caches
 from django.test import SimpleTestCase, override_settings
 
-from portioning import llm
+from portioning import llm, llm_batch, llm_cache, llm_limits, llm_replay
 
 SCHEMA = {
     "type": "object",
@@ -80,3 +87,441 @@ class CompleteStructuredTests(SimpleTestCase):
     def test_raises_on_unparseable_output(self, mock_openai):
         with self.assertRaises(llm.LLMError):
             llm.complete_structured('LLM_FOLLOWUP_DRAFTER', 'sys', 'user', SCHEMA)
+
+
+@override_settings(LLM_HTTP_POOL_SIZE=3, LLM_HTTP_TIMEOUT=7)
+class ClientRegistryTests(SimpleTestCase):
+    def setUp(self):
+        llm.reset_clients()
+        self.addCleanup(llm.reset_clients)
+
+    def test_one_client_per_provider_and_key(self):
+        first = llm.client('openai', 'sk-a')
+        self.assertIs(llm.client('openai', 'sk-a'), first)
+        self.assertIsNot(llm.client('openai', 'sk-b'), first)
+        self.assertIsNot(llm.client('anthropic', 'sk-a'), first)
+
+    def test_clients_are_pooled_with_the_configured_timeout(self):
+        for provider in ('openai', 'anthropic'):
+            sdk_client = llm.client(provider, 'sk-x')
+            self.assertEqual(sdk_client.timeout, 7)
+            self.assertEqual(sdk_client._client._transport._pool._max_connections, 3)
+
+    def test_concurrent_first_use_builds_one_client(self):
+        barrier = threading.Barrier(8)
+        seen = []
+
+        def fetch():
+            barrier.wait()
+            seen.append(llm.client('openai', 'sk-race'))
+
+        threads = [threading.Thread(target=fetch) for _ in range(8)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        self.assertEqual(len({id(c) for c in seen}), 1)
+
+    @override_settings(OPENAI_API_KEY='sk-x', LLM_FOLLOWUP_DRAFTER='openai:gpt-test')
+    def test_calls_reuse_the_shared_client(self):
+        with patch('portioning.llm._build_client') as build:
+            create = build.return_value.chat.completions.create
+            create.return_value.choices[0].message.refusal = None
+            create.return_value.choices[0].message.content = '{"ok": true}'
+            create.return_value.usage.prompt_tokens = 20
+            create.return_value.usage.completion_tokens = 4
+            for _ in range(3):
+                llm.complete_structured('LLM_FOLLOWUP_DRAFTER', 'sys', 'user', SCHEMA)
+        build.assert_called_once_with('openai', 'sk-x')
+        self.assertEqual(create.call_count, 3)
+
+
+@override_settings(LLM_FOLLOWUP_DRAFTER='openai:gpt-test', OPENAI_API_KEY='sk-x',
+                   LLM_CACHE_TASKS=['LLM_FOLLOWUP_DRAFTER'])
+class ResponseCacheTests(SimpleTestCase):
+    def setUp(self):
+        caches['llm'].clear()
+        llm_cache.reset_stats()
+
+    def _ask(self, user='user', **kwargs):
+        return llm.complete_structured('LLM_FOLLOWUP_DRAFTER', 'sys', user, SCHEMA, **kwargs)
+
+    @patch('portioning.llm._call_openai', return_value='{"ok": true}')
+    def test_a_repeated_prompt_is_answered_from_the_cache(self, call):
+        self.assertEqual(self._ask(), ({'ok': True}, 'openai:gpt-test'))
+        self.assertEqual(self._ask(), ({'ok': True}, 'openai:gpt-test'))
+        call.assert_called_once()
+        self.assertEqual(llm_cache.stats(), {'LLM_FOLLOWUP_DRAFTER': {'hits': 1, 'misses': 1}})
+
+    @patch('portioning.llm._call_openai', return_value='{"ok": true}')
+    def test_any_change_to_the_request_is_a_different_entry(self, call):
+        self._ask()
+        self._ask(user='other user')
+        self._ask(max_tokens=50)
+        self.assertEqual(call.call_count, 3)
+
+    @patch('portioning.llm._call_openai', return_value='{"ok": true}')
+    def test_bypassing_asks_the_provider_and_refreshes_the_entry(self, call):
+        self._ask()
+        call.return_value = '{"ok": false}'
+        self.assertEqual(self._ask(cache=False)[0], {'ok': False})
+        self.assertEqual(self._ask()[0], {'ok': False})
+        self.assertEqual(call.call_count, 2)
+
+    @override_settings(LLM_CACHE_TASKS=[])
+    @patch('portioning.llm._call_openai', return_value='{"ok": true}')
+    def test_tasks_not_listed_are_not_cached_unless_asked(self, call):
+        self._ask()
+        self._ask()
+        self.assertEqual(call.call_count, 2)
+        with llm_cache.forced(True):
+            self._ask()
+            self._ask()
+        self.assertEqual(call.call_count, 3)
+
+    @patch('portioning.llm._call_openai', return_value='not json')
+    def test_unparseable_output_is_not_cached(self, call):
+        for _ in range(2):
+            with self.assertRaises(llm.LLMError):
+                self._ask()
+        self.assertEqual(call.call_count, 2)
+
+    @patch('portioning.llm._call_openai', return_value='{"ok": "yes"}')
+    def test_an_answer_that_fails_validation_is_not_cached(self, call):
+        def validate(data):
+            if not isinstance(data['ok'], bool):
+                raise ValueError('ok must be a boolean')
+
+        for _ in range(2):
+            with self.assertRaises(ValueError):
+                self._ask(validate=validate)
+        self.assertEqual(call.call_count, 2)
+        call.return_value = '{"ok": true}'
+        self._ask(validate=validate)
+        self.assertEqual(self._ask(validate=validate)[0], {'ok': True})
+        self.assertEqual(call.call_count, 3)
+
+    @patch('portioning.llm._call_openai', return_value='{"ok": true}')
+    def test_a_broken_cache_costs_a_call_not_the_answer(self, call):
+        with patch.object(caches['llm'], 'get', side_effect=ConnectionError('down')), \
+                patch.object(caches['llm'], 'set', side_effect=ConnectionError('down')), \
+                self.assertLogs('portioning.llm_cache', 'ERROR'):
+            self.assertEqual(self._ask()[0], {'ok': True})
+
+
+def _answer(text='{"ok": true}', input_tokens=30, output_tokens=5, pause=0):
+    """A `_call_openai` stand-in that reports usage, as the real one does."""
+    def call(*args):
+        if pause:
+            time.sleep(pause)
+        llm._report_usage(input_tokens, output_tokens)
+        return text
+    return call
+
+
+def _in_flight(answer):
+    """`answer`, counting how many calls to it run at once: returns (call, peak),
+    with the most seen in peak[0]."""
+    running, peak, lock = [0], [0], threading.Lock()
+
+    def call(*args):
+        with lock:
+            running[0] += 1
+            peak[0] = max(peak[0], running[0])
+        try:
+            return answer(*args)
+        finally:
+            with lock:
+                running[0] -= 1
+    return call, peak
+
+
+@override_settings(LLM_FOLLOWUP_DRAFTER='openai:gpt-test', OPENAI_API_KEY='sk-x')
+class AsyncCompleteStructuredTests(SimpleTestCase):
+    def _gather(self, count, **kwargs):
+        async def run():
+            return await asyncio.gather(*(
+                llm.complete_structured_async('LLM_FOLLOWUP_DRAFTER', 'sys', f'user {n}', SCHEMA, **kwargs)
+                for n in range(count)
+            ))
+        return asyncio.run(run())
+
+    def test_goes_through_the_same_seam(self):
+        with patch('portioning.llm._call_openai', return_value='{"ok": true}') as call:
+            results = self._gather(3)
+        self.assertEqual(results, [({'ok': True}, 'openai:gpt-test')] * 3)
+        self.assertEqual(sorted(c.args[3] for c in call.call_args_list), ['user 0', 'user 1', 'user 2'])
+
+    def test_errors_are_the_sync_ones(self):
+        with patch('portioning.llm._call_openai', return_value='not json'):
+            with self.assertRaises(llm.LLMError):
+                self._gather(1)
+        with override_settings(OPENAI_API_KEY=''), self.assertRaises(llm.LLMNotConfigured):
+            self._gather(1)
+
+    @override_settings(LLM_PROVIDER_CONCURRENCY=2)
+    def test_calls_in_flight_share_the_provider_limit_with_sync_callers(self):
+        call, peak = _in_flight(_answer(pause=0.05))
+        with patch('portioning.llm._call_openai', side_effect=call):
+            sync = [
+                threading.Thread(target=llm.complete_structured, args=('LLM_FOLLOWUP_DRAFTER', 'sys', 'sync', SCHEMA))
+                for _ in range(2)
+            ]
+            for thread in sync:
+                thread.start()
+            self._gather(4)
+            for thread in sync:
+                thread.join()
+        self.assertEqual(peak[0], 2)
+
+    @override_settings(LLM_PROVIDER_CONCURRENCY=8, LLM_TASK_CONCURRENCY={'LLM_FOLLOWUP_DRAFTER': 2})
+    def test_a_capped_task_holds_its_own_slots_inside_the_providers(self):
+        call, peak = _in_flight(_answer(pause=0.05))
+        with patch('portioning.llm._call_openai', side_effect=call):
+            self._gather(5)
+        self.assertEqual(peak[0], 2)
+
+    @patch('bookings.services.local_worker.connection')
+    def test_the_worker_threads_close_their_connections(self, connection):
+        with patch('portioning.llm._call_openai', return_value='{"ok": true}'):
+            self._gather(1)
+        # One for the cache lookup, one for the call.
+        self.assertEqual(connection.close.call_count, 2)
+
+
+@override_settings(LLM_FOLLOWUP_DRAFTER='openai:gpt-test', OPENAI_API_KEY='sk-x')
+class RateLimitTests(SimpleTestCase):
+    def setUp(self):
+        llm_limits._buckets.clear()
+        self.addCleanup(llm_limits._buckets.clear)
+
+    @override_settings(LLM_RATE_LIMITS={'openai': (2, 0)})
+    def test_a_call_over_the_request_rate_waits_for_it(self):
+        with patch('portioning.llm._call_openai', side_effect=_answer()), \
+                patch('portioning.llm.time.sleep') as sleep:
+            for _ in range(3):
+                llm.complete_structured('LLM_FOLLOWUP_DRAFTER', 'sys', 'user', SCHEMA)
+        # Two a minute: the third waits about half a minute for its turn.
+        self.assertEqual(sleep.call_count, 1)
+        self.assertAlmostEqual(sleep.call_args.args[0], 30, delta=1)
+
+    @override_settings(LLM_RATE_LIMITS={'openai': (0, 1000)})
+    def test_token_reservations_are_settled_against_reported_usage(self):
+        # Reserves ~1024 (max_tokens) up front, so a second call would wait...
+        self.assertGreater(llm_limits.reserve('openai', 1024) + llm_limits.reserve('openai', 1), 0)
+        llm_limits._buckets.clear()
+        # ...but a call that reports using 35 hands the rest back.
+        with patch('portioning.llm._call_openai', side_effect=_answer(input_tokens=30, output_tokens=5)):
+            llm.complete_structured('LLM_FOLLOWUP_DRAFTER', 'sys', 'user', SCHEMA, max_tokens=900)
+        self.assertEqual(llm_limits.reserve('openai', 900), 0)
+
+    def test_unlimited_by_default(self):
+        self.assertEqual(llm_limits.reserve('openai', 10**9), 0)
+
+
+@override_settings(LLM_FOLLOWUP_DRAFTER='openai:gpt-test', OPENAI_API_KEY='sk-x')
+class UsageTests(SimpleTestCase):
+    def setUp(self):
+        llm_limits.reset_usage()
+
+    def test_reported_tokens_are_counted_per_task_and_per_tally(self):
+        with patch('portioning.llm._call_openai', side_effect=_answer(input_tokens=30, output_tokens=5)):
+            llm.complete_structured('LLM_FOLLOWUP_DRAFTER', 'sys', 'user', SCHEMA)
+            with llm_limits.tally() as outer, self.assertLogs('portioning.llm', 'INFO') as logs:
+                with llm_limits.tally() as inner:
+                    llm.complete_structured('LLM_FOLLOWUP_DRAFTER', 'sys', 'other', SCHEMA)
+                asyncio.run(llm.complete_structured_async('LLM_FOLLOWUP_DRAFTER', 'sys', 'async', SCHEMA))
+        self.assertEqual((inner.calls, inner.input_tokens, inner.output_tokens), (1, 30, 5))
+        self.assertEqual((outer.calls, outer.input_tokens), (2, 60))
+        self.assertEqual(
+            llm_limits.usage()['LLM_FOLLOWUP_DRAFTER'],
+            {'calls': 3, 'input_tokens': 90, 'output_tokens': 15, 'cached_tokens': 0},
+        )
+        self.assertIn('in=30 tokens, out=5 tokens', logs.output[0])
+
+    def test_a_caller_that_reports_nothing_logs_characters(self):
+        with patch('portioning.llm._call_openai', return_value='{"ok": true}'), \
+                self.assertLogs('portioning.llm', 'INFO') as logs:
+            llm.complete_structured('LLM_FOLLOWUP_DRAFTER', 'sys', 'user', SCHEMA)
+        self.assertIn('chars', logs.output[0])
+        self.assertEqual(llm_limits.usage(), {})
+
+
+@override_settings(LLM_FOLLOWUP_DRAFTER='openai:gpt-test', OPENAI_API_KEY='sk-x')
+class BatchTests(SimpleTestCase):
+    PROMPTS = [llm.Prompt('sys', f'user {n}', SCHEMA) for n in range(3)]
+
+    def test_results_come_back_in_order_with_failures_isolated(self):
+        def answer(model, api_key, system, user_content, schema, max_tokens):
+            if user_content == 'user 1':
+                raise llm.LLMError('refused')
+            return '{"ok": true}' if user_content == 'user 0' else 'not json'
+
+        with patch('portioning.llm._call_openai', side_effect=answer):
+            first, second, third = llm_batch.run('LLM_FOLLOWUP_DRAFTER', self.PROMPTS)
+        self.assertEqual(first, ({'ok': True}, 'openai:gpt-test'))
+        self.assertIsInstance(second, llm.LLMError)
+        self.assertIsInstance(third, llm.LLMError)
+
+    def test_nothing_to_do_submits_nothing(self):
+        with patch('portioning.llm_batch._submit_fake') as submit:
+            self.assertEqual(llm_batch.run('LLM_FOLLOWUP_DRAFTER', []), [])
+        submit.assert_not_called()
+
+    @override_settings(OPENAI_API_KEY='')
+    def test_raises_without_key(self):
+        with self.assertRaises(llm.LLMNotConfigured):
+            llm_batch.run('LLM_FOLLOWUP_DRAFTER', self.PROMPTS)
+
+    def test_a_job_that_runs_too_long_is_cancelled(self):
+        with patch('portioning.llm_batch._poll_fake', return_value=llm_batch.RUNNING), \
+                patch('portioning.llm_batch._cancel_fake') as cancel, \
+                self.assertLogs('portioning.llm_batch', 'WARNING'):
+            results = llm_batch.run('LLM_FOLLOWUP_DRAFTER', self.PROMPTS, timeout=0)
+        cancel.assert_called_once()
+        self.assertTrue(all(isinstance(r, llm.LLMError) for r in results))
+
+    @override_settings(LLM_BATCH_FAKE=False)
+    def test_openai_batch_requests_are_the_interactive_bodies(self):
+        sdk = MagicMock()
+        sdk.batches.create.return_value.id = 'batch_1'
+        sdk.batches.retrieve.side_effect = [
+            MagicMock(status='in_progress'),
+            MagicMock(status='completed', output_file_id='file_out', error_file_id=None),
+        ]
+        rows = [
+            {'custom_id': 'req-0', 'response': {'status_code': 200, 'body': {
+                'choices': [{'message': {'content': '{"ok": true}', 'refusal': None}}],
+                'usage': {'prompt_tokens': 11, 'completion_tokens': 2}}}},
+            {'custom_id': 'req-1', 'response': {'status_code': 400, 'body': {'error': 'bad'}}},
+        ]
+        sdk.files.content.return_value.text = '\n'.join(json.dumps(r) for r in rows)
+        with patch('portioning.llm.client', return_value=sdk):
+            results = llm_batch.run('LLM_FOLLOWUP_DRAFTER', self.PROMPTS, poll_seconds=0)
+
+        uploaded = sdk.files.create.call_args.kwargs['file'][1].decode().splitlines()
+        self.assertEqual(json.loads(uploaded[2])['body'], llm._openai_body('gpt-test', *self.PROMPTS[2]))
+        self.assertEqual(results[0], ({'ok': True}, 'openai:gpt-test'))
+        self.assertIsInstance(results[1], llm.LLMError)
+        self.assertIn('returned nothing', str(results[2]))
+
+    @override_settings(LLM_FOLLOWUP_DRAFTER='anthropic:claude-test', ANTHROPIC_API_KEY='sk-ant', LLM_BATCH_FAKE=False)
+    def test_anthropic_results_are_mapped_back_by_custom_id(self):
+        def entry(custom_id, kind, text=''):
+            result = MagicMock(type=kind)
+            result.message.stop_reason = 'end_turn'
+            result.message.content = [MagicMock(type='text', text=text)]
+            result.message.usage.input_tokens, result.message.usage.output_tokens = 9, 3
+            return MagicMock(custom_id=custom_id, result=result)
+
+        batches = MagicMock()
+        batches.create.return_value.id = 'msgbatch_1'
+        batches.retrieve.return_value.processing_status = 'ended'
+        batches.results.return_value = [entry('req-2', 'succeeded', '{"ok": false}'), entry('req-0', 'errored')]
+        sdk = MagicMock()
+        sdk.messages.batches = batches
+        with patch('portioning.llm.client', return_value=sdk):
+            results = llm_batch.run('LLM_FOLLOWUP_DRAFTER', self.PROMPTS, poll_seconds=0)
+        params = batches.create.call_args.kwargs['requests'][1]['params']
+        self.assertEqual(params, llm._anthropic_params('claude-test', *self.PROMPTS[1]))
+        self.assertIsInstance(results[0], llm.LLMError)
+        self.assertEqual(results[2], ({'ok': False}, 'anthropic:claude-test'))
+
+
+@override_settings(LLM_FOLLOWUP_DRAFTER='openai:gpt-test', OPENAI_API_KEY='sk-x', LLM_REPLAY_LATENCY='0')
+class ReplayTests(SimpleTestCase):
+    def setUp(self):
+        self.dir = self.enterContext(tempfile.TemporaryDirectory())
+        self.enterContext(override_settings(LLM_RECORDINGS_DIR=self.dir))
+
+    def _record(self, user='user'):
+        with override_settings(LLM_TRANSPORT='record'), \
+                patch('portioning.llm._call_openai', side_effect=_answer('{"ok": true}', 40, 4)):
+            return llm.complete_structured('LLM_FOLLOWUP_DRAFTER', 'sys', user, SCHEMA)
+
+    @override_settings(LLM_TRANSPORT='replay', OPENAI_API_KEY='')
+    def test_a_recorded_answer_replays_offline_with_its_usage(self):
+        with override_settings(OPENAI_API_KEY='sk-x'):
+            recorded = self._record()
+        self.assertEqual(len(os.listdir(self.dir)), 1)
+        self.assertTrue(llm.is_configured('LLM_FOLLOWUP_DRAFTER'))
+        with patch('portioning.llm._call_openai', side_effect=AssertionError('went live')), \
+                llm_limits.tally() as usage:
+            replayed = llm.complete_structured('LLM_FOLLOWUP_DRAFTER', 'sys', 'user', SCHEMA)
+        self.assertEqual(replayed, recorded)
+        self.assertEqual((usage.calls, usage.input_tokens, usage.output_tokens), (1, 40, 4))
+
+    @override_settings(LLM_TRANSPORT='replay')
+    def test_an_unrecorded_request_fails_instead_of_going_live(self):
+        self._record()
+        with patch('portioning.llm._call_openai') as live, self.assertRaises(llm.LLMError):
+            llm.complete_structured('LLM_FOLLOWUP_DRAFTER', 'sys', 'something else', SCHEMA)
+        live.assert_not_called()
+
+    @override_settings(LLM_REPLAY_LATENCY='0.05')
+    def test_replays_take_the_configured_time_and_the_batch_fake_replays_too(self):
+        self._record('user 0')
+        with llm_replay.using(llm_replay.REPLAY):
+            started = time.monotonic()
+            llm.complete_structured('LLM_FOLLOWUP_DRAFTER', 'sys', 'user 0', SCHEMA)
+            self.assertGreaterEqual(time.monotonic() - started, 0.05)
+            with patch('portioning.llm._call_openai', side_effect=AssertionError('went live')):
+                first, missing = llm_batch.run('LLM_FOLLOWUP_DRAFTER', [
+                    llm.Prompt('sys', 'user 0', SCHEMA), llm.Prompt('sys', 'user 1', SCHEMA),
+                ])
+        self.assertEqual(first, ({'ok': True}, 'openai:gpt-test'))
+        self.assertIsInstance(missing, llm.LLMError)
+
+
+@override_settings(LLM_FOLLOWUP_DRAFTER='openai:gpt-test', OPENAI_API_KEY='sk-x')
+class PromptCachingTests(SimpleTestCase):
+    PROMPT = llm.SystemPrompt('Fixed rules. ', 'Write British English.')
+
+    def setUp(self):
+        llm_limits.reset_usage()
+
+    def test_a_system_prompt_is_its_joined_blocks(self):
+        self.assertEqual(self.PROMPT, 'Fixed rules. Write British English.')
+        self.assertEqual(self.PROMPT.blocks, ('Fixed rules. ', 'Write British English.'))
+        self.assertEqual(llm.SystemPrompt('Only rules. ', '').blocks, ('Only rules. ',))
+
+    def test_anthropic_marks_each_block_cacheable(self):
+        params = llm._anthropic_params('claude-test', self.PROMPT, 'user', SCHEMA, 100)
+        self.assertEqual(params['system'], [
+            {'type': 'text', 'text': 'Fixed rules. ', 'cache_control': {'type': 'ephemeral'}},
+            {'type': 'text', 'text': 'Write British English.', 'cache_control': {'type': 'ephemeral'}},
+        ])
+        self.assertEqual(len(llm._anthropic_params('claude-test', 'plain', 'u', SCHEMA, 100)['system']), 1)
+
+    def test_openai_routes_calls_sharing_the_fixed_rules_to_one_cache(self):
+        us = llm._openai_body('gpt-test', llm.SystemPrompt('Fixed rules. ', 'American.'), 'u', SCHEMA, 100)
+        gb = llm._openai_body('gpt-test', self.PROMPT, 'u', SCHEMA, 100)
+        other = llm._openai_body('gpt-test', 'Other rules.', 'u', SCHEMA, 100)
+        self.assertEqual(us['prompt_cache_key'], gb['prompt_cache_key'])
+        self.assertNotEqual(us['prompt_cache_key'], other['prompt_cache_key'])
+        self.assertEqual(gb['messages'][0]['content'], 'Fixed rules. Write British English.')
+
+    def test_cached_prompt_tokens_are_logged_and_counted(self):
+        sdk = MagicMock()
+        response = sdk.chat.completions.create.return_value
+        response.choices[0].message.content = '{"ok": true}'
+        response.choices[0].message.refusal = None
+        response.usage.prompt_tokens, response.usage.completion_tokens = 1500, 20
+        response.usage.prompt_tokens_details.cached_tokens = 1280
+        with patch('portioning.llm.client', return_value=sdk), \
+                self.assertLogs('portioning.llm', 'INFO') as logs:
+            llm.complete_structured('LLM_FOLLOWUP_DRAFTER', self.PROMPT, 'user', SCHEMA)
+        self.assertIn('in=1500 tokens, out=20 tokens, cached=1280 tokens', logs.output[0])
+        self.assertEqual(llm_limits.usage()['LLM_FOLLOWUP_DRAFTER']['cached_tokens'], 1280)
+
+    @override_settings(LLM_FOLLOWUP_DRAFTER='anthropic:claude-test', ANTHROPIC_API_KEY='sk-ant')
+    def test_anthropic_cache_reads_and_writes_count_as_input(self):
+        sdk = MagicMock()
+        response = sdk.messages.create.return_value
+        response.stop_reason = 'end_turn'
+        response.content = [MagicMock(type='text', text='{"ok": true}')]
+        response.usage.input_tokens, response.usage.output_tokens = 30, 20
+        response.usage.cache_read_input_tokens, response.usage.cache_creation_input_tokens = 1200, 0
+        with patch('portioning.llm.client', return_value=sdk), llm_limits.tally() as usage:
+            llm.complete_structured('LLM_FOLLOWUP_DRAFTER', self.PROMPT, 'user', SCHEMA)
+        self.assertEqual((usage.input_tokens, usage.cached_tokens), (1230, 1200))
@@ -0,0 +1,90 @@
+"""The shared outbound HTTP layer (portioning.outbound)."""
+from unittest.mock import patch
+
+import requests
+from django.http import HttpResponse
+from django.test import RequestFactory, SimpleTestCase, override_settings
+
+from portioning import outbound
+from portioning.timing import ServerTimingMiddleware
+
+
+class FakeTransportTests(SimpleTestCase):
+    def setUp(self):
+        outbound.reset_stats()
+
+    def test_unanswered_requests_are_refused_not_sent(self):
+        with self.assertRaises(outbound.OutboundBlocked):
+            outbound.session(outbound.META).get('https://graph.facebook.com/v21.0/me')
+        # Still a requests.ConnectionError, so callers' error handling applies.
+        self.assertTrue(issubclass(outbound.OutboundBlocked, requests.ConnectionError))
+        self.assertEqual(outbound.stats()[outbound.META]['errors'], 1)
+
+    def test_fake_responses_answer_and_are_counted(self):
+        seen = []
+
+        def handler(request):
+            seen.append(request.url)
+            return 200, {'id': 'gmail-1'}
+
+        with outbound.fake_responses(handler):
+            response = outbound.session(outbound.GOOGLE).post(
+                'https://gmail.googleapis.com/send', json={'raw': 'x'},
+            )
+        self.assertEqual(response.json(), {'id': 'gmail-1'})
+        self.assertEqual(seen, ['https://gmail.googleapis.com/send'])
+        row = outbound.stats()[outbound.GOOGLE]
+        self.assertEqual((row['calls'], row['errors']), (1, 0))
+
+    def test_a_handler_can_fall_through_to_an_outer_one(self):
+        with outbound.fake_responses(lambda request: (503, 'busy')), \
+                outbound.fake_responses(lambda request: None):
+            response = outbound.session(outbound.TWILIO).get('https://api.twilio.com/x')
+        self.assertEqual(response.status_code, 503)
+        self.assertEqual(outbound.stats()[outbound.TWILIO]['errors'], 1)
+
+    def test_sessions_are_shared_per_provider(self):
+        self.assertIs(outbound.session(outbound.META), outbound.session(outbound.META))
+        self.assertIsNot(outbound.session(outbound.META), outbound.session(outbound.GOOGLE))
+
+    @override_settings(REQUEST_TIMING_ENABLED=True, REQUEST_TIMING_SLOW_MS=60_000,
+                       REQUEST_TIMING_SLOW_QUERIES=50)
+    def test_calls_show_up_in_server_timing_under_the_provider(self):
+        def view(request):
+            with outbound.fake_responses(lambda request: (200, {})):
+                outbound.session(outbound.META).get('https://graph.facebook.com/x')
+            return HttpResponse('ok')
+
+        with self.assertLogs('portioning.timing', 'INFO'):
+            response = ServerTimingMiddleware(view)(RequestFactory().get('/api/x/'))
+        self.assertIn('meta;dur=', response['Server-Timing'])
+
+
+@override_settings(OUTBOUND_HTTP_FAKE=False, OUTBOUND_HTTP_TIMEOUT=7, OUTBOUND_HTTP_POOL_SIZE=3)
+class ProviderAdapterTests(SimpleTestCase):
+    """Built directly with `_build`, never through `session()`: a real adapter
+    must not end up cached for the rest of the test run."""
+
+    def _adapter(self, provider):
+        return outbound._build(provider).get_adapter('https://example.com')
+
+    def test_pooled_with_idempotent_only_retries(self):
+        adapter = self._adapter(outbound.META)
+        self.assertEqual(adapter._pool_maxsize, 3)
+        retry = adapter.max_retries
+        self.assertEqual(retry.total, 2)
+        self.assertIn('GET', retry.allowed_methods)
+        self.assertNotIn('POST', retry.allowed_methods)  # never double-send
+        self.assertIn(503, retry.status_forcelist)
+
+    def test_stripe_is_left_to_retry_itself(self):
+        self.assertEqual(self._adapter(outbound.STRIPE).max_retries.total, 0)
+
+    def test_a_call_without_a_timeout_gets_the_default(self):
+        adapter = self._adapter(outbound.MICROSOFT)
+        request = requests.Request('GET', 'https://graph.microsoft.com/v1.0/me').prepare()
+        with patch('requests.adapters.HTTPAdapter.send') as send:
+            send.return_value.status_code = 200
+            adapter.send(request)
+            adapter.send(request, timeout=3)
+        self.assertEqual([c.kwargs['timeout'] for c in send.call_args_list], [7, 3])
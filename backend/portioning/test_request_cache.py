@@ -0,0 +1,97 @@
+"""Per-request memo of the one-row-per-org settings models (portioning.request_cache)."""
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+
+from bookings.models import OrgSettings
+from portioning import request_cache
+from portioning.request_cache import RequestCacheMiddleware, request_scope
+from rules.models import GlobalConfig, GlobalConstraint
+from users.models import Organisation
+
+
+class RequestScopeTests(TestCase):
+    def setUp(self):
+        self.org = Organisation.objects.create(name='Cache Org', slug='cache-org')
+
+    def test_each_row_fetched_once_per_scope(self):
+        with request_scope():
+            with self.assertNumQueries(1):
+                first = OrgSettings.for_org(self.org)
+                self.assertIs(OrgSettings.for_org(self.org), first)
+            # The calculator's models are memoised the same way.
+            GlobalConfig.for_org(self.org)
+            GlobalConstraint.for_org(self.org)
+            with self.assertNumQueries(0):
+                GlobalConfig.for_org(self.org)
+                GlobalConstraint.for_org(self.org)
+
+    def test_no_memo_outside_a_scope(self):
+        OrgSettings.for_org(self.org)
+        with self.assertNumQueries(1):
+            OrgSettings.for_org(self.org)
+
+    def test_save_invalidates_within_the_scope(self):
+        with request_scope():
+            OrgSettings.for_org(self.org)
+            row = OrgSettings.objects.get(organisation=self.org)
+            row.currency_symbol = '₹'
+            row.save()
+            self.assertEqual(OrgSettings.for_org(self.org).currency_symbol, '₹')
+
+    def test_invalidate_covers_queryset_update(self):
+        with request_scope():
+            OrgSettings.for_org(self.org)
+            OrgSettings.objects.filter(organisation=self.org).update(currency_symbol='€')
+            request_cache.invalidate(OrgSettings, self.org.pk)
+            self.assertEqual(OrgSettings.for_org(self.org).currency_symbol, '€')
+
+    def test_orgs_do_not_share_entries(self):
+        other = Organisation.objects.create(name='Other Org', slug='other-org')
+        OrgSettings.objects.filter(organisation=other).update(currency_symbol='¥')
+        with request_scope():
+            self.assertNotEqual(OrgSettings.for_org(self.org).currency_symbol, '¥')
+            self.assertEqual(OrgSettings.for_org(other).currency_symbol, '¥')
+
+    def test_middleware_opens_a_fresh_scope_per_request(self):
+        seen = []
+
+        def view(request):
+            seen.append(OrgSettings.for_org(self.org))
+            seen.append(OrgSettings.for_org(self.org))
+            return None
+
+        middleware = RequestCacheMiddleware(view)
+        middleware(None)
+        middleware(None)
+        self.assertIs(seen[0], seen[1])
+        self.assertIsNot(seen[1], seen[2])
+
+
+@override_settings(ORG_SETTINGS_CACHE_TTL=60)
+class SharedCacheTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.addCleanup(cache.clear)
+        self.org = Organisation.objects.create(name='Shared Org', slug='shared-org')
+
+    def test_second_scope_is_served_from_the_cache(self):
+        with request_scope():
+            OrgSettings.for_org(self.org)
+        with request_scope():
+            with self.assertNumQueries(0):
+                settings = OrgSettings.for_org(self.org)
+                self.assertEqual(settings.organisation, self.org)
+        self.assertFalse(settings._state.adding)
+
+    def test_save_drops_the_shared_copy(self):
+        OrgSettings.for_org(self.org)
+        row = OrgSettings.objects.get(organisation=self.org)
+        row.tax_label = 'GST'
+        row.save()
+        self.assertEqual(OrgSettings.for_org(self.org).tax_label, 'GST')
+
+    def test_unsaved_edits_do_not_leak_into_the_next_request(self):
+        with request_scope():
+            OrgSettings.for_org(self.org).tax_label = 'edited, never saved'
+        with request_scope():
+            self.assertNotEqual(OrgSettings.for_org(self.org).tax_label, 'edited, never saved')
@@ -0,0 +1,68 @@
+"""Server-Timing / per-request telemetry (portioning.timing)."""
+import json
+
+from django.http import HttpResponse
+from django.test import RequestFactory, TestCase, override_settings
+
+from portioning import timing
+from portioning.timing import ServerTimingMiddleware
+from users.models import Organisation
+
+
+def _view_with_work(request):
+    Organisation.objects.count()
+    Organisation.objects.exists()
+    timing.record_cache(hit=True)
+    timing.record_cache(hit=False)
+    with timing.span('llm'):
+        pass
+    return HttpResponse('ok')
+
+
+@override_settings(REQUEST_TIMING_ENABLED=True, REQUEST_TIMING_SLOW_MS=60_000,
+                   REQUEST_TIMING_SLOW_QUERIES=50)
+class ServerTimingMiddlewareTests(TestCase):
+    def setUp(self):
+        self.request = RequestFactory().get('/api/anything/')
+
+    def test_header_reports_db_cache_and_spans(self):
+        with self.assertLogs('portioning.timing', 'INFO'):
+            response = ServerTimingMiddleware(_view_with_work)(self.request)
+        header = response['Server-Timing']
+        self.assertIn('total;dur=', header)
+        self.assertIn('desc="2 queries"', header)
+        self.assertIn('desc="1 hit, 1 miss"', header)
+        self.assertIn('llm;dur=', header)
+
+    def test_one_structured_log_line_per_request(self):
+        with self.assertLogs('portioning.timing', 'INFO') as logs:
+            ServerTimingMiddleware(_view_with_work)(self.request)
+        self.assertEqual(len(logs.records), 1)
+        record = json.loads(logs.records[0].getMessage().removeprefix('request '))
+        self.assertEqual(record['path'], '/api/anything/')
+        self.assertEqual(record['queries'], 2)
+        self.assertNotIn('slowest_queries', record)
+
+    @override_settings(REQUEST_TIMING_SLOW_QUERIES=1)
+    def test_a_query_heavy_request_is_flagged_with_its_slowest_sql(self):
+        with self.assertLogs('portioning.timing', 'WARNING') as logs:
+            ServerTimingMiddleware(_view_with_work)(self.request)
+        record = json.loads(logs.records[0].getMessage().removeprefix('request '))
+        self.assertTrue(record['slow'])
+        self.assertEqual(len(record['slowest_queries']), 2)
+        self.assertIn('users_organisation', record['slowest_queries'][0]['sql'])
+
+    def test_end_to_end_through_the_stack(self):
+        with self.assertLogs('portioning.timing', 'INFO'):
+            response = self.client.get('/api/health/')
+        self.assertIn('total;dur=', response['Server-Timing'])
+
+
+class DisabledTests(TestCase):
+    @override_settings(REQUEST_TIMING_ENABLED=False)
+    def test_no_header_when_switched_off(self):
+        self.assertFalse(self.client.get('/api/health/').has_header('Server-Timing'))
+
+    def test_span_outside_a_request_is_a_no_op(self):
+        with timing.span('llm'):
+            timing.record_cache(hit=True)
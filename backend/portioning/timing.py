@@ -0,0 +1,176 @@
+"""Per-request performance telemetry: a Server-Timing header and one log line.
+
+Switched on by REQUEST_TIMING_ENABLED. For every request `ServerTimingMiddleware`
+records total time, DB time and query count (through a connection execute
+wrapper, so every ORM and raw query is seen), hits/misses of the app's own
+caches, and time spent in outbound calls that are wrapped in `span` / `timed` —
+the LLM call in `portioning.llm`, and every provider HTTP call, which
+`portioning.outbound` records under the provider's name (meta, google, ...).
+
+The numbers go out two ways:
+
+- a ``Server-Timing`` header, so the browser's network panel shows where a
+  slow response spent its time;
+- one ``portioning.timing`` log line per request, as JSON. A request over
+  REQUEST_TIMING_SLOW_MS or REQUEST_TIMING_SLOW_QUERIES is logged at WARNING
+  with its slowest statements attached — an N+1 shows up there as a query
+  count, long before a customer notices it.
+
+Code outside a request (commands, the cron) has no collector, and `span` /
+`record_cache` are then no-ops.
+"""
+import contextvars
+import functools
+import heapq
+import json
+import logging
+import time
+from collections import defaultdict
+from contextlib import ExitStack, contextmanager
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+
+logger = logging.getLogger(__name__)
+
+# How many of a request's slowest statements a slow-request warning carries,
+# and how much of each.
+SLOWEST_QUERIES = 5
+SQL_PREVIEW_CHARS = 500
+
+_current = contextvars.ContextVar('request_timings', default=None)
+
+
+class RequestTimings:
+    """What one request spent its time on. Also the DB execute wrapper."""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.db_seconds = 0.0
+        self.query_count = 0
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self.spans = defaultdict(float)
+        self._slowest = []  # min-heap of (seconds, sql)
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            elapsed = time.perf_counter() - started
+            self.db_seconds += elapsed
+            self.query_count += 1
+            entry = (elapsed, sql[:SQL_PREVIEW_CHARS])
+            if len(self._slowest) < SLOWEST_QUERIES:
+                heapq.heappush(self._slowest, entry)
+            else:
+                heapq.heappushpop(self._slowest, entry)
+
+    @property
+    def total_ms(self):
+        return (time.perf_counter() - self.started) * 1000
+
+    def slowest_queries(self):
+        return [
+            {'ms': round(seconds * 1000, 1), 'sql': sql}
+            for seconds, sql in sorted(self._slowest, reverse=True)
+        ]
+
+    def server_timing(self, total_ms):
+        """The Server-Timing header value."""
+        metrics = [
+            f'total;dur={total_ms:.1f}',
+            f'db;dur={self.db_seconds * 1000:.1f};desc="{self.query_count} queries"',
+            f'cache;desc="{self.cache_hits} hit, {self.cache_misses} miss"',
+        ]
+        metrics += [f'{name};dur={seconds * 1000:.1f}' for name, seconds in sorted(self.spans.items())]
+        return ', '.join(metrics)
+
+
+def record_cache(hit):
+    """Count one lookup in one of the app's caches against the current request."""
+    timings = _current.get()
+    if timings is None:
+        return
+    if hit:
+        timings.cache_hits += 1
+    else:
+        timings.cache_misses += 1
+
+
+@contextmanager
+def span(name):
+    """Add the time spent in the block to the current request's `name` metric."""
+    timings = _current.get()
+    if timings is None:
+        yield
+        return
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        timings.spans[name] += time.perf_counter() - started
+
+
+def timed(name):
+    """Decorator form of `span`."""
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with span(name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+class ServerTimingMiddleware:
+    """Collect `RequestTimings` for each request and report them.
+
+    Sits first in MIDDLEWARE so "total" covers everything the app does.
+    """
+
+    def __init__(self, get_response):
+        if not getattr(settings, 'REQUEST_TIMING_ENABLED', False):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+
+    def __call__(self, request):
+        timings = RequestTimings()
+        token = _current.set(timings)
+        try:
+            with ExitStack() as stack:
+                for connection in connections.all():
+                    stack.enter_context(connection.execute_wrapper(timings))
+                response = self.get_response(request)
+        finally:
+            _current.reset(token)
+
+        total_ms = timings.total_ms
+        response['Server-Timing'] = timings.server_timing(total_ms)
+        self._log(request, response, timings, total_ms)
+        return response
+
+    def _log(self, request, response, timings, total_ms):
+        record = {
+            'method': request.method,
+            'path': request.path,
+            'status': response.status_code,
+            'total_ms': round(total_ms, 1),
+            'db_ms': round(timings.db_seconds * 1000, 1),
+            'queries': timings.query_count,
+            'cache_hits': timings.cache_hits,
+            'cache_misses': timings.cache_misses,
+            **{f'{name}_ms': round(seconds * 1000, 1) for name, seconds in timings.spans.items()},
+        }
+        slow = (
+            total_ms > settings.REQUEST_TIMING_SLOW_MS
+            or timings.query_count > settings.REQUEST_TIMING_SLOW_QUERIES
+        )
+        if slow:
+            record['slow'] = True
+            record['slowest_queries'] = timings.slowest_queries()
+            logger.warning('request %s', json.dumps(record))
+        else:
+            logger.info('request %s', json.dumps(record))
@@ -3,10 +3,11 @@ from django.urls import path, include
 
 from users.views import DemoRequestCreateView
 
-from .views import health
+from .views import cache_health, health
 
 urlpatterns = [
     path('api/health/', health),
+    path('api/health/cache/', cache_health),
     path('api/admin/', admin.site.urls),
     path('api/', include('dishes.urls')),
     path('api/', include('menus.urls')),
@@ -16,6 +17,7 @@ urlpatterns = [
     path('api/', include('staff.urls')),
     path('api/', include('equipment.urls')),
     path('api/', include('payments.urls')),
+    path('api/', include('agents.urls')),
     path('api/auth/', include('users.urls')),
     path('api/demo-requests/', DemoRequestCreateView.as_view(), name='demo-request-create'),
 ]
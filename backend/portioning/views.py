@@ -1,5 +1,7 @@
 from django.http import JsonResponse
 
+from portioning import cache
+
 
 def health(_request):
     """Liveness probe for the post-deploy smoke check (REL-360).
@@ -9,3 +11,18 @@ def health(_request):
     means "the deploy is down", not "some tenant's data is off".
     """
     return JsonResponse({"status": "ok"})
+
+
+def cache_health(_request):
+    """Readiness of the shared cache (CACHES['default']).
+
+    Separate from `health` because it does touch a backing store — with the
+    database cache, the database. 503 when a value can't round-trip: throttles
+    and every per-org cache would then be failing open or falling back to
+    queries, which is worth an alert even though the app is still serving.
+    """
+    ok, backend = cache.check()
+    return JsonResponse(
+        {"status": "ok" if ok else "error", "backend": backend},
+        status=200 if ok else 503,
+    )
@@ -3,3 +3,8 @@ from django.apps import AppConfig
 
 class RulesConfig(AppConfig):
     name = 'rules'
+
+    def ready(self):
+        from portioning import request_cache
+        from rules.models import GlobalConfig, GlobalConstraint
+        request_cache.track(GlobalConfig, GlobalConstraint)
@@ -2,6 +2,7 @@ from decimal import Decimal
 
 from django.core.validators import MinValueValidator
 from django.db import models
+from portioning import request_cache
 from users.managers import TenantManager
 
 
@@ -47,8 +48,7 @@ class GlobalConfig(models.Model):
 
     @classmethod
     def for_org(cls, org):
-        obj, _ = cls.objects.get_or_create(organisation=org)
-        return obj
+        return request_cache.get_for_org(cls, org)
 
 
 class BudgetProfile(models.Model):
@@ -184,8 +184,7 @@ class GlobalConstraint(models.Model):
 
     @classmethod
     def for_org(cls, org):
-        obj, _ = cls.objects.get_or_create(organisation=org)
-        return obj
+        return request_cache.get_for_org(cls, org)
 
 
 class CategoryConstraint(models.Model):
@@ -10,7 +10,9 @@ from django.test import TestCase, override_settings
 from rest_framework.test import APIClient
 
 from users.models import Organisation, User
+from bookings.activity import log_activity
 from bookings.models import Account, Contact, Venue, Lead, Quote
+from bookings.models.activity import ActivityLog
 from bookings.models.choices import (
     EventTypeOption, LostReasonOption,
 )
@@ -383,6 +385,20 @@ class TestDashboardIsolation(OrgIsolationTestBase):
         data = resp.data
         self.assertEqual(data.get("total_leads", 0), 0)
 
+    def test_activity_counts_are_scoped_by_the_log_organisation(self):
+        log_activity(self.lead_a, 'created', description='Created lead')
+        self.assertEqual(
+            ActivityLog.objects.get(object_id=self.lead_a.pk).organisation, self.org_a,
+        )
+
+        resp = self.client.get("/api/bookings/dashboard/stats/")
+        self.assertEqual(resp.data["lead_summary"]["new_leads"], 0)
+
+        owner_a = APIClient()
+        owner_a.force_authenticate(user=self.user_a)
+        resp = owner_a.get("/api/bookings/dashboard/stats/")
+        self.assertEqual(resp.data["lead_summary"]["new_leads"], 1)
+
 
 class TestSuperuserOrgSwitch(OrgIsolationTestBase):
     """Test superuser org switching.
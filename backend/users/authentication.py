@@ -11,9 +11,22 @@ class CookieJWTAuthentication(JWTAuthentication):
             return super().authenticate(request)
         # Cookie-based auth: enforce CSRF on unsafe methods
         self._enforce_csrf(request)
+        verified = self._verified_by_middleware(request, raw_token)
+        if verified is not None:
+            return verified
         validated_token = self.get_validated_token(raw_token)
         return self.get_user(validated_token), validated_token
 
+    @staticmethod
+    def _verified_by_middleware(request, raw_token):
+        """(user, token) if SubscriptionGateMiddleware already verified this
+        exact token on this request — saves a second signature check and user
+        query. Anything else (no gate on this path, another token) is None."""
+        verified = getattr(request, '_verified_jwt', None)
+        if verified is None or verified[0] != raw_token:
+            return None
+        return verified[1], verified[2]
+
     def _enforce_csrf(self, request):
         if request.method in ("GET", "HEAD", "OPTIONS", "TRACE"):
             return
@@ -0,0 +1,24 @@
+"""Create the database cache table (CACHES['default'] with CACHE_URL=db://).
+
+`createcachetable` is idempotent and a no-op for any other cache backend, so
+running it from a migration means every environment that runs `migrate` — CI,
+a fresh dev checkout, the production deploy — has the table without a separate
+provisioning step.
+"""
+from django.core.management import call_command
+from django.db import migrations
+
+
+def create_cache_table(apps, schema_editor):
+    call_command('createcachetable', database=schema_editor.connection.alias, verbosity=0)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0008_demorequest'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_cache_table, migrations.RunPython.noop),
+    ]
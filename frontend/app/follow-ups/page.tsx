@@ -911,7 +911,7 @@ function DraftsTab() {
       revalidate("followup-draft-count");
       await mutate();
       if (res.failed.length > 0) {
-        setBulkError(`${res.sent.length} sent, ${res.failed.length} failed — open a draft to see why.`);
+        setBulkError(`${res.sent.length} approved, ${res.failed.length} failed — open a draft to see why.`);
       }
     } catch (err) {
       setBulkError(err instanceof Error ? err.message : "Bulk approve failed");
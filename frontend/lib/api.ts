@@ -1256,6 +1256,9 @@ export interface FollowUpDraft {
   model_used: string;
   /** The ledger row this became once sent, on either channel. */
   whatsapp_message: number | null;
+  /** That row's status: `queued` until the outbox delivers it, then `sent`
+   * (or `failed`). `sent` on the draft itself only means it left review. */
+  message_status?: string | null;
   reviewed_by: number | null;
   reviewed_by_name: string | null;
   reviewed_at: string | null;